@@ -0,0 +1,198 @@
+import sys
+import os
+import io
+import argparse
+import time
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.lexer import tokenize
+from src.parser import Parser
+from src.semantic_analyzer.semantic_analyzer import SemanticAnalyzer
+from src.backend.codegen import CodeGenerator
+from src.backend.vm import VirtualMachine
+from src.backend.peephole import optimize
+from src.backend.inliner import Inliner
+from src.backend.loop_optimizer import LoopOptimizer
+from src.backend.regcodegen import RegisterCodeGenerator
+from src.backend.regvm import RegisterMachine
+from src.backend.pycodegen import PythonCodeGenerator, HAVE_NUMPY
+from src.backend.pycache import ProgramCache, ENGINES as ARTIFACT_ENGINES, build_variant, compile_source
+from src.backend.pcode import DEFAULT_MAX_DEPTH
+
+# Benchmark VM: compile sekali, lalu jalankan program beberapa kali di setiap
+# engine dan laporkan waktu terbaik, instruksi per detik, jumlah dispatch per
+# statement source (dari build dengan instrumentasi STM) dan speedup engine
+# register terhadap engine stack. Backend Python dibandingkan dengan waktu
+# eksekusi saja; jika NumPy tersedia, build tanpa NumPy (tanpa loop vektor)
+# ikut diukur sebagai pembanding. Engine stack juga diukur setelah pipeline
+# peephole (-O2), dan setiap engine diukur ulang dengan subprogram kecil
+# di-inline dan dengan optimasi loop. Terakhir, startup cold (compile dari
+# source) dibandingkan dengan warm (memuat artifact .pasc) untuk setiap engine.
+# --io mengukur throughput runtime I/O (writeln ke file dan read dari input
+# in-memory) dengan io-heavy.pas di setiap engine.
+# Workload rekursi dalam dijalankan dengan batas kedalaman call miliknya
+# sendiri (WORKLOAD_MAX_DEPTH), file lain dengan --max-depth.
+# Usage: python -m src.backend.benchmark [file.pas ...] [--repeat N] [--max-depth FRAMES]
+#        python -m src.backend.benchmark --io [--writelns N] [--reads N] [--repeat N]
+
+ENGINES = {
+    "stack": (CodeGenerator, VirtualMachine),
+    "register": (RegisterCodeGenerator, RegisterMachine),
+}
+
+DEFAULT_WORKLOADS = [
+    os.path.join(os.path.dirname(__file__), '..', '..', 'test', 'benchmark', 'factorial-prime.pas'),
+    os.path.join(os.path.dirname(__file__), '..', '..', 'test', 'benchmark', 'array-update.pas'),
+    os.path.join(os.path.dirname(__file__), '..', '..', 'test', 'benchmark', 'call-heavy.pas'),
+    os.path.join(os.path.dirname(__file__), '..', '..', 'test', 'benchmark', 'loop-nest.pas'),
+    os.path.join(os.path.dirname(__file__), '..', '..', 'test', 'benchmark', 'deep-recursion.pas'),
+    os.path.join(os.path.dirname(__file__), '..', '..', 'test', 'milestone-3', 'input-10.pas'),
+]
+# Depth(10^6) non-tail di deep-recursion.pas: 10^6 frame + frame pemanggil
+WORKLOAD_MAX_DEPTH = {'deep-recursion.pas': 1000001}
+IO_WORKLOAD = os.path.join(os.path.dirname(__file__), '..', '..', 'test', 'benchmark', 'io-heavy.pas')
+
+
+def analyze_file(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        source_code = f.read()
+    analyzer = SemanticAnalyzer()
+    ast = analyzer.analyze(Parser(tokenize(source_code)).parse())
+    if analyzer.errors:
+        raise SystemExit(f"{path}: {len(analyzer.errors)} semantic errors")
+    return ast, analyzer.symbol_table
+
+
+def execute(machine_class, program, max_depth: int = DEFAULT_MAX_DEPTH):
+    vm = machine_class(program, input=io.StringIO(), output=io.StringIO(), max_depth=max_depth)
+    start = time.perf_counter()
+    vm.run()
+    return vm, time.perf_counter() - start
+
+
+def bench(path: str, repeat: int, max_depth: int = DEFAULT_MAX_DEPTH):
+    ast, symbol_table = analyze_file(path)
+    print(os.path.basename(path))
+    timings = {}
+    for name, (generator_class, machine_class) in ENGINES.items():
+        program = generator_class(symbol_table).generate(ast)
+        best = min(execute(machine_class, program, max_depth)[1] for _ in range(repeat))
+        vm, _ = execute(machine_class, program, max_depth)
+        # Build terpisah dengan STM untuk menghitung statement yang dieksekusi
+        counted, _ = execute(machine_class, generator_class(symbol_table, count_statements=True).generate(ast),
+                             max_depth)
+        per_statement = (counted.steps - counted.statements) / max(counted.statements, 1)
+        timings[name] = best
+        print(f"  {name:8} {len(program.code):6} instr {vm.steps:10} dispatch "
+              f"{per_statement:6.2f} /stmt {best * 1000:9.2f} ms {vm.steps / best / 1e6:7.2f} M instr/s")
+    print(f"  speedup register vs stack: {timings['stack'] / timings['register']:.2f}x")
+
+    program = CodeGenerator(symbol_table).generate(ast)
+    optimize(program, 2)
+    best = min(execute(VirtualMachine, program, max_depth)[1] for _ in range(repeat))
+    vm, _ = execute(VirtualMachine, program, max_depth)
+    print(f"  stack -O2 {len(program.code):5} instr {vm.steps:10} dispatch {best * 1000:9.2f} ms "
+          f"speedup vs stack: {timings['stack'] / best:.2f}x")
+
+    program = PythonCodeGenerator(symbol_table).generate(ast)
+    best = timings['python'] = min(run_python(program, max_depth) for _ in range(repeat))
+    print(f"  python   {best * 1000:9.2f} ms  speedup vs stack: {timings['stack'] / best:.2f}x")
+    if HAVE_NUMPY:
+        program = PythonCodeGenerator(symbol_table, use_numpy=False).generate(ast)
+        plain = min(run_python(program, max_depth) for _ in range(repeat))
+        print(f"  python without NumPy {plain * 1000:9.2f} ms  NumPy speedup: {plain / best:.2f}x")
+    # AST dianalisis ulang karena inliner mengubah AST dan symbol table
+    ast, symbol_table = analyze_file(path)
+    sites, growth = Inliner(symbol_table).run(ast)
+    print(f"  inlined: {sites} call sites, {growth} AST nodes added")
+    for name, (generator_class, machine_class) in ENGINES.items():
+        program = generator_class(symbol_table).generate(ast)
+        best = min(execute(machine_class, program, max_depth)[1] for _ in range(repeat))
+        vm, _ = execute(machine_class, program, max_depth)
+        print(f"  {name:8} {len(program.code):6} instr {vm.steps:10} dispatch {best * 1000:9.2f} ms "
+              f"inlining speedup: {timings[name] / best:.2f}x")
+    program = PythonCodeGenerator(symbol_table).generate(ast)
+    best = min(run_python(program, max_depth) for _ in range(repeat))
+    print(f"  python   {best * 1000:9.2f} ms  inlining speedup: {timings['python'] / best:.2f}x")
+    ast, symbol_table = analyze_file(path)
+    hoisted, reduced = LoopOptimizer(symbol_table).run(ast)
+    print(f"  loop optimizer: {hoisted} invariants hoisted, {reduced} multiplications strength-reduced")
+    for name, (generator_class, machine_class) in ENGINES.items():
+        program = generator_class(symbol_table).generate(ast)
+        best = min(execute(machine_class, program, max_depth)[1] for _ in range(repeat))
+        vm, _ = execute(machine_class, program, max_depth)
+        print(f"  {name:8} {len(program.code):6} instr {vm.steps:10} dispatch {best * 1000:9.2f} ms "
+              f"loop speedup: {timings[name] / best:.2f}x")
+    program = PythonCodeGenerator(symbol_table).generate(ast)
+    best = min(run_python(program, max_depth) for _ in range(repeat))
+    print(f"  python   {best * 1000:9.2f} ms  loop speedup: {timings['python'] / best:.2f}x")
+
+    with open(path, 'r', encoding='utf-8') as f:
+        source_code = f.read()
+    # Cold start: compile dari source lalu tulis artifact; warm start: muat .pasc
+    with tempfile.TemporaryDirectory() as directory:
+        for engine in ARTIFACT_ENGINES:
+            cache = ProgramCache(directory, build_variant(engine, 1), engine)
+            start = time.perf_counter()
+            compile_source(source_code, cache, engine)
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            _, hit = compile_source(source_code, cache, engine)
+            warm = time.perf_counter() - start
+            print(f"  {engine:8} compile: {cold * 1000:.2f} ms, from artifact: {warm * 1000:.2f} ms "
+                  f"(hit={hit})")
+
+
+def bench_io(writelns: int, reads: int, repeat: int):
+    ast, symbol_table = analyze_file(IO_WORKLOAD)
+    # Input: "n m" lalu m pasangan integer dan real
+    pairs = " ".join(f"{i} {i % 97}.5" for i in range(reads))
+    input_text = f"{writelns} {reads}\n{pairs}\n"
+    programs = {name: (generator_class(symbol_table).generate(ast), machine_class)
+                for name, (generator_class, machine_class) in ENGINES.items()}
+    programs["python"] = (PythonCodeGenerator(symbol_table).generate(ast), None)
+    print(f"{os.path.basename(IO_WORKLOAD)}: {writelns} writeln, {reads} read pairs")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "output.txt")
+        for name, (program, machine_class) in programs.items():
+            best = None
+            for _ in range(repeat):
+                with open(path, 'w', encoding='utf-8') as output:
+                    start = time.perf_counter()
+                    if machine_class is None:
+                        program.run(input=io.StringIO(input_text), output=output)
+                    else:
+                        machine_class(program, input=io.StringIO(input_text), output=output).run()
+                    elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            size = os.path.getsize(path)
+            print(f"  {name:8} {best * 1000:9.2f} ms {(writelns + reads) / best / 1e6:7.2f} M calls/s "
+                  f"{size / best / 1e6:7.2f} MB/s output")
+
+
+def run_python(program, max_depth: int = DEFAULT_MAX_DEPTH) -> float:
+    start = time.perf_counter()
+    program.run(input=io.StringIO(), output=io.StringIO(), max_depth=max_depth)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src.backend.benchmark")
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--io", action="store_true", help="measure write/read throughput instead")
+    parser.add_argument("--writelns", type=int, default=10 ** 7)
+    parser.add_argument("--reads", type=int, default=10 ** 6)
+    parser.add_argument("--max-depth", type=int, metavar="FRAMES",
+                        help=f"maximum call depth (default: per workload, otherwise {DEFAULT_MAX_DEPTH})")
+    args = parser.parse_args()
+    if args.io:
+        bench_io(args.writelns, args.reads, args.repeat)
+        return
+    for path in args.files or DEFAULT_WORKLOADS:
+        max_depth = args.max_depth or WORKLOAD_MAX_DEPTH.get(os.path.basename(path), DEFAULT_MAX_DEPTH)
+        bench(path, args.repeat, max_depth)
+
+
+if __name__ == "__main__":
+    main()
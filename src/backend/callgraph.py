@@ -0,0 +1,248 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Set
+from src.semantic_analyzer.symbol_table import SymbolTable, ObjType
+from src.semantic_analyzer.type_descriptors import ArrayType
+from src.semantic_analyzer.ast_nodes import *
+from src.semantic_analyzer.traversal import walk
+from .codegen import BUILTIN_PROCEDURES
+
+# Call graph dan ringkasan efek samping subprogram untuk pass optimasi AST
+# (inliner, loop optimizer). Untuk setiap subprogram dicatat subprogram yang
+# dipanggilnya dan variabel luar (bukan lokal/parameternya sendiri) yang
+# di-assign; efek ini digabung transitif lewat call graph, sehingga sebuah
+# pemanggilan cukup dianggap meng-assign writes[callee]. Subprogram impure
+# jika (transitif) meng-assign variabel luar, hasil fungsi lain, atau I/O.
+
+READ_PROCEDURES = ("read", "readln")
+
+
+class Subprogram:
+    __slots__ = ("decl", "body", "level", "block_index", "calls", "writes", "has_nested",
+                 "has_local_arrays", "side_effects")
+
+    def __init__(self, decl: ASTNode, body: Optional[ASTNode], level: int, block_index: int):
+        self.decl = decl
+        self.body = body
+        self.level = level                  # Level variabel lokal
+        self.block_index = block_index
+        self.calls: Set[int] = set()        # tab index subprogram yang dipanggil
+        self.writes: Set[int] = set()       # Variabel luar yang di-assign langsung
+        self.has_nested = False
+        self.has_local_arrays = False
+        self.side_effects = False           # Assign variabel luar/hasil fungsi lain atau I/O (langsung)
+
+
+class CallGraph:
+    def __init__(self, symbol_table: SymbolTable):
+        self.symbol_table = symbol_table
+        self.subprograms: Dict[int, Subprogram] = {}
+        self.main_body: Optional[ASTNode] = None
+        self.recursive: Set[int] = set()
+        self.impure: Set[int] = set()
+        # Variabel luar yang mungkin di-assign oleh pemanggilan (transitif)
+        self.writes: Dict[int, Set[int]] = {}
+
+    def build(self, program: ProgramNode) -> CallGraph:
+        for child in program.children:
+            if child.node_type == NodeKind.DECLARATIONS:
+                self.collect_subprograms(child)
+            elif child.node_type == NodeKind.COMPOUND_STATEMENT:
+                self.main_body = child
+        self.find_recursion()
+        self.propagate_effects()
+        return self
+
+    def collect_subprograms(self, declarations: ASTNode):
+        tab = self.symbol_table.tab
+        pending = [declarations]
+        while pending:
+            for decl in pending.pop().children:
+                if not isinstance(decl, (ProcedureDeclNode, FunctionDeclNode)) or decl.tab_index < 0:
+                    continue
+                entry = tab[decl.tab_index]
+                subprogram = Subprogram(decl, None, entry.lev + 1, entry.block_index)
+                for block in decl.children:
+                    if block.node_type != NodeKind.BLOCK:
+                        continue
+                    for child in block.children:
+                        if child.node_type == NodeKind.DECLARATIONS:
+                            pending.append(child)
+                            subprogram.has_nested = any(
+                                isinstance(nested, (ProcedureDeclNode, FunctionDeclNode))
+                                for nested in child.children)
+                        elif child.node_type == NodeKind.COMPOUND_STATEMENT:
+                            subprogram.body = child
+                self.scan_body(decl.tab_index, subprogram)
+                self.subprograms[decl.tab_index] = subprogram
+
+    def scan_body(self, tab_index: int, subprogram: Subprogram):
+        tab = self.symbol_table.tab
+        if subprogram.block_index >= 0:
+            param_count = self.symbol_table.btab[subprogram.block_index].param_count
+            variables = self.block_variables(subprogram.block_index)
+            subprogram.has_local_arrays = any(isinstance(tab[index].type_desc, ArrayType)
+                                              for index in variables[param_count:])
+        if subprogram.body is None:
+            return
+        targets: Set[int] = set()
+
+        def target(var: ASTNode):
+            if not isinstance(var, VariableNode) or var.tab_index < 0:
+                return
+            targets.add(id(var))
+            entry = tab[var.tab_index]
+            if entry.obj == ObjType.FUNCTION:
+                if var.tab_index != tab_index:
+                    subprogram.side_effects = True
+            elif entry.lev != subprogram.level:
+                subprogram.writes.add(var.tab_index)
+                subprogram.side_effects = True
+
+        def assignment(node: ASTNode):
+            if node.children:
+                target(node.children[0])
+
+        def procedure_call(node: ProcedureCallNode):
+            if self.is_builtin(node):
+                subprogram.side_effects = True
+                if node.procedure_name.lower() in READ_PROCEDURES:
+                    for arg in node.children:
+                        target(arg)
+            elif node.tab_index >= 0:
+                subprogram.calls.add(node.tab_index)
+
+        def function_call(node: FunctionCallNode):
+            if node.tab_index is not None and node.tab_index >= 0:
+                subprogram.calls.add(node.tab_index)
+
+        def variable(node: VariableNode):
+            # Nama fungsi di dalam ekspresi adalah pemanggilan (kecuali target assignment)
+            if (id(node) not in targets and node.tab_index >= 0 and
+                    tab[node.tab_index].obj == ObjType.FUNCTION):
+                subprogram.calls.add(node.tab_index)
+
+        walk(subprogram.body, enter={NodeKind.ASSIGNMENT: assignment, NodeKind.FOR_STATEMENT: assignment,
+                                     ProcedureCallNode: procedure_call, FunctionCallNode: function_call,
+                                     VariableNode: variable})
+
+    def find_recursion(self):
+        # Subprogram rekursif: dapat mencapai dirinya sendiri lewat call graph
+        for start in self.subprograms:
+            seen: Set[int] = set()
+            pending = list(self.subprograms[start].calls)
+            while pending:
+                callee = pending.pop()
+                if callee == start:
+                    self.recursive.add(start)
+                    break
+                if callee in seen or callee not in self.subprograms:
+                    continue
+                seen.add(callee)
+                pending.extend(self.subprograms[callee].calls)
+
+    def propagate_effects(self):
+        # Efek samping menular ke caller; iterasi sampai stabil
+        self.impure = {index for index, subprogram in self.subprograms.items() if subprogram.side_effects}
+        self.writes = {index: set(subprogram.writes) for index, subprogram in self.subprograms.items()}
+        changed = True
+        while changed:
+            changed = False
+            for index, subprogram in self.subprograms.items():
+                writes = self.writes[index]
+                size = len(writes)
+                for callee in subprogram.calls:
+                    if callee not in self.subprograms:
+                        continue
+                    # Lokal milik caller yang di-assign callee (subprogram bersarang) tidak bocor keluar
+                    writes.update(variable for variable in self.writes[callee]
+                                  if self.symbol_table.tab[variable].lev != subprogram.level)
+                    if callee in self.impure and index not in self.impure:
+                        self.impure.add(index)
+                        changed = True
+                if len(writes) != size:
+                    changed = True
+
+    def bottom_up_order(self) -> List[int]:
+        # Post-order DFS: callee sebelum caller (siklus rekursi diputus di node yang sudah dikunjungi)
+        order: List[int] = []
+        visited: Set[int] = set()
+        for root in self.subprograms:
+            if root in visited:
+                continue
+            visited.add(root)
+            stack = [(root, iter(sorted(self.subprograms[root].calls)))]
+            while stack:
+                node, callees = stack[-1]
+                for callee in callees:
+                    if callee in self.subprograms and callee not in visited:
+                        visited.add(callee)
+                        stack.append((callee, iter(sorted(self.subprograms[callee].calls))))
+                        break
+                else:
+                    stack.pop()
+                    order.append(node)
+        return order
+
+    # ---------- Helper ----------
+
+    def block_variables(self, block_index: int) -> List[int]:
+        # Variabel (termasuk parameter) milik block, urut sesuai adr
+        tab = self.symbol_table.tab
+        indices = []
+        current_idx = self.symbol_table.btab[block_index].last
+        while current_idx >= self.symbol_table.user_id_start:
+            entry = tab[current_idx]
+            if entry is None:
+                break
+            if entry.obj == ObjType.VARIABLE:
+                indices.append(current_idx)
+            current_idx = entry.link
+        indices.sort(key=lambda index: tab[index].adr)
+        return indices
+
+    def is_builtin(self, stmt: ProcedureCallNode) -> bool:
+        name = stmt.procedure_name.lower()
+        return name in BUILTIN_PROCEDURES and (stmt.tab_index < self.symbol_table.user_id_start or
+                                               self.symbol_table.tab[stmt.tab_index].name.lower() != name)
+
+    def call_target(self, expr: ASTNode) -> int:
+        # tab index fungsi yang dipanggil oleh expr, -1 jika bukan pemanggilan
+        if isinstance(expr, FunctionCallNode):
+            return expr.tab_index if expr.tab_index is not None else -1
+        if (isinstance(expr, VariableNode) and expr.tab_index >= 0 and
+                self.symbol_table.tab[expr.tab_index].obj == ObjType.FUNCTION):
+            return expr.tab_index
+        return -1
+
+    def is_pure(self, exprs: List[ASTNode]) -> bool:
+        # Semua fungsi yang dipanggil di exprs bebas efek samping
+        pending = list(exprs)
+        while pending:
+            expr = pending.pop()
+            if expr.const_value is not None:
+                continue
+            callee = self.call_target(expr)
+            if callee >= 0 and (callee in self.impure or callee not in self.subprograms):
+                return False
+            pending.extend(expr.children or ())
+            pending.extend(expr.index_expressions)
+        return True
+
+
+def assignment_targets(root: Optional[ASTNode]) -> List[VariableNode]:
+    # Variabel yang di-assign (termasuk counter untuk dan argumen read)
+    targets = []
+    if root is None:
+        return targets
+
+    def assignment(node: ASTNode):
+        if node.children and isinstance(node.children[0], VariableNode):
+            targets.append(node.children[0])
+
+    def procedure_call(node: ProcedureCallNode):
+        if node.procedure_name.lower() in READ_PROCEDURES:
+            targets.extend(child for child in node.children if isinstance(child, VariableNode))
+
+    walk(root, enter={NodeKind.ASSIGNMENT: assignment, NodeKind.FOR_STATEMENT: assignment,
+                      NodeKind.PROCEDURE_CALL: procedure_call})
+    return targets
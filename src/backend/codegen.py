@@ -0,0 +1,568 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, Generator, List, Optional, Set, Union
+from src.tokens import Token
+from src.semantic_analyzer.symbol_table import SymbolTable, ObjType, BaseType
+from src.semantic_analyzer.type_descriptors import TypeDescriptor, ArrayType, primitive
+from src.semantic_analyzer.ast_nodes import *
+from src.semantic_analyzer.traversal import trampoline, walk
+from .pcode import (Op, Instruction, ProcInfo, PCodeProgram, FRAME_HEADER, FRAME_RESULT)
+
+# Code generator: decorated AST + SymbolTable -> p-code.
+# Alamat variabel diambil dari tab: level = lev, offset = FRAME_HEADER + posisi
+# adr di dalam block-nya (adr dialokasikan berurutan per block, parameter lebih
+# dulu). Ukuran frame dan parameter diambil dari vsze/psze di btab, batas array
+# dari atab. Seperti CFGBuilder, handler node majemuk berupa generator yang
+# dijalankan lewat trampoline sehingga kedalaman AST tidak dibatasi recursion limit.
+
+BUILTIN_PROCEDURES = ("writeln", "readln", "write", "read")
+
+BINARY_OPS = {
+    '+': Op.ADD, '-': Op.SUB, '*': Op.MUL, '/': Op.DVD, 'bagi': Op.DIV, 'mod': Op.MOD,
+    'dan': Op.AND, 'atau': Op.OR,
+    '=': Op.EQ, '<>': Op.NE, '<': Op.LT, '<=': Op.LE, '>': Op.GT, '>=': Op.GE,
+}
+
+# Statement yang hanya mengelompokkan statement lain (tidak dihitung oleh STM)
+BLOCK_STATEMENTS = (NodeKind.COMPOUND_STATEMENT, NodeKind.STATEMENT_LIST, NodeKind.STATEMENT)
+
+# Nilai awal variabel per tipe dasar (Pascal tidak menginisialisasi variabel,
+# tetapi VM butuh nilai yang deterministik)
+DEFAULT_VALUES = {
+    BaseType.INTEGER: 0,
+    BaseType.REAL: 0.0,
+    BaseType.BOOLEAN: False,
+    BaseType.CHAR: "\0",
+    BaseType.STRING: "",
+}
+
+
+def tail_calls(body: Optional[ASTNode], tab_index: int, is_function: bool) -> Set[int]:
+    # id statement pemanggilan diri sendiri di posisi ekor body subprogram
+    # tab_index: "P(...)" untuk prosedur, "F := F(...)" untuk fungsi. Setelah
+    # statement tersebut tidak ada lagi yang dieksekusi, sehingga frame aktif
+    # boleh dipakai ulang oleh pemanggilan (backend mengganti CAL dengan lompatan).
+    calls: Set[int] = set()
+    pending = [body] if body is not None else []
+    while pending:
+        stmt = pending.pop()
+        kind = stmt.node_type
+        children = stmt.children
+        if kind in (NodeKind.COMPOUND_STATEMENT, NodeKind.STATEMENT_LIST):
+            # Statement terakhir yang bukan statement kosong
+            for child in reversed(children):
+                if child.node_type != NodeKind.STATEMENT:
+                    pending.append(child)
+                    break
+        elif kind == NodeKind.IF_STATEMENT:
+            pending.extend(children[1:])
+        elif isinstance(stmt, RuleNode) and stmt.rule == "<case-statement>":
+            pending.extend(element.children[-1] for element in children[2:]
+                           if isinstance(element, RuleNode) and element.rule == "<case-element>")
+        elif isinstance(stmt, ProcedureCallNode):
+            # Fungsi yang dipanggil sebagai statement: hasilnya dibuang, bukan hasil frame ini
+            if stmt.tab_index == tab_index and not is_function:
+                calls.add(id(stmt))
+        elif kind == NodeKind.ASSIGNMENT and is_function and len(children) >= 2:
+            target, value = children[0], children[1]
+            if (isinstance(target, VariableNode) and target.tab_index == tab_index and
+                    isinstance(value, (FunctionCallNode, VariableNode)) and value.tab_index == tab_index and
+                    not value.index_expressions):
+                calls.add(id(stmt))
+    return calls
+
+
+class CodegenError(Exception):
+    def __init__(self, message: str, token: Optional[Token] = None):
+        super().__init__(message)
+        self.message = message
+        self.token = token
+
+    def __str__(self):
+        location = f" at line {self.token.line}, column {self.token.column}" if self.token else ""
+        return f"Codegen Error{location}: {self.message}"
+
+
+def string_value(raw: str) -> str:
+    # Token STRING_LITERAL masih berisi tanda kutip dan escape ''
+    if len(raw) >= 2 and raw[0] == "'" and raw[-1] == "'":
+        return raw[1:-1].replace("''", "'")
+    return raw
+
+
+def default_value(type_desc: TypeDescriptor) -> List[Any]:
+    # Isi awal cell untuk satu variabel; array diratakan per elemen
+    if isinstance(type_desc, ArrayType):
+        return default_value(type_desc.element) * max(type_desc.high - type_desc.low + 1, 0)
+    return [DEFAULT_VALUES.get(type_desc.base, 0)] * type_desc.size
+
+
+class CodeGenerator:
+    STATEMENT_MARKER = Op.STM
+
+    def __init__(self, symbol_table: SymbolTable, count_statements: bool = False):
+        self.symbol_table = symbol_table
+        self.count_statements = count_statements  # Sisipkan STM di awal setiap statement (benchmark)
+        self.code: List[Instruction] = []
+        self.lines: List[int] = []
+        self.line = 0
+        self.procs: List[ProcInfo] = []
+        self.proc_ids: Dict[int, int] = {}   # tab index subprogram -> nomor prosedur (operand CAL)
+        self.offsets: Dict[int, int] = {}    # tab index variabel -> offset di frame
+        self.max_level = 0
+        # id statement pemanggilan diri sendiri di posisi ekor subprogram yang sedang di-generate
+        self.tail_calls: Set[int] = set()
+
+        self.statement_handlers: Dict[NodeKind, Callable[[ASTNode], Union[Generator, None]]] = {
+            NodeKind.ASSIGNMENT: self.gen_assignment,
+            NodeKind.PROCEDURE_CALL: self.gen_procedure_call,
+            NodeKind.COMPOUND_STATEMENT: self.gen_sequence,
+            NodeKind.STATEMENT_LIST: self.gen_sequence,
+            NodeKind.IF_STATEMENT: self.gen_if,
+            NodeKind.WHILE_STATEMENT: self.gen_while,
+            NodeKind.FOR_STATEMENT: self.gen_for,
+            NodeKind.REPEAT_STATEMENT: self.gen_repeat,
+            NodeKind.STATEMENT: self.gen_empty,
+            NodeKind.RULE: self.gen_rule,
+        }
+        # Ekspresi: per kelas node lalu per node_type (seperti ConstantFolder)
+        self.expression_handlers: Dict[Union[type, NodeKind], Callable[[ASTNode], Union[Generator, None]]] = {
+            NumberNode: self.gen_constant,
+            BooleanNode: self.gen_constant,
+            ConstantNode: self.gen_constant,
+            StringNode: self.gen_string,
+            VariableNode: self.gen_variable,
+            FunctionCallNode: self.gen_function_call,
+            BinaryExpressionNode: self.gen_binary,
+            UnaryExpressionNode: self.gen_unary,
+            NodeKind.NOT_EXPRESSION: self.gen_not,
+        }
+
+    def generate(self, program: ProgramNode) -> PCodeProgram:
+        self.reject_records(program)
+        self.layout_frames()
+        global_block = self.symbol_table.btab[0]
+        main_body = None
+
+        for child in program.children:
+            if child.node_type == NodeKind.DECLARATIONS:
+                self.gen_subprograms(child)
+            elif child.node_type == NodeKind.COMPOUND_STATEMENT:
+                main_body = child
+
+        entry = len(self.code)
+        if main_body is not None:
+            trampoline(self.gen_statement(main_body))
+        self.emit(Op.HLT)
+
+        for proc in self.procs:
+            if proc.entry < 0:
+                raise CodegenError(f"Missing body for '{proc.name}'")
+        return PCodeProgram(program.name, self.code, self.lines, self.procs,
+                            [(array.low, array.high, array.element_size) for array in self.symbol_table.atab],
+                            entry, FRAME_HEADER + global_block.vsze, self.frame_locals(0, 0),
+                            self.max_level)
+
+    def reject_records(self, program: ProgramNode):
+        # Field record tidak punya layout (tipe record hanya RECORD tanpa
+        # struktur), jadi p.x dan p.y akan berbagi satu slot: tolak saja
+        def variable(node: VariableNode):
+            if (node.tab_index >= 0 and
+                    self.symbol_table.tab[node.tab_index].type_desc.base == BaseType.RECORD):
+                raise CodegenError(f"Record variable '{node.identifier}' is not supported", node.token)
+
+        walk(program, enter={VariableNode: variable})
+
+    # ---------- Layout ----------
+
+    def block_variables(self, block_index: int) -> List[int]:
+        # Variabel (termasuk parameter) milik block, urut sesuai adr
+        tab = self.symbol_table.tab
+        indices = []
+        current_idx = self.symbol_table.btab[block_index].last
+        while current_idx >= self.symbol_table.user_id_start:
+            entry = tab[current_idx]
+            if entry is None:
+                break
+            if entry.obj == ObjType.VARIABLE:
+                indices.append(current_idx)
+            current_idx = entry.link
+        indices.sort(key=lambda index: tab[index].adr)
+        return indices
+
+    def layout_frames(self):
+        # adr di tab dialokasikan global dan berurutan; offset dalam frame
+        # adalah jarak dari adr variabel pertama block
+        tab = self.symbol_table.tab
+        for block_index in range(len(self.symbol_table.btab)):
+            variables = self.block_variables(block_index)
+            if variables:
+                base_adr = tab[variables[0]].adr
+                for index in variables:
+                    self.offsets[index] = FRAME_HEADER + tab[index].adr - base_adr
+
+    def frame_locals(self, block_index: int, param_size: int) -> List[Any]:
+        cells: List[Any] = []
+        for index in self.block_variables(block_index):
+            cells.extend(default_value(self.symbol_table.tab[index].type_desc))
+        return cells[param_size:]
+
+    def proc_id(self, tab_index: int) -> int:
+        proc_id = self.proc_ids.get(tab_index)
+        if proc_id is None:
+            entry = self.symbol_table.tab[tab_index]
+            block = self.symbol_table.btab[entry.block_index]
+            level = entry.lev + 1
+            self.max_level = max(self.max_level, level)
+            proc_id = len(self.procs)
+            self.procs.append(ProcInfo(entry.name, tab_index, level, block.psze,
+                                       FRAME_HEADER + block.vsze,
+                                       self.frame_locals(entry.block_index, block.psze)))
+            self.proc_ids[tab_index] = proc_id
+        return proc_id
+
+    # ---------- Emit ----------
+
+    def emit(self, op: Op, a: Any = 0, b: Any = 0) -> int:
+        self.code.append((int(op), a, b))
+        self.lines.append(self.line)
+        return len(self.code) - 1
+
+    def patch(self, pc: int, target: int):
+        op, _, b = self.code[pc]
+        self.code[pc] = (op, target, b)
+
+    def variable_address(self, tab_index: int) -> tuple:
+        entry = self.symbol_table.tab[tab_index]
+        return entry.lev, self.offsets[tab_index]
+
+    def index_arrays(self, var: VariableNode) -> List[tuple]:
+        # (ekspresi indeks, index atab, aman) per dimensi yang diindeks; aman berarti
+        # range analysis membuktikan indeks dalam batas sehingga cek boleh dilewati
+        entry = self.symbol_table.tab[var.tab_index]
+        type_desc = entry.type_desc
+        array_ref = entry.ref
+        safe = var.safe_indices
+        triples = []
+        for position, index_expr in enumerate(var.index_expressions):
+            if not isinstance(type_desc, ArrayType):
+                raise CodegenError(f"Too many indices for '{entry.name}'", var.token)
+            triples.append((index_expr, array_ref, position < len(safe) and safe[position]))
+            type_desc = type_desc.element
+            array_ref = self.symbol_table.atab[array_ref].eref
+        return triples
+
+    def first_token(self, node: ASTNode) -> Optional[Token]:
+        while node.token is None and node.children:
+            node = node.children[0]
+        return node.token
+
+    def check_argument_count(self, tab_index: int, args: List[ASTNode], node: ASTNode):
+        # Frame dengan slot parameter yang tidak terisi tidak boleh dihasilkan
+        entry = self.symbol_table.tab[tab_index]
+        if entry.signature is not None and len(args) != len(entry.signature.params):
+            raise CodegenError(f"Parameter count mismatch in {entry.name}: expected "
+                               f"{len(entry.signature.params)}, got {len(args)}", self.first_token(node))
+
+    # ---------- Subprogram ----------
+
+    def gen_subprograms(self, declarations: ASTNode):
+        for decl in declarations.children:
+            if isinstance(decl, (ProcedureDeclNode, FunctionDeclNode)):
+                self.gen_subprogram(decl)
+
+    def gen_subprogram(self, decl: ASTNode):
+        block = None
+        for child in decl.children:
+            if child.node_type == NodeKind.BLOCK:
+                block = child
+        if block is None:
+            raise CodegenError(f"Missing body for '{self.symbol_table.tab[decl.tab_index].name}'")
+
+        body = None
+        for child in block.children:
+            if child.node_type == NodeKind.DECLARATIONS:
+                # Subprogram bersarang punya kode sendiri, di luar body induknya
+                self.gen_subprograms(child)
+            elif child.node_type == NodeKind.COMPOUND_STATEMENT:
+                body = child
+
+        proc = self.procs[self.proc_id(decl.tab_index)]
+        proc.entry = len(self.code)
+        is_function = isinstance(decl, FunctionDeclNode)
+        if body is not None:
+            self.tail_calls = tail_calls(body, decl.tab_index, is_function)
+            trampoline(self.gen_statement(body))
+            self.tail_calls = set()
+        self.emit(Op.RET, proc.level, 1 if is_function else 0)
+
+    # ---------- Statement ----------
+
+    def gen_statement(self, stmt: ASTNode) -> Union[Generator, None]:
+        handler = self.statement_handlers.get(stmt.node_type)
+        if handler is None:
+            raise CodegenError(f"Cannot generate code for {stmt.node_type.label}", self.first_token(stmt))
+        token = self.first_token(stmt)
+        if token is not None:
+            self.line = token.line
+        if self.count_statements and stmt.node_type not in BLOCK_STATEMENTS:
+            self.emit(self.STATEMENT_MARKER)
+        return handler(stmt)
+
+    def gen_empty(self, stmt: ASTNode):
+        return None
+
+    def gen_sequence(self, stmt: ASTNode) -> Generator:
+        for child in stmt.children:
+            yield self.gen_statement(child)
+
+    def gen_assignment(self, stmt: ASTNode) -> Generator:
+        target, value = stmt.children[0], stmt.children[1]
+        if not isinstance(target, VariableNode) or target.tab_index < 0:
+            raise CodegenError("Invalid assignment target", self.first_token(stmt))
+        entry = self.symbol_table.tab[target.tab_index]
+
+        if id(stmt) in self.tail_calls:
+            # F := F(...) di posisi ekor
+            return (yield self.gen_tail_call(target.tab_index, value.children))
+        if entry.obj == ObjType.FUNCTION:
+            # Assignment ke nama fungsi mengisi slot hasil di frame fungsi tersebut
+            yield self.gen_expression(value)
+            self.emit(Op.STO, entry.lev + 1, FRAME_RESULT)
+        elif target.index_expressions:
+            yield self.gen_element_address(target)
+            yield self.gen_expression(value)
+            self.store_indirect(target.type_desc)
+        elif isinstance(entry.type_desc, ArrayType):
+            self.emit(Op.LDA, *self.variable_address(target.tab_index))
+            yield self.gen_expression(value)
+            self.emit(Op.STB, entry.type_desc.size)
+        else:
+            yield self.gen_expression(value)
+            self.emit(Op.STO, *self.variable_address(target.tab_index))
+
+    def store_indirect(self, type_desc: Optional[TypeDescriptor]):
+        if isinstance(type_desc, ArrayType):
+            self.emit(Op.STB, type_desc.size)
+        else:
+            self.emit(Op.STI)
+
+    def gen_if(self, stmt: ASTNode) -> Generator:
+        # Children: [kondisi, then, else?]
+        yield self.gen_expression(stmt.children[0])
+        jump_else = self.emit(Op.JPC)
+        if len(stmt.children) > 1:
+            yield self.gen_statement(stmt.children[1])
+        if len(stmt.children) > 2:
+            jump_end = self.emit(Op.JMP)
+            self.patch(jump_else, len(self.code))
+            yield self.gen_statement(stmt.children[2])
+            self.patch(jump_end, len(self.code))
+        else:
+            self.patch(jump_else, len(self.code))
+
+    def gen_while(self, stmt: ASTNode) -> Generator:
+        # Children: [kondisi, body]
+        loop = len(self.code)
+        yield self.gen_expression(stmt.children[0])
+        jump_end = self.emit(Op.JPC)
+        if len(stmt.children) > 1:
+            yield self.gen_statement(stmt.children[1])
+        self.emit(Op.JMP, loop)
+        self.patch(jump_end, len(self.code))
+
+    def gen_repeat(self, stmt: ASTNode) -> Generator:
+        # Children: [body (StatementList), kondisi]
+        loop = len(self.code)
+        yield self.gen_statement(stmt.children[0])
+        yield self.gen_expression(stmt.children[1])
+        self.emit(Op.JPC, loop)
+
+    def gen_for(self, stmt: ForStatementNode) -> Generator:
+        # Children: [counter, nilai awal, nilai akhir, body]. Seperti Pascal-S,
+        # alamat counter dan batas akhir tetap di stack selama loop berjalan.
+        counter = stmt.children[0]
+        if not isinstance(counter, VariableNode) or counter.tab_index < 0:
+            raise CodegenError("Invalid for-loop counter", stmt.token)
+        downward = stmt.direction == "turunke"
+        self.emit(Op.LDA, *self.variable_address(counter.tab_index))
+        yield self.gen_expression(stmt.children[1])
+        yield self.gen_expression(stmt.children[2])
+        loop_enter = self.emit(Op.F1D if downward else Op.F1U)
+        body = len(self.code)
+        if len(stmt.children) > 3:
+            yield self.gen_statement(stmt.children[3])
+        self.emit(Op.F2D if downward else Op.F2U, body)
+        self.patch(loop_enter, len(self.code))
+
+    def gen_rule(self, stmt: RuleNode) -> Generator:
+        # Statement yang belum punya node AST khusus tetap berupa RuleNode
+        if stmt.rule != "<case-statement>":
+            raise CodegenError(f"Cannot generate code for {stmt.rule}", self.first_token(stmt))
+        return self.gen_case(stmt)
+
+    def gen_case(self, stmt: RuleNode) -> Generator:
+        # Children: [kasus, selector, dari, <case-element>..., selesai]. Selector
+        # dievaluasi sekali dan tetap di stack sampai sebuah cabang terpilih.
+        selector = stmt.children[1]
+        yield self.gen_expression(selector)
+        jump_ends = []
+        for element in stmt.children[2:]:
+            if not (isinstance(element, RuleNode) and element.rule == "<case-element>"):
+                continue
+            constants, body = element.children[0], element.children[-1]
+            jump_bodies = []
+            for constant in constants.children:
+                if isinstance(constant, RuleNode):
+                    continue    # COMMA
+                self.emit(Op.DUP)
+                yield self.gen_expression(constant)
+                self.emit(Op.NE)
+                jump_bodies.append(self.emit(Op.JPC))
+            jump_next = self.emit(Op.JMP)
+            for jump in jump_bodies:
+                self.patch(jump, len(self.code))
+            self.emit(Op.POP)
+            yield self.gen_statement(body)
+            jump_ends.append(self.emit(Op.JMP))
+            self.patch(jump_next, len(self.code))
+        # Tidak ada cabang yang cocok
+        self.emit(Op.POP)
+        for jump in jump_ends:
+            self.patch(jump, len(self.code))
+
+    def gen_procedure_call(self, stmt: ProcedureCallNode) -> Generator:
+        name = stmt.procedure_name.lower()
+        tab_index = stmt.tab_index
+        if name in BUILTIN_PROCEDURES and (tab_index < self.symbol_table.user_id_start or
+                                           self.symbol_table.tab[tab_index].name.lower() != name):
+            yield self.gen_builtin(name, stmt)
+            return
+        if tab_index < 0:
+            raise CodegenError(f"Undefined procedure '{stmt.procedure_name}'", self.first_token(stmt))
+
+        entry = self.symbol_table.tab[tab_index]
+        self.check_argument_count(tab_index, stmt.children, stmt)
+        if id(stmt) in self.tail_calls:
+            return (yield self.gen_tail_call(tab_index, stmt.children))
+        yield self.gen_call(tab_index, stmt.children)
+        if entry.obj == ObjType.FUNCTION:
+            # Fungsi yang dipanggil sebagai statement: hasilnya dibuang
+            self.emit(Op.POP)
+
+    def gen_builtin(self, name: str, stmt: ProcedureCallNode) -> Generator:
+        if name in ("read", "readln"):
+            for arg in stmt.children:
+                if not isinstance(arg, VariableNode) or arg.tab_index < 0:
+                    raise CodegenError(f"Argument of {name} must be a variable", self.first_token(arg))
+                yield self.gen_address(arg)
+                self.emit(Op.RED, (arg.type_desc or primitive(arg.data_type)).base.value)
+            if name == "readln":
+                self.emit(Op.RDL)
+        else:
+            for arg in stmt.children:
+                if isinstance(arg.type_desc, ArrayType) and not arg.index_expressions:
+                    raise CodegenError("Cannot write an array", self.first_token(arg))
+                yield self.gen_expression(arg)
+                self.emit(Op.WRT)
+            if name == "writeln":
+                self.emit(Op.WRL)
+
+    def gen_call(self, tab_index: int, args: List[ASTNode]) -> Generator:
+        entry = self.symbol_table.tab[tab_index]
+        if entry.obj == ObjType.FUNCTION:
+            self.emit(Op.MKS, DEFAULT_VALUES.get(entry.type_desc.base, 0))
+        else:
+            self.emit(Op.MKS, None)
+        # Parameter by-value: argumen langsung mengisi slot parameter frame baru
+        for arg in args:
+            yield self.gen_expression(arg)
+        self.emit(Op.CAL, self.proc_id(tab_index))
+
+    def gen_tail_call(self, tab_index: int, args: List[ASTNode]) -> Generator:
+        # Frame aktif dipakai ulang: kedalaman stack tetap untuk rekursi ekor
+        entry = self.symbol_table.tab[tab_index]
+        for arg in args:
+            yield self.gen_expression(arg)
+        result = DEFAULT_VALUES.get(entry.type_desc.base, 0) if entry.obj == ObjType.FUNCTION else None
+        self.emit(Op.TCL, self.proc_id(tab_index), result)
+
+    # ---------- Ekspresi ----------
+
+    def gen_expression(self, expr: ASTNode) -> Union[Generator, None]:
+        if expr.const_value is not None and not isinstance(expr, StringNode):
+            return self.gen_constant(expr)
+        handler = (self.expression_handlers.get(expr.__class__) or
+                   self.expression_handlers.get(expr.node_type))
+        if handler is None:
+            raise CodegenError(f"Cannot generate code for {expr.node_type.label}", self.first_token(expr))
+        return handler(expr)
+
+    def gen_constant(self, expr: ASTNode):
+        value = expr.const_value
+        if value is None:
+            value = expr.value
+        if isinstance(value, str) and expr.data_type == BaseType.STRING:
+            value = string_value(value)
+        self.emit(Op.LDC, value)
+
+    def gen_string(self, expr: StringNode):
+        self.emit(Op.LDC, string_value(expr.value))
+
+    def gen_variable(self, expr: VariableNode) -> Union[Generator, None]:
+        if expr.tab_index < 0:
+            raise CodegenError(f"Undefined variable '{expr.identifier}'", expr.token)
+        entry = self.symbol_table.tab[expr.tab_index]
+        if entry.obj == ObjType.FUNCTION:
+            # Nama fungsi tanpa argumen di dalam ekspresi adalah pemanggilan
+            self.check_argument_count(expr.tab_index, [], expr)
+            return self.gen_call(expr.tab_index, [])
+        if expr.index_expressions:
+            return self.gen_element_load(expr)
+        if isinstance(entry.type_desc, ArrayType):
+            self.emit(Op.LDA, *self.variable_address(expr.tab_index))
+            self.emit(Op.LDB, entry.type_desc.size)
+        else:
+            self.emit(Op.LOD, *self.variable_address(expr.tab_index))
+        return None
+
+    def gen_element_load(self, expr: VariableNode) -> Generator:
+        yield self.gen_element_address(expr)
+        if isinstance(expr.type_desc, ArrayType):
+            self.emit(Op.LDB, expr.type_desc.size)
+        else:
+            self.emit(Op.LDI)
+
+    def gen_address(self, var: VariableNode) -> Union[Generator, None]:
+        if var.index_expressions:
+            return self.gen_element_address(var)
+        self.emit(Op.LDA, *self.variable_address(var.tab_index))
+        return None
+
+    def gen_element_address(self, var: VariableNode) -> Generator:
+        self.emit(Op.LDA, *self.variable_address(var.tab_index))
+        for index_expr, array_ref, safe in self.index_arrays(var):
+            yield self.gen_expression(index_expr)
+            self.emit(Op.IXU if safe else Op.IDX, array_ref)
+
+    def gen_function_call(self, expr: FunctionCallNode) -> Generator:
+        if expr.tab_index is None or expr.tab_index < 0:
+            raise CodegenError(f"Undefined function '{expr.function_name}'", self.first_token(expr))
+        self.check_argument_count(expr.tab_index, expr.children, expr)
+        return self.gen_call(expr.tab_index, expr.children)
+
+    def gen_binary(self, expr: BinaryExpressionNode) -> Generator:
+        yield self.gen_expression(expr.children[0])
+        yield self.gen_expression(expr.children[1])
+        op = BINARY_OPS.get(expr.operator.lower())
+        if op is None:
+            raise CodegenError(f"Unknown operator '{expr.operator}'", self.first_token(expr))
+        self.emit(op)
+
+    def gen_unary(self, expr: UnaryExpressionNode) -> Generator:
+        yield self.gen_expression(expr.children[0])
+        if expr.operator == '-':
+            self.emit(Op.NEG)
+
+    def gen_not(self, expr: ASTNode) -> Generator:
+        yield self.gen_expression(expr.children[0])
+        self.emit(Op.NOT)
@@ -0,0 +1,292 @@
+from __future__ import annotations
+import copy
+from typing import Dict, Generator, List, Tuple, Union
+from src.semantic_analyzer.symbol_table import SymbolTable, ObjType, BaseType
+from src.semantic_analyzer.ast_nodes import *
+from src.semantic_analyzer.traversal import trampoline, walk
+from .codegen import DEFAULT_VALUES
+from .callgraph import CallGraph, READ_PROCEDURES, assignment_targets
+
+# Inline expansion subprogram kecil pada decorated AST (dijalankan setelah
+# analisis semantik, sebelum codegen, sehingga berlaku untuk semua backend).
+# Call graph (callgraph.py) dibangun dari ProcedureCall/FunctionCall;
+# subprogram rekursif, yang punya subprogram bersarang atau larik lokal
+# (nilainya harus fresh di setiap pemanggilan) tidak di-inline. Body callee di-clone dengan variabel
+# lokal, parameter dan hasil fungsi dipetakan ke variabel baru di frame caller;
+# parameter by-value diisi lewat assignment sebelum body (argumen konstan atau
+# variabel yang parameternya tidak pernah di-assign disubstitusi langsung).
+# Subprogram diproses bottom-up sehingga body yang di-clone sudah berisi hasil
+# inlining.
+#
+# Pemanggilan fungsi di dalam ekspresi di-hoist menjadi statement sebelum
+# statement pemiliknya. Ini hanya dilakukan jika semua fungsi yang dipanggil
+# statement tersebut bebas efek samping (tidak meng-assign variabel luar dan
+# tidak melakukan I/O), karena urutan evaluasi terhadap operand lain berubah.
+# Kondisi selama/ulangi dievaluasi berulang kali sehingga tidak di-hoist.
+
+# Ukuran body maksimum (jumlah node AST) subprogram yang di-inline
+INLINE_MAX_NODES = 40
+# Total node yang boleh ditambahkan: GROWTH_FACTOR x ukuran program, minimal MIN_BUDGET
+GROWTH_FACTOR = 1.0
+MIN_BUDGET = 200
+
+def count_nodes(root: ASTNode) -> int:
+    count = 0
+
+    def enter(node: ASTNode):
+        nonlocal count
+        count += 1
+
+    walk(root, default_enter=enter)
+    return count
+
+
+class Inliner:
+    def __init__(self, symbol_table: SymbolTable):
+        self.symbol_table = symbol_table
+        self.graph = CallGraph(symbol_table)
+        self.budget = 0
+        # Jumlah call site yang di-inline per nama subprogram
+        self.inlined: Dict[str, int] = {}
+        # Frame caller yang sedang diproses: (block index, level)
+        self.frame = (0, 0)
+
+    def run(self, program: ProgramNode) -> Tuple[int, int]:
+        # Mengembalikan (jumlah call site yang di-inline, jumlah node yang ditambahkan)
+        graph = self.graph.build(program)
+
+        self.budget = initial = max(MIN_BUDGET, int(count_nodes(program) * GROWTH_FACTOR))
+        for tab_index in graph.bottom_up_order():
+            subprogram = graph.subprograms[tab_index]
+            if subprogram.body is not None:
+                self.frame = (subprogram.block_index, subprogram.level)
+                trampoline(self.rewrite_statement(subprogram.body))
+        if graph.main_body is not None:
+            self.frame = (0, 0)
+            trampoline(self.rewrite_statement(graph.main_body))
+        return sum(self.inlined.values()), initial - self.budget
+
+    # ---------- Kriteria ----------
+
+    def can_inline(self, tab_index: int) -> bool:
+        subprogram = self.graph.subprograms.get(tab_index)
+        return (subprogram is not None and subprogram.body is not None and
+                tab_index not in self.graph.recursive and not subprogram.has_nested and
+                not subprogram.has_local_arrays and count_nodes(subprogram.body) <= INLINE_MAX_NODES)
+
+    # ---------- Statement ----------
+
+    def rewrite_statement(self, stmt: ASTNode) -> Union[Generator, ASTNode]:
+        # Mengembalikan statement pengganti (StatementList jika ada statement yang di-hoist)
+        kind = stmt.node_type
+        children = stmt.children
+        if kind in (NodeKind.COMPOUND_STATEMENT, NodeKind.STATEMENT_LIST):
+            return self.rewrite_children(stmt, range(len(children)))
+        if kind == NodeKind.ASSIGNMENT:
+            return self.rewrite_assignment(stmt)
+        if kind == NodeKind.PROCEDURE_CALL:
+            return self.rewrite_procedure_call(stmt)
+        if kind == NodeKind.IF_STATEMENT:
+            return self.rewrite_compound(stmt, range(1, len(children)), [(children, 0)])
+        if kind == NodeKind.WHILE_STATEMENT:
+            return self.rewrite_children(stmt, range(1, len(children)))
+        if kind == NodeKind.REPEAT_STATEMENT:
+            return self.rewrite_children(stmt, range(min(len(children), 1)))
+        if kind == NodeKind.FOR_STATEMENT:
+            return self.rewrite_compound(stmt, range(3, len(children)),
+                                         [(children, position) for position in (1, 2) if position < len(children)])
+        if isinstance(stmt, RuleNode) and stmt.rule == "<case-statement>" and len(children) > 1:
+            return self.rewrite_case(stmt)
+        return stmt
+
+    def rewrite_children(self, stmt: ASTNode, positions: range) -> Generator:
+        for position in positions:
+            stmt.children[position] = yield self.rewrite_statement(stmt.children[position])
+        return stmt
+
+    def rewrite_compound(self, stmt: ASTNode, positions: range, slots: List[tuple]) -> Generator:
+        yield self.rewrite_children(stmt, positions)
+        return (yield self.hoist(stmt, slots))
+
+    def rewrite_case(self, stmt: RuleNode) -> Generator:
+        for element in stmt.children[2:]:
+            if isinstance(element, RuleNode) and element.rule == "<case-element>":
+                element.children[-1] = yield self.rewrite_statement(element.children[-1])
+        return (yield self.hoist(stmt, [(stmt.children, 1)]))
+
+    def rewrite_assignment(self, stmt: ASTNode) -> Generator:
+        if len(stmt.children) < 2:
+            return stmt
+        target = stmt.children[0]
+        # Urutan evaluasi codegen: indeks target lalu nilai
+        slots = [(target.index_expressions, position) for position in range(len(target.index_expressions))]
+        slots.append((stmt.children, 1))
+        return (yield self.hoist(stmt, slots))
+
+    def hoist(self, stmt: ASTNode, slots: List[tuple]) -> Generator:
+        # Ganti pemanggilan fungsi di slot ekspresi dengan variabel hasil inlining
+        if not self.graph.is_pure([container[position] for container, position in slots]):
+            return stmt
+        prelude: List[ASTNode] = []
+        for container, position in slots:
+            container[position] = yield self.inline_calls(container[position], prelude)
+        return self.sequence(prelude + [stmt], stmt)
+
+    def rewrite_procedure_call(self, stmt: ProcedureCallNode) -> Generator:
+        if self.graph.is_builtin(stmt):
+            if stmt.procedure_name.lower() in READ_PROCEDURES:
+                return stmt
+            return (yield self.rewrite_write(stmt))
+        if stmt.tab_index < 0 or not self.can_inline(stmt.tab_index):
+            return (yield self.hoist(stmt, [(stmt.children, position) for position in range(len(stmt.children))]))
+        statements, _ = yield self.expand(stmt.tab_index, list(stmt.children), stmt)
+        return self.sequence(statements, stmt) if statements is not None else stmt
+
+    def rewrite_write(self, stmt: ProcedureCallNode) -> Generator:
+        # write(a, F(x), b) -> write(a); <body F>; write(hasil, b): output sebelum
+        # pemanggilan tetap ditulis lebih dulu
+        statements: List[ASTNode] = []
+        group: List[ASTNode] = []
+        for arg in stmt.children:
+            prelude: List[ASTNode] = []
+            if self.graph.is_pure([arg]):
+                arg = yield self.inline_calls(arg, prelude)
+            if prelude:
+                if group:
+                    statements.append(self.write_call(stmt, group, "write"))
+                    group = []
+                statements.extend(prelude)
+            group.append(arg)
+        if not statements:
+            return stmt
+        statements.append(self.write_call(stmt, group, stmt.procedure_name))
+        return self.sequence(statements, stmt)
+
+    def write_call(self, stmt: ProcedureCallNode, args: List[ASTNode], name: str) -> ProcedureCallNode:
+        call = copy.copy(stmt)
+        call.children = args
+        call.procedure_name = name
+        return call
+
+    def sequence(self, statements: List[ASTNode], original: ASTNode) -> ASTNode:
+        if len(statements) == 1:
+            return statements[0]
+        return ASTNode(NodeKind.STATEMENT_LIST, children=statements, token=original.token)
+
+    # ---------- Ekspresi ----------
+
+    def inline_calls(self, expr: ASTNode, prelude: List[ASTNode]) -> Generator:
+        # Post-order sesuai urutan evaluasi: argumen di-inline sebelum pemanggilnya
+        if expr.const_value is not None:
+            return expr
+        children = expr.children
+        for position in range(len(children)):
+            children[position] = yield self.inline_calls(children[position], prelude)
+        index_expressions = expr.index_expressions
+        for position in range(len(index_expressions)):
+            index_expressions[position] = yield self.inline_calls(index_expressions[position], prelude)
+        callee = self.graph.call_target(expr)
+        if callee < 0 or not self.can_inline(callee):
+            return expr
+        statements, result = yield self.expand(callee, list(children), expr)
+        if statements is None:
+            return expr
+        prelude.extend(statements)
+        return self.variable(result, expr)
+
+    # ---------- Expansion ----------
+
+    def expand(self, callee: int, args: List[ASTNode], call: ASTNode) -> Generator:
+        # Mengembalikan (statement pengganti, tab index variabel hasil) atau (None, -1)
+        # jika budget tidak cukup
+        subprogram = self.graph.subprograms[callee]
+        # Jumlah argumen yang tidak cocok dengan signature tidak di-expand;
+        # pemanggilan dibiarkan agar codegen melaporkannya
+        signature = self.symbol_table.tab[callee].signature
+        if signature is None or len(args) != len(signature.params):
+            return None, -1
+        size = count_nodes(subprogram.body) + len(args)
+        if size > self.budget:
+            return None, -1
+        self.budget -= size
+
+        tab = self.symbol_table.tab
+        entry = tab[callee]
+        assigned = {target.tab_index for target in assignment_targets(subprogram.body)}
+        param_count = self.symbol_table.btab[subprogram.block_index].param_count
+        variables = self.graph.block_variables(subprogram.block_index)
+        mapping: Dict[int, Union[int, ASTNode]] = {}
+        statements: List[ASTNode] = []
+        # Variabel argumen boleh dipakai langsung jika tidak ada yang bisa mengubahnya
+        # selama body berjalan (callee dan argumen lain bebas efek samping)
+        stable = callee not in self.graph.impure and self.graph.is_pure(args)
+        for index, arg in zip(variables[:param_count], args):
+            if index not in assigned:
+                if arg.const_value is not None:
+                    mapping[index] = arg
+                    continue
+                if stable and self.is_plain_variable(arg):
+                    mapping[index] = arg.tab_index
+                    continue
+            mapping[index] = self.new_local(entry.name, index)
+            assignment = AssignmentNode(NodeKind.ASSIGNMENT, children=[self.variable(mapping[index], arg), arg],
+                                        token=call.token, data_type=BaseType.VOID)
+            statements.append((yield self.rewrite_statement(assignment)))
+        for index in variables[param_count:]:
+            mapping[index] = self.new_local(entry.name, index)
+
+        result = -1
+        if entry.obj == ObjType.FUNCTION:
+            result = mapping[callee] = self.symbol_table.enter_local(
+                *self.frame, f"{entry.name}_result", entry.type, entry.ref, entry.type_desc)
+            if not self.assigns_result(subprogram.body, callee):
+                # Fungsi yang tidak meng-assign hasil di semua jalur mengembalikan nilai default
+                default = ConstantNode(NodeKind.CONST_VALUE, token=call.token, data_type=entry.type_desc.base,
+                                       const_value=DEFAULT_VALUES.get(entry.type_desc.base, 0))
+                statements.append(AssignmentNode(NodeKind.ASSIGNMENT,
+                                                 children=[self.variable(result, call), default],
+                                                 token=call.token, data_type=BaseType.VOID))
+        statements.append((yield self.clone(subprogram.body, mapping)))
+        self.inlined[entry.name] = self.inlined.get(entry.name, 0) + 1
+        return statements, result
+
+    def is_plain_variable(self, arg: ASTNode) -> bool:
+        return (isinstance(arg, VariableNode) and not arg.index_expressions and arg.tab_index >= 0 and
+                self.symbol_table.tab[arg.tab_index].obj == ObjType.VARIABLE)
+
+    def assigns_result(self, body: ASTNode, callee: int) -> bool:
+        # Assignment hasil di level teratas body pasti dieksekusi
+        return any(stmt.node_type == NodeKind.ASSIGNMENT and stmt.children and
+                   stmt.children[0].tab_index == callee for stmt in body.children)
+
+    def new_local(self, callee_name: str, index: int) -> int:
+        # Nama baru "<callee>_<lokal>" supaya tidak bentrok dengan variabel caller
+        entry = self.symbol_table.tab[index]
+        return self.symbol_table.enter_local(*self.frame, f"{callee_name}_{entry.name}",
+                                             entry.type, entry.ref, entry.type_desc)
+
+    def variable(self, tab_index: int, origin: ASTNode) -> VariableNode:
+        entry = self.symbol_table.tab[tab_index]
+        return VariableNode(NodeKind.VARIABLE, token=origin.token, data_type=entry.type_desc.base,
+                            tab_index=tab_index, type_desc=entry.type_desc, identifier=entry.name)
+
+    def clone(self, node: ASTNode, mapping: Dict[int, Union[int, ASTNode]]) -> Generator:
+        if isinstance(node, VariableNode):
+            replacement = mapping.get(node.tab_index)
+            if isinstance(replacement, ASTNode):
+                # Argumen konstan disubstitusi langsung
+                return (yield self.clone(replacement, {}))
+        result = copy.copy(node)
+        if node.children:
+            result.children = []
+            for child in node.children:
+                result.children.append((yield self.clone(child, mapping)))
+        if isinstance(node, VariableNode):
+            if node.index_expressions:
+                result.index_expressions = []
+                for index_expr in node.index_expressions:
+                    result.index_expressions.append((yield self.clone(index_expr, mapping)))
+            if replacement is not None:
+                result.tab_index = replacement
+                result.identifier = self.symbol_table.tab[replacement].name
+        return result
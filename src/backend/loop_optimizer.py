@@ -0,0 +1,377 @@
+from __future__ import annotations
+from typing import Dict, Generator, List, Optional, Set, Tuple, Union
+from src.semantic_analyzer.symbol_table import SymbolTable, ObjType, BaseType
+from src.semantic_analyzer.type_descriptors import ArrayType, primitive
+from src.semantic_analyzer.ast_nodes import *
+from src.semantic_analyzer.traversal import trampoline, walk
+from .callgraph import CallGraph, READ_PROCEDURES, assignment_targets
+
+# Loop-invariant code motion dan strength reduction pada decorated AST
+# (selama/ulangi/untuk), dijalankan setelah inliner sehingga berlaku untuk
+# semua backend. Loop diproses dari yang terluar: semua yang invarian di loop
+# luar juga invarian di loop dalamnya.
+#
+# Variabel "dibunuh" oleh loop jika di-assign di dalamnya (termasuk counter
+# untuk dan argumen read) atau mungkin di-assign oleh subprogram yang
+# dipanggil di dalamnya (efek transitif dari call graph). Ekspresi invarian
+# hanya memakai konstanta dan variabel yang tidak dibunuh, tanpa pemanggilan
+# fungsi. Karena ekspresi di-hoist ke sebelum loop (dievaluasi walaupun loop
+# tidak pernah berjalan atau cabangnya tidak terpilih), ekspresi yang bisa
+# gagal tidak di-hoist: pembagian hanya dengan pembagi konstanta bukan nol dan
+# akses elemen larik hanya dengan indeks konstanta yang terbukti dalam batas.
+# Batas untuk loop itu sendiri sudah dievaluasi sekali oleh semua backend, jadi
+# yang di-hoist adalah kondisi selama/ulangi, ekspresi di body dan batas loop
+# dalam.
+#
+# Strength reduction: di untuk dengan counter yang tidak dibunuh body,
+# i * k (k konstanta atau variabel invarian) diganti variabel induksi t
+# (t := awal * k sebelum loop, t := t +/- k di akhir body). Di interpreter satu
+# penjumlahan per iterasi hanya lebih murah dari perkalian jika hasilnya
+# dipakai beberapa kali, jadi penggantian hanya dilakukan jika bobot
+# pemakaiannya (loop dalam berbobot LOOP_WEIGHT kali) minimal MIN_REDUCE_WEIGHT.
+# Body berupa satu assignment arr[i] := ... tidak diubah karena pola itu
+# divektorisasi backend Python.
+
+LOOP_WEIGHT = 10
+MIN_REDUCE_WEIGHT = 2
+
+LOOP_STATEMENTS = (NodeKind.WHILE_STATEMENT, NodeKind.REPEAT_STATEMENT, NodeKind.FOR_STATEMENT)
+GROUP_STATEMENTS = (NodeKind.COMPOUND_STATEMENT, NodeKind.STATEMENT_LIST, NodeKind.STATEMENT)
+# Operator yang bisa gagal (pembagian nol)
+DIVISION_OPERATORS = ('/', 'bagi', 'mod')
+
+# (list pemilik, posisi, kedalaman loop)
+Slot = Tuple[list, int, int]
+
+
+class LoopOptimizer:
+    def __init__(self, symbol_table: SymbolTable):
+        self.symbol_table = symbol_table
+        self.graph = CallGraph(symbol_table)
+        self.hoisted = 0
+        self.reduced = 0
+        # Frame subprogram yang sedang diproses: (block index, level)
+        self.frame = (0, 0)
+
+    def run(self, program: ProgramNode) -> Tuple[int, int]:
+        # Mengembalikan (jumlah ekspresi yang di-hoist, jumlah perkalian yang diganti)
+        graph = self.graph.build(program)
+        for subprogram in graph.subprograms.values():
+            if subprogram.body is not None:
+                self.frame = (subprogram.block_index, subprogram.level)
+                trampoline(self.rewrite_statement(subprogram.body))
+        if graph.main_body is not None:
+            self.frame = (0, 0)
+            trampoline(self.rewrite_statement(graph.main_body))
+        return self.hoisted, self.reduced
+
+    # ---------- Statement ----------
+
+    def rewrite_statement(self, stmt: ASTNode) -> Union[Generator, ASTNode]:
+        # Mengembalikan statement pengganti (StatementList jika ada prelude loop)
+        kind = stmt.node_type
+        children = stmt.children
+        if kind in GROUP_STATEMENTS:
+            return self.rewrite_children(stmt, range(len(children)))
+        if kind == NodeKind.IF_STATEMENT:
+            return self.rewrite_children(stmt, range(1, len(children)))
+        if kind in LOOP_STATEMENTS:
+            return self.rewrite_loop(stmt)
+        if isinstance(stmt, RuleNode) and stmt.rule == "<case-statement>":
+            return self.rewrite_case(stmt)
+        return stmt
+
+    def rewrite_children(self, stmt: ASTNode, positions: range) -> Generator:
+        for position in positions:
+            stmt.children[position] = yield self.rewrite_statement(stmt.children[position])
+        return stmt
+
+    def rewrite_case(self, stmt: RuleNode) -> Generator:
+        for element in stmt.children[2:]:
+            if isinstance(element, RuleNode) and element.rule == "<case-element>":
+                element.children[-1] = yield self.rewrite_statement(element.children[-1])
+        return stmt
+
+    def rewrite_loop(self, loop: ASTNode) -> Generator:
+        killed = self.killed(loop)
+        prelude = self.hoist_invariants(loop, killed)
+        if loop.node_type == NodeKind.FOR_STATEMENT:
+            prelude.extend(self.reduce_strength(loop, killed))
+        # Loop dalam diproses setelah ekspresi invarian loop luar diganti
+        if loop.node_type == NodeKind.WHILE_STATEMENT:
+            yield self.rewrite_children(loop, range(1, len(loop.children)))
+        elif loop.node_type == NodeKind.REPEAT_STATEMENT:
+            yield self.rewrite_children(loop, range(min(len(loop.children), 1)))
+        else:
+            yield self.rewrite_children(loop, range(3, len(loop.children)))
+        if not prelude:
+            return loop
+        return ASTNode(NodeKind.STATEMENT_LIST, children=prelude + [loop], token=loop.token)
+
+    # ---------- Analisis ----------
+
+    def killed(self, root: ASTNode) -> Set[int]:
+        # Variabel yang mungkin berubah selama root dieksekusi
+        killed = {target.tab_index for target in assignment_targets(root)}
+        graph = self.graph
+
+        def call(node: ASTNode):
+            callee = graph.call_target(node)
+            if callee in graph.writes:
+                killed.update(graph.writes[callee])
+
+        def procedure_call(node: ProcedureCallNode):
+            if not graph.is_builtin(node) and node.tab_index in graph.writes:
+                killed.update(graph.writes[node.tab_index])
+
+        walk(root, enter={FunctionCallNode: call, VariableNode: call, ProcedureCallNode: procedure_call})
+        return killed
+
+    def expression_slots(self, loop: ASTNode) -> List[Slot]:
+        # Semua posisi ekspresi di dalam loop dengan kedalaman loop-nya; batas
+        # untuk di kedalaman 0 (loop itu sendiri) tidak termasuk
+        slots: List[Slot] = []
+        pending = [(loop, 0)]
+        while pending:
+            stmt, depth = pending.pop()
+            kind = stmt.node_type
+            children = stmt.children
+            if kind in GROUP_STATEMENTS:
+                pending.extend((child, depth) for child in children)
+            elif kind == NodeKind.ASSIGNMENT and len(children) >= 2:
+                self.target_slots(children[0], depth, slots)
+                slots.append((children, 1, depth))
+            elif kind == NodeKind.PROCEDURE_CALL:
+                if self.graph.is_builtin(stmt) and stmt.procedure_name.lower() in READ_PROCEDURES:
+                    for arg in children:
+                        self.target_slots(arg, depth, slots)
+                else:
+                    slots.extend((children, position, depth) for position in range(len(children)))
+            elif kind == NodeKind.IF_STATEMENT and children:
+                slots.append((children, 0, depth))
+                pending.extend((child, depth) for child in children[1:])
+            elif kind == NodeKind.WHILE_STATEMENT and children:
+                slots.append((children, 0, depth + 1))
+                pending.extend((child, depth + 1) for child in children[1:])
+            elif kind == NodeKind.REPEAT_STATEMENT and len(children) >= 2:
+                pending.append((children[0], depth + 1))
+                slots.append((children, 1, depth + 1))
+            elif kind == NodeKind.FOR_STATEMENT and len(children) >= 3:
+                if depth > 0:
+                    slots.extend((children, position, depth) for position in (1, 2))
+                pending.extend((child, depth + 1) for child in children[3:])
+            elif isinstance(stmt, RuleNode) and stmt.rule == "<case-statement>" and len(children) > 1:
+                slots.append((children, 1, depth))
+                for element in children[2:]:
+                    if isinstance(element, RuleNode) and element.rule == "<case-element>":
+                        pending.append((element.children[-1], depth))
+        return slots
+
+    def target_slots(self, target: ASTNode, depth: int, slots: List[Slot]):
+        # Target assignment/read bukan nilai; hanya indeksnya yang dievaluasi
+        if isinstance(target, VariableNode):
+            index_expressions = target.index_expressions
+            slots.extend((index_expressions, position, depth) for position in range(len(index_expressions)))
+
+    def invariant_keys(self, expr: ASTNode, killed: Set[int], keys: Dict[int, tuple]):
+        # Isi keys[id(node)] = kunci struktural untuk setiap sub-ekspresi invarian
+        tab = self.symbol_table.tab
+
+        def leave(node: ASTNode):
+            if node.const_value is not None:
+                keys[id(node)] = ("const", type(node.const_value), node.const_value)
+                return
+            if isinstance(node, VariableNode):
+                if node.tab_index < 0 or node.tab_index in killed or tab[node.tab_index].obj != ObjType.VARIABLE:
+                    return
+                indices = node.index_expressions
+                if indices and not (len(node.safe_indices) == len(indices) and all(node.safe_indices) and
+                                    all(index.const_value is not None for index in indices)):
+                    return
+                keys[id(node)] = ("var", node.tab_index) + tuple(keys[id(index)] for index in indices)
+                return
+            if not node.children or any(id(child) not in keys for child in node.children):
+                return
+            if isinstance(node, BinaryExpressionNode):
+                operator = node.operator.lower()
+                if operator in DIVISION_OPERATORS:
+                    divisor = node.children[1].const_value
+                    if isinstance(divisor, bool) or not isinstance(divisor, (int, float)) or divisor == 0:
+                        return
+            elif not isinstance(node, UnaryExpressionNode) and node.node_type != NodeKind.NOT_EXPRESSION:
+                return
+            keys[id(node)] = ((node.node_type, getattr(node, "operator", "")) +
+                              tuple(keys[id(child)] for child in node.children))
+
+        walk(expr, default_leave=leave)
+
+    # ---------- Loop-invariant code motion ----------
+
+    def hoist_invariants(self, loop: ASTNode, killed: Set[int]) -> List[ASTNode]:
+        # Ganti sub-ekspresi invarian maksimal dengan variabel yang diisi sebelum loop;
+        # ekspresi yang sama memakai variabel yang sama
+        prelude: List[ASTNode] = []
+        temps: Dict[tuple, int] = {}
+        for container, position, _ in self.expression_slots(loop):
+            keys: Dict[int, tuple] = {}
+            self.invariant_keys(container[position], killed, keys)
+            pending = [(container, position)]
+            while pending:
+                owner, index = pending.pop()
+                expr = owner[index]
+                if expr.const_value is not None:
+                    continue
+                key = keys.get(id(expr))
+                if key is not None and self.is_hoistable(expr):
+                    temp = temps.get(key)
+                    if temp is None:
+                        temp = temps[key] = self.new_local("invariant", expr.data_type)
+                        prelude.append(self.assignment(temp, expr, loop))
+                        self.hoisted += 1
+                    owner[index] = self.variable(temp, expr)
+                    continue
+                if expr.children:
+                    pending.extend((expr.children, child) for child in range(len(expr.children)))
+                if expr.index_expressions:
+                    pending.extend((expr.index_expressions, child)
+                                   for child in range(len(expr.index_expressions)))
+        return prelude
+
+    def is_hoistable(self, expr: ASTNode) -> bool:
+        # Hanya ekspresi yang melakukan komputasi (bukan variabel tunggal) dan bernilai skalar
+        return ((bool(expr.children) or bool(expr.index_expressions)) and expr.data_type is not None and
+                expr.data_type != BaseType.VOID and not isinstance(expr.type_desc, ArrayType))
+
+    # ---------- Strength reduction ----------
+
+    def reduce_strength(self, loop: ForStatementNode, killed: Set[int]) -> List[ASTNode]:
+        if len(loop.children) < 4 or self.is_vector_candidate(loop):
+            return []
+        counter, start, body = loop.children[0], loop.children[1], loop.children[3]
+        tab = self.symbol_table.tab
+        if (not isinstance(counter, VariableNode) or counter.tab_index < 0 or
+                tab[counter.tab_index].type_desc.base != BaseType.INTEGER or
+                counter.tab_index in self.killed(body)):
+            return []
+
+        # Kelompokkan perkalian counter * k per k
+        products: Dict[tuple, List[Tuple[list, int]]] = {}
+        weights: Dict[tuple, int] = {}
+        factors: Dict[tuple, ASTNode] = {}
+        for container, position, depth in self.expression_slots(loop):
+            pending = [(container, position)]
+            while pending:
+                owner, index = pending.pop()
+                expr = owner[index]
+                if expr.const_value is not None:
+                    continue
+                factor = self.induction_factor(expr, counter.tab_index, killed)
+                if factor is not None:
+                    key = self.factor_key(factor)
+                    products.setdefault(key, []).append((owner, index))
+                    weights[key] = weights.get(key, 0) + LOOP_WEIGHT ** (depth - 1)
+                    factors[key] = factor
+                    continue
+                if expr.children:
+                    pending.extend((expr.children, child) for child in range(len(expr.children)))
+                if expr.index_expressions:
+                    pending.extend((expr.index_expressions, child)
+                                   for child in range(len(expr.index_expressions)))
+
+        prelude: List[ASTNode] = []
+        updates: List[ASTNode] = []
+        for key, uses in products.items():
+            if weights[key] < MIN_REDUCE_WEIGHT:
+                continue
+            if not self.is_simple(start):
+                # Nilai awal dievaluasi sekali ke variabel sementara (urutan evaluasi tetap)
+                first = self.new_local("start", BaseType.INTEGER)
+                prelude.append(self.assignment(first, start, loop))
+                start = loop.children[1] = self.variable(first, start)
+            factor = factors[key]
+            induction = self.new_local("induction", BaseType.INTEGER)
+            prelude.append(self.assignment(induction, self.product(start, factor), loop))
+            step = '-' if loop.direction == "turunke" else '+'
+            updates.append(self.assignment(induction, self.binary(step, self.variable(induction, loop),
+                                                                    self.copy_leaf(factor)), loop))
+            for owner, index in uses:
+                owner[index] = self.variable(induction, owner[index])
+            self.reduced += len(uses)
+        if updates:
+            loop.children[3] = ASTNode(NodeKind.STATEMENT_LIST, children=[body] + updates, token=body.token)
+        return prelude
+
+    def induction_factor(self, expr: ASTNode, counter: int, killed: Set[int]) -> Optional[ASTNode]:
+        # k jika expr berbentuk counter * k atau k * counter (integer)
+        if (not isinstance(expr, BinaryExpressionNode) or expr.operator != '*' or
+                expr.data_type != BaseType.INTEGER or len(expr.children) != 2):
+            return None
+        left, right = expr.children
+        if self.is_variable(left, counter):
+            factor = right
+        elif self.is_variable(right, counter):
+            factor = left
+        else:
+            return None
+        if factor.const_value is not None:
+            value = factor.const_value
+            return factor if isinstance(value, int) and not isinstance(value, bool) else None
+        if (isinstance(factor, VariableNode) and not factor.index_expressions and factor.tab_index >= 0 and
+                factor.tab_index not in killed and factor.data_type == BaseType.INTEGER and
+                self.symbol_table.tab[factor.tab_index].obj == ObjType.VARIABLE):
+            return factor
+        return None
+
+    def factor_key(self, factor: ASTNode) -> tuple:
+        if factor.const_value is not None:
+            return ("const", factor.const_value)
+        return ("var", factor.tab_index)
+
+    def is_vector_candidate(self, loop: ForStatementNode) -> bool:
+        # Body tepat satu assignment ke elemen larik
+        body = loop.children[3]
+        while body.node_type in GROUP_STATEMENTS and len(body.children) == 1:
+            body = body.children[0]
+        return (body.node_type == NodeKind.ASSIGNMENT and bool(body.children) and
+                isinstance(body.children[0], VariableNode) and bool(body.children[0].index_expressions))
+
+    # ---------- Helper ----------
+
+    def is_variable(self, expr: ASTNode, tab_index: int) -> bool:
+        return isinstance(expr, VariableNode) and not expr.index_expressions and expr.tab_index == tab_index
+
+    def is_simple(self, expr: ASTNode) -> bool:
+        # Konstanta atau variabel skalar: aman dievaluasi dua kali
+        return expr.const_value is not None or (
+            isinstance(expr, VariableNode) and not expr.index_expressions and expr.tab_index >= 0 and
+            self.symbol_table.tab[expr.tab_index].obj == ObjType.VARIABLE)
+
+    def new_local(self, name: str, data_type: BaseType) -> int:
+        return self.symbol_table.enter_local(*self.frame, name, data_type.value, 0, primitive(data_type))
+
+    def variable(self, tab_index: int, origin: ASTNode) -> VariableNode:
+        entry = self.symbol_table.tab[tab_index]
+        return VariableNode(NodeKind.VARIABLE, token=origin.token, data_type=entry.type_desc.base,
+                            tab_index=tab_index, type_desc=entry.type_desc, identifier=entry.name)
+
+    def copy_leaf(self, node: ASTNode) -> ASTNode:
+        if isinstance(node, VariableNode):
+            return self.variable(node.tab_index, node)
+        return ConstantNode(NodeKind.CONST_VALUE, token=node.token, data_type=node.data_type,
+                            const_value=node.const_value)
+
+    def product(self, start: ASTNode, factor: ASTNode) -> ASTNode:
+        if start.const_value is not None and (factor.const_value is not None or start.const_value == 0):
+            return ConstantNode(NodeKind.CONST_VALUE, token=start.token, data_type=BaseType.INTEGER,
+                                const_value=start.const_value * (factor.const_value or 0))
+        if start.const_value == 1:
+            return self.copy_leaf(factor)
+        return self.binary('*', self.copy_leaf(start), self.copy_leaf(factor))
+
+    def binary(self, operator: str, left: ASTNode, right: ASTNode) -> BinaryExpressionNode:
+        return BinaryExpressionNode(NodeKind.BINARY_EXPRESSION, children=[left, right], token=left.token,
+                                    data_type=BaseType.INTEGER, operator=operator)
+
+    def assignment(self, tab_index: int, value: ASTNode, origin: ASTNode) -> AssignmentNode:
+        return AssignmentNode(NodeKind.ASSIGNMENT, children=[self.variable(tab_index, origin), value],
+                              token=origin.token, data_type=BaseType.VOID)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+from typing import Any, List, Optional, Tuple
+from enum import IntEnum
+
+# P-code bergaya Pascal-S untuk backend.
+# Instruksi berupa tuple (op, a, b) dengan op berupa int (nilai Op). Alamat
+# variabel adalah (level, offset): nilainya ada di stack[display[level] + offset].
+# Setiap frame diawali header FRAME_HEADER cell, lalu parameter dan variabel
+# lokal sesuai urutan adr di tab.
+
+class Op(IntEnum):
+    # Load/store
+    LDA = 0     # push alamat display[a] + b
+    LOD = 1     # push stack[display[a] + b]
+    LDC = 2     # push konstanta a
+    LDI = 3     # alamat di top diganti isinya
+    LDB = 4     # alamat di top diganti a cell berturut-turut (salin array)
+    STO = 5     # pop ke stack[display[a] + b]
+    STI = 6     # pop nilai lalu alamat, simpan nilai ke alamat
+    STB = 7     # pop a cell lalu alamat, salin blok ke alamat
+    IDX = 8     # pop indeks; alamat array di top menjadi alamat elemen (a = index atab)
+    IXU = 9     # seperti IDX tanpa cek batas (indeks terbukti aman oleh range analysis)
+    POP = 10    # buang top
+    DUP = 11    # duplikasi top
+    # Aritmetika dan logika
+    ADD = 12
+    SUB = 13
+    MUL = 14
+    DVD = 15    # "/" (hasil real)
+    DIV = 16    # "bagi" (dibulatkan ke arah nol)
+    MOD = 17
+    NEG = 18
+    AND = 19
+    OR = 20
+    NOT = 21
+    EQ = 22
+    NE = 23
+    LT = 24
+    LE = 25
+    GT = 26
+    GE = 27
+    # Kontrol alur
+    JMP = 28    # lompat ke a
+    JPC = 29    # pop; lompat ke a jika salah
+    F1U = 30    # awal "untuk ... ke": stack [alamat, awal, akhir]; lompat ke a jika loop kosong
+    F2U = 31    # akhir iterasi "ke": counter + 1, kembali ke a selama <= akhir
+    F1D = 32    # awal "untuk ... turunke"
+    F2D = 33    # akhir iterasi "turunke"
+    # Pemanggilan
+    MKS = 34    # sisihkan header frame; a = nilai awal hasil fungsi
+    CAL = 35    # panggil prosedur/fungsi nomor a
+    RET = 36    # kembali dari frame level a; b = 1 jika hasil fungsi ditinggal di top
+    # I/O
+    WRT = 37    # pop dan tulis nilai
+    WRL = 38    # tulis newline
+    RED = 39    # pop alamat, baca satu nilai bertipe a (nilai BaseType)
+    RDL = 40    # buang sisa baris input
+    HLT = 41
+    # Instrumentasi (hanya di kode hasil count_statements=True)
+    STM = 42    # awal satu statement source
+    # Pemanggilan diri sendiri di posisi ekor: argumen di top menggantikan
+    # parameter frame aktif, variabel lokal dan hasil (b) di-reset, lompat ke
+    # awal body prosedur a
+    TCL = 43
+
+
+# Layout header frame
+FRAME_RESULT = 0        # Hasil fungsi
+FRAME_RETURN = 1        # pc kembali
+FRAME_DYNAMIC_LINK = 2  # Base frame pemanggil
+FRAME_SAVED_DISPLAY = 3 # display[level] sebelum pemanggilan
+FRAME_HEADER = 4
+
+# Batas kedalaman pemanggilan default untuk semua engine (--max-depth)
+DEFAULT_MAX_DEPTH = 10000
+
+Instruction = Tuple[int, Any, Any]
+
+
+class ProcInfo:
+    __slots__ = ("name", "tab_index", "entry", "level", "param_size", "frame_size", "locals")
+
+    def __init__(self, name: str, tab_index: int, level: int, param_size: int, frame_size: int,
+                 locals: List[Any]):
+        self.name = name
+        self.tab_index = tab_index
+        self.entry = -1                   # pc instruksi pertama body (diisi saat body di-generate)
+        self.level = level                # Level frame (lev parameter/variabel lokal)
+        self.param_size = param_size      # psze dari btab
+        self.frame_size = frame_size      # FRAME_HEADER + vsze dari btab
+        self.locals = locals              # Nilai awal variabel lokal (setelah parameter)
+
+    def as_tuple(self) -> tuple:
+        # Bentuk yang dibaca VM saat CAL
+        return (self.entry, self.level, self.param_size, self.frame_size, self.locals)
+
+
+class PCodeProgram:
+    # Jenis dan versi artifact .pasc; naikkan versi jika instruction set atau codegen berubah
+    ARTIFACT_KIND = "stack"
+    ARTIFACT_VERSION = "1"
+
+    def __init__(self, name: str, code: List[Instruction], lines: List[int], procs: List[ProcInfo],
+                 arrays: List[Tuple[int, int, int]], entry: int, frame_size: int,
+                 globals: List[Any], max_level: int):
+        self.name = name
+        self.code = code            # Instruksi (op, a, b)
+        self.lines = lines          # Baris source per instruksi (0 jika tidak diketahui)
+        self.procs = procs          # Prosedur/fungsi, diindex oleh operand CAL
+        self.arrays = arrays        # (low, high, element_size) per index atab
+        self.entry = entry          # pc awal program utama
+        self.frame_size = frame_size  # Ukuran frame global (header + variabel global)
+        self.globals = globals      # Nilai awal variabel global
+        self.max_level = max_level  # Level frame terdalam, untuk ukuran display
+
+    def to_artifact(self) -> tuple:
+        # Bentuk yang bisa di-marshal: konstanta ada di operand instruksi, data
+        # tab/btab yang dipakai runtime di procs, atab di arrays
+        procs = [(proc.name, proc.tab_index, proc.entry, proc.level, proc.param_size, proc.frame_size,
+                  proc.locals) for proc in self.procs]
+        return (self.name, self.code, self.lines, procs, self.arrays, self.entry, self.frame_size,
+                self.globals, self.max_level)
+
+    @classmethod
+    def from_artifact(cls, data: tuple) -> PCodeProgram:
+        name, code, lines, procs, arrays, entry, frame_size, globals, max_level = data
+        infos = []
+        for proc_name, tab_index, proc_entry, level, param_size, proc_frame_size, locals in procs:
+            info = ProcInfo(proc_name, tab_index, level, param_size, proc_frame_size, locals)
+            info.entry = proc_entry
+            infos.append(info)
+        return cls(name, code, lines, infos, arrays, entry, frame_size, globals, max_level)
+
+    def disassemble(self) -> str:
+        labels = {proc.entry: proc.name for proc in self.procs}
+        labels.setdefault(self.entry, self.name)
+        lines = []
+        for pc, (op, a, b) in enumerate(self.code):
+            if pc in labels:
+                lines.append(f"{labels[pc]}:")
+            operands = format_operands(op, a, b)
+            lines.append(f"  {pc:5}  {Op(op).name:4} {operands}".rstrip())
+        return "\n".join(lines)
+
+
+_NO_OPERANDS = frozenset((Op.LDI, Op.STI, Op.POP, Op.DUP, Op.ADD, Op.SUB, Op.MUL, Op.DVD, Op.DIV, Op.MOD,
+                          Op.NEG, Op.AND, Op.OR, Op.NOT, Op.EQ, Op.NE, Op.LT, Op.LE, Op.GT,
+                          Op.GE, Op.WRT, Op.WRL, Op.RDL, Op.HLT, Op.STM))
+_TWO_OPERANDS = frozenset((Op.LDA, Op.LOD, Op.STO, Op.RET, Op.TCL))
+
+
+def format_operands(op: int, a: Any, b: Any) -> str:
+    if op in _NO_OPERANDS:
+        return ""
+    if op in _TWO_OPERANDS:
+        return f"{a}, {b}"
+    return repr(a)
+
+
+def format_value(value: Any) -> str:
+    # Boolean ditulis dengan literal bahasa sumber
+    if value is True:
+        return "benar"
+    if value is False:
+        return "salah"
+    return str(value)
+
+
+class VMError(Exception):
+    def __init__(self, message: str, line: Optional[int] = None):
+        super().__init__(message)
+        self.message = message
+        self.line = line
+
+    def __str__(self):
+        location = f" at line {self.line}" if self.line else ""
+        return f"Runtime Error{location}: {self.message}"
@@ -0,0 +1,191 @@
+from __future__ import annotations
+from typing import Callable, List, Optional, Set, Tuple
+from .pcode import Op, PCodeProgram, FRAME_HEADER
+
+# Pipeline optimasi p-code antara codegen dan eksekusi di stack VM.
+# Setiap pass menandai instruksi yang dihapus (None) lalu compact() membuang
+# tanda tersebut dan memetakan ulang target lompatan, entry prosedur dan tabel
+# baris. Pola dua instruksi hanya digabung jika instruksi kedua bukan target
+# lompatan, karena jalur lain yang masuk ke sana membawa isi stack berbeda.
+# Pipeline diulang sampai tidak ada perubahan (satu pass sering membuka
+# peluang untuk pass lain, mis. cabang konstan -> kode tak tercapai -> JMP ke
+# instruksi berikutnya).
+
+MAX_ROUNDS = 10
+
+# Operand a berupa alamat kode
+JUMP_OPS = frozenset((Op.JMP, Op.JPC, Op.F1U, Op.F2U, Op.F1D, Op.F2D))
+# Instruksi yang tidak pernah jatuh ke instruksi berikutnya
+TERMINAL_OPS = frozenset((Op.JMP, Op.RET, Op.HLT, Op.TCL))
+# Instruksi yang hanya push nilai tanpa efek samping
+PURE_PUSH_OPS = frozenset((Op.LDC, Op.LOD, Op.LDA, Op.DUP))
+# Operasi tanpa efek samping yang hasilnya bisa dibuang bersama operandnya
+# (DIV/MOD/DVD tidak termasuk: bisa gagal karena pembagian nol)
+PURE_BINARY_OPS = frozenset((Op.ADD, Op.SUB, Op.MUL, Op.AND, Op.OR, Op.EQ, Op.NE, Op.LT, Op.LE,
+                             Op.GT, Op.GE))
+PURE_UNARY_OPS = frozenset((Op.NEG, Op.NOT))
+# Operasi dengan elemen identitas integer di operand kanan: x + 0, x - 0, x * 1
+IDENTITY_OPERANDS = {Op.ADD: 0, Op.SUB: 0, Op.MUL: 1}
+
+Code = List[Optional[tuple]]
+
+
+def jump_targets(program: PCodeProgram) -> Set[int]:
+    targets = {program.entry}
+    targets.update(proc.entry for proc in program.procs)
+    targets.update(a for op, a, _ in program.code if op in JUMP_OPS)
+    return targets
+
+
+def compact(program: PCodeProgram, code: Code) -> int:
+    # Buang instruksi None; target yang dihapus menunjuk instruksi sesudahnya
+    new_address = [0] * (len(code) + 1)
+    kept = 0
+    for pc, instruction in enumerate(code):
+        new_address[pc] = kept
+        if instruction is not None:
+            kept += 1
+    new_address[len(code)] = kept
+
+    new_code, new_lines = [], []
+    for pc, instruction in enumerate(code):
+        if instruction is None:
+            continue
+        op, a, b = instruction
+        if op in JUMP_OPS:
+            a = new_address[a]
+        new_code.append((op, a, b))
+        new_lines.append(program.lines[pc])
+    removed = len(code) - kept
+    program.code, program.lines = new_code, new_lines
+    program.entry = new_address[program.entry]
+    for proc in program.procs:
+        proc.entry = new_address[proc.entry]
+    return removed
+
+
+def fold_constant_branches(program: PCodeProgram) -> int:
+    # LDC c; JPC L -> (dihapus) jika c benar, JMP L jika c salah; LDC c; NOT -> LDC (not c)
+    code: Code = list(program.code)
+    targets = jump_targets(program)
+    for pc in range(len(code) - 1):
+        first, second = code[pc], code[pc + 1]
+        if first is None or second is None or first[0] != Op.LDC or pc + 1 in targets:
+            continue
+        if second[0] == Op.JPC:
+            if first[1]:
+                code[pc] = code[pc + 1] = None
+            else:
+                code[pc], code[pc + 1] = (int(Op.JMP), second[1], None), None
+        elif second[0] == Op.NOT and isinstance(first[1], bool):
+            code[pc], code[pc + 1] = (int(Op.LDC), not first[1], None), None
+    return compact(program, code)
+
+
+def thread_jumps(program: PCodeProgram) -> int:
+    # Lompatan ke JMP diarahkan langsung ke tujuan akhir; JMP ke instruksi berikutnya dihapus
+    code: Code = list(program.code)
+    for pc, (op, a, b) in enumerate(program.code):
+        if op not in JUMP_OPS:
+            continue
+        target, seen = a, {pc}
+        while target < len(program.code) and program.code[target][0] == Op.JMP and target not in seen:
+            seen.add(target)
+            target = program.code[target][1]
+        if op == Op.JMP and target == pc + 1:
+            code[pc] = None
+        else:
+            code[pc] = (op, target, b)
+    return compact(program, code)
+
+
+def remove_redundant_load_store(program: PCodeProgram) -> int:
+    code: Code = list(program.code)
+    targets = jump_targets(program)
+    for pc in range(len(code) - 1):
+        first, second = code[pc], code[pc + 1]
+        if first is None or second is None or pc + 1 in targets:
+            continue
+        op, a, b = first
+        if op == Op.LOD and second == (Op.STO, a, b):
+            # x := x
+            code[pc] = code[pc + 1] = None
+        elif op in PURE_PUSH_OPS and second[0] == Op.POP:
+            code[pc] = code[pc + 1] = None
+        elif op in PURE_UNARY_OPS and second[0] == Op.POP:
+            code[pc] = None
+        elif op in PURE_BINARY_OPS and second[0] == Op.POP:
+            # Hasil dibuang: cukup buang kedua operand (lalu operand murni ikut hilang)
+            code[pc] = second
+        elif (op == Op.DUP and second[0] == Op.STO and pc + 2 < len(code) and
+              code[pc + 2] is not None and code[pc + 2][0] == Op.POP and pc + 2 not in targets):
+            code[pc], code[pc + 2] = None, None
+        elif op == Op.STO and second == (Op.LOD, a, b):
+            # Simpan lalu muat ulang variabel yang sama: nilai masih ada di stack
+            code[pc], code[pc + 1] = (int(Op.DUP), None, None), first
+        elif (op == Op.LDC and second[0] in IDENTITY_OPERANDS and type(a) is int and
+              a == IDENTITY_OPERANDS[second[0]]):
+            # Hanya konstanta integer: i + 0.0 mengubah tipe hasil menjadi real
+            code[pc] = code[pc + 1] = None
+    return compact(program, code)
+
+
+def eliminate_dead_stores(program: PCodeProgram) -> int:
+    # Variabel yang tidak pernah dibaca (LOD) atau diambil alamatnya (LDA: array,
+    # counter untuk, read) tidak perlu disimpan. Offset sama di level yang sama
+    # bisa milik beberapa prosedur, jadi pembacaan di mana pun membuat store tetap.
+    # Slot header (hasil fungsi) dibaca oleh RET.
+    read = {(a, b) for op, a, b in program.code if op in (Op.LOD, Op.LDA)}
+    code: Code = list(program.code)
+    targets = jump_targets(program)
+    for pc, (op, a, b) in enumerate(program.code):
+        if op != Op.STO or b < FRAME_HEADER or (a, b) in read:
+            continue
+        previous = code[pc - 1] if pc > 0 else None
+        if previous is not None and previous[0] in PURE_PUSH_OPS and pc not in targets:
+            code[pc - 1] = code[pc] = None
+        else:
+            # Nilai tetap dihitung (mis. pemanggilan fungsi) lalu dibuang
+            code[pc] = (int(Op.POP), None, None)
+    return compact(program, code)
+
+
+def remove_unreachable(program: PCodeProgram) -> int:
+    code = program.code
+    reachable = [False] * len(code)
+    pending = [program.entry] + [proc.entry for proc in program.procs if proc.entry >= 0]
+    while pending:
+        pc = pending.pop()
+        while 0 <= pc < len(code) and not reachable[pc]:
+            reachable[pc] = True
+            op, a, _ = code[pc]
+            if op in JUMP_OPS:
+                pending.append(a)
+            if op in TERMINAL_OPS:
+                break
+            pc += 1
+    return compact(program, [instruction if reachable[pc] else None
+                             for pc, instruction in enumerate(code)])
+
+
+# (nama, level minimum, pass)
+PASSES: List[Tuple[str, int, Callable[[PCodeProgram], int]]] = [
+    ("constant-branches", 1, fold_constant_branches),
+    ("unreachable-code", 1, remove_unreachable),
+    ("jump-threading", 1, thread_jumps),
+    ("load-store", 1, remove_redundant_load_store),
+    ("dead-stores", 2, eliminate_dead_stores),
+]
+
+
+def optimize(program: PCodeProgram, level: int) -> List[Tuple[str, int]]:
+    # Mengembalikan jumlah instruksi yang dihapus per pass (program diubah in-place)
+    passes = [(name, run) for name, minimum, run in PASSES if level >= minimum]
+    removed = {name: 0 for name, _ in passes}
+    for _ in range(MAX_ROUNDS):
+        size = len(program.code)
+        for name, run in passes:
+            removed[name] += run(program)
+        if len(program.code) == size:
+            break
+    return list(removed.items())
@@ -0,0 +1,216 @@
+from __future__ import annotations
+from typing import Dict, List, Optional
+import sys
+import threading
+import time
+
+# Profiler untuk program yang dijalankan di VM stack/register.
+# VM memanggil enter/tail/leave pada CAL/TCL/RET (hanya jika profiler
+# dipasang) dan statement pada setiap STM, sehingga line count hanya tersedia
+# di build dengan count_statements=True. Pemanggilan dicatat sebagai calling
+# context tree: satu CallNode per jalur pemanggilan unik, sehingga node yang
+# sama tidak pernah aktif dua kali dan waktu mulai cukup disimpan di node.
+#
+# Profiler (counting) mengukur waktu inclusive/exclusive dengan perf_counter di
+# setiap pemanggilan; SamplingProfiler hanya memindahkan pointer node aktif dan
+# sebuah thread mencatat node tersebut setiap interval (switch interval GIL
+# diturunkan selama profiling agar thread sampler bangun tepat waktu).
+# Keduanya menghasilkan folded stack ("main;A;B bobot", format
+# flamegraph.pl/speedscope) dan laporan teks per subprogram dan per baris source.
+
+SAMPLE_INTERVAL = 0.001     # Detik antar sampel (SamplingProfiler)
+REPORT_LIMIT = 20           # Jumlah baris terpanas di laporan
+
+
+class CallNode:
+    __slots__ = ("proc", "parent", "children", "calls", "self_time", "samples", "start", "child_time")
+
+    def __init__(self, proc: int, parent: Optional[CallNode]):
+        self.proc = proc                    # Index prosedur (operand CAL), -1 untuk program utama
+        self.parent = parent
+        self.children: Dict[int, CallNode] = {}
+        self.calls = 0
+        self.self_time = 0.0                # Waktu exclusive (detik)
+        self.samples = 0                    # Sampel saat node ini aktif (SamplingProfiler)
+        self.start = 0.0                    # Waktu mulai aktivasi yang sedang berjalan
+        self.child_time = 0.0               # Waktu callee selama aktivasi ini
+
+    def child(self, proc: int) -> CallNode:
+        node = self.children.get(proc)
+        if node is None:
+            node = self.children[proc] = CallNode(proc, self)
+        return node
+
+
+class Profiler:
+    def __init__(self, program):
+        self.program_name = program.name
+        self.names = [proc.name for proc in program.procs]
+        self.root = CallNode(-1, None)
+        self.node = self.root               # Node aktif
+        self.lines: Dict[int, int] = {}     # Baris source -> jumlah statement yang dieksekusi
+        self.calls = [0] * len(self.names)
+        self.inclusive = [0.0] * len(self.names)
+        self.exclusive = [0.0] * len(self.names)
+        self.active = [0] * len(self.names)  # Aktivasi yang sedang berjalan (rekursi dihitung sekali)
+        self.elapsed = 0.0
+
+    # ---------- Hook VM ----------
+
+    def start(self):
+        self.root.calls += 1
+        self.root.start = time.perf_counter()
+
+    def enter(self, proc: int):
+        node = self.node = self.node.child(proc)
+        node.calls += 1
+        self.calls[proc] += 1
+        self.active[proc] += 1
+        node.child_time = 0.0
+        node.start = time.perf_counter()
+
+    def tail(self, proc: int):
+        # Frame dipakai ulang: dihitung sebagai pemanggilan tanpa node baru
+        self.node.calls += 1
+        self.calls[proc] += 1
+
+    def leave(self):
+        node = self.node
+        elapsed = time.perf_counter() - node.start
+        proc = node.proc
+        node.self_time += elapsed - node.child_time
+        self.exclusive[proc] += elapsed - node.child_time
+        self.active[proc] -= 1
+        if not self.active[proc]:
+            self.inclusive[proc] += elapsed
+        self.node = node.parent
+        self.node.child_time += elapsed
+
+    def statement(self, line: int):
+        lines = self.lines
+        lines[line] = lines.get(line, 0) + 1
+
+    def stop(self):
+        # Tutup aktivasi yang masih berjalan (runtime error)
+        while self.node is not self.root:
+            self.leave()
+        root = self.root
+        self.elapsed = time.perf_counter() - root.start
+        root.self_time += self.elapsed - root.child_time
+
+    # ---------- Output ----------
+
+    def weight(self, node: CallNode) -> int:
+        # Bobot folded stack: waktu exclusive dalam mikrodetik
+        return round(node.self_time * 1e6)
+
+    def folded(self) -> str:
+        # Rekursi langsung (A;A;A) digabung menjadi satu frame agar ukuran
+        # output tidak kuadratik terhadap kedalaman rekursi
+        weights: Dict[str, int] = {}
+        pending = [(self.root, self.program_name)]
+        while pending:
+            node, path = pending.pop()
+            weight = self.weight(node)
+            if weight > 0:
+                weights[path] = weights.get(path, 0) + weight
+            for proc in sorted(node.children, reverse=True):
+                child_path = path if proc == node.proc else f"{path};{self.names[proc]}"
+                pending.append((node.children[proc], child_path))
+        return "".join(f"{path} {weight}\n" for path, weight in weights.items())
+
+    def report(self, source: Optional[str] = None) -> str:
+        total = self.elapsed or 1e-9
+        lines = [f"  {'subprogram':18} {'calls':>10} {'incl ms':>10} {'excl ms':>10} {'excl %':>7}",
+                 f"  {self.program_name:18} {1:10} {self.elapsed * 1000:10.2f} "
+                 f"{self.root.self_time * 1000:10.2f} {self.root.self_time / total * 100:6.1f}%"]
+        for proc in sorted(range(len(self.names)), key=lambda proc: -self.exclusive[proc]):
+            if self.calls[proc]:
+                lines.append(f"  {self.names[proc]:18} {self.calls[proc]:10} {self.inclusive[proc] * 1000:10.2f} "
+                             f"{self.exclusive[proc] * 1000:10.2f} {self.exclusive[proc] / total * 100:6.1f}%")
+        lines.extend(self.line_report(source))
+        return "\n".join(lines)
+
+    def line_report(self, source: Optional[str]) -> List[str]:
+        if not self.lines:
+            return []
+        text = source.splitlines() if source is not None else []
+        lines = ["", f"  {'line':>6} {'count':>10}  source"]
+        hottest = sorted(self.lines.items(), key=lambda item: (-item[1], item[0]))[:REPORT_LIMIT]
+        for line, count in hottest:
+            snippet = text[line - 1].strip() if 0 < line <= len(text) else ""
+            lines.append(f"  {line:6} {count:10}  {snippet}")
+        return lines
+
+
+class SamplingProfiler(Profiler):
+    def __init__(self, program, interval: float = SAMPLE_INTERVAL):
+        super().__init__(program)
+        self.interval = interval
+        self.sample_count = 0
+        self.stopped = threading.Event()
+        self.sampler: Optional[threading.Thread] = None
+        self.switch_interval = sys.getswitchinterval()
+
+    def start(self):
+        super().start()
+        sys.setswitchinterval(min(self.switch_interval, self.interval / 2))
+        self.sampler = threading.Thread(target=self.sample, daemon=True)
+        self.sampler.start()
+
+    def sample(self):
+        while not self.stopped.wait(self.interval):
+            self.node.samples += 1
+
+    def enter(self, proc: int):
+        node = self.node = self.node.child(proc)
+        node.calls += 1
+        self.calls[proc] += 1
+
+    def leave(self):
+        self.node = self.node.parent
+
+    def stop(self):
+        self.stopped.set()
+        if self.sampler is not None:
+            self.sampler.join()
+        sys.setswitchinterval(self.switch_interval)
+        self.node = self.root
+        self.elapsed = time.perf_counter() - self.root.start
+        # Inclusive/exclusive dalam sampel; rekursi dihitung sekali per jalur.
+        # DFS dengan event masuk/keluar agar active cukup dihitung inkremental.
+        active: Dict[int, int] = {}
+        pending = [(self.root, True)]
+        while pending:
+            node, entering = pending.pop()
+            proc = node.proc
+            if not entering:
+                active[proc] -= 1
+                if not active[proc]:
+                    del active[proc]
+                continue
+            self.sample_count += node.samples
+            if proc >= 0:
+                active[proc] = active.get(proc, 0) + 1
+                pending.append((node, False))
+                self.exclusive[proc] += node.samples
+            for caller in active:
+                self.inclusive[caller] += node.samples
+            pending.extend((child, True) for child in node.children.values())
+
+    def weight(self, node: CallNode) -> int:
+        return node.samples
+
+    def report(self, source: Optional[str] = None) -> str:
+        total = self.sample_count or 1
+        lines = [f"  {self.sample_count} samples every {self.interval * 1000:g} ms, "
+                 f"{self.elapsed * 1000:.2f} ms total",
+                 f"  {'subprogram':18} {'calls':>10} {'incl':>10} {'excl':>10} {'excl %':>7}",
+                 f"  {self.program_name:18} {1:10} {self.sample_count:10} "
+                 f"{self.root.samples:10} {self.root.samples / total * 100:6.1f}%"]
+        for proc in sorted(range(len(self.names)), key=lambda proc: -self.exclusive[proc]):
+            if self.calls[proc]:
+                lines.append(f"  {self.names[proc]:18} {self.calls[proc]:10} {int(self.inclusive[proc]):10} "
+                             f"{int(self.exclusive[proc]):10} {self.exclusive[proc] / total * 100:6.1f}%")
+        lines.extend(self.line_report(source))
+        return "\n".join(lines)
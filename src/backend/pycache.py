@@ -0,0 +1,184 @@
+from __future__ import annotations
+from typing import Callable, Optional, Tuple, Type
+import os
+import hashlib
+import marshal
+import importlib.util
+
+# Artifact hasil compile (.pasc) untuk ketiga engine, seperti __pycache__:
+# program yang sudah di-generate disimpan bersama hash source Pascal sehingga
+# run berikutnya melewati lexer, parser, semantic analysis dan codegen.
+# Isi file (marshal): (versi, jenis, varian, hash source, data program), data
+# dari to_artifact() kelas program (bytecode dengan konstanta di operand, tabel
+# baris, data tab/btab/atab yang dipakai runtime).
+# Versi mencakup COMPILER_VERSION, versi format engine, magic number bytecode
+# CPython dan varian build (mis. -O2) supaya artifact lama otomatis tidak
+# terpakai setelah compiler atau interpreter berubah.
+#
+# Artifact disimpan di __pascache__/ di samping source (nama dari hash), atau
+# sebagai <nama>.pasc tepat di samping source (satu slot per source).
+
+CACHE_DIR_NAME = "__pascache__"
+ARTIFACT_SUFFIX = ".pasc"
+# Naikkan jika front end (parser/semantic analyzer) mengubah hasil compile
+COMPILER_VERSION = 1
+ENGINES = ("stack", "register", "python")
+
+
+def program_class(kind: str) -> Type:
+    # Diimport sesuai kebutuhan: warm start tidak memuat backend lain (mis. NumPy)
+    if kind == "stack":
+        from .pcode import PCodeProgram
+        return PCodeProgram
+    if kind == "register":
+        from .regcode import RegProgram
+        return RegProgram
+    from .pycodegen import PythonProgram
+    return PythonProgram
+
+
+def artifact_version(kind: str, variant: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(importlib.util.MAGIC_NUMBER)
+    digest.update(f"{COMPILER_VERSION}:{kind}:{program_class(kind).ARTIFACT_VERSION}:{variant}".encode())
+    return digest.hexdigest()
+
+
+def source_hash(source_code: str) -> str:
+    return hashlib.sha256(source_code.encode("utf-8")).hexdigest()
+
+
+class ProgramCache:
+    def __init__(self, directory: str, variant: str = "", kind: str = "python",
+                 artifact_path: Optional[str] = None):
+        self.directory = directory
+        self.variant = variant              # Opsi compile yang mengubah kode (mis. -O2)
+        self.kind = kind                    # Engine: stack, register atau python
+        self.artifact_path = artifact_path  # File .pasc tetap; None = nama dari hash di directory
+        self.version = artifact_version(kind, variant)
+
+    @classmethod
+    def for_source_file(cls, path: str, variant: str = "", kind: str = "python") -> ProgramCache:
+        return cls(os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME), variant, kind)
+
+    @classmethod
+    def beside_source_file(cls, path: str, variant: str = "", kind: str = "python") -> ProgramCache:
+        artifact_path = os.path.splitext(os.path.abspath(path))[0] + ARTIFACT_SUFFIX
+        return cls(os.path.dirname(artifact_path), variant, kind, artifact_path)
+
+    def key(self, source_code: str) -> str:
+        return source_hash(source_code)
+
+    def path(self, key: str) -> str:
+        if self.artifact_path is not None:
+            return self.artifact_path
+        name = hashlib.sha256(f"{self.version}:{key}".encode()).hexdigest()
+        return os.path.join(self.directory, f"{name[:32]}{ARTIFACT_SUFFIX}")
+
+    def load(self, key: str):
+        artifact = read_artifact(self.path(key))
+        if artifact is None:
+            return None
+        version, kind, variant, stored_key, data = artifact
+        if version != self.version or stored_key != key:
+            return None
+        return load_program(self.kind, data)
+
+    def store(self, key: str, program):
+        # Tulis ke file sementara lalu rename supaya pembaca tidak melihat file setengah jadi
+        try:
+            data = marshal.dumps((self.version, self.kind, self.variant, key, program.to_artifact()))
+            os.makedirs(self.directory, exist_ok=True)
+            path = self.path(key)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except (OSError, ValueError):
+            pass    # Cache bersifat opsional
+
+
+def read_artifact(path: str) -> Optional[tuple]:
+    try:
+        with open(path, "rb") as f:
+            artifact = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(artifact, tuple) or len(artifact) != 5:
+        return None
+    return artifact
+
+
+def load_program(kind: str, data: tuple):
+    try:
+        return program_class(kind).from_artifact(data)
+    except (TypeError, ValueError):
+        return None
+
+
+def load_artifact_file(path: str):
+    # Artifact tanpa source: hanya versi yang divalidasi.
+    # Mengembalikan (program, jenis engine, varian), atau None jika tidak valid/usang.
+    artifact = read_artifact(path)
+    if artifact is None:
+        return None
+    version, kind, variant, _, data = artifact
+    if kind not in ENGINES or version != artifact_version(kind, variant):
+        return None
+    program = load_program(kind, data)
+    return (program, kind, variant) if program is not None else None
+
+
+def build_variant(engine: str, opt_level: int) -> str:
+    # Hanya VM stack yang berubah di -O1 (peephole); -O2 mengubah AST untuk semua engine
+    if engine == "stack":
+        return f"O{opt_level}"
+    return "O2" if opt_level >= 2 else ""
+
+
+def load_or_generate(source_code: str, generate: Callable[[], object],
+                     cache: Optional[ProgramCache]) -> Tuple[object, bool]:
+    # Mengembalikan (program, True jika diambil dari cache)
+    if cache is None:
+        return generate(), False
+    key = cache.key(source_code)
+    program = cache.load(key)
+    if program is not None:
+        return program, True
+    program = generate()
+    cache.store(key, program)
+    return program, False
+
+
+def compile_source(source_code: str, cache: Optional[ProgramCache] = None, engine: str = "python",
+                   opt_level: int = 1) -> Tuple[object, bool]:
+    # Front end hanya dijalankan jika cache tidak punya entry untuk source ini
+    def generate():
+        from src.lexer import tokenize
+        from src.parser import Parser
+        from src.semantic_analyzer.semantic_analyzer import SemanticAnalyzer
+        from .codegen import CodeGenerator, CodegenError
+
+        analyzer = SemanticAnalyzer()
+        ast = analyzer.analyze(Parser(tokenize(source_code)).parse())
+        if analyzer.errors:
+            raise CodegenError(f"{len(analyzer.errors)} semantic errors: {analyzer.errors[0]}")
+        symbol_table = analyzer.symbol_table
+        if opt_level >= 2:
+            from .inliner import Inliner
+            from .loop_optimizer import LoopOptimizer
+            Inliner(symbol_table).run(ast)
+            LoopOptimizer(symbol_table).run(ast)
+        if engine == "python":
+            from .pycodegen import PythonCodeGenerator
+            return PythonCodeGenerator(symbol_table).generate(ast)
+        if engine == "register":
+            from .regcodegen import RegisterCodeGenerator
+            return RegisterCodeGenerator(symbol_table).generate(ast)
+        program = CodeGenerator(symbol_table).generate(ast)
+        if opt_level > 0:
+            from .peephole import optimize
+            optimize(program, opt_level)
+        return program
+
+    return load_or_generate(source_code, generate, cache)
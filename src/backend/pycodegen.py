@@ -0,0 +1,906 @@
+from __future__ import annotations
+from typing import Generator, List, Optional, Set, Union
+import sys
+import threading
+from src.semantic_analyzer.symbol_table import SymbolTable, ObjType, BaseType
+from src.semantic_analyzer.type_descriptors import TypeDescriptor, ArrayType, primitive
+from src.semantic_analyzer.ast_nodes import *
+from src.semantic_analyzer.traversal import trampoline, walk
+from src.semantic_analyzer.constant_folder import pascal_div, pascal_mod
+from .callgraph import CallGraph
+from .codegen import CodeGenerator, CodegenError, BUILTIN_PROCEDURES, DEFAULT_VALUES, string_value, tail_calls
+from .pcode import VMError, format_value, DEFAULT_MAX_DEPTH
+
+try:
+    import numpy
+except ImportError:     # NumPy opsional: tanpa NumPy larik disimpan sebagai list biasa
+    numpy = None
+
+# Backend Python: decorated AST -> source Python -> code object (compile()).
+# Program menjadi satu fungsi Python; variabel global menjadi variabel lokalnya
+# dan prosedur/fungsi menjadi fungsi bersarang, sehingga nesting lexical Pascal
+# dipetakan langsung ke closure Python (variabel frame luar yang di-assign
+# dideklarasikan nonlocal). Nama Python diturunkan dari nama identifier dan
+# index tab-nya (count_31) supaya shadowing antar block tidak bertabrakan.
+# Loop "untuk" menjadi for ... in range() jika counter tidak mungkin diubah
+# di dalam body; selain itu diterjemahkan ke while dengan semantik Pascal-S.
+# Larik disimpan sebagai list Python (offset low) dengan nilai yang sama persis
+# seperti di VM: integer tidak terbatas, dan elemen real bisa berisi integer.
+# Jika NumPy tersedia, loop "untuk i := a ke b lakukan arr[i] := <ekspresi>"
+# atas larik real tanpa dependensi antar iterasi dijalankan sebagai satu
+# operasi vektor float64 atas salinan slice, hanya jika setiap operasi di
+# ekspresi pasti aritmetika float (lihat vector_assignment) sehingga hasilnya
+# bit-identik dengan loop skalar.
+# Pemanggilan Pascal dipetakan ke pemanggilan Python. Subprogram rekursif
+# menghitung kedalaman secara eksplisit (_depth) dan dibatasi max_depth seperti
+# di VM; subprogram lain tidak dihitung karena masing-masing paling banyak
+# punya satu frame aktif (_STATIC_FRAMES). Recursion limit dinaikkan secukupnya
+# agar semua frame itu muat.
+# Rekursi ekor (P(...) / F := F(...) di posisi ekor) menjadi assignment
+# parameter + continue di dalam "while True" yang membungkus body.
+
+GENERATOR_VERSION = 9
+# Frame Python selain pemanggilan Pascal (fungsi program() dan runtime helper
+# seperti _mod/_bounds) yang ikut dihitung recursion limit
+RECURSION_MARGIN = 10
+# Sebelum Python 3.11 setiap pemanggilan Python juga memakai C stack, sehingga
+# recursion limit yang besar bisa membuat interpreter segfault sebelum
+# RecursionError. Program dengan limit di atas DEFAULT_RECURSION_LIMIT lalu
+# dijalankan di thread dengan C stack seukuran limit tersebut (maksimal
+# MAX_THREAD_STACK); limit dipotong sesuai ukuran stack itu.
+NATIVE_CALL_STACK = sys.version_info < (3, 11)
+DEFAULT_RECURSION_LIMIT = 1000
+C_STACK_PER_FRAME = 1024
+MAX_THREAD_STACK = 1 << 30
+HAVE_NUMPY = numpy is not None
+
+# Operator yang boleh muncul di ekspresi loop vektor
+VECTOR_OPERATORS = {'+': '+', '-': '-', '*': '*', '/': '/'}
+# Integer yang dikonversi ke float64 tanpa pembulatan
+EXACT_FLOAT_INT = 1 << 53
+
+PY_OPERATORS = {
+    '+': '+', '-': '-', '*': '*', '/': '/',
+    # Seperti VM, kedua operand dan/atau selalu dievaluasi; analyzer menjamin
+    # operand boolean (E209) sehingga hasilnya sama dengan and/or di VM
+    'dan': '&', 'atau': '|',
+    '=': '==', '<>': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>=',
+}
+
+# Tipe yang ditulis apa adanya oleh str() (boolean perlu format_value)
+_STR_TYPES = (BaseType.INTEGER, BaseType.REAL, BaseType.CHAR, BaseType.STRING)
+
+
+def _bounds_error(index: int, low: int, high: int):
+    raise VMError(f"Array index out of bounds: {index} not in range {low}..{high}")
+
+
+def _stack_overflow():
+    raise VMError("Stack overflow")
+
+
+def _checked_index(index: int, low: int, high: int) -> int:
+    if index < low or index > high:
+        _bounds_error(index, low, high)
+    return index - low
+
+
+def shift(value: str, delta: int) -> str:
+    # Ekspresi source "value + delta" tanpa suku nol
+    if delta == 0:
+        return value
+    return f"{value} + {delta}" if delta > 0 else f"{value} - {-delta}"
+
+
+# Nama yang tersedia untuk kode hasil generate
+RUNTIME = {
+    "_div": pascal_div,
+    "_mod": pascal_mod,
+    "_fmt": format_value,
+    "_bounds": _bounds_error,
+    "_index": _checked_index,
+    "_overflow": _stack_overflow,
+}
+if HAVE_NUMPY:
+    RUNTIME["_np"] = numpy
+
+
+class PythonProgram:
+    # Code object dan layout larik bergantung pada versi generator dan NumPy
+    ARTIFACT_KIND = "python"
+    ARTIFACT_VERSION = f"{GENERATOR_VERSION}:{int(HAVE_NUMPY)}"
+
+    def __init__(self, name: str, code, line_map: List[int], source: Optional[str] = None):
+        self.name = name
+        self.code = code            # Code object modul hasil compile()
+        self.line_map = line_map    # Baris Python (0-based) -> baris source Pascal
+        self.source = source        # Source Python (None jika dimuat dari cache tanpa source)
+
+    def to_artifact(self) -> tuple:
+        return (self.name, self.line_map, self.source, self.code)
+
+    @classmethod
+    def from_artifact(cls, data: tuple) -> PythonProgram:
+        name, line_map, source, code = data
+        return cls(name, code, line_map, source)
+
+    def run(self, input=None, output=None, max_depth: int = DEFAULT_MAX_DEPTH):
+        from .runtime_io import ProgramInput, ProgramOutput
+        namespace = dict(RUNTIME)
+        exec(self.code, namespace)
+        writer = ProgramOutput(output if output is not None else sys.stdout)
+        reader = ProgramInput(input if input is not None else sys.stdin, writer)
+        limit = sys.getrecursionlimit()
+        try:
+            self.call(namespace["program"], writer.write, reader, max_depth,
+                      max_depth + namespace["_STATIC_FRAMES"])
+        except VMError as error:
+            error.line = self.error_line(error.__traceback__)
+            raise
+        except ZeroDivisionError as error:
+            raise VMError("Division by zero", self.error_line(error.__traceback__)) from None
+        except RecursionError as error:
+            raise VMError("Stack overflow", self.error_line(error.__traceback__)) from None
+        except OverflowError as error:
+            # Integer di luar jangkauan float dikonversi (mis. di loop vektor)
+            raise VMError("Integer overflow", self.error_line(error.__traceback__)) from None
+        finally:
+            writer.flush()
+            sys.setrecursionlimit(limit)
+
+    def call(self, program, write, reader, max_depth: int, frames: int):
+        depth = 0
+        frame = sys._getframe()
+        while frame is not None:
+            depth += 1
+            frame = frame.f_back
+        required = depth + frames + RECURSION_MARGIN
+        if not NATIVE_CALL_STACK or required <= DEFAULT_RECURSION_LIMIT:
+            sys.setrecursionlimit(required)
+            program(write, reader, max_depth)
+            return
+        # Thread baru mulai dari kedalaman 1
+        stack_size = min(MAX_THREAD_STACK, (frames + RECURSION_MARGIN) * C_STACK_PER_FRAME)
+        sys.setrecursionlimit(min(required, stack_size // C_STACK_PER_FRAME))
+        errors = []
+
+        def run():
+            try:
+                program(write, reader, max_depth)
+            except BaseException as error:
+                errors.append(error)
+
+        previous = threading.stack_size(stack_size)
+        try:
+            thread = threading.Thread(target=run, daemon=True)
+            thread.start()
+        finally:
+            threading.stack_size(previous)
+        thread.join()
+        if errors:
+            raise errors[0]
+
+    def error_line(self, traceback) -> Optional[int]:
+        # Frame terdalam yang berasal dari kode hasil generate
+        line = None
+        while traceback is not None:
+            if traceback.tb_frame.f_code.co_filename == self.code.co_filename:
+                lineno = traceback.tb_lineno
+                if 0 < lineno <= len(self.line_map):
+                    line = self.line_map[lineno - 1] or line
+            traceback = traceback.tb_next
+        return line
+
+
+class PythonCodeGenerator(CodeGenerator):
+    def __init__(self, symbol_table: SymbolTable, use_numpy: bool = HAVE_NUMPY):
+        super().__init__(symbol_table)
+        if use_numpy and not HAVE_NUMPY:
+            raise CodegenError("NumPy is not installed")
+        self.use_numpy = use_numpy
+        self.source_lines: List[str] = []
+        self.line_map: List[int] = []
+        self.indent = 0
+        self.level = 0
+        self.function_tab = -1           # Fungsi yang sedang di-generate (-1: program utama)
+        self.pinned: Set[int] = set()    # Variabel yang di-assign dari luar block pemiliknya
+        self.counted: Set[int] = set()   # Subprogram rekursif yang menghitung kedalaman (_depth)
+        self.temp_count = 0
+
+        self.statement_handlers.update({
+            NodeKind.ASSIGNMENT: self.gen_assignment,
+            NodeKind.PROCEDURE_CALL: self.gen_procedure_call,
+            NodeKind.COMPOUND_STATEMENT: self.gen_sequence,
+            NodeKind.STATEMENT_LIST: self.gen_sequence,
+            NodeKind.IF_STATEMENT: self.gen_if,
+            NodeKind.WHILE_STATEMENT: self.gen_while,
+            NodeKind.FOR_STATEMENT: self.gen_for,
+            NodeKind.REPEAT_STATEMENT: self.gen_repeat,
+            NodeKind.STATEMENT: self.gen_empty,
+        })
+        self.expression_handlers.update({
+            NumberNode: self.gen_constant,
+            BooleanNode: self.gen_constant,
+            ConstantNode: self.gen_constant,
+            StringNode: self.gen_string,
+            VariableNode: self.gen_variable,
+            FunctionCallNode: self.gen_function_call,
+            BinaryExpressionNode: self.gen_binary,
+            UnaryExpressionNode: self.gen_unary,
+            NodeKind.NOT_EXPRESSION: self.gen_not,
+        })
+
+    def generate(self, program: ProgramNode) -> PythonProgram:
+        self.reject_records(program)
+        declarations = None
+        main_body = None
+        for child in program.children:
+            if child.node_type == NodeKind.DECLARATIONS:
+                declarations = child
+            elif child.node_type == NodeKind.COMPOUND_STATEMENT:
+                main_body = child
+
+        graph = CallGraph(self.symbol_table).build(program)
+        self.counted = graph.recursive
+        self.write(f"_STATIC_FRAMES = {len(graph.subprograms) - len(graph.recursive)}")
+        self.write("def program(_write, _input, _max_depth):")
+        self.indent += 1
+        self.write("_depth = 0")
+        self.pinned = self.nonlocal_targets(declarations)
+        self.gen_frame(0, declarations, main_body)
+        self.indent -= 1
+
+        source = "\n".join(self.source_lines) + "\n"
+        try:
+            code = compile(source, f"<pascal:{program.name}>", "exec")
+        except (SyntaxError, RecursionError, MemoryError) as error:
+            # Mis. batas block bersarang CPython (20 level loop)
+            raise CodegenError(f"Cannot compile generated Python: {error}")
+        return PythonProgram(program.name, code, self.line_map, source)
+
+    # ---------- Output ----------
+
+    def write(self, text: str):
+        self.source_lines.append("    " * self.indent + text)
+        self.line_map.append(self.line)
+
+    def temp(self, prefix: str) -> str:
+        self.temp_count += 1
+        return f"_{prefix}{self.temp_count}"
+
+    def name(self, tab_index: int) -> str:
+        return f"{self.symbol_table.tab[tab_index].name.lower()}_{tab_index}"
+
+    def result_name(self, tab_index: int) -> str:
+        return f"result_{tab_index}"
+
+    def is_vector(self, type_desc: Optional[TypeDescriptor]) -> bool:
+        # Larik yang bisa diproses loop vektor: satu dimensi dengan elemen real
+        return (self.use_numpy and isinstance(type_desc, ArrayType) and
+                not isinstance(type_desc.element, ArrayType) and type_desc.element.base == BaseType.REAL)
+
+    def initial_value(self, type_desc: TypeDescriptor) -> str:
+        if isinstance(type_desc, ArrayType):
+            count = max(type_desc.high - type_desc.low + 1, 0)
+            if isinstance(type_desc.element, ArrayType):
+                return f"[{self.initial_value(type_desc.element)} for _ in range({count})]"
+            return f"[{DEFAULT_VALUES.get(type_desc.element.base, 0)!r}] * {count}"
+        return repr(DEFAULT_VALUES.get(type_desc.base, 0))
+
+    def copy_array(self, value: str, type_desc: ArrayType) -> str:
+        # Array diteruskan/di-assign by value
+        if isinstance(type_desc.element, ArrayType):
+            return f"[{self.copy_array('row', type_desc.element)} for row in {value}]"
+        return f"{value}[:]"
+
+    # ---------- Frame ----------
+
+    def gen_frame(self, block_index: int, declarations: Optional[ASTNode], body: Optional[ASTNode],
+                  param_count: int = 0):
+        # Inisialisasi variabel lokal, subprogram bersarang, lalu body
+        tab = self.symbol_table.tab
+        size = len(self.source_lines)
+        for index in self.block_variables(block_index)[param_count:]:
+            self.write(f"{self.name(index)} = {self.initial_value(tab[index].type_desc)}")
+        if declarations is not None:
+            for decl in declarations.children:
+                if isinstance(decl, (ProcedureDeclNode, FunctionDeclNode)):
+                    self.gen_subprogram(decl)
+        if body is not None:
+            trampoline(self.gen_statement(body))
+        if len(self.source_lines) == size:
+            self.write("pass")
+
+    def gen_subprogram(self, decl: ASTNode):
+        entry = self.symbol_table.tab[decl.tab_index]
+        block_index = entry.block_index
+        block = None
+        for child in decl.children:
+            if child.node_type == NodeKind.BLOCK:
+                block = child
+        if block is None:
+            raise CodegenError(f"Missing body for '{entry.name}'")
+        declarations = body = None
+        for child in block.children:
+            if child.node_type == NodeKind.DECLARATIONS:
+                declarations = child
+            elif child.node_type == NodeKind.COMPOUND_STATEMENT:
+                body = child
+
+        param_count = self.symbol_table.btab[block_index].param_count
+        params = self.block_variables(block_index)[:param_count]
+        outer_state = (self.level, self.function_tab)
+        self.level = entry.lev + 1
+        self.function_tab = decl.tab_index if isinstance(decl, FunctionDeclNode) else -1
+
+        token = self.first_token(decl)
+        if token is not None:
+            self.line = token.line
+        self.write(f"def {self.name(decl.tab_index)}({', '.join(self.name(index) for index in params)}):")
+        self.indent += 1
+        nonlocals = sorted(self.name(index) if index >= 0 else self.result_name(~index)
+                           for index in self.outer_assignments(body))
+        counted = decl.tab_index in self.counted
+        if counted:
+            nonlocals.insert(0, "_depth")
+        if nonlocals:
+            self.write(f"nonlocal {', '.join(nonlocals)}")
+        if counted:
+            # Kedalaman pemanggilan seperti CAL di VM (rekursi ekor tidak menambah
+            # frame); baris tanpa line map sehingga overflow dilaporkan di baris pemanggil
+            line, self.line = self.line, 0
+            self.write("_depth += 1")
+            self.write("if _depth > _max_depth:")
+            self.write("    _overflow()")
+            self.line = line
+        outer_tail_calls = self.tail_calls
+        self.tail_calls = tail_calls(body, decl.tab_index, self.function_tab >= 0)
+        if self.tail_calls:
+            # Setiap iterasi adalah satu aktivasi: hasil dan variabel lokal diinisialisasi ulang
+            self.write("while True:")
+            self.indent += 1
+        if self.function_tab >= 0:
+            self.write(f"{self.result_name(decl.tab_index)} = {repr(DEFAULT_VALUES.get(entry.type_desc.base, 0))}")
+        self.gen_frame(block_index, declarations, body, param_count)
+        if self.tail_calls:
+            self.write("break")
+            self.indent -= 1
+        if counted:
+            self.write("_depth -= 1")
+        if self.function_tab >= 0:
+            self.write(f"return {self.result_name(decl.tab_index)}")
+        self.indent -= 1
+        self.level, self.function_tab = outer_state
+        self.tail_calls = outer_tail_calls
+
+    def assignment_targets(self, root: Optional[ASTNode]) -> List[VariableNode]:
+        # Variabel yang di-assign (termasuk counter untuk dan argumen read)
+        targets = []
+        if root is None:
+            return targets
+
+        def assignment(node: ASTNode):
+            targets.append(node.children[0])
+
+        def procedure_call(node: ProcedureCallNode):
+            if node.procedure_name.lower() in ("read", "readln"):
+                targets.extend(child for child in node.children if isinstance(child, VariableNode))
+
+        walk(root, enter={NodeKind.ASSIGNMENT: assignment, NodeKind.FOR_STATEMENT: assignment,
+                          NodeKind.PROCEDURE_CALL: procedure_call})
+        return targets
+
+    def nonlocal_targets(self, declarations: Optional[ASTNode]) -> Set[int]:
+        # Variabel yang di-assign dari subprogram selain block pemiliknya
+        tab = self.symbol_table.tab
+        targets: Set[int] = set()
+        pending = [declarations] if declarations is not None else []
+        while pending:
+            for decl in pending.pop().children:
+                if not isinstance(decl, (ProcedureDeclNode, FunctionDeclNode)):
+                    continue
+                level = tab[decl.tab_index].lev + 1
+                for block in decl.children:
+                    if block.node_type != NodeKind.BLOCK:
+                        continue
+                    for child in block.children:
+                        if child.node_type == NodeKind.DECLARATIONS:
+                            pending.append(child)
+                            continue
+                        for target in self.assignment_targets(child):
+                            if (isinstance(target, VariableNode) and target.tab_index >= 0 and
+                                    tab[target.tab_index].lev != level):
+                                targets.add(target.tab_index)
+        return targets
+
+    def outer_assignments(self, body: Optional[ASTNode]) -> Set[int]:
+        # Nama frame luar yang di-rebind oleh body (hasil fungsi luar ditandai ~tab_index)
+        tab = self.symbol_table.tab
+        names = set()
+        for target in self.assignment_targets(body):
+            if not isinstance(target, VariableNode) or target.tab_index < 0 or target.index_expressions:
+                continue
+            entry = tab[target.tab_index]
+            if entry.obj == ObjType.FUNCTION:
+                if target.tab_index != self.function_tab:
+                    names.add(~target.tab_index)
+            elif entry.lev < self.level:
+                names.add(target.tab_index)
+        return names
+
+    # ---------- Statement ----------
+
+    def gen_empty(self, stmt: ASTNode):
+        return None
+
+    def gen_assignment(self, stmt: ASTNode) -> Generator:
+        target, value = stmt.children[0], stmt.children[1]
+        if not isinstance(target, VariableNode) or target.tab_index < 0:
+            raise CodegenError("Invalid assignment target", self.first_token(stmt))
+        entry = self.symbol_table.tab[target.tab_index]
+        if id(stmt) in self.tail_calls:
+            # F := F(...) di posisi ekor
+            return (yield self.gen_tail_call(target.tab_index, value.children))
+        if target.index_expressions:
+            # Seperti VM, indeks (dan cek batasnya) dievaluasi sebelum nilai;
+            # Python mengevaluasi ruas kanan lebih dulu, jadi offset disimpan ke
+            # temp jika ruas kanan bisa mengubah variabel indeks (pemanggilan
+            # fungsi) atau bisa error sebelum cek batas indeks
+            hoist = None
+            if not self.is_simple(value):
+                hoist = "all" if self.has_call(value) else "checked"
+            element = yield self.gen_element(target, hoist=hoist)
+            source = yield self.gen_expression(value)
+            if isinstance(target.type_desc, ArrayType):
+                source = self.copy_array(source, target.type_desc)
+            self.write(f"{element} = {source}")
+            return
+        source = yield self.gen_expression(value)
+        if entry.obj == ObjType.FUNCTION:
+            self.write(f"{self.result_name(target.tab_index)} = {source}")
+        elif isinstance(entry.type_desc, ArrayType):
+            self.write(f"{self.name(target.tab_index)} = {self.copy_array(source, entry.type_desc)}")
+        else:
+            self.write(f"{self.name(target.tab_index)} = {source}")
+
+    def gen_if(self, stmt: ASTNode) -> Generator:
+        condition = yield self.gen_expression(stmt.children[0])
+        self.write(f"if {condition}:")
+        yield self.gen_block(stmt.children[1] if len(stmt.children) > 1 else None)
+        if len(stmt.children) > 2:
+            self.write("else:")
+            yield self.gen_block(stmt.children[2])
+
+    def gen_block(self, stmt: Optional[ASTNode]) -> Generator:
+        # Body statement majemuk Python tidak boleh kosong
+        self.indent += 1
+        size = len(self.source_lines)
+        if stmt is not None:
+            yield self.gen_statement(stmt)
+        if len(self.source_lines) == size:
+            self.write("pass")
+        self.indent -= 1
+
+    def gen_while(self, stmt: ASTNode) -> Generator:
+        condition = yield self.gen_expression(stmt.children[0])
+        self.write(f"while {condition}:")
+        yield self.gen_block(stmt.children[1] if len(stmt.children) > 1 else None)
+
+    def gen_repeat(self, stmt: ASTNode) -> Generator:
+        self.write("while True:")
+        self.indent += 1
+        yield self.gen_statement(stmt.children[0])
+        condition = yield self.gen_expression(stmt.children[1])
+        self.write(f"if {condition}:")
+        self.write("    break")
+        self.indent -= 1
+
+    def gen_for(self, stmt: ForStatementNode) -> Generator:
+        counter = stmt.children[0]
+        if not isinstance(counter, VariableNode) or counter.tab_index < 0:
+            raise CodegenError("Invalid for-loop counter", stmt.token)
+        downward = stmt.direction == "turunke"
+        start = yield self.gen_expression(stmt.children[1])
+        end = yield self.gen_expression(stmt.children[2])
+        body = stmt.children[3] if len(stmt.children) > 3 else None
+        vector_loop = self.vector_assignment(counter, body)
+        if vector_loop is None:
+            yield self.gen_counted_loop(counter, start, end, downward, body)
+            return
+
+        # Loop vektor hanya jika seluruh rentang counter valid untuk semua larik;
+        # selain itu (loop kosong atau indeks keluar batas) loop skalar dijalankan
+        # supaya error dan isi larik sama persis dengan engine lain
+        start_name = self.temp("start")
+        end_name = self.temp("end")
+        self.write(f"{start_name} = {start}")
+        self.write(f"{end_name} = {end}")
+        first, last = (end_name, start_name) if downward else (start_name, end_name)
+        assignment, vector = vector_loop
+        target, value = assignment.children
+        arrays = [target]
+        self.vector_elements(value, arrays)
+        conditions = [f"{first} <= {last}"]
+        for low, high in sorted({self.array_bounds(array) for array in arrays}):
+            conditions.append(f"{low} <= {first} and {last} <= {high}")
+        self.write(f"if {' and '.join(conditions)}:")
+        self.indent += 1
+        index = self.temp("index")
+        source = yield self.gen_vector(value, counter.tab_index, index, first, last)
+        if index in source:
+            self.write(f"{index} = _np.arange({first}, {last} + 1)")
+        if vector:
+            self.write(f"{self.vector_slice(target, first, last)} = ({source}).tolist()")
+        else:
+            self.write(f"{self.vector_slice(target, first, last)} = [{source}] * ({last} - {first} + 1)")
+        self.write(f"{self.name(counter.tab_index)} = {end_name}")
+        self.indent -= 1
+        self.write("else:")
+        self.indent += 1
+        yield self.gen_counted_loop(counter, start_name, end_name, downward, body)
+        self.indent -= 1
+
+    def gen_counted_loop(self, counter: VariableNode, start: str, end: str, downward: bool,
+                         body: Optional[ASTNode]) -> Generator:
+        entry = self.symbol_table.tab[counter.tab_index]
+        name = self.name(counter.tab_index)
+
+        # range() hanya jika nilai counter tidak mungkin diubah selain oleh loop
+        # itu sendiri: counter integer lokal, tidak di-assign di body, dan tidak
+        # di-assign oleh subprogram lain (mis. prosedur bersarang)
+        assigned = {target.tab_index for target in self.assignment_targets(body)
+                    if isinstance(target, VariableNode)}
+        if (entry.lev == self.level and entry.type_desc.base == BaseType.INTEGER and
+                counter.tab_index not in assigned and counter.tab_index not in self.pinned):
+            stop = f"{end} - 1, -1" if downward else f"{end} + 1"
+            self.write(f"for {name} in range({start}, {stop}):")
+            yield self.gen_block(body)
+            return
+
+        # Semantik Pascal-S (F1U/F2U): counter hanya di-assign jika loop tidak
+        # kosong, batas akhir dievaluasi sekali, counter dibaca ulang setiap iterasi
+        start_name = self.temp("start")
+        end_name = self.temp("end")
+        self.write(f"{start_name} = {start}")
+        self.write(f"{end_name} = {end}")
+        self.write(f"if {start_name} {'>=' if downward else '<='} {end_name}:")
+        self.indent += 1
+        self.write(f"{name} = {start_name}")
+        self.write("while True:")
+        self.indent += 1
+        if body is not None:
+            yield self.gen_statement(body)
+        if downward:
+            self.write(f"if {name} - 1 < {end_name}:")
+        else:
+            self.write(f"if {name} + 1 > {end_name}:")
+        self.write("    break")
+        self.write(f"{name} {'-' if downward else '+'}= 1")
+        self.indent -= 2
+
+    # ---------- Loop vektor (NumPy) ----------
+
+    def vector_assignment(self, counter: VariableNode, body: Optional[ASTNode]) -> Optional[tuple]:
+        # Body berupa tepat satu "arr[i] := <ekspresi>" dengan arr larik real dan
+        # ekspresi hanya memakai konstanta, skalar, counter dan elemen larik real
+        # ber-indeks counter, sehingga tidak ada dependensi antar iterasi.
+        # Mengembalikan (assignment, True jika ekspresi memuat operand vektor)
+        if not self.use_numpy or body is None:
+            return None
+        entry = self.symbol_table.tab[counter.tab_index]
+        if entry.type_desc is None or entry.type_desc.base != BaseType.INTEGER:
+            return None
+        while body.node_type in (NodeKind.COMPOUND_STATEMENT, NodeKind.STATEMENT_LIST):
+            if len(body.children) != 1:
+                return None
+            body = body.children[0]
+        if body.node_type != NodeKind.ASSIGNMENT:
+            return None
+        target, value = body.children[0], body.children[1]
+        if not self.is_counter_element(target, counter.tab_index):
+            return None
+        # Post-order: jenis operand dihitung sebelum operatornya
+        kinds = {}
+        pending = [(value, False)]
+        while pending:
+            expr, visited = pending.pop()
+            if (not visited and expr.const_value is None and
+                    isinstance(expr, (BinaryExpressionNode, UnaryExpressionNode))):
+                pending.append((expr, True))
+                pending.extend((child, False) for child in expr.children)
+                continue
+            kind = self.vector_kind(expr, counter.tab_index, kinds)
+            if kind is None:
+                return None
+            kinds[id(expr)] = kind
+        # Hasil yang disimpan harus float, seperti hasil loop skalar
+        vector, certain, _ = kinds[id(value)]
+        return (body, vector) if certain else None
+
+    def vector_kind(self, expr: ASTNode, counter_index: int, kinds: dict) -> Optional[tuple]:
+        # (memuat operand vektor, pasti float, nilainya tepat di float64), atau
+        # None jika tidak bisa divektorkan. Elemen larik real dan variabel bisa
+        # berisi integer tak terbatas (seperti di VM), jadi operasi yang
+        # melibatkan vektor hanya boleh berupa +, -, * dengan operand yang pasti
+        # float (Python juga mengonversi operand integer ke float), atau / dengan
+        # kedua operand tepat di float64; pembagi harus konstanta bukan nol
+        # karena pembagian nol di NumPy tidak melempar error.
+        constant = expr.const_value
+        if constant is not None:
+            if isinstance(constant, bool) or not isinstance(constant, (int, float)):
+                return None
+            certain = isinstance(constant, float)
+            return (False, certain, certain or abs(constant) <= EXACT_FLOAT_INT)
+        if isinstance(expr, VariableNode):
+            if expr.index_expressions:
+                return (True, False, False) if self.is_counter_element(expr, counter_index) else None
+            if expr.tab_index == counter_index:
+                return (True, False, True)
+            if (expr.tab_index < 0 or self.symbol_table.tab[expr.tab_index].obj != ObjType.VARIABLE or
+                    expr.data_type not in (BaseType.INTEGER, BaseType.REAL)):
+                return None
+            return (False, False, False)
+        if isinstance(expr, UnaryExpressionNode):
+            if expr.operator not in ('-', '+'):
+                return None
+            return kinds[id(expr.children[0])]
+        if not isinstance(expr, BinaryExpressionNode):
+            return None
+        operator = expr.operator.lower()
+        if operator not in VECTOR_OPERATORS:
+            return None
+        left, right = kinds[id(expr.children[0])], kinds[id(expr.children[1])]
+        vector = left[0] or right[0]
+        if operator == '/':
+            divisor = expr.children[1].const_value
+            if isinstance(divisor, bool) or not isinstance(divisor, (int, float)) or divisor == 0:
+                return None
+            if vector and not (left[2] and right[2]):
+                return None
+            return (vector, True, True)
+        certain = left[1] or right[1]
+        if vector and not certain:
+            return None
+        return (vector, certain, certain)
+
+    def is_counter_element(self, var: ASTNode, counter_index: int) -> bool:
+        # arr[i] dengan arr larik ndarray dan i counter loop
+        if not isinstance(var, VariableNode) or var.tab_index < 0 or len(var.index_expressions or ()) != 1:
+            return False
+        entry = self.symbol_table.tab[var.tab_index]
+        index = var.index_expressions[0]
+        return (entry.obj == ObjType.VARIABLE and self.is_vector(entry.type_desc) and
+                isinstance(index, VariableNode) and not index.index_expressions and
+                index.tab_index == counter_index)
+
+    def vector_elements(self, expr: ASTNode, arrays: List[VariableNode]):
+        pending = [expr]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, VariableNode) and node.index_expressions:
+                arrays.append(node)
+            elif node.const_value is None:
+                pending.extend(node.children or ())
+
+    def array_bounds(self, var: VariableNode) -> tuple:
+        type_desc = self.symbol_table.tab[var.tab_index].type_desc
+        return type_desc.low, type_desc.high
+
+    def vector_slice(self, var: VariableNode, first: str, last: str) -> str:
+        low, _ = self.array_bounds(var)
+        return f"{self.name(var.tab_index)}[{shift(first, -low)}:{shift(last, 1 - low)}]"
+
+    def gen_vector(self, expr: ASTNode, counter_index: int, index: str, first: str, last: str) -> Generator:
+        # Ekspresi elemen per elemen atas rentang first..last; elemen larik
+        # dibaca sebagai salinan float64 dari slice list
+        if expr.const_value is not None:
+            return self.gen_constant(expr)
+        if isinstance(expr, VariableNode):
+            if expr.index_expressions:
+                return f"_np.array({self.vector_slice(expr, first, last)}, _np.float64)"
+            return index if expr.tab_index == counter_index else self.name(expr.tab_index)
+        if isinstance(expr, UnaryExpressionNode):
+            operand = yield self.gen_vector(expr.children[0], counter_index, index, first, last)
+            return f"(-{operand})" if expr.operator == '-' else operand
+        left = yield self.gen_vector(expr.children[0], counter_index, index, first, last)
+        right = yield self.gen_vector(expr.children[1], counter_index, index, first, last)
+        return f"({left} {VECTOR_OPERATORS[expr.operator.lower()]} {right})"
+
+    def gen_case(self, stmt: RuleNode) -> Generator:
+        selector = yield self.gen_expression(stmt.children[1])
+        selector_name = self.temp("case")
+        self.write(f"{selector_name} = {selector}")
+        keyword = "if"
+        for element in stmt.children[2:]:
+            if not (isinstance(element, RuleNode) and element.rule == "<case-element>"):
+                continue
+            constants, body = element.children[0], element.children[-1]
+            values = []
+            for constant in constants.children:
+                if isinstance(constant, RuleNode):
+                    continue    # COMMA
+                value = yield self.gen_expression(constant)
+                values.append(f"{selector_name} == {value}")
+            self.write(f"{keyword} {' or '.join(values) or 'False'}:")
+            yield self.gen_block(body)
+            keyword = "elif"
+
+    def gen_procedure_call(self, stmt: ProcedureCallNode) -> Generator:
+        name = stmt.procedure_name.lower()
+        tab_index = stmt.tab_index
+        if name in BUILTIN_PROCEDURES and (tab_index < self.symbol_table.user_id_start or
+                                           self.symbol_table.tab[tab_index].name.lower() != name):
+            yield self.gen_builtin(name, stmt)
+            return
+        if tab_index < 0:
+            raise CodegenError(f"Undefined procedure '{stmt.procedure_name}'", self.first_token(stmt))
+        self.check_argument_count(tab_index, stmt.children, stmt)
+        if id(stmt) in self.tail_calls:
+            return (yield self.gen_tail_call(tab_index, stmt.children))
+        call = yield self.gen_call(tab_index, stmt.children)
+        self.write(call)
+
+    def gen_builtin(self, name: str, stmt: ProcedureCallNode) -> Generator:
+        if name in ("read", "readln"):
+            for arg in stmt.children:
+                if not isinstance(arg, VariableNode) or arg.tab_index < 0:
+                    raise CodegenError(f"Argument of {name} must be a variable", self.first_token(arg))
+                base_type = (arg.type_desc or primitive(arg.data_type)).base.value
+                target = (yield self.gen_element(arg)) if arg.index_expressions else self.name(arg.tab_index)
+                self.write(f"{target} = _input.read_value({base_type})")
+            if name == "readln":
+                self.write("_input.read_line()")
+            return
+
+        # Argumen digabung menjadi satu _write, kecuali argumen yang bisa punya
+        # efek samping atau error (pemanggilan fungsi, indeks, pembagian):
+        # argumen sebelumnya ditulis lebih dulu, seperti urutan di VM
+        parts = []
+        for arg in stmt.children:
+            if isinstance(arg.type_desc, ArrayType) and not arg.index_expressions:
+                raise CodegenError("Cannot write an array", self.first_token(arg))
+            if isinstance(arg, StringNode):
+                parts.append(repr(string_value(arg.value)))
+                continue
+            if parts and not self.is_simple(arg):
+                self.write(f"_write({' + '.join(parts)})")
+                parts = []
+            value = yield self.gen_expression(arg)
+            if arg.data_type == BaseType.STRING or arg.data_type == BaseType.CHAR:
+                parts.append(value)
+            elif arg.data_type in _STR_TYPES:
+                parts.append(f"str({value})")
+            else:
+                parts.append(f"_fmt({value})")
+        if name == "writeln":
+            parts.append(repr("\n"))
+        if parts:
+            self.write(f"_write({' + '.join(parts)})")
+
+    def gen_call(self, tab_index: int, args: List[ASTNode]) -> Generator:
+        values = yield self.gen_arguments(args)
+        return f"{self.name(tab_index)}({', '.join(values)})"
+
+    def gen_arguments(self, args: List[ASTNode]) -> Generator:
+        values = []
+        for arg in args:
+            value = yield self.gen_expression(arg)
+            if isinstance(arg.type_desc, ArrayType) and not (isinstance(arg, VariableNode) and arg.index_expressions):
+                value = self.copy_array(value, arg.type_desc)
+            values.append(value)
+        return values
+
+    def gen_tail_call(self, tab_index: int, args: List[ASTNode]) -> Generator:
+        # Semua argumen dievaluasi sebelum parameter ditimpa (assignment tuple)
+        values = yield self.gen_arguments(args)
+        block_index = self.symbol_table.tab[tab_index].block_index
+        params = self.block_variables(block_index)[:self.symbol_table.btab[block_index].param_count]
+        if params:
+            self.write(f"{', '.join(self.name(index) for index in params)} = {', '.join(values)}")
+        self.write("continue")
+
+    # ---------- Ekspresi ----------
+
+    def gen_expression(self, expr: ASTNode) -> Union[Generator, str]:
+        if expr.const_value is not None and not isinstance(expr, StringNode):
+            return self.gen_constant(expr)
+        handler = (self.expression_handlers.get(expr.__class__) or
+                   self.expression_handlers.get(expr.node_type))
+        if handler is None:
+            raise CodegenError(f"Cannot generate code for {expr.node_type.label}", self.first_token(expr))
+        return handler(expr)
+
+    def gen_constant(self, expr: ASTNode) -> str:
+        value = expr.const_value
+        if value is None:
+            value = expr.value
+        if isinstance(value, str) and expr.data_type == BaseType.STRING:
+            value = string_value(value)
+        return repr(value)
+
+    def gen_string(self, expr: StringNode) -> str:
+        return repr(string_value(expr.value))
+
+    def gen_variable(self, expr: VariableNode) -> Union[Generator, str]:
+        if expr.tab_index < 0:
+            raise CodegenError(f"Undefined variable '{expr.identifier}'", expr.token)
+        entry = self.symbol_table.tab[expr.tab_index]
+        if entry.obj == ObjType.FUNCTION:
+            self.check_argument_count(expr.tab_index, [], expr)
+            return self.gen_call(expr.tab_index, [])
+        if expr.index_expressions:
+            return self.gen_element(expr)
+        return self.name(expr.tab_index)
+
+    def gen_element(self, var: VariableNode, hoist: Optional[str] = None) -> Generator:
+        # Indeks dicek inline jika ekspresinya sederhana (variabel/konstanta) dan
+        # tidak dicek sama sekali jika range analysis membuktikannya dalam batas
+        element = self.name(var.tab_index)
+        for index_expr, array_ref, safe in self.index_arrays(var):
+            array = self.symbol_table.atab[array_ref]
+            low, high = array.low, array.high
+            index = yield self.gen_expression(index_expr)
+            constant = index_expr.const_value
+            if isinstance(constant, int) and not isinstance(constant, bool) and low <= constant <= high:
+                offset = repr(constant - low)
+            elif safe:
+                offset = shift(index, -low)
+            elif self.is_simple(index_expr):
+                offset = f"{shift(index, -low)} if {low} <= {index} <= {high} else _bounds({index}, {low}, {high})"
+            else:
+                offset = f"_index({index}, {low}, {high})"
+            # "checked": hanya offset yang bisa error (cek batas atau ekspresi indeks)
+            checked = not (safe and self.is_simple(index_expr))
+            if not offset.isdigit() and (hoist == "all" or hoist == "checked" and checked):
+                temp = self.temp("offset")
+                self.write(f"{temp} = {offset}")
+                offset = temp
+            element = f"{element}[{offset}]"
+        return element
+
+    def has_call(self, expr: ASTNode) -> bool:
+        pending = [expr]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, FunctionCallNode):
+                return True
+            if isinstance(node, VariableNode):
+                if node.tab_index >= 0 and self.symbol_table.tab[node.tab_index].obj == ObjType.FUNCTION:
+                    return True
+                pending.extend(node.index_expressions or ())
+            pending.extend(node.children or ())
+        return False
+
+    def is_simple(self, expr: ASTNode) -> bool:
+        return ((isinstance(expr, VariableNode) and not expr.index_expressions and expr.tab_index >= 0 and
+                 self.symbol_table.tab[expr.tab_index].obj != ObjType.FUNCTION) or
+                expr.const_value is not None)
+
+    def gen_function_call(self, expr: FunctionCallNode) -> Generator:
+        if expr.tab_index is None or expr.tab_index < 0:
+            raise CodegenError(f"Undefined function '{expr.function_name}'", self.first_token(expr))
+        self.check_argument_count(expr.tab_index, expr.children, expr)
+        return self.gen_call(expr.tab_index, expr.children)
+
+    def gen_binary(self, expr: BinaryExpressionNode) -> Generator:
+        operator = expr.operator.lower()
+        left = yield self.gen_expression(expr.children[0])
+        right = yield self.gen_expression(expr.children[1])
+        if operator in ('bagi', 'mod'):
+            helper, inline = ("_div", "//") if operator == 'bagi' else ("_mod", "%")
+            if self.is_simple(expr.children[0]) and self.is_simple(expr.children[1]):
+                # Untuk operand non-negatif, // dan % Python sama dengan bagi/mod Pascal
+                return f"({left} {inline} {right} if {left} >= 0 and {right} > 0 else {helper}({left}, {right}))"
+            return f"{helper}({left}, {right})"
+        op = PY_OPERATORS.get(operator)
+        if op is None:
+            raise CodegenError(f"Unknown operator '{expr.operator}'", self.first_token(expr))
+        return f"({left} {op} {right})"
+
+    def gen_unary(self, expr: UnaryExpressionNode) -> Generator:
+        operand = yield self.gen_expression(expr.children[0])
+        return f"(-{operand})" if expr.operator == '-' else operand
+
+    def gen_not(self, expr: ASTNode) -> Generator:
+        operand = yield self.gen_expression(expr.children[0])
+        return f"(not {operand})"
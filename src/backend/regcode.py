@@ -0,0 +1,130 @@
+from __future__ import annotations
+from typing import Any, List, Tuple
+from enum import IntEnum
+
+# Bytecode register untuk backend.
+# Setiap aktivasi prosedur/fungsi punya register file sendiri berupa list:
+# layout-nya sama dengan frame p-code (header, parameter, variabel lokal sesuai
+# adr di tab), diikuti register sementara. Register konstanta diletakkan di
+# ujung list dan dialamati dengan index negatif (-1, -2, ...), sehingga alokasi
+# konstanta tidak bertabrakan dengan register sementara.
+# Instruksi berupa tuple (op, a, b, c). Register frame aktif langsung dipakai
+# sebagai operand; variabel frame lain (global atau frame lexical luar) diakses
+# lewat display[level] dengan LDX/STX.
+
+class ROp(IntEnum):
+    # Pemindahan data
+    MOV = 0     # r[a] = r[b]
+    LDX = 1     # r[a] = display[b][c]
+    STX = 2     # display[a][b] = r[c]
+    ELA = 3     # r[a] = alamat elemen pertama dimensi: c = (base, low, high, size), indeks r[b]
+    ELN = 4     # r[a] += offset dimensi berikutnya: c = (low, high, size), indeks r[b]
+    LDE = 5     # r[a] = display[b][r[c]]
+    STE = 6     # display[a][r[b]] = r[c]
+    CPY = 7     # salin blok: a = (level, offset) tujuan, b = (level, offset) sumber, c = ukuran
+    # Aritmetika dan logika: r[a] = r[b] <op> r[c]
+    ADD = 8
+    SUB = 9
+    MUL = 10
+    DVD = 11
+    DIV = 12
+    MOD = 13
+    AND = 14
+    OR = 15
+    EQ = 16
+    NE = 17
+    LT = 18
+    LE = 19
+    GT = 20
+    GE = 21
+    NEG = 22    # r[a] = -r[b]
+    NOT = 23    # r[a] = not r[b]
+    # Superinstruction
+    ADDK = 24   # r[a] = r[b] + c (c konstanta langsung)
+    INC = 25    # r[a] += b (assignment "x := x + k" / "x := x - k")
+    # Kontrol alur
+    JMP = 26    # lompat ke a
+    JF = 27     # lompat ke b jika r[a] salah
+    JT = 28     # lompat ke b jika r[a] benar
+    JEQ = 29    # compare-and-branch: lompat ke c jika r[a] <rel> r[b]
+    JNE = 30
+    JLT = 31
+    JLE = 32
+    JGT = 33
+    JGE = 34
+    FRU = 35    # akhir iterasi "ke": r[a] + 1 <= r[b] -> r[a] += 1, lompat ke c
+    FRD = 36    # akhir iterasi "turunke": r[a] - 1 >= r[b] -> r[a] -= 1, lompat ke c
+    # Pemanggilan
+    CAL = 37    # panggil prosedur b; argumen di r[c...]; hasil fungsi ke r[a] (a < 0: dibuang)
+    RET = 38
+    # I/O
+    WRT = 39    # tulis r[a]
+    WRL = 40
+    RED = 41    # baca nilai bertipe b (nilai BaseType) ke r[a]
+    RDL = 42
+    HLT = 43
+    # Instrumentasi (hanya di kode hasil count_statements=True)
+    STM = 44
+    # Pemanggilan diri sendiri di posisi ekor: register file aktif diisi ulang
+    # dari template prosedur b dengan argumen r[c...], lalu lompat ke awal body
+    TCL = 45
+
+
+# Pasangan relasi dan kebalikannya untuk compare-and-branch
+BRANCH_OPS = {
+    '=': (ROp.JEQ, ROp.JNE), '<>': (ROp.JNE, ROp.JEQ),
+    '<': (ROp.JLT, ROp.JGE), '>=': (ROp.JGE, ROp.JLT),
+    '>': (ROp.JGT, ROp.JLE), '<=': (ROp.JLE, ROp.JGT),
+}
+
+RegInstruction = Tuple[int, Any, Any, Any]
+
+
+class RegProcInfo:
+    __slots__ = ("name", "entry", "level", "param_size", "template")
+
+    def __init__(self, name: str, entry: int, level: int, param_size: int, template: List[Any]):
+        self.name = name
+        self.entry = entry
+        self.level = level
+        self.param_size = param_size
+        self.template = template          # Isi awal register file (disalin setiap CAL)
+
+    def as_tuple(self) -> tuple:
+        return (self.entry, self.level, self.param_size, self.template)
+
+
+class RegProgram:
+    # Jenis dan versi artifact .pasc; naikkan versi jika instruction set atau codegen berubah
+    ARTIFACT_KIND = "register"
+    ARTIFACT_VERSION = "1"
+
+    def __init__(self, name: str, code: List[RegInstruction], lines: List[int],
+                 procs: List[RegProcInfo], entry: int, globals: List[Any], max_level: int):
+        self.name = name
+        self.code = code
+        self.lines = lines
+        self.procs = procs          # Diindex oleh operand CAL
+        self.entry = entry
+        self.globals = globals      # Isi awal register file global (frame level 0)
+        self.max_level = max_level
+
+    def to_artifact(self) -> tuple:
+        procs = [(proc.name, proc.entry, proc.level, proc.param_size, proc.template) for proc in self.procs]
+        return (self.name, self.code, self.lines, procs, self.entry, self.globals, self.max_level)
+
+    @classmethod
+    def from_artifact(cls, data: tuple) -> RegProgram:
+        name, code, lines, procs, entry, globals, max_level = data
+        return cls(name, code, lines, [RegProcInfo(*proc) for proc in procs], entry, globals, max_level)
+
+    def disassemble(self) -> str:
+        labels = {proc.entry: proc.name for proc in self.procs}
+        labels.setdefault(self.entry, self.name)
+        lines = []
+        for pc, (op, a, b, c) in enumerate(self.code):
+            if pc in labels:
+                lines.append(f"{labels[pc]}:")
+            operands = ", ".join(repr(operand) for operand in (a, b, c) if operand is not None)
+            lines.append(f"  {pc:5}  {ROp(op).name:4} {operands}".rstrip())
+        return "\n".join(lines)
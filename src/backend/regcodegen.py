@@ -0,0 +1,563 @@
+from __future__ import annotations
+from typing import Any, Dict, Generator, List, Optional, Union
+from src.semantic_analyzer.symbol_table import SymbolTable, ObjType, BaseType
+from src.semantic_analyzer.type_descriptors import ArrayType, primitive
+from src.semantic_analyzer.ast_nodes import *
+from src.semantic_analyzer.traversal import trampoline
+from .pcode import FRAME_HEADER, FRAME_RESULT
+from .codegen import CodeGenerator, CodegenError, BUILTIN_PROCEDURES, DEFAULT_VALUES, string_value, tail_calls
+from .regcode import ROp, RegProcInfo, RegProgram, BRANCH_OPS
+
+# Code generator untuk VM register.
+# Layout frame (offset variabel, ukuran parameter, nilai awal) sama dengan
+# CodeGenerator p-code; bedanya variabel frame aktif langsung dipakai sebagai
+# operand instruksi sehingga tidak ada push/pop. Handler ekspresi menerima
+# register tujuan opsional (target) dan mengembalikan register berisi hasil.
+# Pola yang sering muncul dipadatkan menjadi superinstruction:
+#   x := x + k            -> INC x, k
+#   a + k / a - k         -> ADDK
+#   jika/selama a <rel> b -> compare-and-branch (JLT, JGE, ...)
+#   untuk ... ke/turunke  -> FRU/FRD (increment, test dan lompat dalam satu instruksi)
+
+ARITHMETIC_OPS = {
+    '+': ROp.ADD, '-': ROp.SUB, '*': ROp.MUL, '/': ROp.DVD, 'bagi': ROp.DIV, 'mod': ROp.MOD,
+    'dan': ROp.AND, 'atau': ROp.OR,
+    '=': ROp.EQ, '<>': ROp.NE, '<': ROp.LT, '<=': ROp.LE, '>': ROp.GT, '>=': ROp.GE,
+}
+
+# Posisi operand target lompatan per opcode (untuk patch)
+_JUMP_OPERAND = {ROp.JMP: 0, ROp.JF: 1, ROp.JT: 1}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class RegisterCodeGenerator(CodeGenerator):
+    STATEMENT_MARKER = ROp.STM
+
+    def __init__(self, symbol_table: SymbolTable, count_statements: bool = False):
+        super().__init__(symbol_table, count_statements)
+        self.templates: Dict[int, List[Any]] = {}   # Nomor prosedur -> isi awal register file
+        self.level = 0
+        self.frame_size = 0
+        # Register sementara dialokasikan seperti stack di atas variabel frame
+        self.temp_top = 0
+        self.temp_max = 0
+        self.constants: Dict[tuple, int] = {}
+        self.constant_values: List[Any] = []
+
+        self.statement_handlers.update({
+            NodeKind.ASSIGNMENT: self.gen_assignment,
+            NodeKind.PROCEDURE_CALL: self.gen_procedure_call,
+            NodeKind.IF_STATEMENT: self.gen_if,
+            NodeKind.WHILE_STATEMENT: self.gen_while,
+            NodeKind.FOR_STATEMENT: self.gen_for,
+            NodeKind.REPEAT_STATEMENT: self.gen_repeat,
+        })
+        self.expression_handlers.update({
+            NumberNode: self.gen_constant,
+            BooleanNode: self.gen_constant,
+            ConstantNode: self.gen_constant,
+            StringNode: self.gen_string,
+            VariableNode: self.gen_variable,
+            FunctionCallNode: self.gen_function_call,
+            BinaryExpressionNode: self.gen_binary,
+            UnaryExpressionNode: self.gen_unary,
+            NodeKind.NOT_EXPRESSION: self.gen_not,
+        })
+
+    def generate(self, program: ProgramNode) -> RegProgram:
+        self.reject_records(program)
+        self.layout_frames()
+        main_body = None
+        for child in program.children:
+            if child.node_type == NodeKind.DECLARATIONS:
+                self.gen_subprograms(child)
+            elif child.node_type == NodeKind.COMPOUND_STATEMENT:
+                main_body = child
+
+        self.begin_frame(0, FRAME_HEADER + self.symbol_table.btab[0].vsze)
+        entry = len(self.code)
+        if main_body is not None:
+            trampoline(self.gen_statement(main_body))
+        self.emit(ROp.HLT)
+        globals = self.end_frame([0] * FRAME_HEADER + self.frame_locals(0, 0))
+
+        procs = []
+        for proc_id, proc in enumerate(self.procs):
+            if proc.entry < 0:
+                raise CodegenError(f"Missing body for '{proc.name}'")
+            procs.append(RegProcInfo(proc.name, proc.entry, proc.level, proc.param_size,
+                                     self.templates[proc_id]))
+        return RegProgram(program.name, self.code, self.lines, procs, entry, globals, self.max_level)
+
+    # ---------- Register ----------
+
+    def begin_frame(self, level: int, frame_size: int):
+        self.level = level
+        self.frame_size = frame_size
+        self.temp_top = self.temp_max = frame_size
+        self.constants = {}
+        self.constant_values = []
+
+    def end_frame(self, cells: List[Any]) -> List[Any]:
+        # Register file: frame p-code, register sementara, lalu konstanta (index negatif)
+        return cells + [0] * (self.temp_max - len(cells)) + self.constant_values[::-1]
+
+    def new_temp(self) -> int:
+        register = self.temp_top
+        self.temp_top += 1
+        if self.temp_top > self.temp_max:
+            self.temp_max = self.temp_top
+        return register
+
+    def constant(self, value: Any) -> int:
+        # Kunci menyertakan tipe supaya benar/1 dan 1/1.0 tidak berbagi register
+        key = (type(value), value)
+        register = self.constants.get(key)
+        if register is None:
+            self.constant_values.append(value)
+            register = -len(self.constant_values)
+            self.constants[key] = register
+        return register
+
+    def move(self, register: int, target: Optional[int]) -> int:
+        if target is None or target == register:
+            return register
+        self.emit(ROp.MOV, target, register)
+        return target
+
+    def result_register(self, target: Optional[int]) -> int:
+        return target if target is not None else self.new_temp()
+
+    def is_local(self, tab_index: int) -> bool:
+        return self.symbol_table.tab[tab_index].lev == self.level
+
+    # ---------- Emit ----------
+
+    def emit(self, op: ROp, a: Any = None, b: Any = None, c: Any = None) -> int:
+        self.code.append((int(op), a, b, c))
+        self.lines.append(self.line)
+        return len(self.code) - 1
+
+    def patch(self, pc: int, target: int):
+        instruction = list(self.code[pc])
+        instruction[1 + _JUMP_OPERAND.get(instruction[0], 2)] = target
+        self.code[pc] = tuple(instruction)
+
+    # ---------- Subprogram ----------
+
+    def gen_subprogram(self, decl: ASTNode):
+        block = None
+        for child in decl.children:
+            if child.node_type == NodeKind.BLOCK:
+                block = child
+        if block is None:
+            raise CodegenError(f"Missing body for '{self.symbol_table.tab[decl.tab_index].name}'")
+
+        body = None
+        for child in block.children:
+            if child.node_type == NodeKind.DECLARATIONS:
+                self.gen_subprograms(child)
+            elif child.node_type == NodeKind.COMPOUND_STATEMENT:
+                body = child
+
+        proc_id = self.proc_id(decl.tab_index)
+        proc = self.procs[proc_id]
+        self.begin_frame(proc.level, proc.frame_size)
+        proc.entry = len(self.code)
+        if body is not None:
+            self.tail_calls = tail_calls(body, decl.tab_index, isinstance(decl, FunctionDeclNode))
+            trampoline(self.gen_statement(body))
+            self.tail_calls = set()
+        self.emit(ROp.RET)
+
+        entry = self.symbol_table.tab[decl.tab_index]
+        header = [0] * FRAME_HEADER
+        if isinstance(decl, FunctionDeclNode):
+            header[FRAME_RESULT] = DEFAULT_VALUES.get(entry.type_desc.base, 0)
+        self.templates[proc_id] = self.end_frame(header + [0] * proc.param_size + proc.locals)
+
+    # ---------- Statement ----------
+
+    def gen_assignment(self, stmt: ASTNode) -> Generator:
+        target, value = stmt.children[0], stmt.children[1]
+        if not isinstance(target, VariableNode) or target.tab_index < 0:
+            raise CodegenError("Invalid assignment target", self.first_token(stmt))
+        entry = self.symbol_table.tab[target.tab_index]
+        mark = self.temp_top
+
+        if id(stmt) in self.tail_calls:
+            # F := F(...) di posisi ekor
+            yield self.gen_tail_call(target.tab_index, value.children)
+        elif entry.obj == ObjType.FUNCTION:
+            if entry.lev + 1 == self.level:
+                yield self.gen_expression(value, FRAME_RESULT)
+            else:
+                register = yield self.gen_expression(value)
+                self.emit(ROp.STX, entry.lev + 1, FRAME_RESULT, register)
+        elif target.index_expressions:
+            if isinstance(target.type_desc, ArrayType):
+                raise CodegenError("Array element of array type cannot be assigned", self.first_token(stmt))
+            level, address = yield self.gen_element_address(target)
+            register = yield self.gen_expression(value)
+            self.emit(ROp.STE, level, address, register)
+        elif isinstance(entry.type_desc, ArrayType):
+            self.gen_array_copy((entry.lev, self.offsets[target.tab_index]), value, entry.type_desc.size)
+        elif self.is_local(target.tab_index):
+            offset = self.offsets[target.tab_index]
+            register = yield self.gen_expression(value, offset)
+            self.move(register, offset)
+        else:
+            register = yield self.gen_expression(value)
+            self.emit(ROp.STX, entry.lev, self.offsets[target.tab_index], register)
+        self.temp_top = mark
+
+    def gen_array_copy(self, destination: tuple, value: ASTNode, size: int):
+        if not (isinstance(value, VariableNode) and value.tab_index >= 0 and not value.index_expressions):
+            raise CodegenError("Array value must be an array variable", self.first_token(value))
+        source = self.symbol_table.tab[value.tab_index]
+        self.emit(ROp.CPY, destination, (source.lev, self.offsets[value.tab_index]), size)
+
+    def gen_branch(self, cond: ASTNode, when: bool) -> Generator:
+        # Emit lompatan yang diambil jika nilai cond == when; mengembalikan pc
+        # instruksi lompatan untuk di-patch
+        mark = self.temp_top
+        if (isinstance(cond, BinaryExpressionNode) and cond.const_value is None and
+                cond.operator in BRANCH_OPS):
+            left = yield self.gen_left_operand(cond.children[0], cond.children[1])
+            right = yield self.gen_expression(cond.children[1])
+            jump_true, jump_false = BRANCH_OPS[cond.operator]
+            pc = self.emit(jump_true if when else jump_false, left, right)
+        elif cond.node_type == NodeKind.NOT_EXPRESSION and cond.const_value is None:
+            pc = yield self.gen_branch(cond.children[0], not when)
+        else:
+            register = yield self.gen_expression(cond)
+            pc = self.emit(ROp.JT if when else ROp.JF, register)
+        self.temp_top = mark
+        return pc
+
+    def gen_if(self, stmt: ASTNode) -> Generator:
+        jump_else = yield self.gen_branch(stmt.children[0], False)
+        if len(stmt.children) > 1:
+            yield self.gen_statement(stmt.children[1])
+        if len(stmt.children) > 2:
+            jump_end = self.emit(ROp.JMP)
+            self.patch(jump_else, len(self.code))
+            yield self.gen_statement(stmt.children[2])
+            self.patch(jump_end, len(self.code))
+        else:
+            self.patch(jump_else, len(self.code))
+
+    def gen_while(self, stmt: ASTNode) -> Generator:
+        # Kondisi diletakkan setelah body sehingga setiap iterasi hanya
+        # menjalankan satu compare-and-branch
+        jump_test = self.emit(ROp.JMP)
+        body = len(self.code)
+        if len(stmt.children) > 1:
+            yield self.gen_statement(stmt.children[1])
+        self.patch(jump_test, len(self.code))
+        jump_body = yield self.gen_branch(stmt.children[0], True)
+        self.patch(jump_body, body)
+
+    def gen_repeat(self, stmt: ASTNode) -> Generator:
+        body = len(self.code)
+        yield self.gen_statement(stmt.children[0])
+        jump_body = yield self.gen_branch(stmt.children[1], False)
+        self.patch(jump_body, body)
+
+    def gen_for(self, stmt: ForStatementNode) -> Generator:
+        counter = stmt.children[0]
+        if not isinstance(counter, VariableNode) or counter.tab_index < 0:
+            raise CodegenError("Invalid for-loop counter", stmt.token)
+        downward = stmt.direction == "turunke"
+        entry = self.symbol_table.tab[counter.tab_index]
+        offset = self.offsets[counter.tab_index]
+        mark = self.temp_top
+
+        start = yield self.gen_expression(stmt.children[1])
+        end_expr = stmt.children[2]
+        # Batas akhir dievaluasi sekali; variabel disalin karena body boleh mengubahnya
+        if end_expr.const_value is not None and not isinstance(end_expr, StringNode):
+            end = yield self.gen_expression(end_expr)
+        else:
+            end = self.new_temp()
+            end = yield self.gen_expression(end_expr, end)
+        jump_end = self.emit(ROp.JLT if downward else ROp.JGT, start, end)
+        step = ROp.FRD if downward else ROp.FRU
+
+        if self.is_local(counter.tab_index):
+            self.emit(ROp.MOV, offset, start)
+            body = len(self.code)
+            if len(stmt.children) > 3:
+                yield self.gen_statement(stmt.children[3])
+            self.emit(step, offset, end, body)
+        else:
+            # Counter di frame lain: iterasi memakai register sementara
+            register = self.new_temp()
+            self.emit(ROp.MOV, register, start)
+            body = self.emit(ROp.STX, entry.lev, offset, register)
+            if len(stmt.children) > 3:
+                yield self.gen_statement(stmt.children[3])
+            self.emit(ROp.LDX, register, entry.lev, offset)
+            self.emit(step, register, end, body)
+        self.patch(jump_end, len(self.code))
+        self.temp_top = mark
+
+    def gen_case(self, stmt: RuleNode) -> Generator:
+        mark = self.temp_top
+        selector = yield self.gen_expression(stmt.children[1])
+        jump_ends = []
+        for element in stmt.children[2:]:
+            if not (isinstance(element, RuleNode) and element.rule == "<case-element>"):
+                continue
+            constants, body = element.children[0], element.children[-1]
+            jump_bodies = []
+            for constant in constants.children:
+                if isinstance(constant, RuleNode):
+                    continue    # COMMA
+                register = yield self.gen_expression(constant)
+                jump_bodies.append(self.emit(ROp.JEQ, selector, register))
+            jump_next = self.emit(ROp.JMP)
+            for jump in jump_bodies:
+                self.patch(jump, len(self.code))
+            yield self.gen_statement(body)
+            jump_ends.append(self.emit(ROp.JMP))
+            self.patch(jump_next, len(self.code))
+        for jump in jump_ends:
+            self.patch(jump, len(self.code))
+        self.temp_top = mark
+
+    def gen_procedure_call(self, stmt: ProcedureCallNode) -> Generator:
+        name = stmt.procedure_name.lower()
+        tab_index = stmt.tab_index
+        if name in BUILTIN_PROCEDURES and (tab_index < self.symbol_table.user_id_start or
+                                           self.symbol_table.tab[tab_index].name.lower() != name):
+            yield self.gen_builtin(name, stmt)
+            return
+        if tab_index < 0:
+            raise CodegenError(f"Undefined procedure '{stmt.procedure_name}'", self.first_token(stmt))
+        self.check_argument_count(tab_index, stmt.children, stmt)
+        mark = self.temp_top
+        if id(stmt) in self.tail_calls:
+            yield self.gen_tail_call(tab_index, stmt.children)
+        else:
+            yield self.gen_call(tab_index, stmt.children, None, discard=True)
+        self.temp_top = mark
+
+    def gen_builtin(self, name: str, stmt: ProcedureCallNode) -> Generator:
+        for arg in stmt.children:
+            mark = self.temp_top
+            if name in ("read", "readln"):
+                yield self.gen_read(name, arg)
+            else:
+                if isinstance(arg.type_desc, ArrayType) and not arg.index_expressions:
+                    raise CodegenError("Cannot write an array", self.first_token(arg))
+                register = yield self.gen_expression(arg)
+                self.emit(ROp.WRT, register)
+            self.temp_top = mark
+        if name == "readln":
+            self.emit(ROp.RDL)
+        elif name == "writeln":
+            self.emit(ROp.WRL)
+
+    def gen_read(self, name: str, arg: ASTNode) -> Generator:
+        if not isinstance(arg, VariableNode) or arg.tab_index < 0:
+            raise CodegenError(f"Argument of {name} must be a variable", self.first_token(arg))
+        base_type = (arg.type_desc or primitive(arg.data_type)).base.value
+        entry = self.symbol_table.tab[arg.tab_index]
+        if arg.index_expressions:
+            level, address = yield self.gen_element_address(arg)
+            register = self.new_temp()
+            self.emit(ROp.RED, register, base_type)
+            self.emit(ROp.STE, level, address, register)
+        elif self.is_local(arg.tab_index):
+            self.emit(ROp.RED, self.offsets[arg.tab_index], base_type)
+        else:
+            register = self.new_temp()
+            self.emit(ROp.RED, register, base_type)
+            self.emit(ROp.STX, entry.lev, self.offsets[arg.tab_index], register)
+
+    def gen_call(self, tab_index: int, args: List[ASTNode], target: Optional[int] = None,
+                 discard: bool = False) -> Generator:
+        # Argumen dievaluasi ke register sementara berurutan lalu disalin CAL
+        # ke slot parameter register file baru
+        entry = self.symbol_table.tab[tab_index]
+        proc_id = self.proc_id(tab_index)
+        mark = self.temp_top
+        arg_start = self.temp_top
+        for _ in range(self.procs[proc_id].param_size):
+            self.new_temp()
+        position = arg_start
+        for arg in args:
+            if isinstance(arg.type_desc, ArrayType) and not (isinstance(arg, VariableNode) and arg.index_expressions):
+                self.gen_array_copy((self.level, position), arg, arg.type_desc.size)
+                position += arg.type_desc.size
+            else:
+                yield self.gen_expression(arg, position)
+                position += 1
+        self.temp_top = mark
+        if entry.obj == ObjType.FUNCTION and not discard:
+            result = self.result_register(target)
+        else:
+            result = -1
+        self.emit(ROp.CAL, result, proc_id, arg_start)
+        return result
+
+    def gen_tail_call(self, tab_index: int, args: List[ASTNode]) -> Generator:
+        # Argumen dievaluasi ke register sementara seperti CAL; parameter lama
+        # masih bisa dibaca argumen berikutnya karena baru ditimpa oleh TCL
+        proc_id = self.proc_id(tab_index)
+        arg_start = self.temp_top
+        for _ in range(self.procs[proc_id].param_size):
+            self.new_temp()
+        position = arg_start
+        for arg in args:
+            if isinstance(arg.type_desc, ArrayType) and not (isinstance(arg, VariableNode) and arg.index_expressions):
+                self.gen_array_copy((self.level, position), arg, arg.type_desc.size)
+                position += arg.type_desc.size
+            else:
+                yield self.gen_expression(arg, position)
+                position += 1
+        self.emit(ROp.TCL, None, proc_id, arg_start)
+
+    # ---------- Ekspresi ----------
+
+    def gen_expression(self, expr: ASTNode, target: Optional[int] = None) -> Union[Generator, int]:
+        if expr.const_value is not None and not isinstance(expr, StringNode):
+            return self.gen_constant(expr, target)
+        handler = (self.expression_handlers.get(expr.__class__) or
+                   self.expression_handlers.get(expr.node_type))
+        if handler is None:
+            raise CodegenError(f"Cannot generate code for {expr.node_type.label}", self.first_token(expr))
+        return handler(expr, target)
+
+    def gen_constant(self, expr: ASTNode, target: Optional[int] = None) -> int:
+        value = expr.const_value
+        if value is None:
+            value = expr.value
+        if isinstance(value, str) and expr.data_type == BaseType.STRING:
+            value = string_value(value)
+        return self.move(self.constant(value), target)
+
+    def gen_string(self, expr: StringNode, target: Optional[int] = None) -> int:
+        return self.move(self.constant(string_value(expr.value)), target)
+
+    def gen_variable(self, expr: VariableNode, target: Optional[int] = None) -> Union[Generator, int]:
+        if expr.tab_index < 0:
+            raise CodegenError(f"Undefined variable '{expr.identifier}'", expr.token)
+        entry = self.symbol_table.tab[expr.tab_index]
+        if entry.obj == ObjType.FUNCTION:
+            self.check_argument_count(expr.tab_index, [], expr)
+            return self.gen_call(expr.tab_index, [], target)
+        if expr.index_expressions:
+            return self.gen_element_load(expr, target)
+        if isinstance(entry.type_desc, ArrayType):
+            raise CodegenError("Array value must be assigned or passed as argument", expr.token)
+        offset = self.offsets[expr.tab_index]
+        if entry.lev == self.level:
+            return self.move(offset, target)
+        register = self.result_register(target)
+        self.emit(ROp.LDX, register, entry.lev, offset)
+        return register
+
+    def gen_element_address(self, var: VariableNode) -> Generator:
+        # Menghasilkan (level frame, register berisi offset elemen di frame tersebut)
+        entry = self.symbol_table.tab[var.tab_index]
+        address = self.new_temp()
+        for position, (index_expr, array_ref, safe) in enumerate(self.index_arrays(var)):
+            mark = self.temp_top
+            index = yield self.gen_expression(index_expr)
+            array = self.symbol_table.atab[array_ref]
+            if position == 0 and safe and array.element_size == 1:
+                # Indeks terbukti dalam batas: alamat cukup index + (base - low)
+                self.emit(ROp.ADDK, address, index, self.offsets[var.tab_index] - array.low)
+            elif position == 0:
+                self.emit(ROp.ELA, address, index,
+                          (self.offsets[var.tab_index], array.low, array.high, array.element_size))
+            else:
+                self.emit(ROp.ELN, address, index, (array.low, array.high, array.element_size))
+            self.temp_top = mark
+        return entry.lev, address
+
+    def gen_element_load(self, expr: VariableNode, target: Optional[int] = None) -> Generator:
+        if isinstance(expr.type_desc, ArrayType):
+            raise CodegenError("Array element of array type cannot be used as a value", expr.token)
+        mark = self.temp_top
+        level, address = yield self.gen_element_address(expr)
+        self.temp_top = mark
+        register = self.result_register(target)
+        self.emit(ROp.LDE, register, level, address)
+        return register
+
+    def gen_function_call(self, expr: FunctionCallNode, target: Optional[int] = None) -> Generator:
+        if expr.tab_index is None or expr.tab_index < 0:
+            raise CodegenError(f"Undefined function '{expr.function_name}'", self.first_token(expr))
+        self.check_argument_count(expr.tab_index, expr.children, expr)
+        return self.gen_call(expr.tab_index, expr.children, target)
+
+    def gen_binary(self, expr: BinaryExpressionNode, target: Optional[int] = None) -> Generator:
+        operator = expr.operator.lower()
+        op = ARITHMETIC_OPS.get(operator)
+        if op is None:
+            raise CodegenError(f"Unknown operator '{expr.operator}'", self.first_token(expr))
+        mark = self.temp_top
+        left = yield self.gen_left_operand(expr.children[0], expr.children[1])
+        right_expr = expr.children[1]
+        if operator in ('+', '-') and _is_number(right_expr.const_value):
+            step = right_expr.const_value if operator == '+' else -right_expr.const_value
+            self.temp_top = mark
+            register = self.result_register(target)
+            if register == left:
+                self.emit(ROp.INC, register, step)
+            else:
+                self.emit(ROp.ADDK, register, left, step)
+            return register
+        right = yield self.gen_expression(right_expr)
+        self.temp_top = mark
+        register = self.result_register(target)
+        self.emit(op, register, left, right)
+        return register
+
+    def gen_left_operand(self, left_expr: ASTNode, right_expr: ASTNode) -> Generator:
+        # Variabel lokal dibaca langsung dari register-nya; jika operand kanan
+        # memanggil subprogram yang bisa mengubah variabel itu, nilai lama disalin dulu
+        left = yield self.gen_expression(left_expr)
+        if 0 <= left < self.frame_size and self.has_call(right_expr):
+            left = self.move(left, self.new_temp())
+        return left
+
+    def has_call(self, expr: ASTNode) -> bool:
+        pending = [expr]
+        tab = self.symbol_table.tab
+        while pending:
+            node = pending.pop()
+            if node.const_value is not None:
+                continue
+            if isinstance(node, FunctionCallNode):
+                return True
+            if isinstance(node, VariableNode):
+                if node.tab_index >= 0 and tab[node.tab_index].obj == ObjType.FUNCTION:
+                    return True
+                pending.extend(node.index_expressions)
+            pending.extend(node.children or ())
+        return False
+
+    def gen_unary(self, expr: UnaryExpressionNode, target: Optional[int] = None) -> Generator:
+        mark = self.temp_top
+        operand = yield self.gen_expression(expr.children[0])
+        if expr.operator != '-':
+            return self.move(operand, target)
+        self.temp_top = mark
+        register = self.result_register(target)
+        self.emit(ROp.NEG, register, operand)
+        return register
+
+    def gen_not(self, expr: ASTNode, target: Optional[int] = None) -> Generator:
+        mark = self.temp_top
+        operand = yield self.gen_expression(expr.children[0])
+        self.temp_top = mark
+        register = self.result_register(target)
+        self.emit(ROp.NOT, register, operand)
+        return register
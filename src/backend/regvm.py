@@ -0,0 +1,229 @@
+from __future__ import annotations
+from typing import Any, List, Optional, TextIO
+import sys
+from src.semantic_analyzer.constant_folder import pascal_div, pascal_mod
+from .pcode import VMError, format_value, FRAME_HEADER, FRAME_RESULT, DEFAULT_MAX_DEPTH
+from .regcode import ROp, RegProgram
+from .runtime_io import ProgramInput, ProgramOutput
+from .profiler import Profiler
+
+# Interpreter bytecode register.
+# r adalah register file aktivasi yang sedang berjalan; CAL membuat register
+# file baru dari template prosedur, menyalin argumen ke slot parameter, dan
+# menyimpan (pc kembali, r pemanggil, register hasil, level, display lama) di
+# call stack. display[level] menunjuk register file terdekat untuk setiap level.
+# TCL (rekursi ekor) mengisi ulang register file aktif dari template tanpa
+# menambah call stack. Profiler opsional dipanggil di CAL/TCL/RET/STM seperti
+# pada VM stack.
+
+MOV, LDX, STX, ELA, ELN, LDE, STE, CPY = (int(op) for op in (
+    ROp.MOV, ROp.LDX, ROp.STX, ROp.ELA, ROp.ELN, ROp.LDE, ROp.STE, ROp.CPY))
+ADD, SUB, MUL, DVD, DIV, MOD, AND, OR = (int(op) for op in (
+    ROp.ADD, ROp.SUB, ROp.MUL, ROp.DVD, ROp.DIV, ROp.MOD, ROp.AND, ROp.OR))
+EQ, NE, LT, LE, GT, GE, NEG, NOT = (int(op) for op in (
+    ROp.EQ, ROp.NE, ROp.LT, ROp.LE, ROp.GT, ROp.GE, ROp.NEG, ROp.NOT))
+ADDK, INC, JMP, JF, JT = (int(op) for op in (ROp.ADDK, ROp.INC, ROp.JMP, ROp.JF, ROp.JT))
+JEQ, JNE, JLT, JLE, JGT, JGE, FRU, FRD = (int(op) for op in (
+    ROp.JEQ, ROp.JNE, ROp.JLT, ROp.JLE, ROp.JGT, ROp.JGE, ROp.FRU, ROp.FRD))
+CAL, RET, WRT, WRL, RED, RDL, HLT, STM = (int(op) for op in (
+    ROp.CAL, ROp.RET, ROp.WRT, ROp.WRL, ROp.RED, ROp.RDL, ROp.HLT, ROp.STM))
+TCL = int(ROp.TCL)
+
+
+class RegisterMachine:
+    def __init__(self, program: RegProgram, max_depth: int = DEFAULT_MAX_DEPTH,
+                 input: Optional[TextIO] = None, output: Optional[TextIO] = None,
+                 profiler: Optional[Profiler] = None):
+        self.program = program
+        self.max_depth = max_depth      # Batas kedalaman pemanggilan
+        self.profiler = profiler        # Hook CAL/TCL/RET/STM, None jika profiling mati
+        self.output = ProgramOutput(output if output is not None else sys.stdout)
+        self.input = ProgramInput(input if input is not None else sys.stdin, self.output)
+        self.globals: List[Any] = []
+        self.steps = 0
+        self.statements = 0
+
+    def run(self):
+        program = self.program
+        code = program.code
+        procs = [proc.as_tuple() for proc in program.procs]
+        max_depth = self.max_depth
+        write = self.output.write
+        lines = program.lines
+        profiler = self.profiler
+
+        r = self.globals = list(program.globals)
+        display: List[Any] = [None] * (program.max_level + 1)
+        display[0] = r
+        calls = []
+        pc = program.entry
+        steps = 0
+        statements = 0
+        if profiler is not None:
+            profiler.start()
+
+        try:
+            while True:
+                op, a, b, c = code[pc]
+                pc += 1
+                steps += 1
+                if op == MOV:
+                    r[a] = r[b]
+                elif op == INC:
+                    r[a] += b
+                elif op == ADDK:
+                    r[a] = r[b] + c
+                elif op == FRU:
+                    value = r[a] + 1
+                    if value <= r[b]:
+                        r[a] = value
+                        pc = c
+                elif op == JLT:
+                    if r[a] < r[b]:
+                        pc = c
+                elif op == JGE:
+                    if r[a] >= r[b]:
+                        pc = c
+                elif op == JLE:
+                    if r[a] <= r[b]:
+                        pc = c
+                elif op == JGT:
+                    if r[a] > r[b]:
+                        pc = c
+                elif op == JEQ:
+                    if r[a] == r[b]:
+                        pc = c
+                elif op == JNE:
+                    if r[a] != r[b]:
+                        pc = c
+                elif op == JF:
+                    if not r[a]:
+                        pc = b
+                elif op == JT:
+                    if r[a]:
+                        pc = b
+                elif op == JMP:
+                    pc = a
+                elif op == ADD:
+                    r[a] = r[b] + r[c]
+                elif op == SUB:
+                    r[a] = r[b] - r[c]
+                elif op == MUL:
+                    r[a] = r[b] * r[c]
+                elif op == MOD:
+                    r[a] = pascal_mod(r[b], r[c])
+                elif op == DIV:
+                    r[a] = pascal_div(r[b], r[c])
+                elif op == LT:
+                    r[a] = r[b] < r[c]
+                elif op == LE:
+                    r[a] = r[b] <= r[c]
+                elif op == GT:
+                    r[a] = r[b] > r[c]
+                elif op == GE:
+                    r[a] = r[b] >= r[c]
+                elif op == EQ:
+                    r[a] = r[b] == r[c]
+                elif op == NE:
+                    r[a] = r[b] != r[c]
+                elif op == AND:
+                    r[a] = r[b] and r[c]
+                elif op == OR:
+                    r[a] = r[b] or r[c]
+                elif op == LDX:
+                    r[a] = display[b][c]
+                elif op == STX:
+                    display[a][b] = r[c]
+                elif op == ELA:
+                    base, low, high, size = c
+                    index = r[b]
+                    if index < low or index > high:
+                        raise VMError(f"Array index out of bounds: {index} not in range {low}..{high}")
+                    r[a] = base + (index - low) * size
+                elif op == LDE:
+                    r[a] = display[b][r[c]]
+                elif op == STE:
+                    display[a][r[b]] = r[c]
+                elif op == CAL:
+                    entry, level, param_size, template = procs[b]
+                    frame = template[:]
+                    if param_size:
+                        frame[FRAME_HEADER:FRAME_HEADER + param_size] = r[c:c + param_size]
+                    calls.append((pc, r, a, level, display[level]))
+                    if len(calls) > max_depth:
+                        raise VMError("Stack overflow")
+                    display[level] = r = frame
+                    pc = entry
+                    if profiler is not None:
+                        profiler.enter(b)
+                elif op == TCL:
+                    entry, _, param_size, template = procs[b]
+                    frame = template[:]
+                    if param_size:
+                        frame[FRAME_HEADER:FRAME_HEADER + param_size] = r[c:c + param_size]
+                    # Isi diganti in-place: display[level] tetap menunjuk register file ini
+                    r[:] = frame
+                    pc = entry
+                    if profiler is not None:
+                        profiler.tail(b)
+                elif op == RET:
+                    pc, caller, result, level, saved = calls.pop()
+                    display[level] = saved
+                    if result >= 0:
+                        caller[result] = r[FRAME_RESULT]
+                    r = caller
+                    if profiler is not None:
+                        profiler.leave()
+                elif op == FRD:
+                    value = r[a] - 1
+                    if value >= r[b]:
+                        r[a] = value
+                        pc = c
+                elif op == NOT:
+                    r[a] = not r[b]
+                elif op == NEG:
+                    r[a] = -r[b]
+                elif op == DVD:
+                    r[a] = r[b] / r[c]
+                elif op == ELN:
+                    low, high, size = c
+                    index = r[b]
+                    if index < low or index > high:
+                        raise VMError(f"Array index out of bounds: {index} not in range {low}..{high}")
+                    r[a] += (index - low) * size
+                elif op == CPY:
+                    (target_level, target), (source_level, source) = a, b
+                    display[target_level][target:target + c] = display[source_level][source:source + c]
+                elif op == WRT:
+                    write(format_value(r[a]))
+                elif op == WRL:
+                    write("\n")
+                elif op == RED:
+                    r[a] = self.input.read_value(b)
+                elif op == RDL:
+                    self.input.read_line()
+                elif op == HLT:
+                    break
+                elif op == STM:
+                    statements += 1
+                    if profiler is not None:
+                        profiler.statement(lines[pc - 1])
+                else:
+                    raise VMError(f"Invalid opcode {op}")
+        except VMError as error:
+            error.line = lines[pc - 1] or None
+            raise
+        except ZeroDivisionError:
+            raise VMError("Division by zero", lines[pc - 1] or None) from None
+        finally:
+            self.steps = steps
+            self.statements = statements
+            self.output.flush()
+            if profiler is not None:
+                profiler.stop()
+
+
+def run_program(program: RegProgram, **kwargs) -> RegisterMachine:
+    vm = RegisterMachine(program, **kwargs)
+    vm.run()
+    return vm
@@ -0,0 +1,115 @@
+from __future__ import annotations
+from typing import Any, List, Optional, TextIO
+from src.semantic_analyzer.type_descriptors import BaseType
+from .pcode import VMError
+
+# Runtime I/O untuk write/writeln/read/readln, dipakai ketiga engine.
+# ProgramOutput menulis ke buffer besar tanpa line buffering (bahkan jika
+# stdout berupa terminal); buffer di-flush saat program selesai, saat buffer
+# penuh, dan sebelum input menunggu data dari stream (prompt sebelum
+# read/readln tetap terlihat). Stream tanpa file descriptor (StringIO untuk
+# test dan benchmark) ditulis langsung.
+#
+# ProgramInput membaca stream non-interaktif per chunk besar lalu memecahnya
+# menjadi baris dan token; terminal dibaca per baris agar tidak menunggu EOF.
+
+OUTPUT_BUFFER_SIZE = 1 << 20
+INPUT_CHUNK_SIZE = 1 << 16
+
+
+class ProgramOutput:
+    __slots__ = ("stream", "buffer", "write")
+
+    def __init__(self, stream: TextIO, buffer_size: int = OUTPUT_BUFFER_SIZE):
+        self.stream = stream
+        self.buffer = open_buffer(stream, buffer_size)
+        self.write = self.buffer.write      # Bound method C, dipanggil langsung oleh engine
+
+    def flush(self):
+        self.buffer.flush()
+
+
+def open_buffer(stream: TextIO, buffer_size: int) -> TextIO:
+    # File descriptor yang sama dibuka ulang dengan buffer sendiri (closefd=False)
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        return stream
+    stream.flush()
+    return open(fd, "w", buffering=buffer_size, encoding=getattr(stream, "encoding", None) or "utf-8",
+                errors=getattr(stream, "errors", None), closefd=False)
+
+
+class ProgramInput:
+    # Input untuk read/readln: token dipisah whitespace, readln menutup baris aktif
+    def __init__(self, stream: TextIO, output: Optional[ProgramOutput] = None):
+        self.stream = stream
+        self.output = output            # Di-flush sebelum menunggu input
+        self.tokens: List[str] = []     # Token yang belum dibaca dari baris aktif
+        self.line_open = False          # True jika baris aktif belum ditutup readln
+        self.lines: List[str] = []      # Baris yang sudah dibaca dari stream (urutan terbalik)
+        self.partial = ""               # Sisa chunk terakhir tanpa newline
+        self.eof = False
+        isatty = getattr(stream, "isatty", None)
+        self.interactive = bool(isatty and isatty())
+
+    def next_line(self) -> Optional[str]:
+        if not self.lines:
+            self.fill()
+        return self.lines.pop() if self.lines else None
+
+    def fill(self):
+        if self.output is not None:
+            self.output.flush()
+        if self.interactive:
+            line = self.stream.readline()
+            if line:
+                self.lines.append(line)
+            return
+        while not self.lines and not self.eof:
+            chunk = self.stream.read(INPUT_CHUNK_SIZE)
+            if not chunk:
+                self.eof = True
+                if self.partial:
+                    self.lines.append(self.partial)
+                    self.partial = ""
+                return
+            lines = (self.partial + chunk).split("\n")
+            self.partial = lines.pop()
+            lines.reverse()
+            self.lines = lines
+
+    def read_token(self) -> str:
+        while not self.tokens:
+            line = self.next_line()
+            if line is None:
+                raise VMError("Unexpected end of input")
+            self.tokens = line.split()
+            self.tokens.reverse()
+            self.line_open = True
+        return self.tokens.pop()
+
+    def read_value(self, base_type: int) -> Any:
+        token = self.read_token()
+        try:
+            if base_type == BaseType.INTEGER.value:
+                return int(token)
+            if base_type == BaseType.REAL.value:
+                return float(token)
+        except ValueError:
+            raise VMError(f"Invalid input '{token}'") from None
+        if base_type == BaseType.BOOLEAN.value:
+            return token.lower() == "benar"
+        if base_type == BaseType.CHAR.value:
+            # Sisa token tetap tersedia untuk read berikutnya
+            if len(token) > 1:
+                self.tokens.append(token[1:])
+            return token[0]
+        return token
+
+    def read_line(self):
+        # readln: buang sisa baris aktif, atau satu baris penuh jika belum ada
+        if not self.line_open:
+            self.next_line()
+        self.tokens = []
+        self.line_open = False
@@ -0,0 +1,291 @@
+from __future__ import annotations
+from typing import Any, List, Optional, TextIO
+import sys
+from src.semantic_analyzer.constant_folder import pascal_div, pascal_mod
+from .pcode import (Op, PCodeProgram, VMError, format_value, FRAME_HEADER, FRAME_RESULT, FRAME_RETURN,
+                    FRAME_DYNAMIC_LINK, FRAME_SAVED_DISPLAY, DEFAULT_MAX_DEPTH)
+from .profiler import Profiler
+from .runtime_io import ProgramInput, ProgramOutput
+
+# Interpreter p-code.
+# Runtime stack berupa list yang dialokasikan sekali di awal (tidak pernah
+# append/pop); top menunjuk cell kosong berikutnya dan base ke frame aktif.
+# display[level] menyimpan base frame terdekat untuk setiap level lexical;
+# CAL menyimpan display[level] lama di header frame dan RET memulihkannya.
+# Cell stack bisa berisi int, float, bool, char/string, sehingga dipakai list
+# biasa, bukan array.array bertipe.
+#
+# Ukuran stack dihitung dari ukuran frame (vsze di btab) terbesar sehingga
+# muat max_depth frame bersarang; pemanggilan melewati max_depth menjadi
+# VMError "Stack overflow", bukan error Python. TCL (rekursi ekor) memakai
+# ulang frame aktif sehingga tidak menambah kedalaman.
+#
+# Profiler opsional (src.backend.profiler) dipanggil di CAL/TCL/RET/STM; saat
+# tidak dipasang biayanya hanya satu cek None per pemanggilan.
+
+DEFAULT_STACK_SIZE = 1 << 16
+# Cell tambahan per frame untuk operand yang masih ada di stack pemanggil
+FRAME_SLACK = 16
+
+# Opcode sebagai int lokal: perbandingan dengan IntEnum jauh lebih lambat
+LDA, LOD, LDC, LDI, LDB, STO, STI, STB, IDX, IXU, POP, DUP = (int(op) for op in (
+    Op.LDA, Op.LOD, Op.LDC, Op.LDI, Op.LDB, Op.STO, Op.STI, Op.STB, Op.IDX, Op.IXU, Op.POP, Op.DUP))
+ADD, SUB, MUL, DVD, DIV, MOD, NEG, AND, OR, NOT = (int(op) for op in (
+    Op.ADD, Op.SUB, Op.MUL, Op.DVD, Op.DIV, Op.MOD, Op.NEG, Op.AND, Op.OR, Op.NOT))
+EQ, NE, LT, LE, GT, GE = (int(op) for op in (Op.EQ, Op.NE, Op.LT, Op.LE, Op.GT, Op.GE))
+JMP, JPC, F1U, F2U, F1D, F2D = (int(op) for op in (Op.JMP, Op.JPC, Op.F1U, Op.F2U, Op.F1D, Op.F2D))
+MKS, CAL, RET, WRT, WRL, RED, RDL, HLT, STM = (int(op) for op in (
+    Op.MKS, Op.CAL, Op.RET, Op.WRT, Op.WRL, Op.RED, Op.RDL, Op.HLT, Op.STM))
+TCL = int(Op.TCL)
+
+
+class VirtualMachine:
+    def __init__(self, program: PCodeProgram, stack_size: Optional[int] = None,
+                 input: Optional[TextIO] = None, output: Optional[TextIO] = None,
+                 max_depth: int = DEFAULT_MAX_DEPTH, profiler: Optional[Profiler] = None):
+        self.program = program
+        self.max_depth = max_depth      # Batas kedalaman pemanggilan
+        self.profiler = profiler        # Hook CAL/TCL/RET/STM, None jika profiling mati
+        self.stack: List[Any] = [0] * (stack_size or required_stack_size(program, max_depth))
+        self.display: List[int] = [0] * (program.max_level + 1)
+        self.output = ProgramOutput(output if output is not None else sys.stdout)
+        self.input = ProgramInput(input if input is not None else sys.stdin, self.output)
+        self.steps = 0                  # Jumlah instruksi yang dieksekusi run() terakhir
+        self.statements = 0             # Jumlah STM yang dieksekusi (kode instrumentasi)
+
+    def run(self):
+        program = self.program
+        code = program.code
+        procs = [proc.as_tuple() for proc in program.procs]
+        arrays = program.arrays
+        s = self.stack
+        display = self.display
+        limit = len(s)
+        max_depth = self.max_depth
+        depth = 0
+        write = self.output.write
+        lines = program.lines
+        profiler = self.profiler
+
+        # Frame global di base 0
+        base = 0
+        top = program.frame_size
+        if top > limit:
+            raise VMError("Stack overflow")
+        s[FRAME_HEADER:top] = program.globals
+        pc = program.entry
+        steps = 0
+        statements = 0
+        if profiler is not None:
+            profiler.start()
+
+        try:
+            while True:
+                op, a, b = code[pc]
+                pc += 1
+                steps += 1
+                if op == LOD:
+                    s[top] = s[display[a] + b]
+                    top += 1
+                elif op == LDC:
+                    s[top] = a
+                    top += 1
+                elif op == STO:
+                    top -= 1
+                    s[display[a] + b] = s[top]
+                elif op == ADD:
+                    top -= 1
+                    s[top - 1] += s[top]
+                elif op == JPC:
+                    top -= 1
+                    if not s[top]:
+                        pc = a
+                elif op == SUB:
+                    top -= 1
+                    s[top - 1] -= s[top]
+                elif op == MUL:
+                    top -= 1
+                    s[top - 1] *= s[top]
+                elif op == LT:
+                    top -= 1
+                    s[top - 1] = s[top - 1] < s[top]
+                elif op == LE:
+                    top -= 1
+                    s[top - 1] = s[top - 1] <= s[top]
+                elif op == GT:
+                    top -= 1
+                    s[top - 1] = s[top - 1] > s[top]
+                elif op == GE:
+                    top -= 1
+                    s[top - 1] = s[top - 1] >= s[top]
+                elif op == EQ:
+                    top -= 1
+                    s[top - 1] = s[top - 1] == s[top]
+                elif op == NE:
+                    top -= 1
+                    s[top - 1] = s[top - 1] != s[top]
+                elif op == JMP:
+                    pc = a
+                elif op == F2U:
+                    address = s[top - 3]
+                    value = s[address] + 1
+                    if value <= s[top - 1]:
+                        s[address] = value
+                        pc = a
+                    else:
+                        top -= 3
+                elif op == F2D:
+                    address = s[top - 3]
+                    value = s[address] - 1
+                    if value >= s[top - 1]:
+                        s[address] = value
+                        pc = a
+                    else:
+                        top -= 3
+                elif op == IDX:
+                    top -= 1
+                    index = s[top]
+                    low, high, size = arrays[a]
+                    if index < low or index > high:
+                        raise VMError(f"Array index out of bounds: {index} not in range {low}..{high}")
+                    s[top - 1] += (index - low) * size
+                elif op == IXU:
+                    top -= 1
+                    low, _, size = arrays[a]
+                    s[top - 1] += (s[top] - low) * size
+                elif op == LDI:
+                    s[top - 1] = s[s[top - 1]]
+                elif op == STI:
+                    top -= 2
+                    s[s[top]] = s[top + 1]
+                elif op == LDA:
+                    s[top] = display[a] + b
+                    top += 1
+                elif op == DIV:
+                    top -= 1
+                    s[top - 1] = pascal_div(s[top - 1], s[top])
+                elif op == MOD:
+                    top -= 1
+                    s[top - 1] = pascal_mod(s[top - 1], s[top])
+                elif op == DVD:
+                    top -= 1
+                    s[top - 1] /= s[top]
+                elif op == AND:
+                    top -= 1
+                    s[top - 1] = s[top - 1] and s[top]
+                elif op == OR:
+                    top -= 1
+                    s[top - 1] = s[top - 1] or s[top]
+                elif op == NOT:
+                    s[top - 1] = not s[top - 1]
+                elif op == NEG:
+                    s[top - 1] = -s[top - 1]
+                elif op == MKS:
+                    s[top] = a
+                    top += FRAME_HEADER
+                elif op == CAL:
+                    entry, level, param_size, frame_size, local_values = procs[a]
+                    frame = top - param_size - FRAME_HEADER
+                    s[frame + FRAME_RETURN] = pc
+                    s[frame + FRAME_DYNAMIC_LINK] = base
+                    s[frame + FRAME_SAVED_DISPLAY] = display[level]
+                    display[level] = frame
+                    base = frame
+                    top = frame + frame_size
+                    depth += 1
+                    if top > limit or depth > max_depth:
+                        raise VMError("Stack overflow")
+                    s[top - len(local_values):top] = local_values
+                    pc = entry
+                    if profiler is not None:
+                        profiler.enter(a)
+                elif op == TCL:
+                    entry, _, param_size, frame_size, local_values = procs[a]
+                    parameters = base + FRAME_HEADER
+                    s[parameters:parameters + param_size] = s[top - param_size:top]
+                    s[base + FRAME_RESULT] = b
+                    top = base + frame_size
+                    s[top - len(local_values):top] = local_values
+                    pc = entry
+                    if profiler is not None:
+                        profiler.tail(a)
+                elif op == RET:
+                    display[a] = s[base + FRAME_SAVED_DISPLAY]
+                    pc = s[base + FRAME_RETURN]
+                    top = base + b
+                    base = s[base + FRAME_DYNAMIC_LINK]
+                    depth -= 1
+                    if profiler is not None:
+                        profiler.leave()
+                elif op == F1U:
+                    if s[top - 2] <= s[top - 1]:
+                        s[s[top - 3]] = s[top - 2]
+                    else:
+                        top -= 3
+                        pc = a
+                elif op == F1D:
+                    if s[top - 2] >= s[top - 1]:
+                        s[s[top - 3]] = s[top - 2]
+                    else:
+                        top -= 3
+                        pc = a
+                elif op == LDB:
+                    address = s[top - 1]
+                    s[top - 1:top - 1 + a] = s[address:address + a]
+                    top += a - 1
+                    if top > limit:
+                        raise VMError("Stack overflow")
+                elif op == STB:
+                    top -= a
+                    address = s[top - 1]
+                    s[address:address + a] = s[top:top + a]
+                    top -= 1
+                elif op == POP:
+                    top -= 1
+                elif op == DUP:
+                    s[top] = s[top - 1]
+                    top += 1
+                elif op == WRT:
+                    top -= 1
+                    write(format_value(s[top]))
+                elif op == WRL:
+                    write("\n")
+                elif op == RED:
+                    top -= 1
+                    s[s[top]] = self.input.read_value(a)
+                elif op == RDL:
+                    self.input.read_line()
+                elif op == HLT:
+                    break
+                elif op == STM:
+                    statements += 1
+                    if profiler is not None:
+                        profiler.statement(lines[pc - 1])
+                else:
+                    raise VMError(f"Invalid opcode {op}")
+        except VMError as error:
+            error.line = lines[pc - 1] or None
+            raise
+        except ZeroDivisionError:
+            raise VMError("Division by zero", lines[pc - 1] or None) from None
+        except IndexError:
+            raise VMError("Stack overflow", lines[pc - 1] or None) from None
+        finally:
+            self.steps = steps
+            self.statements = statements
+            self.output.flush()
+            if profiler is not None:
+                profiler.stop()
+
+
+def required_stack_size(program: PCodeProgram, max_depth: int) -> int:
+    # Frame global + max_depth frame terbesar + salinan larik terbesar (LDB)
+    largest_frame = max((proc.frame_size for proc in program.procs), default=0) + FRAME_SLACK
+    largest_array = max(((high - low + 1) * size for low, high, size in program.arrays), default=0)
+    return max(DEFAULT_STACK_SIZE, program.frame_size + max_depth * largest_frame + largest_array)
+
+
+def run_program(program: PCodeProgram, **kwargs) -> VirtualMachine:
+    vm = VirtualMachine(program, **kwargs)
+    vm.run()
+    return vm
@@ -1,19 +1,71 @@
 import sys
 import os
+import argparse
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.lexer import tokenize
-from src.parser import Parser
-from src.parse_tree import print_tree, ParseNode
-from src.reader import Reader
-from src.semantic_analyzer.semantic_analyzer import SemanticAnalyzer
-from src.semantic_analyzer.ast_printer import print_decorated_ast, print_symbol_tables
+from src.backend.pcode import DEFAULT_MAX_DEPTH
+
+# Setiap phase (dan printer-nya) diimport hanya jika dijalankan/dicetak, sehingga
+# --stop-after dan --emit none tidak membayar import maupun format output.
+PHASES = ("lex", "parse", "sema")
+# Phase yang menghasilkan setiap output --emit
+EMIT_PHASES = {"tokens": "lex", "parse-tree": "parse", "ast": "sema", "symtab": "sema"}
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m src.compiler")
+    parser.add_argument("input_file")
+    parser.add_argument("--stop-after", choices=PHASES, default="sema",
+                        help="last phase to run (default: sema)")
+    parser.add_argument("--emit", action="append", choices=tuple(EMIT_PHASES) + ("none",),
+                        help="output to print; may be repeated (default: all outputs of the phases run)")
+    # Body prosedur/fungsi level teratas dianalisis di N proses (lihat parallel.py)
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="analyze top-level subprogram bodies in N processes (default: 1)")
+    # Ekspor diagnostic dalam JSON (mis. ke CI)
+    parser.add_argument("--diagnostics-json", metavar="OUTPUT_FILE")
+    # Backend: tampilkan p-code dan/atau jalankan program di VM
+    parser.add_argument("--pcode", action="store_true", help="print generated p-code")
+    parser.add_argument("--run", action="store_true", help="execute the program on the VM")
+    parser.add_argument("--vm", choices=("stack", "register", "python"), default="stack",
+                        help="execution engine for --pcode/--run (default: stack)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="do not read or write the compiled-program cache (--vm python)")
+    # -O0: tanpa optimasi, -O1: peephole/cabang konstan/kode mati (stack VM),
+    # -O2: + dead-store, inlining subprogram kecil dan optimasi loop (semua backend)
+    parser.add_argument("-O", dest="opt_level", type=int, choices=(0, 1, 2), default=1,
+                        help="optimization level: 1 = p-code peephole (stack VM), "
+                             "2 = + dead stores, inlining and loop optimization (default: 1)")
+    # Batas kedalaman pemanggilan (frame) sebelum runtime error "Stack overflow"
+    parser.add_argument("--max-depth", type=int, default=DEFAULT_MAX_DEPTH, metavar="FRAMES",
+                        help=f"maximum call depth for --run (default: {DEFAULT_MAX_DEPTH})")
+    # Profiling --run: count = jumlah panggilan, waktu, dan eksekusi per baris;
+    # sample = sampling berkala (overhead kecil, tanpa hitungan baris)
+    parser.add_argument("--profile", nargs="?", const="count", choices=("count", "sample"),
+                        help="profile the program during --run (default mode: count)")
+    parser.add_argument("--folded", metavar="OUTPUT_FILE",
+                        help="write the profile as folded stacks (flamegraph.pl/speedscope)")
+    args = parser.parse_args(argv)
+    last_phase = PHASES.index(args.stop_after)
+    if args.emit is None:
+        args.emit = {emit for emit, phase in EMIT_PHASES.items() if PHASES.index(phase) <= last_phase}
+    else:
+        args.emit = set(args.emit) - {"none"}
+    for emit in sorted(args.emit):
+        if PHASES.index(EMIT_PHASES[emit]) > last_phase:
+            parser.error(f"--emit {emit} requires --stop-after {EMIT_PHASES[emit]}")
+    if args.stop_after != "sema" and (args.pcode or args.run or args.diagnostics_json):
+        parser.error("--pcode, --run and --diagnostics-json require --stop-after sema")
+    if args.profile and args.vm == "python":
+        parser.error("--profile requires --vm stack or --vm register")
+    if args.folded and not args.profile:
+        parser.error("--folded requires --profile")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python -m src.compiler <input_file>")
-        sys.exit(1)
-    
-    input_file = sys.argv[1]
+    args = parse_args(sys.argv[1:])
+    diagnostics_json = args.diagnostics_json
+    input_file = args.input_file
     
     try:
         with open(input_file, 'r', encoding='utf-8') as f:
@@ -25,57 +77,63 @@ def main():
         print(f"Error reading file: {e}")
         sys.exit(1)
     
-    print("=== TOKENS ===")
+    from src.lexer import tokenize
     tokens = tokenize(source_code)
     
-    # Print tokens with numbering
-    for i, token in enumerate(tokens):
-        print(f"{i:3}: {token.type.name:20} '{token.value}' at {token.line}:{token.column}")
-    
-    print("==============")
-    print()
+    if "tokens" in args.emit:
+        # Print tokens with numbering (satu write untuk seluruh daftar)
+        lines = ["=== TOKENS ==="]
+        lines.extend(f"{i:3}: {token.type.name:20} '{token.value}' at {token.line}:{token.column}"
+                     for i, token in enumerate(tokens))
+        lines.append("==============\n\n")
+        sys.stdout.write("\n".join(lines))
+    if args.stop_after == "lex":
+        return
     
     # Parse
     try:
+        from src.parser import Parser
         parser = Parser(tokens)
         parse_tree = parser.parse()
         
-        print("=== PARSE TREE ===")
-        print_tree(parse_tree)
-        print()
-        
-        # Debug: print assignment structure
-        # print("\n=== DEBUG ASSIGNMENT STRUCTURE ===")
-        # def debug_assignments(node: ParseNode, level: int = 0):
-        #     if node.name == "<assignment-statement>":
-        #         indent = "  " * level
-        #         print(f"{indent}ASSIGNMENT FOUND:")
-        #         print(f"{indent}  Children: {[child.name for child in node.children]}")
-        #         for i, child in enumerate(node.children):
-        #             token_info = f" - '{child.token.value}'" if child.token else ""
-        #             print(f"{indent}    {i}: {child.name}{token_info}")
-        #     for child in node.children:
-        #         debug_assignments(child, level + 1)
-        
-        # debug_assignments(parse_tree)
-        # print()
+        if "parse-tree" in args.emit:
+            from src.parse_tree import print_tree
+            print("=== PARSE TREE ===")
+            print_tree(parse_tree)
+            print()
+        if args.stop_after == "parse":
+            return
         
         # Semantic Analysis
+        from src.semantic_analyzer.semantic_analyzer import SemanticAnalyzer
         print("=== SEMANTIC ANALYSIS ===")
-        analyzer = SemanticAnalyzer()
+        analyzer = SemanticAnalyzer(jobs=args.jobs)
         ast = analyzer.analyze(parse_tree)
         
-        print("\n=== DECORATED AST ===")
-        print_decorated_ast(ast)
+        if "ast" in args.emit:
+            from src.semantic_analyzer.ast_printer import print_decorated_ast
+            print("\n=== DECORATED AST ===")
+            print_decorated_ast(ast)
         
-        print_symbol_tables(analyzer)
+        if "symtab" in args.emit:
+            from src.semantic_analyzer.ast_printer import print_symbol_tables
+            print_symbol_tables(analyzer)
         
         if analyzer.errors:
             print(f"\n✗ Found {len(analyzer.errors)} semantic errors:")
             for error in analyzer.errors:
                 print(f"  - {error}")
+            if analyzer.errors.suppressed:
+                print(f"  ... {analyzer.errors.suppressed} more diagnostics suppressed")
         else:
-            print(f"\n✓ No semantic errors found")
+            print("\n✓ No semantic errors found")
+        
+        if diagnostics_json:
+            with open(diagnostics_json, 'w', encoding='utf-8') as f:
+                f.write(analyzer.errors.to_json(input_file))
+        
+        if (args.pcode or args.run) and not analyzer.errors:
+            run_backend(ast, analyzer, args, source_code)
             
     except Exception as e:
         print(f"Error during parsing or semantic analysis: {e}")
@@ -83,5 +141,94 @@ def main():
         traceback.print_exc()
         sys.exit(1)
 
+def run_backend(ast, analyzer, args, source_code):
+    from src.backend.codegen import CodeGenerator, CodegenError
+    from src.backend.pcode import VMError
+    
+    if args.opt_level >= 2:
+        from src.backend.inliner import Inliner
+        inliner = Inliner(analyzer.symbol_table)
+        sites, growth = inliner.run(ast)
+        print("\n=== INLINER ===")
+        for name, count in inliner.inlined.items():
+            print(f"  {name:18} {count:5} call sites")
+        print(f"  {'total':18} {sites:5} call sites, {growth} AST nodes added")
+
+        from src.backend.loop_optimizer import LoopOptimizer
+        hoisted, reduced = LoopOptimizer(analyzer.symbol_table).run(ast)
+        print("\n=== LOOP OPTIMIZER ===")
+        print(f"  {'invariants hoisted':18} {hoisted:5}")
+        print(f"  {'strength reduced':18} {reduced:5}")
+    
+    # Line count profiler berasal dari instruksi STM di awal setiap statement
+    count_statements = args.run and args.profile == "count"
+    try:
+        if args.vm == "python":
+            from src.backend.pycodegen import PythonCodeGenerator
+            from src.backend.pycache import ProgramCache, build_variant, load_or_generate
+            # Build dengan optimasi AST (-O2) disimpan terpisah dari build biasa
+            variant = build_variant(args.vm, args.opt_level)
+            cache = None if args.no_cache else ProgramCache.for_source_file(args.input_file, variant)
+            program, _ = load_or_generate(
+                source_code, lambda: PythonCodeGenerator(analyzer.symbol_table).generate(ast), cache)
+        elif args.vm == "register":
+            from src.backend.regcodegen import RegisterCodeGenerator
+            program = RegisterCodeGenerator(analyzer.symbol_table, count_statements).generate(ast)
+        else:
+            program = CodeGenerator(analyzer.symbol_table, count_statements).generate(ast)
+    except CodegenError as e:
+        print(f"\n{e}")
+        sys.exit(1)
+    
+    if args.vm == "stack" and args.opt_level > 0:
+        from src.backend.peephole import optimize
+        size = len(program.code)
+        print(f"\n=== OPTIMIZER (-O{args.opt_level}) ===")
+        for name, removed in optimize(program, args.opt_level):
+            print(f"  {name:18} {removed:5} instructions removed")
+        print(f"  {'total':18} {size - len(program.code):5} of {size}")
+    
+    if args.pcode:
+        if args.vm == "python":
+            print("\n=== PYTHON CODE ===")
+            print(program.source.rstrip())
+        else:
+            print("\n=== P-CODE ===")
+            print(program.disassemble())
+    
+    if args.run:
+        profiler = None
+        if args.profile == "count":
+            from src.backend.profiler import Profiler
+            profiler = Profiler(program)
+        elif args.profile == "sample":
+            from src.backend.profiler import SamplingProfiler
+            profiler = SamplingProfiler(program)
+        print("\n=== PROGRAM OUTPUT ===")
+        sys.stdout.flush()
+        error = None
+        try:
+            if args.vm == "python":
+                program.run(max_depth=args.max_depth)
+            elif args.vm == "register":
+                from src.backend.regvm import RegisterMachine
+                RegisterMachine(program, max_depth=args.max_depth, profiler=profiler).run()
+            else:
+                from src.backend.vm import VirtualMachine
+                VirtualMachine(program, max_depth=args.max_depth, profiler=profiler).run()
+        except VMError as e:
+            sys.stdout.flush()
+            print(f"\n{e}")
+            error = e
+        # Profil tetap dilaporkan untuk program yang berhenti karena runtime error
+        if profiler is not None:
+            print(f"\n=== PROFILE ({args.profile}) ===")
+            print(profiler.report(source_code))
+            if args.folded:
+                with open(args.folded, 'w', encoding='utf-8') as f:
+                    f.write(profiler.folded())
+        if error is not None:
+            sys.exit(1)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
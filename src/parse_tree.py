@@ -1,7 +1,8 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List, Optional
-from src.tokens import Token
+from typing import List, Optional, TextIO
+import sys
+from src.tokens import Token, TokenType
 
 @dataclass
 class ParseNode:
@@ -13,49 +14,80 @@ class ParseNode:
         self.children.append(child)
 
 
-def print_tree(root: ParseNode) -> None:
-    print(root.name)
-    print_tree_recursive(root.children, "")
+# Printer parse tree tanpa rekursi: baris dikumpulkan lalu ditulis sekali ke
+# stream (default stdout). Prefix anak dibentuk sekali per node dari prefix
+# induk, bukan per baris.
 
+# Node yang anaknya "diangkat" ke level induk jika berada di bawah node tersebut
+_FLATTENED = {
+    "<statement-list>": "<statement>",
+    "<var-declaration>": "<var-item>",
+    "<assignment-statement>": "<variable>",
+}
+_OPERATORS = frozenset(("<additive-operator>", "<multiplicative-operator>", "<relational-operator>"))
+# Nama anak yang membuat process_children perlu menyalin daftar anak
+_SPECIAL = frozenset(("<statement>", "<statement-list>")) | _OPERATORS
+# Enum.name lewat descriptor, jauh lebih lambat daripada lookup dict
+_TYPE_NAMES = {token_type: token_type.name for token_type in TokenType}
 
-def print_tree_recursive(nodes: List[ParseNode], prefix: str) -> None:
-    for i, node in enumerate(nodes):
-        is_last = (i == len(nodes) - 1)
-        connector = "└── " if is_last else "├── "
-        
-        if node.token is not None:
-            label = f"{node.token.type.name}({node.token.value})"
-        else:
-            label = node.name
-        
-        print(prefix + connector + label)
-        
-        processed_children = process_children(node)
-        
-        new_prefix = prefix + ("    " if is_last else "│   ")
-        print_tree_recursive(processed_children, new_prefix)
+
+def print_tree(root: ParseNode, stream: Optional[TextIO] = None) -> None:
+    lines = [root.name]
+    write_tree(root, lines)
+    lines.append("")
+    (stream if stream is not None else sys.stdout).write("\n".join(lines))
+
+
+def write_tree(root: ParseNode, lines: List[str]) -> None:
+    append = lines.append
+    type_names = _TYPE_NAMES
+    # Stack berisi (node, prefix, is_last), anak terakhir di-push lebih dulu
+    stack = []
+    children = process_children(root)
+    for i in range(len(children) - 1, -1, -1):
+        stack.append((children[i], "", i == len(children) - 1))
+    while stack:
+        node, prefix, is_last = stack.pop()
+        token = node.token
+        label = f"{type_names[token.type]}({token.value})" if token is not None else node.name
+        append(f"{prefix}└── {label}" if is_last else f"{prefix}├── {label}")
+        if not node.children:
+            continue
+        children = process_children(node)
+        if children:
+            child_prefix = prefix + ("    " if is_last else "│   ")
+            last = len(children) - 1
+            for i in range(last, -1, -1):
+                stack.append((children[i], child_prefix, i == last))
 
 
 def process_children(node: ParseNode) -> List[ParseNode]:
-    processed = []
-    
+    # Anak yang dicetak: node kosong dibuang, node pembungkus tertentu diganti
+    # anak-anaknya (berulang, memakai stack), dan operator diganti token-nya
+    flattened = _FLATTENED.get(node.name)
     for child in node.children:
+        if child.name in _SPECIAL or child.name == flattened:
+            break
+    else:
+        # Kasus umum: tidak ada anak yang diubah, daftar dipakai apa adanya
+        return node.children
+    processed = []
+    pending = [(node, iter(node.children))]
+    while pending:
+        parent, children = pending[-1]
+        child = next(children, None)
+        if child is None:
+            pending.pop()
+            continue
         # Skip empty nodes
         if child.name == "<statement>" and not child.children and child.token is None:
             continue
         elif child.name == "<statement-list>" and not child.children:
             continue
-        
-        if node.name == "<statement-list>" and child.name == "<statement>":
-            # Untuk <statement> dalam <statement-list>, langsung ambil grandchildren
-            processed.extend(process_children(child))
-        elif node.name == "<var-declaration>" and child.name == "<var-item>":
-            # Untuk <var-item> dalam <var-declaration>, langsung ambil grandchildren  
-            processed.extend(process_children(child))
-        elif node.name == "<assignment-statement>" and child.name == "<variable>":
-            # Untuk <variable> dalam <assignment-statement>, langsung ambil grandchildren
-            processed.extend(process_children(child))
-        elif child.name in ["<additive-operator>", "<multiplicative-operator>", "<relational-operator>"]:
+
+        if _FLATTENED.get(parent.name) == child.name:
+            pending.append((child, iter(child.children)))
+        elif child.name in _OPERATORS:
             # Handle operator nodes
             if child.children and child.children[0].token:
                 operator_token = child.children[0].token
@@ -68,5 +100,5 @@ def process_children(node: ParseNode) -> List[ParseNode]:
                 processed.append(child)
         else:
             processed.append(child)
-    
-    return processed
\ No newline at end of file
+
+    return processed
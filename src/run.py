@@ -0,0 +1,106 @@
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.backend.pcode import DEFAULT_MAX_DEPTH
+from src.backend.pycache import (ProgramCache, ENGINES, ARTIFACT_SUFFIX, build_variant, compile_source,
+                                 load_artifact_file)
+
+# Entry point eksekusi untuk job runner: hanya output program yang ditulis.
+# Source .pas di-compile lewat artifact .pasc (dipakai langsung jika hash
+# source dan versi compiler cocok); file .pasc dijalankan tanpa source dengan
+# engine dan varian yang tercatat di artifact.
+# Usage: python -m src.run program.pas [--vm ENGINE] [-O N] [--beside | --cache-dir DIR]
+#        python -m src.run program.pasc
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m src.run")
+    parser.add_argument("input_file", help="Pascal-S source (.pas) or compiled artifact (.pasc)")
+    parser.add_argument("--vm", choices=ENGINES, default="stack",
+                        help="execution engine for source files (default: stack)")
+    parser.add_argument("-O", dest="opt_level", type=int, choices=(0, 1, 2), default=1,
+                        help="optimization level (default: 1)")
+    location = parser.add_mutually_exclusive_group()
+    location.add_argument("--cache-dir", metavar="DIR",
+                          help="artifact directory (default: __pascache__ next to the source)")
+    location.add_argument("--beside", action="store_true",
+                          help="store the artifact as <name>.pasc next to the source")
+    location.add_argument("--no-cache", action="store_true", help="always compile from source")
+    parser.add_argument("--max-depth", type=int, default=DEFAULT_MAX_DEPTH, metavar="FRAMES",
+                        help=f"maximum call depth (default: {DEFAULT_MAX_DEPTH})")
+    # Waktu load/compile dan eksekusi ke stderr (membandingkan cold vs warm start)
+    parser.add_argument("--timing", action="store_true", help="print load and run times to stderr")
+    return parser.parse_args(argv)
+
+
+def load(args):
+    # Mengembalikan (program, engine, True jika dari artifact)
+    if args.input_file.endswith(ARTIFACT_SUFFIX):
+        loaded = load_artifact_file(args.input_file)
+        if loaded is None:
+            fail(f"Error: '{args.input_file}' is not a valid artifact for this compiler version")
+        program, engine, _ = loaded
+        return program, engine, True
+
+    try:
+        with open(args.input_file, 'r', encoding='utf-8') as f:
+            source_code = f.read()
+    except OSError as e:
+        fail(f"Error reading file: {e}")
+    variant = build_variant(args.vm, args.opt_level)
+    if args.no_cache:
+        cache = None
+    elif args.beside:
+        cache = ProgramCache.beside_source_file(args.input_file, variant, args.vm)
+    elif args.cache_dir:
+        cache = ProgramCache(args.cache_dir, variant, args.vm)
+    else:
+        cache = ProgramCache.for_source_file(args.input_file, variant, args.vm)
+
+    from src.backend.codegen import CodegenError
+    from src.parser import ParserError
+    try:
+        program, hit = compile_source(source_code, cache, args.vm, args.opt_level)
+    except (CodegenError, ParserError) as e:
+        fail(f"{args.input_file}: {e}")
+    return program, args.vm, hit
+
+
+def execute(program, engine: str, max_depth: int):
+    if engine == "python":
+        program.run(max_depth=max_depth)
+    elif engine == "register":
+        from src.backend.regvm import RegisterMachine
+        RegisterMachine(program, max_depth=max_depth).run()
+    else:
+        from src.backend.vm import VirtualMachine
+        VirtualMachine(program, max_depth=max_depth).run()
+
+
+def fail(message: str):
+    print(message, file=sys.stderr)
+    sys.exit(1)
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    start = time.perf_counter()
+    program, engine, hit = load(args)
+    loaded = time.perf_counter()
+
+    from src.backend.pcode import VMError
+    try:
+        execute(program, engine, args.max_depth)
+    except VMError as e:
+        sys.stdout.flush()
+        fail(str(e))
+    finally:
+        if args.timing:
+            print(f"[{engine}] {'artifact' if hit else 'compile'}: {(loaded - start) * 1000:.2f} ms, "
+                  f"run: {(time.perf_counter() - loaded) * 1000:.2f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
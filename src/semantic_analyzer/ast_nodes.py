@@ -1,39 +1,121 @@
 from __future__ import annotations
-from typing import List, Optional
-from dataclasses import dataclass, field
+from typing import Any, ClassVar, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+from enum import IntEnum, auto
 from src.tokens import Token
 from .symbol_table import BaseType
+from .type_descriptors import TypeDescriptor
 
-@dataclass
+class NodeKind(IntEnum):
+    # Program dan deklarasi
+    PROGRAM = auto()
+    DECLARATIONS = auto()
+    CONST_DECLARATION = auto()
+    CONST_ITEM = auto()
+    CONST_VALUE = auto()
+    CONST_IDENTIFIER = auto()
+    TYPE_DECLARATION = auto()
+    TYPE_ITEM = auto()
+    TYPE_DEFINITION = auto()
+    TYPE = auto()
+    ARRAY_TYPE = auto()
+    RANGE_TYPE = auto()
+    VAR_DECLARATION = auto()
+    VAR_ITEM = auto()
+    PARAMETER = auto()
+    SUBPROGRAM_DECLARATION = auto()
+    PROCEDURE_DECLARATION = auto()
+    FUNCTION_DECLARATION = auto()
+    FORMAL_PARAMETER_LIST = auto()
+    PARAMETER_GROUP = auto()
+    BLOCK = auto()
+    # Statement
+    COMPOUND_STATEMENT = auto()
+    STATEMENT_LIST = auto()
+    STATEMENT = auto()
+    ASSIGNMENT = auto()
+    IF_STATEMENT = auto()
+    WHILE_STATEMENT = auto()
+    FOR_STATEMENT = auto()
+    REPEAT_STATEMENT = auto()
+    PROCEDURE_CALL = auto()
+    # Ekspresi
+    FUNCTION_CALL = auto()
+    PARAMETER_LIST = auto()
+    BINARY_EXPRESSION = auto()
+    UNARY_EXPRESSION = auto()
+    NOT_EXPRESSION = auto()
+    FACTOR = auto()
+    NUMBER = auto()
+    STRING = auto()
+    CHAR = auto()
+    BOOLEAN = auto()
+    VARIABLE = auto()
+    ARRAY_ELEMENT = auto()
+    # Node pengganti untuk input yang tidak valid
+    UNKNOWN_VARIABLE = auto()
+    UNKNOWN_VALUE = auto()
+    UNKNOWN_TARGET = auto()
+    # Rule parse tree tanpa visitor khusus (lihat RuleNode)
+    RULE = auto()
+
+    @property
+    def label(self) -> str:
+        # Nama CamelCase untuk output, mis. IF_STATEMENT -> "IfStatement"
+        return _NODE_KIND_LABELS[self]
+
+
+_NODE_KIND_LABELS = {kind: "".join(part.capitalize() for part in kind.name.split("_"))
+                     for kind in NodeKind}
+
+
+# Semua node memakai __slots__ (tanpa __dict__); atribut tambahan harus
+# dideklarasikan sebagai field di kelas node yang sesuai.
+
+@dataclass(slots=True)
 class ASTNode:
-    node_type: str
-    children: List[ASTNode] = field(default_factory=list)
+    node_type: NodeKind
+    # Node daun berbagi tuple kosong; list baru dibuat saat anak pertama ditambahkan
+    children: Sequence[ASTNode] = ()
     token: Optional[Token] = None
     data_type: Optional[BaseType] = None
     tab_index: int = -1
     block_index: int = -1
+    # Descriptor tipe ter-intern untuk tipe komposit (array); None = primitif data_type
+    type_desc: Optional[TypeDescriptor] = None
+    # Nilai hasil constant folding (None jika bukan ekspresi konstan)
+    const_value: Any = None
+    # Hanya VariableNode (akses elemen array) yang punya index expressions
+    index_expressions: ClassVar[tuple] = ()
     
     def add_child(self, child: ASTNode):
-        self.children.append(child)
+        children = self.children
+        if not children:
+            self.children = [child]
+        elif len(children) == 1:
+            # Mayoritas node punya <= 2 anak; list dibuat pas tanpa over-allocation
+            self.children = [children[0], child]
+        else:
+            children.append(child)
         
     def __repr__(self):
-        return f"{self.node_type}(type={self.data_type}, tab_idx={self.tab_index})"
+        return f"{self.node_type.label}(type={self.data_type}, tab_idx={self.tab_index})"
 
-@dataclass
+@dataclass(slots=True)
 class ProgramNode(ASTNode):
     name: str = ""
     
     def __repr__(self):
         return f"ProgramNode(name: '{self.name}')"
 
-@dataclass
+@dataclass(slots=True)
 class VarDeclNode(ASTNode):
     identifier: str = ""
     
     def __repr__(self):
         return f"VarDecl('{self.identifier}')"
 
-@dataclass
+@dataclass(slots=True)
 class AssignmentNode(ASTNode):
     def __repr__(self):
         if len(self.children) >= 2:
@@ -64,7 +146,7 @@ class AssignmentNode(ASTNode):
         else:
             return "Assign(?)"
 
-@dataclass
+@dataclass(slots=True)
 class BinaryExpressionNode(ASTNode):
     operator: str = ""
     
@@ -77,28 +159,40 @@ class BinaryExpressionNode(ASTNode):
             return f"{left_str}{self.operator}{right_str}"
         return f"BinOp '{self.operator}'"
 
-@dataclass
+@dataclass(slots=True)
+class UnaryExpressionNode(ASTNode):
+    operator: str = ""
+    
+    def __repr__(self):
+        operand = self.children[0] if self.children else "?"
+        return f"{self.operator}{operand}"
+
+@dataclass(slots=True)
 class VariableNode(ASTNode):
     identifier: str = ""
+    is_array_element: bool = False
+    index_expressions: List[ASTNode] = ()
+    # Per index: True jika range analysis membuktikan indeks selalu dalam batas
+    safe_indices: Tuple[bool, ...] = ()
     
     def __repr__(self):
         return f"Var('{self.identifier}')"
 
-@dataclass
+@dataclass(slots=True)
 class NumberNode(ASTNode):
     value: int = 0
     
     def __repr__(self):
         return f"{self.value}"
 
-@dataclass
+@dataclass(slots=True)
 class StringNode(ASTNode):
     value: str = ""
     
     def __repr__(self):
         return f"String('{self.value}')"
     
-@dataclass
+@dataclass(slots=True)
 class BooleanNode(ASTNode):
     value: bool = False
     identifier: str = ""
@@ -106,17 +200,51 @@ class BooleanNode(ASTNode):
     def __repr__(self):
         return f"Boolean('{self.identifier}')"
 
-@dataclass  
+@dataclass(slots=True)
 class ArrayElementNode(VariableNode):
     is_array_element: bool = True
     
     def __repr__(self):
         return f"ArrayElement('{self.identifier}')"
 
-@dataclass
+@dataclass(slots=True)
 class ProcedureCallNode(ASTNode):
     procedure_name: str = ""
+    is_user_defined: bool = False
     
     def __repr__(self):
         args = ", ".join(str(child) for child in self.children) if self.children else ""
-        return f"ProcedureCall(name: '{self.procedure_name}', args: [{args}])"
\ No newline at end of file
+        return f"ProcedureCall(name: '{self.procedure_name}', args: [{args}])"
+
+# Node berikut memakai __repr__ milik ASTNode
+
+@dataclass(slots=True, repr=False)
+class ConstantNode(ASTNode):
+    # ConstValue, ConstIdentifier, dan Char
+    value: Any = None
+    identifier: str = ""
+
+@dataclass(slots=True, repr=False)
+class ProcedureDeclNode(ASTNode):
+    procedure_name: str = ""
+
+@dataclass(slots=True, repr=False)
+class FunctionDeclNode(ASTNode):
+    function_name: str = ""
+
+@dataclass(slots=True, repr=False)
+class FunctionCallNode(ASTNode):
+    function_name: str = ""
+
+@dataclass(slots=True, repr=False)
+class ForStatementNode(ASTNode):
+    counter_var_name: str = ""
+    direction: str = "ke"     # "ke" atau "turunke"
+
+@dataclass(slots=True)
+class RuleNode(ASTNode):
+    # Node untuk rule parse tree yang tidak punya visitor khusus
+    rule: str = ""
+
+    def __repr__(self):
+        return f"{self.rule}(type={self.data_type}, tab_idx={self.tab_index})"
@@ -1,39 +1,76 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, TextIO, Union
+import sys
 from enum import Enum, auto
 from dataclasses import dataclass, field
 from src.parse_tree import ParseNode
 from src.tokens import Token, TokenType
 from .symbol_table import SymbolTable, ObjType, BaseType
 from .ast_nodes import *
+from .traversal import ASTWalker, SKIP
 from .semantic_analyzer import SemanticAnalyzer 
 
-def print_decorated_ast(node: ASTNode, level: int = 0, prefix: str = "", is_last: bool = True):
+class DecoratedASTPrinter(ASTWalker):
+    # Node container (Program, Declarations, Block, dan node lain yang tidak
+    # dicetak) membuka satu level indentasi; node yang dicetak sebagai satu
+    # baris (deklarasi, assignment, pemanggilan prosedur) tidak diturunkan.
+    def __init__(self, level: int = 0, prefix: str = "", is_last: bool = True):
+        super().__init__(
+            enter={
+                ProgramNode: self.print_program,
+                VarDeclNode: self.print_var_decl,
+                AssignmentNode: self.print_assignment,
+                ProcedureCallNode: self.print_procedure_call,
+                NodeKind.DECLARATIONS: self.print_declarations,
+                NodeKind.PROCEDURE_DECLARATION: self.print_procedure_decl,
+                NodeKind.FUNCTION_DECLARATION: self.print_function_decl,
+                NodeKind.CONST_ITEM: self.print_const_decl,
+                NodeKind.TYPE_ITEM: self.print_type_decl,
+                NodeKind.COMPOUND_STATEMENT: self.print_block,
+            },
+            default_enter=self.open_level,
+            default_leave=self.close_level,
+        )
+        # Per level: (prefix untuk anak, anak terakhir, level anak)
+        self.levels = [(prefix, None, level)]
+        self.root_is_last = is_last
+        # Baris output dikumpulkan lalu ditulis sekali oleh print_decorated_ast
+        self.lines: List[str] = []
+        self.emit = self.lines.append
+        
+    def walk(self, root: ASTNode):
+        prefix, _, level = self.levels[0]
+        self.levels[0] = (prefix, root if self.root_is_last else None, level)
+        super().walk(root)
     
-    if level == 0:
-        connector = ""
-        child_prefix = ""
-    else:
-        connector = " └─ " if is_last else " ├─ "
-        child_prefix = "    " if is_last else " │  "
+    def position(self, node: ASTNode) -> tuple[str, str, str]:
+        # Prefix, connector, dan prefix anak untuk node ini
+        prefix, last_child, level = self.levels[-1]
+        if level == 0:
+            return prefix, "", ""
+        if node is last_child:
+            return prefix, " └─ ", "    "
+        return prefix, " ├─ ", " │  "
     
-    if isinstance(node, ProgramNode):
-        print(f"ProgramNode(name: '{node.name}')")
-        
-        for i, child in enumerate(node.children):
-            is_last_child = (i == len(node.children) - 1)
-            new_prefix = prefix + child_prefix
-            print_decorated_ast(child, level + 1, new_prefix, is_last_child)
-            
-    elif node.node_type == "Declarations":
-        print(prefix + connector + "Declarations")
-        
-        for i, child in enumerate(node.children):
-            is_last_child = (i == len(node.children) - 1)
-            new_prefix = prefix + child_prefix
-            print_decorated_ast(child, level + 1, new_prefix, is_last_child)
-                
-    elif isinstance(node, VarDeclNode):
+    def open_level(self, node: ASTNode):
+        prefix, _, child_prefix = self.position(node)
+        level = self.levels[-1][2]
+        self.levels.append((prefix + child_prefix, node.children[-1] if node.children else None, level + 1))
+    
+    def close_level(self, node: ASTNode):
+        self.levels.pop()
+    
+    def print_program(self, node: ProgramNode):
+        self.emit(f"ProgramNode(name: '{node.name}')")
+        self.open_level(node)
+    
+    def print_declarations(self, node: ASTNode):
+        prefix, connector, _ = self.position(node)
+        self.emit(prefix + connector + "Declarations")
+        self.open_level(node)
+    
+    def print_var_decl(self, node: VarDeclNode):
+        prefix, connector, _ = self.position(node)
         decorators = []
         if node.tab_index >= 0:
             decorators.append(f"tab_index:{node.tab_index}")
@@ -42,32 +79,38 @@ def print_decorated_ast(node: ASTNode, level: int = 0, prefix: str = "", is_last
         decorators.append(f"lev:{node.block_index}") # Gunakan block_index sebagai level
         
         decorator_str = f" → {', '.join(decorators)}"
-        print(prefix + connector + f"VarDecl('{node.identifier}'){decorator_str}")
+        self.emit(prefix + connector + f"VarDecl('{node.identifier}'){decorator_str}")
+        return SKIP
 
-    elif node.node_type == "ProcedureDeclaration":
+    def print_procedure_decl(self, node: ProcedureDeclNode):
+        prefix, connector, _ = self.position(node)
         decorators = []
         if node.tab_index >= 0:
             decorators.append(f"tab_index:{node.tab_index}")
-        if hasattr(node, 'procedure_name'):
+        if node.procedure_name:
             decorators.append(f"name:{node.procedure_name}")
         
         decorator_str = f" → {', '.join(decorators)}" if decorators else ""
-        print(prefix + connector + f"ProcedureDecl{decorator_str}")
+        self.emit(prefix + connector + f"ProcedureDecl{decorator_str}")
+        return SKIP
 
-    elif node.node_type == "FunctionDeclaration":
+    def print_function_decl(self, node: FunctionDeclNode):
+        prefix, connector, _ = self.position(node)
         decorators = []
         if node.tab_index >= 0:
             decorators.append(f"tab_index:{node.tab_index}")
         if node.data_type:
             decorators.append(f"return_type:{node.data_type.name.lower()}")
-        if hasattr(node, 'function_name'):
+        if node.function_name:
             decorators.append(f"name:{node.function_name}")
         
         decorator_str = f" → {', '.join(decorators)}" if decorators else ""
-        print(prefix + connector + f"FunctionDecl{decorator_str}")
+        self.emit(prefix + connector + f"FunctionDecl{decorator_str}")
+        return SKIP
         
-    elif node.node_type == "ConstItem":
+    def print_const_decl(self, node: ASTNode):
         # Print Constant declaration
+        prefix, connector, _ = self.position(node)
         decorators = []
         if node.tab_index >= 0:
             decorators.append(f"tab_index:{node.tab_index}")
@@ -76,10 +119,12 @@ def print_decorated_ast(node: ASTNode, level: int = 0, prefix: str = "", is_last
         decorators.append(f"lev:0")
         
         decorator_str = f" → {', '.join(decorators)}"
-        print(prefix + connector + f"ConstDecl{decorator_str}")
+        self.emit(prefix + connector + f"ConstDecl{decorator_str}")
+        return SKIP
         
-    elif node.node_type == "TypeItem":
+    def print_type_decl(self, node: ASTNode):
         # Print Type declaration
+        prefix, connector, _ = self.position(node)
         decorators = []
         if node.tab_index >= 0:
             decorators.append(f"tab_index:{node.tab_index}")
@@ -88,26 +133,26 @@ def print_decorated_ast(node: ASTNode, level: int = 0, prefix: str = "", is_last
         decorators.append(f"lev:0")
         
         decorator_str = f" → {', '.join(decorators)}"
-        print(prefix + connector + f"TypeDecl{decorator_str}")
+        self.emit(prefix + connector + f"TypeDecl{decorator_str}")
+        return SKIP
         
-    elif node.node_type == "CompoundStatement":
+    def print_block(self, node: ASTNode):
         # Print Block
+        prefix, connector, _ = self.position(node)
         decorators = []
         if node.block_index >= 0:
             decorators.append(f"block_index:{node.block_index}")
         decorators.append(f"lev:1")
         
         decorator_str = f" → {', '.join(decorators)}" if decorators else ""
-        print(prefix + connector + f"Block{decorator_str}")
+        self.emit(prefix + connector + f"Block{decorator_str}")
         
         # Process statements
-        for i, child in enumerate(node.children):
-            is_last_child = (i == len(node.children) - 1)
-            new_prefix = prefix + child_prefix
-            print_decorated_ast(child, level + 1, new_prefix, is_last_child)
+        self.open_level(node)
             
-    elif isinstance(node, AssignmentNode):
+    def print_assignment(self, node: AssignmentNode):
         # Print Assignment statement
+        prefix, connector, child_prefix = self.position(node)
         if len(node.children) >= 2:
             target = node.children[0]
             value = node.children[1]
@@ -141,7 +186,7 @@ def print_decorated_ast(node: ASTNode, level: int = 0, prefix: str = "", is_last
             decorators.append(f"type:{node.data_type.name.lower()}")
             
         decorator_str = f" → {', '.join(decorators)}" if decorators else ""
-        print(prefix + connector + f"{assign_str}{decorator_str}")
+        self.emit(prefix + connector + f"{assign_str}{decorator_str}")
         
         # Print children details
         if len(node.children) >= 2:
@@ -156,7 +201,7 @@ def print_decorated_ast(node: ASTNode, level: int = 0, prefix: str = "", is_last
                     decorators.append(f"type:{target.data_type.name.lower()}")
                     
                 decorator_str = f" → {', '.join(decorators)}" if decorators else ""
-                print(prefix + child_prefix + " ├─ " + f"target '{target.identifier}'{decorator_str}")
+                self.emit(prefix + child_prefix + " ├─ " + f"target '{target.identifier}'{decorator_str}")
             
             if isinstance(value, BinaryExpressionNode):
                 decorators = []
@@ -164,7 +209,7 @@ def print_decorated_ast(node: ASTNode, level: int = 0, prefix: str = "", is_last
                     decorators.append(f"type:{value.data_type.name.lower()}")
                     
                 decorator_str = f" → {', '.join(decorators)}" if decorators else ""
-                print(prefix + child_prefix + " └─ " + f"BinOp '{value.operator}'{decorator_str}")
+                self.emit(prefix + child_prefix + " └─ " + f"BinOp '{value.operator}'{decorator_str}")
                 
                 # Print BinOp children
                 if len(value.children) >= 2:
@@ -174,26 +219,26 @@ def print_decorated_ast(node: ASTNode, level: int = 0, prefix: str = "", is_last
                     # Left operand
                     if isinstance(left, (VariableNode, NumberNode)):
                         left_decorators = []
-                        if hasattr(left, 'tab_index') and left.tab_index >= 0:
+                        if left.tab_index >= 0:
                             left_decorators.append(f"tab_index:{left.tab_index}")
                         if left.data_type:
                             left_decorators.append(f"type:{left.data_type.name.lower()}")
                             
                         left_decorator_str = f" → {', '.join(left_decorators)}" if left_decorators else ""
                         left_repr = f"'{left.identifier}'" if isinstance(left, VariableNode) else str(left)
-                        print(prefix + child_prefix + "     ├─ " + f"{left_repr}{left_decorator_str}")
+                        self.emit(prefix + child_prefix + "     ├─ " + f"{left_repr}{left_decorator_str}")
                     
                     # Right operand
                     if isinstance(right, (VariableNode, NumberNode)):
                         right_decorators = []
-                        if hasattr(right, 'tab_index') and right.tab_index >= 0:
+                        if right.tab_index >= 0:
                             right_decorators.append(f"tab_index:{right.tab_index}")
                         if right.data_type:
                             right_decorators.append(f"type:{right.data_type.name.lower()}")
                             
                         right_decorator_str = f" → {', '.join(right_decorators)}" if right_decorators else ""
                         right_repr = f"'{right.identifier}'" if isinstance(right, VariableNode) else str(right)
-                        print(prefix + child_prefix + "     └─ " + f"{right_repr}{right_decorator_str}")
+                        self.emit(prefix + child_prefix + "     └─ " + f"{right_repr}{right_decorator_str}")
             else:
                 decorators = []
                 if value.data_type:
@@ -201,10 +246,12 @@ def print_decorated_ast(node: ASTNode, level: int = 0, prefix: str = "", is_last
                     
                 decorator_str = f" → {', '.join(decorators)}" if decorators else ""
                 value_repr = f"'{value.identifier}'" if isinstance(value, VariableNode) else str(value)
-                print(prefix + child_prefix + " └─ " + f"value {value_repr}{decorator_str}")
+                self.emit(prefix + child_prefix + " └─ " + f"value {value_repr}{decorator_str}")
+        return SKIP
 
-    elif isinstance(node, ProcedureCallNode):
+    def print_procedure_call(self, node: ProcedureCallNode):
         # Print procedure call
+        prefix, connector, _ = self.position(node)
         decorators = []
         if node.tab_index >= 0:
             if node.procedure_name in ['writeln', 'readln', 'write', 'read']:
@@ -212,43 +259,49 @@ def print_decorated_ast(node: ASTNode, level: int = 0, prefix: str = "", is_last
             decorators.append(f"tab_index:{node.tab_index}")
             
         decorator_str = f" → {', '.join(decorators)}" if decorators else ""
-        print(prefix + connector + f"{node.procedure_name}(...){decorator_str}")
-        
-    else:
-        # Skip nodes yang tidak perlu ditampilkan secara eksplisit
-        for i, child in enumerate(node.children):
-            is_last_child = (i == len(node.children) - 1)
-            new_prefix = prefix + child_prefix
-            print_decorated_ast(child, level + 1, new_prefix, is_last_child)
+        self.emit(prefix + connector + f"{node.procedure_name}(...){decorator_str}")
+        return SKIP
+
+
+def print_decorated_ast(node: ASTNode, level: int = 0, prefix: str = "", is_last: bool = True,
+                        stream: Optional[TextIO] = None):
+    printer = DecoratedASTPrinter(level, prefix, is_last)
+    printer.walk(node)
+    printer.lines.append("")
+    (stream if stream is not None else sys.stdout).write("\n".join(printer.lines))
 
-def print_symbol_tables(analyzer: SemanticAnalyzer):
-    print("\n=== SYMBOL TABLES ===")
+def print_symbol_tables(analyzer: SemanticAnalyzer, stream: Optional[TextIO] = None):
+    lines: List[str] = []
+    emit = lines.append
+    emit("\n=== SYMBOL TABLES ===")
     
-    print("\nIdentifier Table (tab):")
-    print("Idx  Name        Obj        Type    Ref  Nrm  Lev  Adr  Link")
-    print("-" * 60)
+    emit("\nIdentifier Table (tab):")
+    emit("Idx  Name        Obj        Type    Ref  Nrm  Lev  Adr  Link")
+    emit("-" * 60)
     for i, entry in enumerate(analyzer.symbol_table.tab):
         if entry is not None:
             obj_name = entry['obj'].name if isinstance(entry['obj'], ObjType) else str(entry['obj'])
             type_name = BaseType(entry['type']).name if entry['type'] in [t.value for t in BaseType] else str(entry['type'])
-            print(f"{i:3}  {entry['name']:10}  {obj_name:10}  {type_name:6}  {entry['ref']:3}  {entry['nrm']:3}  {entry['lev']:3}  {entry['adr']:3}  {entry['link']:4}")
+            emit(f"{i:3}  {entry['name']:10}  {obj_name:10}  {type_name:6}  {entry['ref']:3}  {entry['nrm']:3}  {entry['lev']:3}  {entry['adr']:3}  {entry['link']:4}")
         elif i >= analyzer.symbol_table.user_id_start:
             # Tampilkan empty slot untuk user identifiers
-            print(f"{i:3}  {'-':10}  {'-':10}  {'-':6}  {'-':3}  {'-':3}  {'-':3}  {'-':3}  {'-':4}")
+            emit(f"{i:3}  {'-':10}  {'-':10}  {'-':6}  {'-':3}  {'-':3}  {'-':3}  {'-':3}  {'-':4}")
     
-    print("\nBlock Table (btab):")
-    print("Idx  Last  Lpar  Psze  Vsze")
-    print("-" * 25)
+    emit("\nBlock Table (btab):")
+    emit("Idx  Last  Lpar  Psze  Vsze")
+    emit("-" * 25)
     for i, entry in enumerate(analyzer.symbol_table.btab):
-        print(f"{i:3}  {entry['last']:4}  {entry['lpar']:4}  {entry['psze']:4}  {entry['vsze']:4}")
+        emit(f"{i:3}  {entry['last']:4}  {entry['lpar']:4}  {entry['psze']:4}  {entry['vsze']:4}")
     
-    print("\nArray Table (atab):")
+    emit("\nArray Table (atab):")
     if analyzer.symbol_table.atab:
-        print("Idx  IdxType  ElemType  Eref  Low  High  ElemSize  Size")
-        print("-" * 50)
+        emit("Idx  IdxType  ElemType  Eref  Low  High  ElemSize  Size")
+        emit("-" * 50)
         for i, entry in enumerate(analyzer.symbol_table.atab):
             idx_type = BaseType(entry['index_type']).name if entry['index_type'] in [t.value for t in BaseType] else str(entry['index_type'])
             elem_type = BaseType(entry['element_type']).name if entry['element_type'] in [t.value for t in BaseType] else str(entry['element_type'])
-            print(f"{i:3}  {idx_type:7}  {elem_type:8}  {entry['eref']:4}  {entry['low']:3}  {entry['high']:4}  {entry['element_size']:8}  {entry['size']:4}")
+            emit(f"{i:3}  {idx_type:7}  {elem_type:8}  {entry['eref']:4}  {entry['low']:3}  {entry['high']:4}  {entry['element_size']:8}  {entry['size']:4}")
     else:
-        print("(empty)")
\ No newline at end of file
+        emit("(empty)")
+    lines.append("")
+    (stream if stream is not None else sys.stdout).write("\n".join(lines))
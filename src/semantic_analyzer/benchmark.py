@@ -0,0 +1,243 @@
+import sys
+import os
+import argparse
+import time
+from dataclasses import fields
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.lexer import tokenize
+from src.parser import Parser
+from src.parse_tree import ParseNode
+from src.semantic_analyzer.semantic_analyzer import SemanticAnalyzer
+from src.semantic_analyzer.constant_folder import ConstantFolder
+from src.semantic_analyzer.traversal import ASTWalker
+
+# Benchmark front-end (analisis semantik) pada program hasil generate, supaya
+# angka di commit message bisa direproduksi:
+# - tab: memori record tab/btab/atab (__slots__ vs dict dengan field yang
+#   sama), waktu baca field dict vs atribut, dan waktu analisis penuh.
+# - dispatch: SemanticAnalyzer.visit pada node leaf lewat tabel dispatch vs
+#   lookup lama (nama "visit_..." dari str.replace + getattr).
+# - calls: waktu validate_parameters untuk --calls pemanggilan (setengah
+#   prosedur, setengah fungsi) terhadap signature yang sudah dihitung.
+# - ast: memori AST (node __slots__ + list children) vs node dengan __dict__
+#   berisi field yang sama dan list children per node, serta waktu walk dan
+#   fold_tree atas seluruh AST.
+# Program default: 200 prosedur x (20 variabel lokal + 1 larik) x 30 statement,
+# 200 global.
+# Usage: python -m src.semantic_analyzer.benchmark {tab,dispatch,calls,ast} [--procedures N] [--calls N] [--repeat N]
+
+
+def generate_program(procedures: int = 200, local_vars: int = 20, statements: int = 30,
+                     global_vars: int = 200) -> str:
+    lines = ["program Big;", "variabel"]
+    for g in range(global_vars):
+        lines.append(f"  g{g}: integer;")
+    for p in range(procedures):
+        lines.append(f"prosedur P{p}(a, b: integer);")
+        lines.append("variabel")
+        for v in range(local_vars):
+            lines.append(f"  v{v}: integer;")
+        lines.append(f"  w: larik[1..{local_vars}] dari integer;")
+        lines.append("mulai")
+        lines.append("  v0 := a + b;")
+        lines.append("  w[1] := v0;")
+        for s in range(statements):
+            v = s % local_vars
+            lines.append(f"  v{(v + 1) % local_vars} := v{v} * 2 + g{s % global_vars};")
+            if s % 5 == 0:
+                lines.append(f"  jika v{v} > 10 maka v{v} := 0 selainitu v{v} := 1;")
+        lines.append("selesai;")
+    lines.append("mulai")
+    for g in range(global_vars):
+        lines.append(f"  g{g} := {g};")
+    for p in range(procedures):
+        lines.append(f"  P{p}(g{p % global_vars}, 1);")
+    lines.append("selesai.")
+    return "\n".join(lines) + "\n"
+
+
+def generate_calls(calls: int = 10 ** 5) -> str:
+    lines = ["program Calls;", "variabel", "  a, b: integer;", "  r: real;",
+             "prosedur P(x, y: integer; z: real);", "variabel t: integer;",
+             "mulai", "  t := x", "selesai;",
+             "fungsi F(x: integer; y: real): integer;",
+             "mulai", "  F := x", "selesai;",
+             "mulai", "  a := 1; b := 2; r := 1.0;"]
+    for _ in range(calls // 2):
+        lines.append("  P(a, b, r);")
+        lines.append("  a := F(b, r);")
+    lines.append("  writeln(a)")
+    lines.append("selesai.")
+    return "\n".join(lines) + "\n"
+
+
+def parse(source_code: str):
+    return Parser(tokenize(source_code)).parse()
+
+
+def analyze(parse_tree):
+    analyzer = SemanticAnalyzer()
+    ast = analyzer.analyze(parse_tree)
+    if analyzer.errors:
+        raise SystemExit(f"{len(analyzer.errors)} semantic errors")
+    return analyzer, ast
+
+
+def best_of(repeat: int, function) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_tab(args):
+    parse_tree = parse(generate_program(args.procedures))
+    analyzer, _ = analyze(parse_tree)
+    table = analyzer.symbol_table
+    for name, rows in (("tab", table.tab), ("btab", table.btab), ("atab", table.atab)):
+        rows = [row for row in rows if row is not None]
+        # Representasi sebelum record __slots__: satu dict per entry dengan field yang sama
+        slots = sum(sys.getsizeof(row) for row in rows)
+        dicts = sum(sys.getsizeof({field: row[field] for field in row.keys()}) for row in rows)
+        print(f"{name:5} {len(rows):6} entries  memory dict {dicts / 1e6:6.2f} MB  slots {slots / 1e6:6.2f} MB")
+
+    entries = [entry for entry in table.tab if entry is not None]
+    records = [{field: entry[field] for field in entry.keys()} for entry in entries]
+
+    def read_items():
+        for _ in range(200):
+            for record in records:
+                record["type"], record["lev"], record["link"]
+
+    def read_attributes():
+        for _ in range(200):
+            for entry in entries:
+                entry.type, entry.lev, entry.link
+
+    print(f"  3 field reads x200  dict {best_of(args.repeat, read_items):.3f} s   "
+          f"slots {best_of(args.repeat, read_attributes):.3f} s")
+    print(f"  analyze             {best_of(args.repeat, lambda: analyze(parse_tree)):.3f} s")
+
+
+def bench_dispatch(args):
+    parse_tree = parse(generate_program(args.procedures))
+    nodes, stack = 0, [parse_tree]
+    while stack:
+        node = stack.pop()
+        nodes += 1
+        stack.extend(node.children)
+    print(f"parse tree: {nodes} nodes")
+    analyzer = SemanticAnalyzer()
+    leaf = ParseNode("KEYWORD(mulai)")
+
+    def visit_table():
+        for _ in range(300000):
+            analyzer.visit(leaf)
+
+    def visit_getattr():
+        # Lookup sebelum tabel dispatch, tanpa try/except lamanya
+        for _ in range(300000):
+            name = f'visit_{leaf.name.replace("<", "").replace(">", "").replace("-", "_")}'
+            getattr(analyzer, name, analyzer.visit_default)(leaf)
+
+    print(f"  visit(leaf) x300k  getattr {best_of(args.repeat, visit_getattr):.3f} s   "
+          f"table {best_of(args.repeat, visit_table):.3f} s")
+    print(f"  analyze            {best_of(args.repeat, lambda: analyze(parse_tree)):.3f} s")
+
+
+def bench_calls(args):
+    parse_tree = parse(generate_calls(args.calls))
+    best_validate = best_analyze = None
+    for _ in range(args.repeat):
+        analyzer = SemanticAnalyzer()
+        validate = analyzer.validate_parameters
+        spent = 0.0
+
+        def timed_validate(*call_args, **kwargs):
+            nonlocal spent
+            start = time.perf_counter()
+            result = validate(*call_args, **kwargs)
+            spent += time.perf_counter() - start
+            return result
+
+        analyzer.validate_parameters = timed_validate
+        start = time.perf_counter()
+        analyzer.analyze(parse_tree)
+        elapsed = time.perf_counter() - start
+        if analyzer.errors:
+            raise SystemExit(f"{len(analyzer.errors)} semantic errors")
+        best_validate = spent if best_validate is None else min(best_validate, spent)
+        best_analyze = elapsed if best_analyze is None else min(best_analyze, elapsed)
+    print(f"calls: {args.calls // 2 * 2}")
+    print(f"  validate_parameters {best_validate:.3f} s   analyze {best_analyze:.3f} s")
+
+
+class _DictNode:
+    # Node dengan __dict__, pembanding untuk memori node __slots__
+    pass
+
+
+def bench_ast(args):
+    _, ast = analyze(parse(generate_program(args.procedures)))
+    nodes, stack = [], [ast]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.children)
+        stack.extend(node.index_expressions)
+    slots = 0
+    seen = set()
+    for node in nodes:
+        slots += sys.getsizeof(node)
+        # List children/index_expressions bisa dipakai bersama; tuple kosong tidak dihitung
+        for sequence in (node.children, node.index_expressions):
+            if isinstance(sequence, list) and id(sequence) not in seen:
+                seen.add(id(sequence))
+                slots += sys.getsizeof(sequence)
+    dicts = 0
+    for node in nodes:
+        record = _DictNode()
+        record.__dict__.update((field.name, getattr(node, field.name)) for field in fields(node))
+        dicts += sys.getsizeof(record) + sys.getsizeof(record.__dict__) + sys.getsizeof(list(node.children))
+    print(f"ast: {len(nodes)} nodes")
+    print(f"  memory  dict {dicts / 1e6:6.2f} MB ({dicts / len(nodes):.0f} B/node)   "
+          f"slots {slots / 1e6:6.2f} MB ({slots / len(nodes):.0f} B/node)")
+
+    walker = ASTWalker(default_enter=lambda node: None)
+    folder = ConstantFolder()
+    best_fold = None
+    for _ in range(args.repeat):
+        # fold_tree melewati subtree yang sudah punya const_value
+        for node in nodes:
+            node.const_value = None
+        start = time.perf_counter()
+        folder.fold_tree(ast)
+        elapsed = time.perf_counter() - start
+        best_fold = elapsed if best_fold is None else min(best_fold, elapsed)
+    print(f"  walk {best_of(args.repeat, lambda: walker.walk(ast)) * 1000:.1f} ms   "
+          f"fold_tree {best_fold * 1000:.1f} ms")
+
+
+BENCHMARKS = {
+    "tab": bench_tab,
+    "dispatch": bench_dispatch,
+    "calls": bench_calls,
+    "ast": bench_ast,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src.semantic_analyzer.benchmark")
+    parser.add_argument("benchmark", choices=tuple(BENCHMARKS))
+    parser.add_argument("--procedures", type=int, default=200, help="procedures in the generated program")
+    parser.add_argument("--calls", type=int, default=10 ** 5, help="calls in the generated program (calls benchmark)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
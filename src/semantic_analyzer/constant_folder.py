@@ -0,0 +1,146 @@
+from __future__ import annotations
+from typing import Any, Callable, Optional
+from src.tokens import Token
+from .ast_nodes import *
+from .traversal import ASTWalker, SKIP
+
+# Constant folding untuk decorated AST.
+# Nilai konstan hasil folding disimpan di node.const_value (None berarti
+# bukan ekspresi konstan). Konstanta dari deklarasi konstanta sudah
+# dipropagasi ke node ConstIdentifier oleh analyzer, sehingga folder cukup
+# bekerja bottom-up dari NumberNode/BooleanNode/ConstIdentifier.
+
+ARITHMETIC_OPERATORS = ('+', '-', '*', '/', 'bagi', 'mod')
+RELATIONAL_OPERATORS = ('=', '<>', '<', '<=', '>', '>=')
+LOGICAL_OPERATORS = ('dan', 'atau')
+
+# Node yang tidak pernah konstan; fold() tidak perlu turun ke anak-anaknya
+_NEVER_CONSTANT = (NodeKind.VARIABLE, NodeKind.ARRAY_ELEMENT, NodeKind.FUNCTION_CALL)
+
+
+def pascal_div(left: int, right: int) -> int:
+    # "bagi" membulatkan ke arah nol, bukan floor seperti // di Python
+    quotient = abs(left) // abs(right)
+    return quotient if (left >= 0) == (right >= 0) else -quotient
+
+
+def pascal_mod(left: int, right: int) -> int:
+    # Hasil mod mengikuti tanda dividend: a mod b = a - (a bagi b) * b
+    return left - pascal_div(left, right) * right
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class ConstantFolder:
+    def __init__(self, report: Callable[..., None] = None):
+        self.report = report
+        # Nilai node dihitung saat leave (setelah anak-anaknya di-fold). Node
+        # yang tidak punya handler bukan ekspresi konstan.
+        folders = {
+            NumberNode: self.fold_literal,
+            BooleanNode: self.fold_literal,
+            ConstantNode: self.fold_literal,
+            UnaryExpressionNode: self.fold_unary,
+            BinaryExpressionNode: self.fold_binary,
+            NodeKind.NOT_EXPRESSION: self.fold_not,
+        }
+        # fold(): berhenti di node yang tidak pernah konstan. fold_tree(): turun
+        # ke semua node, termasuk argumen FunctionCall dan indeks array.
+        never_constant = {node_type: self.skip for node_type in _NEVER_CONSTANT}
+        self.expression_walker = ASTWalker(enter=never_constant, leave=folders, default_enter=self.enter)
+        self.tree_walker = ASTWalker(leave=folders, default_enter=self.enter)
+
+    def fold(self, node: ASTNode) -> Any:
+        # Fold satu ekspresi; hasil di-cache di const_value sehingga subtree
+        # yang sudah di-fold (mis. batas array) tidak dihitung ulang.
+        if node.const_value is None:
+            self.expression_walker.walk(node)
+        return node.const_value
+
+    def fold_tree(self, root: ASTNode):
+        # Fold semua ekspresi di AST, termasuk argumen FunctionCall dan
+        # ekspresi indeks array yang tidak bisa konstan secara keseluruhan.
+        self.tree_walker.walk(root)
+
+    def enter(self, node: ASTNode):
+        if node.const_value is not None:
+            return SKIP
+
+    def skip(self, node: ASTNode):
+        return SKIP
+
+    def fold_literal(self, node: ASTNode):
+        node.const_value = node.value
+
+    def fold_not(self, node: ASTNode):
+        if len(node.children) == 1 and isinstance(node.children[0].const_value, bool):
+            node.const_value = not node.children[0].const_value
+
+    def fold_unary(self, node: UnaryExpressionNode):
+        if len(node.children) == 1 and _is_number(node.children[0].const_value):
+            operand = node.children[0].const_value
+            node.const_value = -operand if node.operator == '-' else operand
+
+    def fold_binary(self, node: BinaryExpressionNode):
+        if len(node.children) == 2:
+            left = node.children[0].const_value
+            right = node.children[1].const_value
+            if left is not None and right is not None:
+                node.const_value = self.evaluate_binary(node, node.operator.lower(), left, right)
+
+    def evaluate_binary(self, node: ASTNode, operator: str, left: Any, right: Any) -> Any:
+        if operator in ARITHMETIC_OPERATORS:
+            if not (_is_number(left) and _is_number(right)):
+                return None
+            if operator == '+':
+                return left + right
+            if operator == '-':
+                return left - right
+            if operator == '*':
+                return left * right
+            if right == 0:
+                self.division_by_zero(node)
+                return None
+            if operator == '/':
+                return left / right
+            if not (isinstance(left, int) and isinstance(right, int)):
+                return None
+            if operator == 'bagi':
+                return pascal_div(left, right)
+            return pascal_mod(left, right)
+
+        if operator in RELATIONAL_OPERATORS:
+            comparable = ((_is_number(left) and _is_number(right)) or
+                          (type(left) is type(right)))
+            if not comparable:
+                return None
+            if operator == '=':
+                return left == right
+            if operator == '<>':
+                return left != right
+            if operator == '<':
+                return left < right
+            if operator == '<=':
+                return left <= right
+            if operator == '>':
+                return left > right
+            return left >= right
+
+        if operator in LOGICAL_OPERATORS:
+            if not (isinstance(left, bool) and isinstance(right, bool)):
+                return None
+            return (left and right) if operator == 'dan' else (left or right)
+
+        return None
+
+    def division_by_zero(self, node: ASTNode):
+        if self.report is not None:
+            self.report("E304", self.first_token(node.children[1]))
+
+    def first_token(self, node: ASTNode) -> Optional[Token]:
+        # BinaryExpression tidak menyimpan token; ambil token terkiri di subtree
+        while node.token is None and node.children:
+            node = node.children[0]
+        return node.token
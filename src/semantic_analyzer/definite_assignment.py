@@ -0,0 +1,471 @@
+from __future__ import annotations
+from typing import List, Dict, Optional, Callable, Generator, Set, Union
+from .symbol_table import SymbolTable, ObjType, BaseType
+from .ast_nodes import *
+from .traversal import ASTWalker, SKIP, trampoline, walk
+
+# Definite-assignment analysis berbasis control-flow graph.
+# Setiap body (program utama dan setiap prosedur/fungsi) diubah menjadi CFG
+# dari basic block. Variabel yang dilacak diberi nomor bit berdasarkan urutan
+# tab index, sehingga himpunan "pasti sudah di-assign" cukup disimpan sebagai
+# integer bitset. Di titik join himpunan di-AND, dan loop diiterasi sampai
+# fixpoint.
+# Variabel larik tidak dilacak: store per elemen (a[i] := ...) mengisi
+# sebagian larik dan biasanya terjadi di dalam loop, sehingga tidak bisa
+# dimodelkan sebagai satu definisi.
+#
+# Pemanggilan subprogram dicatat sebagai event CALL dan baru diselesaikan
+# setelah semua body dibangun, karena ringkasan callee (variabel non-lokal
+# yang mungkin di-assign, di level mana pun) bisa berasal dari prosedur
+# nested atau rekursif yang dibangun belakangan.
+
+USE = 0
+DEF = 1
+CALL = 2
+
+BUILTIN_PROCEDURES = ("writeln", "readln", "write", "read")
+READ_PROCEDURES = ("read", "readln")
+
+
+class BasicBlock:
+    __slots__ = ("index", "events", "succs", "preds")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.events: List[tuple] = []   # (USE/DEF, bit, node) sesuai urutan eksekusi
+        self.succs: List[BasicBlock] = []
+        self.preds: List[BasicBlock] = []
+
+    def gen(self) -> int:
+        mask = 0
+        for kind, bit, _ in self.events:
+            if kind == DEF:
+                mask |= bit
+        return mask
+
+    def resolve_calls(self, call_defs: Callable[[int], int]):
+        # CALL -> DEF dengan bitmask variabel yang di-assign callee
+        self.events = [(DEF, call_defs(value), None) if kind == CALL else (kind, value, node)
+                       for kind, value, node in self.events]
+
+
+class ControlFlowGraph:
+    def __init__(self):
+        self.blocks: List[BasicBlock] = []
+        self.entry = self.new_block()
+
+    def new_block(self) -> BasicBlock:
+        block = BasicBlock(len(self.blocks))
+        self.blocks.append(block)
+        return block
+
+    def connect(self, source: BasicBlock, target: BasicBlock):
+        source.succs.append(target)
+        target.preds.append(source)
+
+    def reverse_postorder(self) -> List[BasicBlock]:
+        order = []
+        visited = {self.entry.index}
+        stack = [(self.entry, 0)]
+        while stack:
+            block, i = stack.pop()
+            if i < len(block.succs):
+                stack.append((block, i + 1))
+                succ = block.succs[i]
+                if succ.index not in visited:
+                    visited.add(succ.index)
+                    stack.append((succ, 0))
+            else:
+                order.append(block)
+        order.reverse()
+        return order
+
+
+class CFGBuilder:
+    # Handler statement majemuk berupa generator: "exit = yield self.build_statement(...)"
+    # membangun statement anak lewat trampoline tanpa rekursi Python. Statement
+    # sederhana langsung mengembalikan block keluarnya. Satu builder dipakai
+    # ulang untuk semua body; state per body di-reset oleh build().
+    def __init__(self, symbol_table: SymbolTable):
+        self.symbol_table = symbol_table
+        self.tracked: Dict[int, int] = {}     # tab index -> bit
+        self.level = 0                        # Level variabel lokal body ini
+        self.cfg = ControlFlowGraph()
+        # Efek samping body ini (untuk ringkasan prosedur/fungsi)
+        self.assigned_nonlocals: Set[int] = set()
+        self.callees: Set[int] = set()
+
+        self.statement_handlers: Dict[NodeKind, Callable[[ASTNode, BasicBlock], Union[Generator, BasicBlock]]] = {
+            NodeKind.ASSIGNMENT: self.build_assignment,
+            NodeKind.PROCEDURE_CALL: self.build_procedure_call,
+            NodeKind.COMPOUND_STATEMENT: self.build_sequence,
+            NodeKind.STATEMENT_LIST: self.build_sequence,
+            NodeKind.IF_STATEMENT: self.build_if,
+            NodeKind.WHILE_STATEMENT: self.build_while,
+            NodeKind.FOR_STATEMENT: self.build_for,
+            NodeKind.REPEAT_STATEMENT: self.build_repeat,
+            NodeKind.STATEMENT: self.build_empty,
+        }
+        # Use variabel dicatat setelah index expressions-nya, call setelah argumennya
+        self.current_block: Optional[BasicBlock] = None
+        self.expression_walker = ASTWalker(leave={
+            VariableNode: self.visit_variable,
+            NodeKind.FUNCTION_CALL: self.visit_function_call,
+        })
+
+    def build(self, body: ASTNode, tracked: Dict[int, int], level: int) -> ControlFlowGraph:
+        self.tracked = tracked
+        self.level = level
+        self.cfg = ControlFlowGraph()
+        self.assigned_nonlocals = set()
+        self.callees = set()
+        trampoline(self.build_statement(body, self.cfg.entry))
+        return self.cfg
+
+    # ---------- Events ----------
+
+    def add_use(self, var_node: VariableNode, block: BasicBlock):
+        bit = self.tracked.get(var_node.tab_index)
+        if bit is not None:
+            block.events.append((USE, bit, var_node))
+
+    def add_def(self, tab_index: int, block: BasicBlock, node: ASTNode = None):
+        if tab_index < 0:
+            return
+        bit = self.tracked.get(tab_index)
+        if bit is not None:
+            block.events.append((DEF, bit, node))
+        entry = self.symbol_table.tab[tab_index]
+        if entry is not None and entry.obj == ObjType.VARIABLE and entry.lev < self.level:
+            self.assigned_nonlocals.add(tab_index)
+
+    def add_call(self, callee_idx: int, block: BasicBlock):
+        if callee_idx is None or callee_idx < 0:
+            return
+        self.callees.add(callee_idx)
+        block.events.append((CALL, callee_idx, None))
+
+    def build_expression(self, expr: ASTNode, block: BasicBlock):
+        # Ekspresi daun (variabel sederhana, literal) tidak perlu walker
+        if not expr.children and not expr.index_expressions:
+            if isinstance(expr, VariableNode):
+                self.add_use(expr, block)
+            elif isinstance(expr, FunctionCallNode):
+                self.add_call(expr.tab_index, block)
+            return
+        self.current_block = block
+        self.expression_walker.walk(expr)
+
+    def build_index_expressions(self, var_node: VariableNode, block: BasicBlock):
+        for index_expr in var_node.index_expressions:
+            self.build_expression(index_expr, block)
+
+    def visit_variable(self, var_node: VariableNode):
+        self.add_use(var_node, self.current_block)
+
+    def visit_function_call(self, call: ASTNode):
+        self.add_call(call.tab_index, self.current_block)
+
+    # ---------- Statements ----------
+
+    def build_statement(self, stmt: ASTNode, block: BasicBlock) -> Union[Generator, BasicBlock]:
+        handler = self.statement_handlers.get(stmt.node_type)
+        if handler is not None:
+            return handler(stmt, block)
+        return self.build_unknown(stmt, block)
+
+    def build_empty(self, stmt: ASTNode, block: BasicBlock) -> BasicBlock:
+        return block
+
+    def build_sequence(self, stmt: ASTNode, block: BasicBlock) -> Generator:
+        for child in stmt.children:
+            block = yield self.build_statement(child, block)
+        return block
+
+    def build_assignment(self, stmt: ASTNode, block: BasicBlock) -> BasicBlock:
+        if len(stmt.children) >= 2:
+            target, value = stmt.children[0], stmt.children[1]
+            self.build_expression(value, block)
+            if isinstance(target, VariableNode):
+                self.build_index_expressions(target, block)
+                self.add_def(target.tab_index, block, target)
+        return block
+
+    def build_procedure_call(self, stmt: ProcedureCallNode, block: BasicBlock) -> BasicBlock:
+        name = stmt.procedure_name.lower()
+        user_defined = stmt.is_user_defined and name not in BUILTIN_PROCEDURES
+        for arg in stmt.children:
+            if name in READ_PROCEDURES and isinstance(arg, VariableNode):
+                # read/readln mengisi argumennya
+                self.build_index_expressions(arg, block)
+                self.add_def(arg.tab_index, block, arg)
+            elif user_defined and isinstance(arg, VariableNode):
+                # Argumen variabel ke prosedur user dianggap bisa diisi (by-reference)
+                self.add_def(arg.tab_index, block, arg)
+            else:
+                self.build_expression(arg, block)
+        if user_defined:
+            self.add_call(stmt.tab_index, block)
+        return block
+
+    def build_if(self, stmt: ASTNode, block: BasicBlock) -> Generator:
+        if not stmt.children:
+            return block
+        self.build_expression(stmt.children[0], block)
+        join = self.cfg.new_block()
+
+        branches = stmt.children[1:3]
+        for branch in branches:
+            branch_entry = self.cfg.new_block()
+            self.cfg.connect(block, branch_entry)
+            branch_exit = yield self.build_statement(branch, branch_entry)
+            self.cfg.connect(branch_exit, join)
+        if len(branches) < 2:
+            # Tanpa selainitu: kondisi salah langsung ke join
+            self.cfg.connect(block, join)
+        return join
+
+    def build_while(self, stmt: ASTNode, block: BasicBlock) -> Generator:
+        header = self.cfg.new_block()
+        self.cfg.connect(block, header)
+        if stmt.children:
+            self.build_expression(stmt.children[0], header)
+
+        body_entry = self.cfg.new_block()
+        self.cfg.connect(header, body_entry)
+        body_exit = body_entry
+        if len(stmt.children) > 1:
+            body_exit = yield self.build_statement(stmt.children[1], body_entry)
+        self.cfg.connect(body_exit, header)
+
+        exit_block = self.cfg.new_block()
+        self.cfg.connect(header, exit_block)
+        return exit_block
+
+    def build_for(self, stmt: ASTNode, block: BasicBlock) -> Generator:
+        if len(stmt.children) < 3:
+            return (yield self.build_unknown(stmt, block))
+        counter, start, end = stmt.children[0], stmt.children[1], stmt.children[2]
+        self.build_expression(start, block)
+        self.build_expression(end, block)
+        if isinstance(counter, VariableNode):
+            self.add_def(counter.tab_index, block, counter)
+
+        header = self.cfg.new_block()
+        self.cfg.connect(block, header)
+        body_entry = self.cfg.new_block()
+        self.cfg.connect(header, body_entry)
+        body_exit = body_entry
+        if len(stmt.children) > 3:
+            body_exit = yield self.build_statement(stmt.children[3], body_entry)
+        self.cfg.connect(body_exit, header)
+
+        exit_block = self.cfg.new_block()
+        self.cfg.connect(header, exit_block)
+        return exit_block
+
+    def build_repeat(self, stmt: ASTNode, block: BasicBlock) -> Generator:
+        # Body ulangi selalu dieksekusi minimal sekali
+        body_entry = self.cfg.new_block()
+        self.cfg.connect(block, body_entry)
+        body_exit = body_entry
+        if stmt.children:
+            body_exit = yield self.build_statement(stmt.children[0], body_entry)
+
+        condition = self.cfg.new_block()
+        self.cfg.connect(body_exit, condition)
+        if len(stmt.children) > 1:
+            self.build_expression(stmt.children[1], condition)
+        self.cfg.connect(condition, body_entry)
+
+        exit_block = self.cfg.new_block()
+        self.cfg.connect(condition, exit_block)
+        return exit_block
+
+    def build_unknown(self, stmt: ASTNode, block: BasicBlock) -> Generator:
+        # Statement yang tidak dikenal (mis. kasus): isinya dianggap mungkin
+        # dieksekusi, jadi use tetap dicek tetapi def tidak dijamin setelahnya.
+        maybe = self.cfg.new_block()
+        self.cfg.connect(block, maybe)
+        maybe_exit = maybe
+        for child in stmt.children:
+            if child.node_type in self.statement_handlers:
+                maybe_exit = yield self.build_statement(child, maybe_exit)
+            else:
+                self.build_expression(child, maybe_exit)
+        join = self.cfg.new_block()
+        self.cfg.connect(block, join)
+        self.cfg.connect(maybe_exit, join)
+        return join
+
+
+def solve_definitely_assigned(cfg: ControlFlowGraph, universe: int) -> Dict[int, int]:
+    # IN[b] = AND(OUT[p]) untuk semua predecessor, OUT[b] = IN[b] | GEN[b]
+    order = cfg.reverse_postorder()
+    gen = {block.index: block.gen() for block in order}
+    in_sets = {block.index: universe for block in order}
+    out_sets = {block.index: universe for block in order}
+    in_sets[cfg.entry.index] = 0
+
+    changed = True
+    while changed:
+        changed = False
+        for block in order:
+            if block is cfg.entry:
+                in_set = 0
+            else:
+                in_set = universe
+                for pred in block.preds:
+                    if pred.index in out_sets:
+                        in_set &= out_sets[pred.index]
+            out_set = in_set | gen[block.index]
+            if out_set != out_sets[block.index] or in_set != in_sets[block.index]:
+                in_sets[block.index] = in_set
+                out_sets[block.index] = out_set
+                changed = True
+    return in_sets
+
+
+class DefiniteAssignmentAnalysis:
+    def __init__(self, symbol_table: SymbolTable, report: Callable[..., None]):
+        self.symbol_table = symbol_table
+        self.report = report
+        # Ringkasan: variabel non-lokal yang (mungkin) di-assign oleh setiap prosedur/fungsi
+        self.nonlocal_defs: Dict[int, Set[int]] = {}
+        self.callees: Dict[int, Set[int]] = {}
+        self.levels: Dict[int, int] = {}    # tab index subprogram -> level variabel lokalnya
+        self.builder = CFGBuilder(symbol_table)
+
+    def run(self, program: ASTNode):
+        if program is None:
+            return
+        bodies = []
+        self.collect_bodies(program, bodies)
+
+        # Semua CFG dibangun lebih dulu; event CALL diselesaikan setelah
+        # ringkasan ditutup terhadap call graph
+        graphs = []
+        for subprogram_idx, block_idx, body in bodies:
+            if subprogram_idx is not None:
+                level = self.symbol_table.tab[subprogram_idx].lev + 1
+                variables = self.local_variables(block_idx)
+            else:
+                level = 0
+                variables = self.global_variables()
+            tracked = {tab_index: 1 << bit for bit, tab_index in enumerate(variables)}
+            cfg = self.builder.build(body, tracked, level)
+            if subprogram_idx is not None:
+                self.nonlocal_defs[subprogram_idx] = self.builder.assigned_nonlocals
+                self.callees[subprogram_idx] = self.builder.callees
+                self.levels[subprogram_idx] = level
+            graphs.append((subprogram_idx, block_idx, variables, tracked, cfg))
+        self.propagate_summaries()
+
+        # Subprogram dilaporkan lebih dulu, lalu program utama
+        graphs.sort(key=lambda graph: graph[0] is None)
+        for subprogram_idx, block_idx, variables, tracked, cfg in graphs:
+            self.analyze_body(block_idx, variables, tracked, cfg)
+
+    def collect_bodies(self, program: ASTNode, bodies: List[tuple]):
+        # Body (CompoundStatement langsung di bawah program/Block subprogram)
+        # dicatat saat induknya di-enter lalu tidak diturunkan
+        def enter_subprogram(node: ASTNode):
+            if node.tab_index < 0:
+                return
+            entry = self.symbol_table.tab[node.tab_index]
+            for child in node.children:
+                if child.node_type == NodeKind.BLOCK:
+                    for part in child.children:
+                        if part.node_type == NodeKind.COMPOUND_STATEMENT:
+                            bodies.append((node.tab_index, entry.block_index, part))
+
+        def enter_program(node: ASTNode):
+            for child in node.children:
+                if child.node_type == NodeKind.COMPOUND_STATEMENT:
+                    bodies.append((None, child.block_index, child))
+
+        def skip_body(node: ASTNode):
+            return SKIP
+
+        walk(program, enter={
+            ProgramNode: enter_program,
+            NodeKind.PROCEDURE_DECLARATION: enter_subprogram,
+            NodeKind.FUNCTION_DECLARATION: enter_subprogram,
+            NodeKind.COMPOUND_STATEMENT: skip_body,
+        })
+
+    def local_variables(self, block_idx: int) -> List[int]:
+        tab = self.symbol_table.tab
+        result = []
+        if 0 <= block_idx < len(self.symbol_table.btab):
+            current_idx = self.symbol_table.btab[block_idx].last
+            while current_idx >= self.symbol_table.user_id_start:
+                entry = tab[current_idx]
+                if entry is None:
+                    break
+                if self.is_tracked(entry):
+                    result.append(current_idx)
+                current_idx = entry.link
+        return sorted(result)
+
+    def global_variables(self) -> List[int]:
+        tab = self.symbol_table.tab
+        return [i for i in range(self.symbol_table.user_id_start, len(tab))
+                if tab[i] is not None and tab[i].lev == 0 and self.is_tracked(tab[i])]
+
+    @staticmethod
+    def is_tracked(entry) -> bool:
+        # Variabel skalar non-parameter; larik tidak dilacak (lihat header)
+        return entry.obj == ObjType.VARIABLE and not entry.is_param and entry.type != BaseType.ARRAY.value
+
+    def propagate_summaries(self):
+        # Efek transitif: jika P memanggil Q, variabel yang di-assign Q dan
+        # non-lokal bagi P juga dihitung untuk P
+        tab = self.symbol_table.tab
+        changed = True
+        while changed:
+            changed = False
+            for caller, callees in self.callees.items():
+                summary = self.nonlocal_defs[caller]
+                level = self.levels[caller]
+                before = len(summary)
+                for callee in callees:
+                    for tab_index in self.nonlocal_defs.get(callee, ()):
+                        if tab[tab_index].lev < level:
+                            summary.add(tab_index)
+                if len(summary) != before:
+                    changed = True
+
+    def call_defs(self, tracked: Dict[int, int]) -> Callable[[int], int]:
+        def defs(callee_idx: int) -> int:
+            mask = 0
+            for tab_index in self.nonlocal_defs.get(callee_idx, ()):
+                mask |= tracked.get(tab_index, 0)
+            return mask
+        return defs
+
+    def analyze_body(self, block_idx: int, variables: List[int], tracked: Dict[int, int],
+                     cfg: ControlFlowGraph):
+        if not tracked:
+            return
+        call_defs = self.call_defs(tracked)
+        for block in cfg.blocks:
+            block.resolve_calls(call_defs)
+
+        universe = (1 << len(variables)) - 1
+        in_sets = solve_definitely_assigned(cfg, universe)
+        uninitialized = []
+        for block in cfg.blocks:
+            if block.index not in in_sets:
+                continue  # unreachable
+            state = in_sets[block.index]
+            for kind, bit, node in block.events:
+                if kind == DEF:
+                    state |= bit
+                elif not state & bit:
+                    uninitialized.append(node)
+
+        uninitialized.sort(key=lambda n: (n.token.line, n.token.column) if n.token else (0, 0))
+        for var_node in uninitialized:
+            self.report("E401", var_node.token, symbol=var_node.identifier, scope=block_idx,
+                        name=var_node.identifier)
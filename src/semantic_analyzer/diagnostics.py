@@ -0,0 +1,156 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from enum import Enum
+import json
+from src.tokens import Token
+
+# Diagnostic terstruktur untuk semantic analysis.
+# Setiap diagnostic menyimpan code stabil, severity, span, dan argumen mentah;
+# pesan baru diformat saat dicetak/diekspor. DiagnosticBag membuang duplikat
+# per (code, symbol, scope) dan membatasi jumlah diagnostic per file.
+
+class Severity(Enum):
+    ERROR = "error"
+    WARNING = "warning"
+
+
+# Code stabil -> template pesan. Jangan mengubah arti code yang sudah ada;
+# tambahkan code baru untuk jenis diagnostic baru.
+MESSAGES: Dict[str, str] = {
+    # Resolusi nama
+    "E101": "Undefined identifier '{name}'",
+    "E102": "Undefined variable '{name}'",
+    "E103": "Undefined type '{name}'",
+    "E104": "Undefined function/procedure '{name}'",
+    "E105": "Undefined procedure '{name}'",
+    "E106": "Duplicate identifier '{name}'",
+    "E107": "'{name}' is not a function or procedure",
+    "E108": "'{name}' is not an array or undefined",
+    # Tipe dan pemanggilan
+    "E201": "Type mismatch in assignment: cannot assign {source} to {target}",
+    "E202": "Type mismatch in array assignment: cannot assign {source} to array element of type {target}",
+    "E203": "Parameter type mismatch in {name}: parameter {position} ({param}) expects {expected}, got {actual}",
+    "E204": "Parameter count mismatch in {name}: expected {expected}, got {actual}",
+    "E205": "Cannot find parameter information for '{name}'",
+    "E206": "Cannot assign to constant '{name}'",
+    "E207": "Unary '{operator}' requires numeric operand, got {actual}",
+    "E208": "Relational operator '{operator}' cannot follow another comparison; parenthesize each comparison",
+    "E209": "Logical operator '{operator}' requires boolean operands, got {actual}",
+    # Array dan ekspresi konstan
+    "E301": "Invalid array bounds: {low}..{high} (lower bound > upper bound)",
+    "E302": "Invalid array bounds: lower bound ({low}) > upper bound ({high})",
+    "E303": "Array index out of bounds: {index} not in range {low}..{high}",
+    "E304": "Division by zero in constant expression",
+    # Alur data
+    "E401": "Variable '{name}' might be used before initialization",
+    # Bug di analyzer
+    "E900": "Internal error while analyzing {rule}: {exception}",
+    "E901": "Program nesting too deep to analyze",
+}
+
+DEFAULT_MAX_DIAGNOSTICS = 100
+
+
+class Span:
+    __slots__ = ("line", "column")
+
+    def __init__(self, line: int, column: int):
+        self.line = line
+        self.column = column
+
+    @classmethod
+    def from_token(cls, token: Optional[Token]) -> Optional[Span]:
+        return cls(token.line, token.column) if token else None
+
+
+class Diagnostic:
+    __slots__ = ("code", "severity", "span", "args", "key")
+
+    def __init__(self, code: str, severity: Severity, span: Optional[Span], args: Dict[str, Any],
+                 key: Optional[tuple] = None):
+        self.code = code
+        self.severity = severity
+        self.span = span
+        self.args = args
+        self.key = key      # (code, symbol, scope) untuk deduplikasi; None = selalu dilaporkan
+
+    @property
+    def message(self) -> str:
+        return MESSAGES[self.code].format(**self.args)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "code": self.code,
+            "severity": self.severity.value,
+            "line": self.span.line if self.span else None,
+            "column": self.span.column if self.span else None,
+            "message": self.message,
+            "args": {name: str(value) for name, value in self.args.items()},
+        }
+
+    def __str__(self):
+        kind = "Error" if self.severity == Severity.ERROR else "Warning"
+        location = f" at line {self.span.line}, column {self.span.column}" if self.span else ""
+        return f"Semantic {kind}{location}: {self.message}"
+
+    def __repr__(self):
+        return f"Diagnostic({self.code}, {self.span.line if self.span else '?'}:{self.span.column if self.span else '?'})"
+
+
+class DiagnosticBag:
+    def __init__(self, max_diagnostics: Optional[int] = DEFAULT_MAX_DIAGNOSTICS):
+        self.max_diagnostics = max_diagnostics
+        self.diagnostics: List[Diagnostic] = []
+        self.suppressed = 0     # Diagnostic yang dibuang karena melewati batas
+        self.seen: set = set()  # Kunci (code, symbol, scope) yang sudah dilaporkan
+
+    def add(self, code: str, token: Optional[Token] = None, symbol: Optional[str] = None,
+            scope: Any = None, severity: Severity = Severity.ERROR, **args) -> Optional[Diagnostic]:
+        key = (code, symbol, scope) if symbol is not None else None
+        if not self.accept(key):
+            return None
+        diagnostic = Diagnostic(code, severity, Span.from_token(token), args, key)
+        self.diagnostics.append(diagnostic)
+        return diagnostic
+
+    def accept(self, key: Optional[tuple]) -> bool:
+        # Diagnostic per simbol cukup dilaporkan sekali per scope
+        if key is not None:
+            if key in self.seen:
+                return False
+            self.seen.add(key)
+        if self.max_diagnostics is not None and len(self.diagnostics) >= self.max_diagnostics:
+            self.suppressed += 1
+            return False
+        return True
+
+    def extend(self, diagnostics: Iterable[Diagnostic]):
+        # Dipakai saat menggabungkan hasil analisis paralel; dedup dan batas
+        # diterapkan ulang sesuai urutan akhir
+        for diagnostic in diagnostics:
+            if self.accept(diagnostic.key):
+                self.diagnostics.append(diagnostic)
+
+    def clear(self):
+        self.diagnostics.clear()
+        self.seen.clear()
+        self.suppressed = 0
+
+    def __len__(self) -> int:
+        return len(self.diagnostics)
+
+    def __iter__(self) -> Iterator[Diagnostic]:
+        return iter(self.diagnostics)
+
+    def __getitem__(self, index):
+        return self.diagnostics[index]
+
+    def __bool__(self) -> bool:
+        return bool(self.diagnostics)
+
+    def to_json(self, file_name: Optional[str] = None, indent: Optional[int] = 2) -> str:
+        return json.dumps({
+            "file": file_name,
+            "diagnostics": [diagnostic.to_dict() for diagnostic in self.diagnostics],
+            "suppressed": self.suppressed,
+        }, indent=indent)
@@ -0,0 +1,272 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import accumulate
+import pickle
+from src.parse_tree import ParseNode
+from .symbol_table import SymbolTableSnapshot, TabEntry, BlockEntry, ArrayEntry, ObjType, BaseType
+from .ast_nodes import *
+from .diagnostics import Diagnostic
+from .traversal import walk
+
+# Analisis paralel body prosedur/fungsi level teratas.
+# Fase 1 (sequential): deklarasi global, header dan signature setiap subprogram,
+# serta program utama dianalisis seperti biasa, tetapi body subprogram level
+# teratas ditunda (DeferredBody).
+# Fase 2: setiap body dianalisis di worker terhadap fork dari snapshot SymbolTable
+# hasil fase 1. Entry baru di tab/btab/atab worker bernomor mulai dari ukuran snapshot.
+# Fase 3: hasil worker digabung sesuai urutan deklarasi. Entry baru setiap body
+# disisipkan di posisi tab/btab/atab/adr saat body ditunda dan entry fase 1
+# sesudahnya digeser, sehingga penomoran akhir sama dengan analisis
+# sequential; error disisipkan di posisi yang sama dengan analisis sequential.
+
+
+class DeferredBody:
+    __slots__ = ("decl_node", "block_node", "tab_index", "block_index", "error_position", "marks")
+
+    def __init__(self, decl_node: ASTNode, block_node: ParseNode, tab_index: int,
+                 block_index: int, error_position: int, marks: Tuple[int, int, int, int]):
+        self.decl_node = decl_node            # ProcedureDeclaration/FunctionDeclaration AST
+        self.block_node = block_node          # <block> parse node yang ditunda
+        self.tab_index = tab_index            # Entry subprogram di tab
+        self.block_index = block_index        # Block subprogram di btab
+        self.error_position = error_position  # len(errors) saat body ditunda
+        self.marks = marks                    # (next_user_id, len(btab), len(atab), next_adr) saat ditunda
+
+
+class Relocation:
+    # Pemetaan satu penomoran (tab, btab, atab atau adr) ke urutan sequential:
+    # entry baru body ke-k menempati posisi marks[k], entry fase 1 mulai dari
+    # marks[k] bergeser sebesar total ukuran body sebelumnya
+    __slots__ = ("base", "marks", "shifts")
+
+    def __init__(self, base: int, marks: List[int], sizes: List[int]):
+        self.base = base                                    # Ukuran fase 1; index worker >= base adalah entry baru
+        self.marks = marks                                  # Tidak turun (urutan deklarasi)
+        self.shifts = list(accumulate(sizes, initial=0))    # shifts[k]: total ukuran body sebelum body k
+
+    @property
+    def total(self) -> int:
+        return self.base + self.shifts[-1]
+
+    def phase1(self, index: int) -> int:
+        return index + self.shifts[bisect_right(self.marks, index)]
+
+    def body(self, k: int, index: int) -> int:
+        if index < self.base:
+            return self.phase1(index)
+        return self.marks[k] + self.shifts[k] + index - self.base
+
+
+class BodyResult:
+    __slots__ = ("block_ast", "errors", "tab", "btab", "atab", "own_block",
+                 "const_values", "adr_used")
+
+    def __init__(self, block_ast: ASTNode, errors: List[Diagnostic], tab: List[Optional[TabEntry]],
+                 btab: List[BlockEntry], atab: List[ArrayEntry], own_block: BlockEntry,
+                 const_values: Dict[str, Any], adr_used: int):
+        self.block_ast = block_ast
+        self.errors = errors
+        self.tab = tab                    # Entry tab baru, mulai dari snapshot.next_user_id
+        self.btab = btab                  # Block baru, mulai dari len(snapshot.btab)
+        self.atab = atab                  # Array baru, mulai dari len(snapshot.atab)
+        self.own_block = own_block        # BlockEntry subprogram setelah body dianalisis
+        self.const_values = const_values  # Konstanta lokal yang ditambahkan body
+        self.adr_used = adr_used          # Jumlah alamat yang dialokasikan body
+
+
+# State milik proses worker, dikirim sekali lewat initializer: snapshot
+# SymbolTable hasil fase 1 dan (block_node, tab_index, block_index) setiap body.
+# Task yang dikirim per body cukup berupa index ke daftar ini.
+_base_table: Optional[SymbolTableSnapshot] = None
+_bodies: List[tuple] = []
+
+
+def _init_worker(snapshot: bytes, bodies: List[tuple]):
+    global _base_table, _bodies
+    _base_table = pickle.loads(snapshot)
+    _bodies = bodies
+
+
+def analyze_body(task: int) -> BodyResult:
+    from .semantic_analyzer import SemanticAnalyzer
+
+    block_node, tab_index, block_index = _bodies[task]
+    # Fork copy-on-write: hanya entry yang diubah body (block global dan block
+    # subprogram) yang disalin
+    table = _base_table.fork()
+    base_next_id = table.next_user_id
+    base_btab = len(table.btab)
+    base_atab = len(table.atab)
+    base_adr = table.next_adr
+    base_consts = _base_table.const_values
+
+    # Hanya deklarasi global sampai subprogram ini yang terlihat, sama seperti
+    # saat body dianalisis secara sequential (link chain berjalan mundur)
+    global_block = table.display[0]
+    table.writable_block(global_block).last = tab_index
+    table.display = [global_block, block_index]
+    table.level = 1
+
+    # Batas diagnostic baru diterapkan saat merge
+    analyzer = SemanticAnalyzer(max_diagnostics=None)
+    analyzer.symbol_table = table
+    block_ast = analyzer.visit(block_node)
+    analyzer.report_nesting_overflow()
+    block_ast.block_index = block_index
+
+    const_values = {name: value for name, value in table.const_values.items()
+                    if name not in base_consts or base_consts[name] is not value}
+    return BodyResult(block_ast, analyzer.errors.diagnostics,
+                      table.tab[base_next_id:table.next_user_id],
+                      table.btab[base_btab:], table.atab[base_atab:],
+                      table.btab[block_index], const_values,
+                      table.next_adr - base_adr)
+
+
+class ParallelBodyAnalysis:
+    def __init__(self, analyzer, jobs: int, max_diagnostics: Optional[int]):
+        self.analyzer = analyzer
+        self.jobs = jobs
+        self.max_diagnostics = max_diagnostics  # Batas diagnostic yang berlaku setelah merge
+
+    def run(self, bodies: List[DeferredBody]):
+        table = self.analyzer.symbol_table
+        snapshot = pickle.dumps(table.snapshot(), protocol=pickle.HIGHEST_PROTOCOL)
+        worker_bodies = [(body.block_node, body.tab_index, body.block_index) for body in bodies]
+        tasks = range(len(worker_bodies))
+
+        if self.jobs > 1 and len(tasks) > 1:
+            chunksize = max(1, len(tasks) // (self.jobs * 4))
+            with ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker,
+                                     initargs=(snapshot, worker_bodies)) as pool:
+                results = list(pool.map(analyze_body, tasks, chunksize=chunksize))
+        else:
+            _init_worker(snapshot, worker_bodies)
+            results = [analyze_body(task) for task in tasks]
+
+        # Merge sesuai urutan deklarasi supaya hasil deterministik. Fase 1 berjalan
+        # tanpa batas diagnostic; dedup dan batas diterapkan ulang di urutan akhir.
+        self.merge(bodies, results)
+        merged_errors = []
+        consumed = 0
+        errors = self.analyzer.errors
+        for body, result in zip(bodies, results):
+            merged_errors.extend(errors[consumed:body.error_position])
+            merged_errors.extend(result.errors)
+            consumed = body.error_position
+        merged_errors.extend(errors[consumed:])
+        errors.clear()
+        errors.max_diagnostics = self.max_diagnostics
+        errors.extend(merged_errors)
+
+    def merge(self, bodies: List[DeferredBody], results: List[BodyResult]):
+        analyzer = self.analyzer
+        table = analyzer.symbol_table
+        tabs = Relocation(table.next_user_id, [body.marks[0] for body in bodies],
+                          [len(result.tab) for result in results])
+        btabs = Relocation(len(table.btab), [body.marks[1] for body in bodies],
+                           [len(result.btab) for result in results])
+        atabs = Relocation(len(table.atab), [body.marks[2] for body in bodies],
+                           [len(result.atab) for result in results])
+        adrs = Relocation(table.next_adr, [body.marks[3] for body in bodies],
+                          [result.adr_used for result in results])
+        phase1 = (tabs.phase1, btabs.phase1, atabs.phase1, adrs.phase1)
+
+        # Entry fase 1 disalin (bisa dipakai bersama snapshot) lalu dipindah;
+        # AST fase 1 direlokasi sebelum body dipasang
+        tab: List[Optional[TabEntry]] = [None] * tabs.total
+        tab[:table.user_id_start] = table.tab[:table.user_id_start]
+        for index in range(table.user_id_start, table.next_user_id):
+            entry = table.tab[index]
+            if entry is not None:
+                entry = entry.copy()
+                self.relocate_entry(entry, *phase1)
+            tab[tabs.phase1(index)] = entry
+        btab: List[Optional[BlockEntry]] = [None] * btabs.total
+        for index, block in enumerate(table.btab):
+            block = block.copy()
+            self.relocate_block(block, tabs.phase1)
+            btab[btabs.phase1(index)] = block
+        atab: List[Optional[ArrayEntry]] = [None] * atabs.total
+        for index, array in enumerate(table.atab):
+            array = array.copy()
+            self.relocate_array(array, atabs.phase1)
+            atab[atabs.phase1(index)] = array
+        self.relocate_ast(analyzer.current_ast, tabs.phase1, btabs.phase1, atabs.phase1)
+        self.relocate_errors(analyzer.errors, btabs.phase1)
+
+        for k, (body, result) in enumerate(zip(bodies, results)):
+            relocations = (partial(tabs.body, k), partial(btabs.body, k), partial(atabs.body, k),
+                           partial(adrs.body, k))
+            tab_index, btab_index, atab_index, _ = relocations
+            for position, entry in enumerate(result.tab):
+                if entry is not None:
+                    self.relocate_entry(entry, *relocations)
+                tab[tab_index(tabs.base + position)] = entry
+            self.relocate_block(result.own_block, tab_index)
+            btab[btabs.phase1(body.block_index)] = result.own_block
+            for position, block in enumerate(result.btab):
+                self.relocate_block(block, tab_index)
+                btab[btab_index(btabs.base + position)] = block
+            for position, array in enumerate(result.atab):
+                self.relocate_array(array, atab_index)
+                atab[atab_index(atabs.base + position)] = array
+            for name, value in result.const_values.items():
+                table.set_constant(name, value)
+            self.relocate_ast(result.block_ast, tab_index, btab_index, atab_index)
+            self.relocate_errors(result.errors, btab_index)
+            body.decl_node.add_child(result.block_ast)
+
+        # Tabel awal berisi seluruh PRELUDE; sisa entry di atas next_user_id tetap ada
+        tab.extend(table.tab[len(tab):])
+        table.tab, table.btab, table.atab = tab, btab, atab
+        table.display = [btabs.phase1(index) for index in table.display]
+        table.next_user_id = tabs.total
+        table.next_adr = adrs.total
+        # Semua entry dianggap dipakai bersama: perubahan berikutnya menyalin dulu
+        table.shared_tab, table.shared_btab, table.shared_atab = len(tab), len(btab), len(atab)
+        table.owned_tab, table.owned_btab, table.owned_atab = set(), set(), set()
+
+    def relocate_entry(self, entry: TabEntry, tab_index: Callable[[int], int], btab_index: Callable[[int], int],
+                       atab_index: Callable[[int], int], adr: Callable[[int], int]):
+        entry.link = tab_index(entry.link)
+        entry.block_index = btab_index(entry.block_index) if entry.block_index >= 0 else -1
+        if entry.type == BaseType.ARRAY.value:
+            entry.ref = atab_index(entry.ref)
+        if entry.obj == ObjType.VARIABLE:
+            entry.adr = adr(entry.adr)
+
+    def relocate_block(self, block: BlockEntry, tab_index: Callable[[int], int]):
+        block.last = tab_index(block.last)
+        block.lpar = tab_index(block.lpar)
+
+    def relocate_array(self, array: ArrayEntry, atab_index: Callable[[int], int]):
+        # eref 0 untuk elemen non-array bukan index atab
+        if array.element_type == BaseType.ARRAY.value:
+            array.eref = atab_index(array.eref)
+
+    def relocate_errors(self, diagnostics, btab_index: Callable[[int], int]):
+        # Key dedup memuat block aktif (scope)
+        for diagnostic in diagnostics:
+            key = diagnostic.key
+            if key is not None and isinstance(key[2], int) and not isinstance(key[2], bool):
+                diagnostic.key = (key[0], key[1], btab_index(key[2]))
+
+    def relocate_ast(self, root: ASTNode, tab_index, btab_index, atab_index):
+        def relocate(node: ASTNode):
+            # FunctionCall ke fungsi yang tidak terdefinisi menyimpan tab_index None
+            if node.tab_index is not None and node.tab_index >= 0:
+                node.tab_index = tab_index(node.tab_index)
+            if node.block_index >= 0:
+                node.block_index = btab_index(node.block_index)
+
+        def relocate_array_type(node: ASTNode):
+            if node.tab_index >= 0:
+                node.tab_index = atab_index(node.tab_index)
+            if node.block_index >= 0:
+                node.block_index = btab_index(node.block_index)
+
+        walk(root, enter={NodeKind.ARRAY_TYPE: relocate_array_type}, default_enter=relocate)
@@ -0,0 +1,591 @@
+from __future__ import annotations
+from typing import Dict, Generator, List, Optional, Set, Tuple, Union
+from .symbol_table import SymbolTable, ObjType, BaseType
+from .type_descriptors import ArrayType
+from .ast_nodes import *
+from .traversal import trampoline, walk, SKIP
+from .constant_folder import pascal_div
+
+# Range analysis untuk eliminasi cek batas array.
+# Setiap body dianalisis dengan abstract interpretation: environment memetakan
+# tab index variabel integer skalar ke interval (low, high), None berarti tak
+# terbatas; variabel yang tidak ada di environment bernilai sembarang, dan
+# environment None berarti titik program tidak tercapai. Assignment, batas loop
+# "untuk" dan kondisi jika/selama/sampai mempersempit interval; loop diiterasi
+# sampai fixpoint dengan widening. Akses arr[e] yang interval e-nya pasti di
+# dalam low..high atab ditandai di VariableNode.safe_indices, sehingga backend
+# meng-emit load/store tanpa cek batas.
+
+Interval = Tuple[Optional[int], Optional[int]]
+Env = Optional[Dict[int, Interval]]
+
+TOP: Interval = (None, None)
+
+# Jumlah iterasi loop sebelum bound yang masih berubah di-widen ke tak terbatas
+WIDEN_AFTER = 2
+
+RELATIONAL_OPERATORS = ('=', '<>', '<', '<=', '>', '>=')
+# Relasi setelah operand ditukar (e < x sama dengan x > e)
+SWAPPED = {'=': '=', '<>': '<>', '<': '>', '<=': '>=', '>': '<', '>=': '<='}
+# Relasi saat kondisi bernilai salah
+NEGATED = {'=': '<>', '<>': '=', '<': '>=', '<=': '>', '>': '<=', '>=': '<'}
+
+READ_PROCEDURES = ("read", "readln")
+BUILTIN_PROCEDURES = ("writeln", "readln", "write", "read")
+
+
+def _constant(value) -> Interval:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value, value
+    return TOP
+
+
+def _add(left: Interval, right: Interval) -> Interval:
+    low = None if left[0] is None or right[0] is None else left[0] + right[0]
+    high = None if left[1] is None or right[1] is None else left[1] + right[1]
+    return low, high
+
+
+def _neg(value: Interval) -> Interval:
+    return (None if value[1] is None else -value[1]), (None if value[0] is None else -value[0])
+
+
+def _mul(left: Interval, right: Interval) -> Interval:
+    if None in left or None in right:
+        return TOP
+    products = [a * b for a in left for b in right]
+    return min(products), max(products)
+
+
+def _div(left: Interval, divisor: int) -> Interval:
+    # "bagi" monoton terhadap dividend untuk pembagi konstan
+    low, high = (pascal_div(bound, divisor) if bound is not None else None for bound in left)
+    return (low, high) if divisor > 0 else (high, low)
+
+
+def _mod(left: Interval, divisor: int) -> Interval:
+    # Hasil mengikuti tanda dividend dan |hasil| < |pembagi|
+    limit = abs(divisor) - 1
+    low, high = left
+    if low is not None and low >= 0:
+        return 0, limit if high is None else min(limit, high)
+    if high is not None and high <= 0:
+        return -limit if low is None else max(-limit, low), 0
+    return -limit, limit
+
+
+def _hull(left: Interval, right: Interval) -> Interval:
+    low = None if left[0] is None or right[0] is None else min(left[0], right[0])
+    high = None if left[1] is None or right[1] is None else max(left[1], right[1])
+    return low, high
+
+
+def _intersect(left: Interval, right: Interval) -> Optional[Interval]:
+    # None jika irisan kosong
+    low = left[0] if right[0] is None else right[0] if left[0] is None else max(left[0], right[0])
+    high = left[1] if right[1] is None else right[1] if left[1] is None else min(left[1], right[1])
+    if low is not None and high is not None and low > high:
+        return None
+    return low, high
+
+
+def join(left: Env, right: Env) -> Env:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return {index: _hull(value, right[index]) for index, value in left.items() if index in right}
+
+
+def widen(old: Env, new: Env) -> Env:
+    # Bound yang masih bergerak dilepas supaya loop pasti mencapai fixpoint
+    if old is None or new is None:
+        return new
+    result = {}
+    for index, (low, high) in new.items():
+        if index not in old:
+            continue
+        old_low, old_high = old[index]
+        if low is not None and (old_low is None or low < old_low):
+            low = None
+        if high is not None and (old_high is None or high > old_high):
+            high = None
+        if low is not None or high is not None:
+            result[index] = (low, high)
+    return result
+
+
+class RangeAnalysis:
+    def __init__(self, symbol_table: SymbolTable):
+        self.symbol_table = symbol_table
+        self.tracked: Dict[int, bool] = {}
+        # Variabel yang di-assign dari subprogram selain block pemiliknya:
+        # nilainya tidak diketahui lagi setelah pemanggilan prosedur/fungsi
+        self.clobbered: Set[int] = set()
+        # Hasil per akses: AND dari semua kunjungan (termasuk iterasi fixpoint)
+        self.accesses: Dict[int, Tuple[VariableNode, List[bool]]] = {}
+        self.recording = True
+
+        self.statement_handlers = {
+            NodeKind.ASSIGNMENT: self.visit_assignment,
+            NodeKind.PROCEDURE_CALL: self.visit_procedure_call,
+            NodeKind.COMPOUND_STATEMENT: self.visit_sequence,
+            NodeKind.STATEMENT_LIST: self.visit_sequence,
+            NodeKind.IF_STATEMENT: self.visit_if,
+            NodeKind.WHILE_STATEMENT: self.visit_while,
+            NodeKind.FOR_STATEMENT: self.visit_for,
+            NodeKind.REPEAT_STATEMENT: self.visit_repeat,
+            NodeKind.STATEMENT: self.visit_empty,
+            NodeKind.RULE: self.visit_rule,
+        }
+
+    def run(self, program: ASTNode) -> Tuple[int, int]:
+        # Mengembalikan (jumlah cek indeks, jumlah cek yang dieliminasi)
+        bodies = self.collect_bodies(program)
+        for level, body in bodies:
+            for target in self.assignment_targets(body):
+                if target.tab_index >= 0 and self.symbol_table.tab[target.tab_index].lev != level:
+                    self.clobbered.add(target.tab_index)
+        for _, body in bodies:
+            trampoline(self.visit_statement(body, {}))
+
+        total = eliminated = 0
+        for node, flags in self.accesses.values():
+            node.safe_indices = tuple(flags)
+            total += len(flags)
+            eliminated += sum(flags)
+        # Akses yang tidak pernah tercapai tetap dicek
+        for node in self.unvisited_accesses(bodies):
+            total += len(node.index_expressions)
+        return total, eliminated
+
+    def collect_bodies(self, program: ASTNode) -> List[Tuple[int, ASTNode]]:
+        # (level variabel lokal, CompoundStatement body) untuk program dan setiap subprogram
+        bodies = []
+        tab = self.symbol_table.tab
+
+        def enter_subprogram(node: ASTNode):
+            if node.tab_index < 0:
+                return
+            for child in node.children:
+                if child.node_type == NodeKind.BLOCK:
+                    for part in child.children:
+                        if part.node_type == NodeKind.COMPOUND_STATEMENT:
+                            bodies.append((tab[node.tab_index].lev + 1, part))
+
+        def enter_program(node: ASTNode):
+            for child in node.children:
+                if child.node_type == NodeKind.COMPOUND_STATEMENT:
+                    bodies.append((0, child))
+
+        walk(program, enter={
+            ProgramNode: enter_program,
+            NodeKind.PROCEDURE_DECLARATION: enter_subprogram,
+            NodeKind.FUNCTION_DECLARATION: enter_subprogram,
+            NodeKind.COMPOUND_STATEMENT: lambda node: SKIP,
+        })
+        return bodies
+
+    def assignment_targets(self, root: Optional[ASTNode]) -> List[VariableNode]:
+        # Variabel yang di-assign (termasuk counter untuk dan argumen read)
+        targets = []
+        if root is None:
+            return targets
+
+        def assignment(node: ASTNode):
+            if node.children and isinstance(node.children[0], VariableNode):
+                targets.append(node.children[0])
+
+        def procedure_call(node: ProcedureCallNode):
+            if node.procedure_name.lower() in READ_PROCEDURES:
+                targets.extend(child for child in node.children if isinstance(child, VariableNode))
+
+        walk(root, enter={NodeKind.ASSIGNMENT: assignment, NodeKind.FOR_STATEMENT: assignment,
+                          NodeKind.PROCEDURE_CALL: procedure_call})
+        return targets
+
+    def unvisited_accesses(self, bodies: List[Tuple[int, ASTNode]]) -> List[VariableNode]:
+        nodes = []
+
+        def variable(node: VariableNode):
+            if node.index_expressions and id(node) not in self.accesses:
+                nodes.append(node)
+
+        for _, body in bodies:
+            walk(body, enter={VariableNode: variable})
+        return nodes
+
+    def is_tracked(self, tab_index: int) -> bool:
+        tracked = self.tracked.get(tab_index)
+        if tracked is None:
+            entry = self.symbol_table.tab[tab_index] if tab_index >= 0 else None
+            tracked = (entry is not None and entry.obj == ObjType.VARIABLE and
+                       entry.type_desc is not None and not isinstance(entry.type_desc, ArrayType) and
+                       entry.type_desc.base == BaseType.INTEGER)
+            self.tracked[tab_index] = tracked
+        return tracked
+
+    def has_call(self, expr: Optional[ASTNode]) -> bool:
+        pending = [expr] if expr is not None else []
+        tab = self.symbol_table.tab
+        while pending:
+            node = pending.pop()
+            if node.const_value is not None:
+                continue
+            if isinstance(node, FunctionCallNode):
+                return True
+            if isinstance(node, VariableNode):
+                if node.tab_index >= 0 and tab[node.tab_index].obj == ObjType.FUNCTION:
+                    return True
+                pending.extend(node.index_expressions)
+            pending.extend(node.children or ())
+        return False
+
+    def after_call(self, env: Env) -> Env:
+        if env is None:
+            return None
+        return {index: value for index, value in env.items() if index not in self.clobbered}
+
+    def assign(self, env: Env, tab_index: int, value: Interval) -> Env:
+        if env is None or not self.is_tracked(tab_index):
+            return env
+        env = dict(env)
+        if value == TOP:
+            env.pop(tab_index, None)
+        else:
+            env[tab_index] = value
+        return env
+
+    # ---------- Statement ----------
+
+    def visit_statement(self, stmt: ASTNode, env: Env) -> Union[Generator, Env]:
+        if env is None:
+            return None     # Tidak tercapai
+        handler = self.statement_handlers.get(stmt.node_type)
+        if handler is None:
+            return {}
+        return handler(stmt, env)
+
+    def visit_empty(self, stmt: ASTNode, env: Env) -> Env:
+        return env
+
+    def visit_sequence(self, stmt: ASTNode, env: Env) -> Generator:
+        for child in stmt.children:
+            env = yield self.visit_statement(child, env)
+        return env
+
+    def visit_assignment(self, stmt: ASTNode, env: Env) -> Generator:
+        if len(stmt.children) < 2:
+            return env
+        target, value = stmt.children[0], stmt.children[1]
+        if self.has_call(value) or any(self.has_call(index) for index in target.index_expressions):
+            env = self.after_call(env)
+        interval = yield self.evaluate(value, env)
+        if not isinstance(target, VariableNode):
+            return env
+        if target.index_expressions:
+            yield self.evaluate_element(target, env)
+            return env
+        return self.assign(env, target.tab_index, interval)
+
+    def visit_procedure_call(self, stmt: ProcedureCallNode, env: Env) -> Generator:
+        name = stmt.procedure_name.lower()
+        if name in READ_PROCEDURES:
+            for arg in stmt.children:
+                if isinstance(arg, VariableNode):
+                    if arg.index_expressions:
+                        yield self.evaluate_element(arg, env)
+                    else:
+                        env = self.assign(env, arg.tab_index, TOP)
+            return env
+        user_defined = stmt.is_user_defined and name not in BUILTIN_PROCEDURES
+        if user_defined or any(self.has_call(arg) for arg in stmt.children):
+            env = self.after_call(env)
+        for arg in stmt.children:
+            yield self.evaluate(arg, env)
+        return env
+
+    def visit_if(self, stmt: ASTNode, env: Env) -> Generator:
+        if not stmt.children:
+            return env
+        condition = stmt.children[0]
+        env = yield self.visit_condition(condition, env)
+        then_env = self.refine(env, condition, True)
+        if len(stmt.children) > 1:
+            then_env = yield self.visit_statement(stmt.children[1], then_env)
+        else_env = self.refine(env, condition, False)
+        if len(stmt.children) > 2:
+            else_env = yield self.visit_statement(stmt.children[2], else_env)
+        return join(then_env, else_env)
+
+    def visit_while(self, stmt: ASTNode, env: Env) -> Generator:
+        if not stmt.children:
+            return env
+        condition = stmt.children[0]
+        body = stmt.children[1] if len(stmt.children) > 1 else None
+        head = env
+        iteration = 0
+        while True:
+            checked = yield self.visit_condition(condition, head)
+            out = self.refine(checked, condition, True)
+            if body is not None:
+                out = yield self.visit_statement(body, out)
+            next_head = join(env, out)
+            if iteration >= WIDEN_AFTER:
+                next_head = widen(head, next_head)
+            if next_head == head:
+                return self.refine(checked, condition, False)
+            head = next_head
+            iteration += 1
+
+    def visit_repeat(self, stmt: ASTNode, env: Env) -> Generator:
+        if not stmt.children:
+            return env
+        body = stmt.children[0]
+        condition = stmt.children[1] if len(stmt.children) > 1 else None
+        head = env
+        iteration = 0
+        while True:
+            out = yield self.visit_statement(body, head)
+            if condition is None:
+                return out
+            checked = yield self.visit_condition(condition, out)
+            next_head = join(env, self.refine(checked, condition, False))
+            if iteration >= WIDEN_AFTER:
+                next_head = widen(head, next_head)
+            if next_head == head:
+                return self.refine(checked, condition, True)
+            head = next_head
+            iteration += 1
+
+    def visit_for(self, stmt: ForStatementNode, env: Env) -> Generator:
+        if len(stmt.children) < 3 or not isinstance(stmt.children[0], VariableNode):
+            return {}
+        counter, start_expr, end_expr = stmt.children[0], stmt.children[1], stmt.children[2]
+        body = stmt.children[3] if len(stmt.children) > 3 else None
+        if self.has_call(start_expr) or self.has_call(end_expr):
+            env = self.after_call(env)
+        start = yield self.evaluate(start_expr, env)
+        end = yield self.evaluate(end_expr, env)
+        counter_index = counter.tab_index
+
+        # Batas akhir dievaluasi sekali; selama counter tidak diubah selain oleh
+        # loop, nilainya di body selalu di antara awal dan akhir
+        fixed = (self.is_tracked(counter_index) and counter_index not in self.clobbered and
+                 all(target.tab_index != counter_index for target in self.assignment_targets(body)))
+        if stmt.direction == "turunke":
+            counter_range = _intersect((end[0], None), (None, start[1]))
+        else:
+            counter_range = _intersect((start[0], None), (None, end[1]))
+        if counter_range is None:
+            return env      # Loop pasti kosong
+
+        head = env
+        iteration = 0
+        while True:
+            out = head
+            if body is not None:
+                body_env = self.assign(head, counter_index, counter_range if fixed else TOP)
+                out = yield self.visit_statement(body, body_env)
+            next_head = join(env, out)
+            if iteration >= WIDEN_AFTER:
+                next_head = widen(head, next_head)
+            if next_head == head:
+                break
+            head = next_head
+            iteration += 1
+        # Setelah loop yang dieksekusi counter bernilai batas akhir
+        executed = self.assign(head, counter_index, end if fixed else TOP)
+        return join(env, executed)
+
+    def visit_rule(self, stmt: RuleNode, env: Env) -> Generator:
+        if stmt.rule != "<case-statement>" or len(stmt.children) < 2:
+            return {}
+        selector = stmt.children[1]
+        if self.has_call(selector):
+            env = self.after_call(env)
+        yield self.evaluate(selector, env)
+        result = env    # Tidak ada cabang yang cocok
+        for element in stmt.children[2:]:
+            if isinstance(element, RuleNode) and element.rule == "<case-element>":
+                branch = yield self.visit_statement(element.children[-1], env)
+                result = join(result, branch)
+        return result
+
+    def visit_condition(self, condition: ASTNode, env: Env) -> Generator:
+        if self.has_call(condition):
+            env = self.after_call(env)
+        yield self.evaluate(condition, env)
+        return env
+
+    # ---------- Ekspresi ----------
+
+    def evaluate(self, expr: ASTNode, env: Env) -> Union[Generator, Interval]:
+        if env is None:
+            return TOP
+        if expr.const_value is not None:
+            return _constant(expr.const_value)
+        if isinstance(expr, VariableNode):
+            if expr.index_expressions:
+                return self.evaluate_element(expr, env)
+            return env.get(expr.tab_index, TOP)
+        if isinstance(expr, BinaryExpressionNode):
+            return self.evaluate_binary(expr, env)
+        if isinstance(expr, UnaryExpressionNode):
+            return self.evaluate_unary(expr, env)
+        return self.evaluate_children(expr, env)
+
+    def evaluate_children(self, expr: ASTNode, env: Env) -> Generator:
+        # Argumen fungsi dan operand lain tetap dikunjungi untuk akses array di dalamnya
+        for child in expr.children:
+            yield self.evaluate(child, env)
+        return TOP
+
+    def evaluate_element(self, var: VariableNode, env: Env) -> Generator:
+        entry = self.symbol_table.tab[var.tab_index] if var.tab_index >= 0 else None
+        type_desc = entry.type_desc if entry is not None else None
+        array_ref = entry.ref if entry is not None else -1
+        flags = []
+        for index_expr in var.index_expressions:
+            low, high = yield self.evaluate(index_expr, env)
+            if not isinstance(type_desc, ArrayType):
+                flags.append(False)
+                continue
+            array = self.symbol_table.atab[array_ref]
+            flags.append(low is not None and high is not None and array.low <= low and high <= array.high)
+            type_desc = type_desc.element
+            array_ref = array.eref
+        if not self.recording:
+            return TOP
+        _, previous = self.accesses.setdefault(id(var), (var, flags))
+        if previous is not flags:
+            previous[:] = [old and new for old, new in zip(previous, flags)]
+        return TOP
+
+    def evaluate_binary(self, expr: BinaryExpressionNode, env: Env) -> Generator:
+        left = yield self.evaluate(expr.children[0], env)
+        right = yield self.evaluate(expr.children[1], env)
+        if expr.data_type != BaseType.INTEGER:
+            return TOP
+        operator = expr.operator.lower()
+        if operator == '+':
+            return _add(left, right)
+        if operator == '-':
+            return _add(left, _neg(right))
+        if operator == '*':
+            return _mul(left, right)
+        divisor = expr.children[1].const_value
+        if isinstance(divisor, int) and not isinstance(divisor, bool) and divisor != 0:
+            if operator == 'bagi':
+                return _div(left, divisor)
+            if operator == 'mod':
+                return _mod(left, divisor)
+        return TOP
+
+    def evaluate_unary(self, expr: UnaryExpressionNode, env: Env) -> Generator:
+        operand = yield self.evaluate(expr.children[0], env)
+        if expr.data_type != BaseType.INTEGER:
+            return TOP
+        return _neg(operand) if expr.operator == '-' else operand
+
+    # ---------- Guard kondisi ----------
+
+    def refine(self, env: Env, condition: ASTNode, truth: bool) -> Env:
+        # Environment di cabang tempat condition bernilai truth. Kondisi yang
+        # memanggil fungsi tidak dipakai (nilai variabel bisa berubah di tengah)
+        if env is None or self.has_call(condition):
+            return env
+        value = condition.const_value
+        if isinstance(value, bool):
+            return env if value == truth else None
+        if condition.node_type == NodeKind.NOT_EXPRESSION and condition.children:
+            return self.refine(env, condition.children[0], not truth)
+        if not isinstance(condition, BinaryExpressionNode) or len(condition.children) < 2:
+            return env
+        operator = condition.operator.lower()
+        left, right = condition.children[0], condition.children[1]
+        if operator in ('dan', 'atau'):
+            if (operator == 'dan') == truth:
+                # Kedua operand bernilai truth
+                return self.refine(self.refine(env, left, truth), right, truth)
+            return join(self.refine(env, left, truth), self.refine(env, right, truth))
+        if operator not in RELATIONAL_OPERATORS:
+            return env
+        if not truth:
+            operator = NEGATED[operator]
+        env = self.narrow(env, left, operator, self.value_of(right, env))
+        if env is not None:
+            env = self.narrow(env, right, SWAPPED[operator], self.value_of(left, env))
+        return env
+
+    def value_of(self, expr: ASTNode, env: Env) -> Interval:
+        # Dengan dan/atau kedua operand selalu dievaluasi, jadi akses array di
+        # dalam guard tidak boleh dinilai dengan environment yang sudah dipersempit
+        self.recording = False
+        try:
+            return trampoline(self.evaluate(expr, env))
+        finally:
+            self.recording = True
+
+    def narrow(self, env: Dict[int, Interval], var: ASTNode, operator: str, other: Interval) -> Env:
+        # Persempit interval var dengan relasi "var <operator> other"
+        if not isinstance(var, VariableNode) or var.index_expressions or not self.is_tracked(var.tab_index):
+            return env
+        low, high = other
+        if operator == '<':
+            bound = (None, None if high is None else high - 1)
+        elif operator == '<=':
+            bound = (None, high)
+        elif operator == '>':
+            bound = (None if low is None else low + 1, None)
+        elif operator == '>=':
+            bound = (low, None)
+        elif operator == '=':
+            bound = other
+        else:
+            return env
+        value = _intersect(env.get(var.tab_index, TOP), bound)
+        if value is None:
+            return None     # Cabang tidak mungkin dieksekusi
+        return self.assign(env, var.tab_index, value)
+
+
+def main():
+    # Laporan eliminasi cek batas (jumlah akses indeks statis) untuk corpus test.
+    # Usage: python -m src.semantic_analyzer.range_analysis [file.pas ...]
+    import argparse
+    import glob
+    import os
+    from src.lexer import tokenize
+    from src.parser import Parser
+    from .semantic_analyzer import SemanticAnalyzer
+
+    parser = argparse.ArgumentParser(prog="python -m src.semantic_analyzer.range_analysis")
+    parser.add_argument("files", nargs="*")
+    args = parser.parse_args()
+    root = os.path.join(os.path.dirname(__file__), '..', '..', 'test')
+    files = args.files or sorted(glob.glob(os.path.join(root, '**', '*.pas'), recursive=True))
+
+    total = eliminated = skipped = 0
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            source_code = f.read()
+        try:
+            analyzer = SemanticAnalyzer()
+            analyzer.analyze(Parser(tokenize(source_code)).parse())
+        except Exception:
+            analyzer = None
+        if analyzer is None or analyzer.errors:
+            skipped += 1
+            continue
+        checks, removed = analyzer.bounds_checks
+        if checks:
+            print(f"{os.path.relpath(path):45} {removed:4}/{checks:<4} checks eliminated ({removed / checks:6.1%})")
+        total += checks
+        eliminated += removed
+    print(f"total: {eliminated}/{total} checks eliminated ({eliminated / max(total, 1):.1%}), "
+          f"{skipped} files skipped (syntax/semantic errors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,131 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Callable, Generator
+from types import GeneratorType
 from enum import Enum, auto
 from dataclasses import dataclass, field
 from src.parse_tree import ParseNode
 from src.tokens import Token, TokenType
-from .symbol_table import SymbolTable, ObjType, BaseType
+from .symbol_table import SymbolTable, SymbolTableSnapshot, ObjType, BaseType
+from .type_descriptors import (TypeDescriptor, ArrayType, primitive, subrange_type,
+                               is_compatible)
 from .ast_nodes import *
+from .definite_assignment import DefiniteAssignmentAnalysis
+from .range_analysis import RangeAnalysis
+from .constant_folder import ConstantFolder
+from .parallel import DeferredBody, ParallelBodyAnalysis
+from .diagnostics import Diagnostic, DiagnosticBag, DEFAULT_MAX_DIAGNOSTICS
+
+# Rule yang visitor-nya mengembalikan AST anak apa adanya bila hanya punya satu anak
+PASS_THROUGH_RULES = frozenset(("<expression>", "<simple-expression>", "<term>"))
+
+
+class DeclarationCheckpoint:
+    # State analisis setelah <declaration-part> global. Program lain dengan
+    # deklarasi yang sama (mis. mutan pada mutation testing) bisa dianalisis
+    # lewat analyze(parse_tree, resume=checkpoint) tanpa mengulang deklarasi.
+    # AST deklarasi dipakai bersama oleh semua hasil resume; perlakukan read-only.
+    __slots__ = ("symbols", "program_idx", "declarations", "diagnostics")
+
+    def __init__(self, symbols: SymbolTableSnapshot, program_idx: int, declarations: ASTNode,
+                 diagnostics: List[Diagnostic]):
+        self.symbols = symbols            # Snapshot SymbolTable (global block masih terbuka)
+        self.program_idx = program_idx    # Entry program di tab
+        self.declarations = declarations  # Declarations AST
+        self.diagnostics = diagnostics    # Diagnostic dari program header dan deklarasi
+
 
 class SemanticAnalyzer:
-    def __init__(self):
+    # Tabel dispatch nama node parse tree -> visitor, dibangun sekali per kelas
+    _dispatch_table: Dict[str, Callable[..., ASTNode]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch_table = cls._build_dispatch_table()
+
+    @classmethod
+    def _build_dispatch_table(cls) -> Dict[str, Callable[..., ASTNode]]:
+        # visit_while_statement menangani node "<while-statement>", dst.
+        table = {}
+        for attr in dir(cls):
+            if attr.startswith("visit_") and attr != "visit_default":
+                rule_name = attr[len("visit_"):].replace("_", "-")
+                table[f"<{rule_name}>"] = getattr(cls, attr)
+        return table
+
+    def __init__(self, jobs: int = 1, max_diagnostics: Optional[int] = DEFAULT_MAX_DIAGNOSTICS):
         self.symbol_table = SymbolTable()
         self.current_ast: Optional[ASTNode] = None
-        self.errors: List[str] = []
+        self.errors = DiagnosticBag(max_diagnostics)
+        self.constant_folder = ConstantFolder(self.report)
+        
+        # jobs > 1: body prosedur/fungsi level teratas dianalisis paralel (lihat parallel.py)
+        self.jobs = jobs
+        self.deferred_bodies: Optional[List[DeferredBody]] = None
         
-    def analyze(self, parse_tree: ParseNode) -> ASTNode:
+        # Checkpoint setelah <declaration-part> dari analyze() terakhir; None jika
+        # body subprogram dianalisis paralel (deklarasi belum lengkap saat itu)
+        self.checkpoint: Optional[DeclarationCheckpoint] = None
+        self.resume: Optional[DeclarationCheckpoint] = None
+        
+        # Subtree pertama yang memicu RecursionError (deklarasi bersarang sangat dalam)
+        self.nesting_overflow: Optional[ParseNode] = None
+        
+        # (jumlah cek indeks array, jumlah yang dieliminasi) dari analyze() terakhir
+        self.bounds_checks = (0, 0)
+        
+        # Bind visitor sekali per instance agar visit() cukup satu lookup dict
+        self._visitors: Dict[str, Callable[[ParseNode], Union[ASTNode, Generator]]] = {
+            name: visitor.__get__(self) for name, visitor in self._dispatch_table.items()
+        }
+        self._visit_default = self.visit_default
+        
+    def analyze(self, parse_tree: ParseNode, resume: Optional[DeclarationCheckpoint] = None) -> ASTNode:
         self.errors.clear()
+        self.checkpoint = None
+        self.resume = resume
         
-        # Start dengan global scope - block 0
-        global_block_idx = self.symbol_table.enter_block()
+        if resume is not None:
+            # Lanjut dari state setelah deklarasi global (global block sudah terbuka)
+            self.symbol_table = resume.symbols.fork()
+        else:
+            # Start dengan global scope - block 0
+            global_block_idx = self.symbol_table.enter_block()
         
         # Build AST and perform semantic analysis
+        max_diagnostics = self.errors.max_diagnostics
+        if self.jobs > 1:
+            self.deferred_bodies = []
+            self.errors.max_diagnostics = None
         self.current_ast = self.visit(parse_tree)
+        self.report_nesting_overflow()
+        
+        # Body yang ditunda dianalisis di process pool lalu di-merge
+        if self.deferred_bodies is not None:
+            ParallelBodyAnalysis(self, self.jobs, max_diagnostics).run(self.deferred_bodies)
+        self.deferred_bodies = None
+        
+        # Fold semua ekspresi konstan agar pass berikutnya memakai nilai jadi
+        self.constant_folder.fold_tree(self.current_ast)
         
         # Validasi semua variabel telah diinisialisasi
         self.validate_variable_initialization()
         
+        # Tandai akses array yang indeksnya terbukti dalam batas (hanya untuk AST valid)
+        self.bounds_checks = (0, 0)
+        if not self.errors:
+            self.bounds_checks = RangeAnalysis(self.symbol_table).run(self.current_ast)
+        
         # Leave global scope
         self.symbol_table.leave_block()
         
         return self.current_ast
 
-    def error(self, message: str, token: Token = None):
-        if token:
-            location = f" at line {token.line}, column {token.column}"
-        else:
-            location = ""
-        self.errors.append(f"Semantic Error{location}: {message}")
+    def report(self, code: str, token: Token = None, symbol: Optional[str] = None,
+               scope: Any = None, **args):
+        # Diagnostic per identifier (symbol) dideduplikasi per block aktif
+        if symbol is not None and scope is None:
+            scope = self.symbol_table.display[-1] if self.symbol_table.display else 0
+        self.errors.add(code, token, symbol, scope, **args)
     
     def get_type_name(self, type_enum: BaseType) -> str:
         return type_enum.name.lower()
@@ -65,31 +155,10 @@ class SemanticAnalyzer:
         return identifiers
     
     def evaluate_constant_expression(self, expr_node: ParseNode) -> Optional[int]:
-        if expr_node.name == "<simple-expression>":
-            if expr_node.children and expr_node.children[0].name == "<term>":
-                term_node = expr_node.children[0]
-                if term_node.children and term_node.children[0].name == "<factor>":
-                    factor_node = term_node.children[0]
-                    if factor_node.children:
-                        first_child = factor_node.children[0]
-                        if first_child.name == "NUMBER" and first_child.token:
-                            try:
-                                return int(first_child.token.value)
-                            except ValueError:
-                                return None
-                        elif first_child.name == "IDENTIFIER" and first_child.token:
-                            # Look up constant value in symbol table
-                            const_name = first_child.token.value
-                            const_value = self.symbol_table.get_constant_value(const_name)
-                            if const_value is not None:
-                                return const_value
-                            else:
-                                # Mencari constant di symbol table
-                                const_idx = self.symbol_table.find_identifier(const_name)
-                                if const_idx is not None and self.symbol_table.tab[const_idx]["obj"] == ObjType.CONSTANT:
-                                    stored_value = self.symbol_table.get_constant_value(const_name)
-                                    if stored_value is not None:
-                                        return stored_value
+        # Bangun AST ekspresi lalu fold; konstanta sudah dipropagasi lewat ConstIdentifier
+        value = self.constant_folder.fold(self.visit(expr_node))
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
         return None
     
     def parse_range(self, index_spec_node: ParseNode) -> tuple[int, int]:
@@ -114,34 +183,16 @@ class SemanticAnalyzer:
         
         return low_bound, high_bound
 
-    def is_type_compatible(self, target_type: BaseType, source_type: BaseType, is_parameter: bool = False) -> bool:
-        if target_type == source_type:
-            return True
-        
-        if target_type == BaseType.REAL and source_type == BaseType.INTEGER:
-            return True
-            
-        if is_parameter:
-            if target_type == BaseType.INTEGER and source_type == BaseType.REAL:
-                return False  # Real tidak bisa ke integer parameter
-            if target_type == BaseType.BOOLEAN and source_type != BaseType.BOOLEAN:
-                return False  # Hanya boolean ke boolean
-            if target_type == BaseType.CHAR and source_type != BaseType.CHAR:
-                return False  # Hanya char ke char
-                
-        # Char dapat diassign ke string
-        if target_type == BaseType.STRING and source_type == BaseType.CHAR:
-            return True
-            
-        # Boolean literals compatibility
-        if target_type == BaseType.BOOLEAN and source_type == BaseType.BOOLEAN:
-            return True
-            
-        # VOID type
-        if target_type == BaseType.VOID or source_type == BaseType.VOID:
-            return True
-                
-        return False
+    def is_type_compatible(self, target_type: Union[BaseType, TypeDescriptor],
+                           source_type: Union[BaseType, TypeDescriptor], is_parameter: bool = False) -> bool:
+        # Descriptor di-intern; hasil dicache per (target, source) di type_descriptors
+        return is_compatible(target_type, source_type, is_parameter)
+    
+    def type_label(self, node: ASTNode) -> str:
+        # Tipe array ditampilkan lengkap agar mismatch antar larik jelas
+        if isinstance(node.type_desc, ArrayType):
+            return repr(node.type_desc)
+        return node.data_type.name
     
     def get_expression_type(self, left_type: BaseType, right_type: BaseType, operator: str) -> BaseType:
         # Handle None types
@@ -173,76 +224,79 @@ class SemanticAnalyzer:
         existing_idx = self.symbol_table.find_identifier(name)
         if existing_idx is not None:
             existing_entry = self.symbol_table.tab[existing_idx]
-            if existing_entry["lev"] == self.symbol_table.level:
-                self.error(f"Duplicate identifier '{name}'", token)
+            if existing_entry.lev == self.symbol_table.level:
+                self.report("E106", token, name=name)
                 return True
         return False
 
     def check_constant_assignment(self, target: ASTNode, token: Token = None):
-        if (hasattr(target, 'tab_index') and target.tab_index >= 0 and 
+        if (target.tab_index is not None and target.tab_index >= 0 and 
             target.tab_index < len(self.symbol_table.tab)):
             target_entry = self.symbol_table.tab[target.tab_index]
-            if target_entry["obj"] == ObjType.CONSTANT:
-                self.error(f"Cannot assign to constant '{target.identifier if hasattr(target, 'identifier') else 'unknown'}'", token)
+            if target_entry.obj == ObjType.CONSTANT:
+                self.report("E206", token, name=target.identifier if isinstance(target, VariableNode) else 'unknown')
                 return False
         return True
 
+    def check_logical_operands(self, operator: str, left: ASTNode, right: Optional[ASTNode],
+                               token: Token = None):
+        # dan/atau/tidak hanya untuk boolean; VOID berarti error sudah dilaporkan
+        if operator.lower() not in ('dan', 'atau', 'tidak'):
+            return True
+        for operand in (left, right):
+            if operand is not None and operand.data_type not in (BaseType.BOOLEAN, BaseType.VOID, None):
+                self.report("E209", token, operator=operator,
+                            actual=self.get_type_name(operand.data_type))
+                return False
+        return True
+    
     def check_parameter_count(self, func_name: str, expected_count: int, actual_count: int, token: Token = None):
         if expected_count != actual_count:
-            self.error(f"Parameter count mismatch in {func_name}: expected {expected_count}, got {actual_count}", token)
+            self.report("E204", token, name=func_name, expected=expected_count, actual=actual_count)
             return False
         return True
     
     def validate_parameters(self, func_name: str, param_count: int, param_types: List[BaseType], 
-                        token: Token = None) -> bool:
-        # Look up function di symbol table
-        func_idx = self.symbol_table.find_identifier(func_name)
+                        token: Token = None, func_idx: Optional[int] = None) -> bool:
+        # Look up function di symbol table (caller boleh memberikan index hasil lookup-nya)
         if func_idx is None:
-            self.error(f"Undefined function/procedure '{func_name}'", token)
+            func_idx = self.symbol_table.find_identifier(func_name)
+        if func_idx is None:
+            self.report("E104", token, symbol=func_name, name=func_name)
             return False
         
         func_entry = self.symbol_table.tab[func_idx]
         
-        if func_entry["obj"] not in [ObjType.FUNCTION, ObjType.PROCEDURE]:
-            self.error(f"'{func_name}' is not a function or procedure", token)
+        if func_entry.obj not in [ObjType.FUNCTION, ObjType.PROCEDURE]:
+            self.report("E107", token, symbol=func_name, name=func_name)
             return False
         
         if func_name in ['writeln', 'readln', 'write', 'read']:
             return True
         
-        func_block_idx = func_entry.get("block_index", -1)
-        if func_block_idx < 0 or func_block_idx >= len(self.symbol_table.btab):
-            self.error(f"Cannot find parameter information for '{func_name}'", token)
+        signature = func_entry.signature
+        if signature is None:
+            self.report("E205", token, symbol=func_name, name=func_name)
             return False
         
-        # Mengambil parameter fungsi
-        expected_params = []
-        current_idx = self.symbol_table.btab[func_block_idx]["last"]
-        
-        while current_idx >= self.symbol_table.user_id_start:
-            if current_idx < len(self.symbol_table.tab) and self.symbol_table.tab[current_idx] is not None:
-                entry = self.symbol_table.tab[current_idx]
-                if entry["obj"] == ObjType.VARIABLE and entry.get("is_param", False):
-                    expected_params.append({
-                        "type": BaseType(entry["type"]),
-                        "name": entry["name"]
-                    })
-            if current_idx < len(self.symbol_table.tab) and self.symbol_table.tab[current_idx]:
-                current_idx = self.symbol_table.tab[current_idx]["link"]
-            else:
-                break
-        
-        expected_params.reverse()
-        
         # Cek jumlah parameter
-        if len(expected_params) != param_count:
-            self.error(f"Parameter count mismatch in {func_name}: expected {len(expected_params)}, got {param_count}", token)
+        if len(signature.params) != param_count:
+            self.report("E204", token, name=func_name, expected=len(signature.params), actual=param_count)
             return False
         
+        # Fast path: tipe aktual persis sama dengan signature
+        actual_types = tuple(param_types)
+        if actual_types == signature.bases or actual_types == signature.params:
+            return True
+        
         # Cek tipe parameter
-        for i, (expected, actual) in enumerate(zip(expected_params, param_types)):
-            if not self.is_type_compatible(expected["type"], actual):
-                self.error(f"Parameter type mismatch in {func_name}: parameter {i+1} ({expected['name']}) expects {expected['type'].name.lower()}, got {actual.name.lower()}", token)
+        for i, (expected, actual) in enumerate(zip(signature.params, actual_types)):
+            if actual is None:
+                actual = BaseType.VOID
+            if not self.is_type_compatible(expected, actual):
+                actual_name = actual.base.name if isinstance(actual, TypeDescriptor) else actual.name
+                self.report("E203", token, name=func_name, position=i + 1, param=signature.names[i],
+                            expected=expected.base.name.lower(), actual=actual_name.lower())
                 return False
         
         return True
@@ -254,114 +308,101 @@ class SemanticAnalyzer:
         array_info = self.symbol_table.atab[array_idx]
         
         # Cek jika lower bound > upper bound
-        if array_info["low"] > array_info["high"]:
-            self.error(f"Invalid array bounds: lower bound ({array_info['low']}) > upper bound ({array_info['high']})", token)
+        if array_info.low > array_info.high:
+            self.report("E302", token, low=array_info.low, high=array_info.high)
             return
         
-        if hasattr(index_expr, 'value') and isinstance(index_expr.value, (int, float)):
-            index_value = int(index_expr.value)
-            if index_value < array_info["low"] or index_value > array_info["high"]:
-                self.error(f"Array index out of bounds: {index_value} not in range {array_info['low']}..{array_info['high']}", token)
+        index_value = self.constant_folder.fold(index_expr)
+        if isinstance(index_value, int) and not isinstance(index_value, bool):
+            if index_value < array_info.low or index_value > array_info.high:
+                self.report("E303", token, index=index_value, low=array_info.low, high=array_info.high)
 
     def validate_variable_initialization(self):
-        # Validasi inisialisasi variabel
-        
-        class ValidationState:
-            def __init__(self):
-                self.assigned_vars = set()
-                self.in_subprogram = False
-                self.current_procedure_params = set()
-        
-        state = ValidationState()
-        
-        def process_node(node):
-            if not node:
-                return
-            
-            # Track deklarasi subprogram
-            if hasattr(node, 'node_type'):
-                if node.node_type in ["ProcedureDeclaration", "FunctionDeclaration"]:
-                    state.in_subprogram = True
-                    state.current_procedure_params = set()
-                elif node.node_type == "ForStatement":
-                    # Handle inisialisasi pada for loop counter
-                    if hasattr(node, 'counter_var_name'):
-                        state.assigned_vars.add(node.counter_var_name)
-            
-            # Track parameter procedure call
-            if isinstance(node, ProcedureCallNode):
-                param_vars = set()
-                for param in node.children:
-                    if isinstance(param, VariableNode) and param.identifier:
-                        param_vars.add(param.identifier)
-                state.current_procedure_params = param_vars
-            
-            # Track assignment
-            if isinstance(node, AssignmentNode) and node.children:
-                target = node.children[0]
-                if isinstance(target, VariableNode) and target.identifier:
-                    state.assigned_vars.add(target.identifier)
-            
-            # Cek variabel
-            if isinstance(node, VariableNode) and node.identifier:
-                self._check_variable_usage(node, state)
-            
-            # Rekursif
-            if hasattr(node, 'children'):
-                for child in node.children:
-                    # Skip deklarasi parameter di subprogram
-                    if (state.in_subprogram and 
-                        hasattr(child, 'node_type') and 
-                        child.node_type in ["ParameterGroup", "FormalParameterList"]):
-                        continue
-                    process_node(child)
-        
-        if self.current_ast:
-            process_node(self.current_ast)
-
-    def _check_variable_usage(self, var_node: VariableNode, state: Any):
-        # Helper method untuk check variable usage
-        var_idx = self.symbol_table.find_identifier(var_node.identifier)
-        if var_idx is None:
-            return
-        
-        var_entry = self.symbol_table.tab[var_idx]
-        
-        # Skip checking untuk:
-        # - Bukan variabel biasa
-        # - Parameter formal
-        # - Dalam subprogram declaration  
-        # - Sudah di-assign
-        # - Parameter procedure call
-        if (var_entry["obj"] != ObjType.VARIABLE or
-            var_entry.get("is_param", False) or
-            state.in_subprogram or
-            var_node.identifier in state.assigned_vars or
-            var_node.identifier in state.current_procedure_params):
-            return
-        
-        if var_entry["lev"] in [0, 1]:
-            self.error(f"Variable '{var_node.identifier}' might be used before initialization", 
-                    var_node.token if hasattr(var_node, 'token') else None)
+        # Definite-assignment analysis per body (lihat definite_assignment.py)
+        DefiniteAssignmentAnalysis(self.symbol_table, self.report).run(self.current_ast)
             
     def visit(self, node: ParseNode) -> ASTNode:
-        method_name = f'visit_{node.name.replace("<", "").replace(">", "").replace("-", "_")}'
-        method = getattr(self, method_name, self.visit_default)
-        
+        # Visitor statement dan ekspresi berupa generator: "yield child" (parse node
+        # anak, atau generator visitor yang dipanggil langsung) mengembalikan AST
+        # anak. Semua generator dijalankan di stack eksplisit ini sehingga nesting
+        # dalam (mis. rantai selainitu jika) tidak dibatasi recursion limit.
+        visitor = self._visitors.get(node.name, self._visit_default)
         try:
-            return method(node)
+            result = visitor(node)
         except Exception as e:
-            print(f"Warning: Error in {method_name}: {e}")
-            ast_node = ASTNode(node.name)
-            for child in node.children:
-                try:
-                    ast_node.add_child(self.visit(child))
-                except:
-                    continue
-            return ast_node
+            return self.report_internal_error(node, e)
+        if result.__class__ is not GeneratorType:
+            return result
+        
+        # Owner (parse node) disimpan terpisah untuk lokasi laporan internal error
+        owners = [node]
+        frames = [result]
+        push_owner, push_frame = owners.append, frames.append
+        pop_owner, pop_frame = owners.pop, frames.pop
+        get_visitor, default = self._visitors.get, self._visit_default
+        result = None
+        while frames:
+            try:
+                child = frames[-1].send(result)
+            except StopIteration as stop:
+                pop_frame()
+                pop_owner()
+                result = stop.value
+                continue
+            except Exception as e:
+                pop_frame()
+                result = self.report_internal_error(pop_owner(), e)
+                continue
+            if child.__class__ is GeneratorType:
+                push_frame(child)
+                push_owner(owners[-1])
+                result = None
+                continue
+            # Expression/simple/term dengan satu anak hanya meneruskan hasil anaknya
+            while child.name in PASS_THROUGH_RULES and len(child.children) == 1:
+                child = child.children[0]
+            try:
+                result = get_visitor(child.name, default)(child)
+            except Exception as e:
+                result = self.report_internal_error(child, e)
+                continue
+            if result.__class__ is GeneratorType:
+                push_frame(result)
+                push_owner(child)
+                result = None
+        return result
+    
+    def report_internal_error(self, node: ParseNode, exc: Exception) -> ASTNode:
+        # Bug pada visitor dilaporkan sebagai diagnostic dengan lokasi token pertama
+        # dari subtree; subtree tersebut tidak di-visit ulang. RecursionError
+        # (visitor rekursif seperti deklarasi yang bersarang sangat dalam) hanya
+        # dicatat; stack masih penuh sehingga laporan ditunda ke report_nesting_overflow.
+        if isinstance(exc, RecursionError):
+            if self.nesting_overflow is None:
+                self.nesting_overflow = node
+        else:
+            self.report("E900", self.first_token(node), rule=node.name,
+                        exception=f"{type(exc).__name__}: {exc}")
+        return RuleNode(NodeKind.RULE, rule=node.name)
+    
+    def report_nesting_overflow(self):
+        # Satu diagnostic per program, dipanggil setelah visit() teratas selesai
+        if self.nesting_overflow is not None:
+            self.report("E901", self.first_token(self.nesting_overflow),
+                        symbol="<nesting>", scope=0)
+            self.nesting_overflow = None
+    
+    def first_token(self, node: ParseNode) -> Optional[Token]:
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.token is not None:
+                return current.token
+            stack.extend(reversed(current.children))
+        return None
     
     def visit_default(self, node: ParseNode) -> ASTNode:
-        ast_node = ASTNode(node.name)
+        ast_node = RuleNode(NodeKind.RULE, rule=node.name)
         for child in node.children:
             ast_node.add_child(self.visit(child))
         return ast_node
@@ -375,17 +416,29 @@ class SemanticAnalyzer:
                 program_name = header_children[1].token.value
         
         # Masukkan program ke symbol table
-        program_idx = self.symbol_table.enter_identifier(
-            program_name, ObjType.PROGRAM, BaseType.VOID.value
-        )
+        resume = self.resume
+        if resume is not None:
+            program_idx = resume.program_idx
+        else:
+            program_idx = self.symbol_table.enter_identifier(
+                program_name, ObjType.PROGRAM, BaseType.VOID.value
+            )
         
-        ast_node = ProgramNode("Program", name=program_name, 
+        ast_node = ProgramNode(NodeKind.PROGRAM, name=program_name, 
                             token=node.children[0].children[1].token if node.children else None,
                             data_type=BaseType.VOID, tab_index=program_idx)
         
         for child in node.children:
             if child.name == "<declaration-part>":
-                decl_ast = self.visit(child)
+                if resume is not None:
+                    decl_ast = resume.declarations
+                    self.errors.extend(resume.diagnostics)
+                    self.checkpoint = resume
+                else:
+                    decl_ast = self.visit(child)
+                    if self.deferred_bodies is None:
+                        self.checkpoint = DeclarationCheckpoint(self.symbol_table.snapshot(), program_idx,
+                                                                decl_ast, list(self.errors))
                 ast_node.add_child(decl_ast)
             elif child.name == "<compound-statement>":
                 main_block_idx = self.symbol_table.enter_block()
@@ -397,7 +450,7 @@ class SemanticAnalyzer:
         return ast_node
     
     def visit_declaration_part(self, node: ParseNode) -> ASTNode:
-        ast_node = ASTNode("Declarations")
+        ast_node = ASTNode(NodeKind.DECLARATIONS)
         for child in node.children:
             if child.name == "<var-declaration>":
                 var_decl_ast = self.visit(child)
@@ -422,73 +475,58 @@ class SemanticAnalyzer:
                     ast_node.add_child(subprogram_ast)
         return ast_node
     
-    def visit_while_statement(self, node: ParseNode) -> ASTNode:
-        ast_node = ASTNode("WhileStatement")
-        
-        # Process condition
-        if len(node.children) > 0:
-            condition_node = self.visit(node.children[0])
-            ast_node.add_child(condition_node)
+    def visit_if_statement(self, node: ParseNode) -> Generator:
+        # Pattern: jika <expression> maka <statement> [selainitu <statement>]
+        ast_node = ASTNode(NodeKind.IF_STATEMENT, token=node.children[0].token if node.children else None)
         
-        # Process statement
-        if len(node.children) > 1:
-            stmt_node = self.visit(node.children[1])
-            ast_node.add_child(stmt_node)
+        for child in node.children:
+            if child.name == "<expression>" or child.name == "<statement>":
+                ast_node.add_child((yield child))
         
         return ast_node
 
-    def visit_for_statement(self, node: ParseNode) -> ASTNode:
-        ast_node = ASTNode("ForStatement")
-        ast_node.node_type = "ForStatement"
-        
-        # Pattern: untuk <variable> := <expression> ke <expression> lakukan <statement>
-        counter_var_name = None
-        assignment_found = False
+    def visit_while_statement(self, node: ParseNode) -> Generator:
+        # Pattern: selama <expression> lakukan <statement>
+        ast_node = ASTNode(NodeKind.WHILE_STATEMENT, token=node.children[0].token if node.children else None)
         
-        for i, child in enumerate(node.children):
-            child_ast = self.visit(child)
-            ast_node.add_child(child_ast)
-            
-            # Cari assignment pattern dalam for statement
-            if (i + 2 < len(node.children) and 
-                child.name == "<variable>" and
-                node.children[i + 1].name == "ASSIGN_OPERATOR" and
-                node.children[i + 2].name == "<expression>"):
-                
-                if hasattr(child_ast, 'identifier'):
-                    counter_var_name = child_ast.identifier
-                elif (hasattr(child_ast, 'children') and child_ast.children and
-                    hasattr(child_ast.children[0], 'identifier')):
-                    counter_var_name = child_ast.children[0].identifier
-                assignment_found = True
-                break
+        for child in node.children:
+            if child.name == "<expression>" or child.name == "<statement>":
+                ast_node.add_child((yield child))
         
-        # Fallback: cari identifier langsung
-        if not counter_var_name:
-            for child in node.children:
-                if child.name == "IDENTIFIER" and child.token:
-                    counter_var_name = child.token.value
-                    break
+        return ast_node
+
+    def visit_for_statement(self, node: ParseNode) -> Generator:
+        # Pattern: untuk IDENTIFIER := <expression> (ke | turunke) <expression> lakukan <statement>
+        # Children AST: [counter, nilai awal, nilai akhir, body]
+        ast_node = ForStatementNode(NodeKind.FOR_STATEMENT, token=node.children[0].token if node.children else None)
         
-        if counter_var_name:
-            ast_node.counter_var_name = counter_var_name
+        for child in node.children:
+            if child.name == "IDENTIFIER" and child.token:
+                counter_node = self.resolve_variable(child.token)
+                ast_node.counter_var_name = child.token.value
+                ast_node.add_child(counter_node)
+            elif child.name == "KEYWORD(turunke)":
+                ast_node.direction = "turunke"
+            elif child.name == "<expression>" or child.name == "<statement>":
+                ast_node.add_child((yield child))
         
         return ast_node
 
-    def visit_repeat_statement(self, node: ParseNode) -> ASTNode:
-        ast_node = ASTNode("RepeatStatement")
+    def visit_repeat_statement(self, node: ParseNode) -> Generator:
+        # Pattern: ulangi <statement-list> sampai <expression>
+        # Children AST: [body (StatementList), kondisi]
+        ast_node = ASTNode(NodeKind.REPEAT_STATEMENT, token=node.children[0].token if node.children else None)
         
-        # Statement dan condition
         for child in node.children:
-            child_ast = self.visit(child)
-            ast_node.add_child(child_ast)
+            if child.name == "<statement-list>" or child.name == "<expression>":
+                ast_node.add_child((yield child))
         
         return ast_node
     
     def visit_subprogram_declaration(self, node: ParseNode) -> ASTNode:
         if node.children:
             return self.visit(node.children[0])
-        return ASTNode("SubprogramDeclaration")
+        return ASTNode(NodeKind.SUBPROGRAM_DECLARATION)
     
     def visit_procedure_declaration(self, node: ParseNode) -> ASTNode:
         proc_name = ""
@@ -500,12 +538,12 @@ class SemanticAnalyzer:
                 break
         
         if not proc_name:
-            return ASTNode("ProcedureDeclaration")
+            return ProcedureDeclNode(NodeKind.PROCEDURE_DECLARATION)
         
         # Cek identifier duplikat
         if self.check_duplicate_identifier(proc_name, 
             node.children[1].token if len(node.children) > 1 else None):
-            return ASTNode("ProcedureDeclaration")
+            return ProcedureDeclNode(NodeKind.PROCEDURE_DECLARATION)
         
         # Masukkan procedure ke symbol table
         proc_idx = self.symbol_table.enter_identifier(
@@ -513,16 +551,15 @@ class SemanticAnalyzer:
         )
         
         # Create procedure node
-        proc_node = ASTNode("ProcedureDeclaration", 
-                        data_type=BaseType.VOID, tab_index=proc_idx)
-        proc_node.procedure_name = proc_name
+        proc_node = ProcedureDeclNode(NodeKind.PROCEDURE_DECLARATION, 
+                        data_type=BaseType.VOID, tab_index=proc_idx, procedure_name=proc_name)
         
         # Enter procedure block
         proc_block_idx = self.symbol_table.enter_block()
         
         # Simpan block index dalam symbol table entry
         if proc_idx < len(self.symbol_table.tab) and self.symbol_table.tab[proc_idx] is not None:
-            self.symbol_table.tab[proc_idx]["block_index"] = proc_block_idx
+            self.symbol_table.writable_entry(proc_idx).block_index = proc_block_idx
         
         # Process parameters
         has_params = False
@@ -533,9 +570,14 @@ class SemanticAnalyzer:
                 has_params = True
                 break
         
+        # Signature dihitung sekali di sini, dipakai ulang oleh setiap call site
+        self.symbol_table.enter_signature(proc_idx, proc_block_idx)
+        
         # Process procedure body (block)
         for child in node.children:
             if child.name == "<block>":
+                if self.defer_body(proc_node, child, proc_idx, proc_block_idx):
+                    break
                 block_ast = self.visit(child)
                 block_ast.block_index = proc_block_idx
                 proc_node.add_child(block_ast)
@@ -548,6 +590,7 @@ class SemanticAnalyzer:
     def visit_function_declaration(self, node: ParseNode) -> ASTNode:
         func_name = ""
         return_type = BaseType.VOID
+        return_desc = None
         
         # Extract function name dan return type
         for i, child in enumerate(node.children):
@@ -556,31 +599,31 @@ class SemanticAnalyzer:
             elif child.name == "<type>":
                 type_ast = self.visit(child)
                 return_type = type_ast.data_type if type_ast.data_type else BaseType.VOID
+                return_desc = type_ast.type_desc
         
         if not func_name:
-            return ASTNode("FunctionDeclaration")
+            return FunctionDeclNode(NodeKind.FUNCTION_DECLARATION)
         
         # Cek identifier duplikat
         if self.check_duplicate_identifier(func_name, 
             node.children[1].token if len(node.children) > 1 else None):
-            return ASTNode("FunctionDeclaration")
+            return FunctionDeclNode(NodeKind.FUNCTION_DECLARATION)
         
         # Masukkan function ke symbol table
         func_idx = self.symbol_table.enter_identifier(
-            func_name, ObjType.FUNCTION, return_type.value
+            func_name, ObjType.FUNCTION, return_type.value, type_desc=return_desc
         )
         
         # Create function node
-        func_node = ASTNode("FunctionDeclaration", 
-                        data_type=return_type, tab_index=func_idx)
-        func_node.function_name = func_name
+        func_node = FunctionDeclNode(NodeKind.FUNCTION_DECLARATION, 
+                        data_type=return_type, tab_index=func_idx, function_name=func_name)
         
         # Enter function block
         func_block_idx = self.symbol_table.enter_block()
         
         # Simpan block index dalam symbol table entry
         if func_idx < len(self.symbol_table.tab) and self.symbol_table.tab[func_idx] is not None:
-            self.symbol_table.tab[func_idx]["block_index"] = func_block_idx
+            self.symbol_table.writable_entry(func_idx).block_index = func_block_idx
         
         # Process parameters
         has_params = False
@@ -591,9 +634,14 @@ class SemanticAnalyzer:
                 has_params = True
                 break
         
+        # Signature dihitung sekali di sini, dipakai ulang oleh setiap call site
+        self.symbol_table.enter_signature(func_idx, func_block_idx, return_desc)
+        
         # Process function body (block)
         for child in node.children:
             if child.name == "<block>":
+                if self.defer_body(func_node, child, func_idx, func_block_idx):
+                    break
                 block_ast = self.visit(child)
                 block_ast.block_index = func_block_idx
                 func_node.add_child(block_ast)
@@ -604,7 +652,18 @@ class SemanticAnalyzer:
         
         return func_node
     
-    def visit_function_call(self, node: ParseNode) -> ASTNode:
+    def defer_body(self, decl_node: ASTNode, block_node: ParseNode, tab_index: int, block_index: int) -> bool:
+        # Mode paralel: hanya body subprogram level teratas yang ditunda; subprogram
+        # nested tetap dianalisis oleh worker yang menangani body induknya
+        if self.deferred_bodies is None or self.symbol_table.level != 1:
+            return False
+        table = self.symbol_table
+        marks = (table.next_user_id, len(table.btab), len(table.atab), table.next_adr)
+        self.deferred_bodies.append(DeferredBody(decl_node, block_node, tab_index,
+                                                 block_index, len(self.errors), marks))
+        return True
+    
+    def visit_function_call(self, node: ParseNode) -> Generator:
         func_name = ""
         
         # Extract nama function
@@ -614,7 +673,7 @@ class SemanticAnalyzer:
                 break
         
         if not func_name:
-            return ASTNode("FunctionCall", data_type=BaseType.VOID)
+            return FunctionCallNode(NodeKind.FUNCTION_CALL, data_type=BaseType.VOID)
         
         # Cari function di symbol table
         func_idx = self.symbol_table.find_identifier(func_name)
@@ -622,8 +681,8 @@ class SemanticAnalyzer:
         
         if func_idx is not None:
             func_entry = self.symbol_table.tab[func_idx]
-            if func_entry["obj"] == ObjType.FUNCTION:
-                return_type = BaseType(func_entry["type"])
+            if func_entry.obj == ObjType.FUNCTION:
+                return_type = func_entry.type_desc.base
         
         # Kumpulkan parameter
         param_nodes = []
@@ -631,23 +690,20 @@ class SemanticAnalyzer:
         
         for child in node.children:
             if child.name == "<parameter-list>":
-                param_ast = self.visit(child)
+                param_ast = yield child
                 # Extract parameter expressions dan types
                 for param_expr in param_ast.children:
                     param_nodes.append(param_expr)
-                    if hasattr(param_expr, 'data_type'):
-                        param_types.append(param_expr.data_type)
-                    else:
-                        param_types.append(BaseType.VOID)
+                    param_types.append(param_expr.type_desc or param_expr.data_type or BaseType.VOID)
         
         # Validasi parameter untuk user-defined functions
         if func_name not in ['writeln', 'readln', 'write', 'read']:
             self.validate_parameters(func_name, len(param_types), param_types,
-                                node.children[0].token if node.children else None)
+                                node.children[0].token if node.children else None, func_idx)
         
         # Buat function call node
-        ast_node = ASTNode("FunctionCall", data_type=return_type, tab_index=func_idx)
-        ast_node.function_name = func_name
+        ast_node = FunctionCallNode(NodeKind.FUNCTION_CALL, data_type=return_type, tab_index=func_idx,
+                                    function_name=func_name)
         
         # Tambahkan parameter
         for param_node in param_nodes:
@@ -656,7 +712,7 @@ class SemanticAnalyzer:
         return ast_node
     
     def visit_formal_parameter_list(self, node: ParseNode) -> ASTNode:
-        ast_node = ASTNode("FormalParameterList")
+        ast_node = ASTNode(NodeKind.FORMAL_PARAMETER_LIST)
         for child in node.children:
             if child.name == "<parameter-group>":
                 param_group_ast = self.visit(child)
@@ -668,14 +724,15 @@ class SemanticAnalyzer:
         if current_block_idx < len(self.symbol_table.btab):
             # Hitung jumlah parameter
             param_count = sum(len(group.children) for group in ast_node.children)
-            self.symbol_table.btab[current_block_idx]["param_count"] = param_count
+            self.symbol_table.writable_block(current_block_idx).param_count = param_count
         
         return ast_node
     
     def visit_parameter_group(self, node: ParseNode) -> ASTNode:
-        ast_node = ASTNode("ParameterGroup")
+        ast_node = ASTNode(NodeKind.PARAMETER_GROUP)
         identifiers = []
         param_type = BaseType.VOID
+        type_ast = None
         
         for child in node.children:
             if child.name == "<identifier-list>":
@@ -684,16 +741,19 @@ class SemanticAnalyzer:
                 type_ast = self.visit(child)
                 param_type = type_ast.data_type if type_ast.data_type else BaseType.VOID
         
+        param_desc = type_ast.type_desc if type_ast and type_ast.type_desc else primitive(param_type)
+        
         # Masukkan parameter ke symbol table dengan flag is_param
         for identifier in identifiers:
             param_idx = self.symbol_table.enter_identifier(
-                identifier, ObjType.VARIABLE, param_type.value, size=1
+                identifier, ObjType.VARIABLE, param_type.value,
+                ref=self.type_ref(type_ast), size=param_desc.size, type_desc=param_desc
             )
             # Tandai sebagai parameter
             if param_idx < len(self.symbol_table.tab) and self.symbol_table.tab[param_idx] is not None:
-                self.symbol_table.tab[param_idx]["is_param"] = True
+                self.symbol_table.writable_entry(param_idx).is_param = True
             
-            param_node = VarDeclNode("Parameter", identifier=identifier,
+            param_node = VarDeclNode(NodeKind.PARAMETER, identifier=identifier,
                                 data_type=param_type, tab_index=param_idx, 
                                 block_index=self.symbol_table.display[-1])
             ast_node.add_child(param_node)
@@ -701,7 +761,7 @@ class SemanticAnalyzer:
         return ast_node
             
     def visit_const_declaration(self, node: ParseNode) -> ASTNode:
-        ast_node = ASTNode("ConstDeclaration")
+        ast_node = ASTNode(NodeKind.CONST_DECLARATION)
         for child in node.children:
             if child.name == "<const-item>":
                 const_item_ast = self.visit(child)
@@ -719,15 +779,12 @@ class SemanticAnalyzer:
                 identifier = child.token.value
             elif child.name == "<const-value>":
                 value_node = self.visit(child)
-                if hasattr(value_node, 'value'):
-                    const_value = value_node.value
-                elif value_node.children and hasattr(value_node.children[0], 'value'):
-                    const_value = value_node.children[0].value
+                const_value = value_node.value
         
         if identifier and value_node:
             # Cek identifier duplikat
             if self.check_duplicate_identifier(identifier, node.children[0].token if node.children else None):
-                const_node = ASTNode("ConstItem", 
+                const_node = ASTNode(NodeKind.CONST_ITEM, 
                                 token=node.children[0].token if node.children else None,
                                 data_type=value_node.data_type, tab_index=-1)
                 const_node.add_child(value_node)
@@ -742,13 +799,13 @@ class SemanticAnalyzer:
             )
             
             # Buat constant node khusus
-            const_node = ASTNode("ConstItem", 
+            const_node = ASTNode(NodeKind.CONST_ITEM, 
                             token=node.children[0].token if node.children else None,
                             data_type=const_type, tab_index=const_idx)
             const_node.add_child(value_node)
             return const_node
         
-        return ASTNode("ConstItem")
+        return ASTNode(NodeKind.CONST_ITEM)
     
     def visit_const_value(self, node: ParseNode) -> ASTNode:
         if node.children:
@@ -762,14 +819,14 @@ class SemanticAnalyzer:
                     # Cek jika ini char literal (panjang 3, diapit ')
                     if len(token_value) == 3 and token_value.startswith("'") and token_value.endswith("'"):
                         data_type = BaseType.CHAR
-                        ast_node = ASTNode("ConstValue", token=child.token, data_type=data_type)
-                        ast_node.value = token_value[1]
+                        ast_node = ConstantNode(NodeKind.CONST_VALUE, token=child.token, data_type=data_type,
+                                                value=token_value[1])
                         return ast_node
                     else:
                         # String literal biasa
                         data_type = BaseType.STRING
-                        ast_node = ASTNode("ConstValue", token=child.token, data_type=data_type)
-                        ast_node.value = token_value
+                        ast_node = ConstantNode(NodeKind.CONST_VALUE, token=child.token, data_type=data_type,
+                                                value=token_value)
                         return ast_node
                         
                 elif token_type == TokenType.NUMBER:
@@ -780,14 +837,14 @@ class SemanticAnalyzer:
                     else:
                         data_type = BaseType.INTEGER
                         value = int(token_value)
-                    ast_node = ASTNode("ConstValue", token=child.token, data_type=data_type)
-                    ast_node.value = value
+                    ast_node = ConstantNode(NodeKind.CONST_VALUE, token=child.token, data_type=data_type,
+                                            value=value)
                     return ast_node
                     
                 elif token_type == TokenType.CHAR_LITERAL:
                     data_type = BaseType.CHAR
-                    ast_node = ASTNode("ConstValue", token=child.token, data_type=data_type)
-                    ast_node.value = token_value
+                    ast_node = ConstantNode(NodeKind.CONST_VALUE, token=child.token, data_type=data_type,
+                                            value=token_value)
                     return ast_node
                     
                 elif token_type == TokenType.IDENTIFIER:
@@ -795,21 +852,21 @@ class SemanticAnalyzer:
                     ident_idx = self.symbol_table.find_identifier(token_value)
                     if ident_idx is not None:
                         ident_entry = self.symbol_table.tab[ident_idx]
-                        data_type = BaseType(ident_entry["type"])
-                        ast_node = ASTNode("ConstValue", token=child.token, data_type=data_type)
-                        # Untuk identifier constants, resolve value nanti
-                        ast_node.value = token_value
+                        data_type = ident_entry.type_desc.base
+                        # Propagasi nilai konstanta yang direferensikan
+                        ast_node = ConstantNode(NodeKind.CONST_VALUE, token=child.token, data_type=data_type,
+                                                value=self.symbol_table.get_constant_value(token_value))
                         return ast_node
                     else:
                         data_type = BaseType.VOID
-                        self.error(f"Undefined identifier '{token_value}'", child.token)
+                        self.report("E101", child.token, symbol=token_value, name=token_value)
                 else:
                     data_type = BaseType.VOID
             
-        return ASTNode("ConstValue", data_type=BaseType.VOID)
+        return ConstantNode(NodeKind.CONST_VALUE, data_type=BaseType.VOID)
     
     def visit_var_declaration(self, node: ParseNode) -> ASTNode:
-        ast_node = ASTNode("VarDeclaration")
+        ast_node = ASTNode(NodeKind.VAR_DECLARATION)
         for child in node.children:
             if child.name == "<var-item>":
                 var_item_ast = self.visit(child)
@@ -832,9 +889,10 @@ class SemanticAnalyzer:
         
         if identifiers and type_ast:
             base_type = type_ast.data_type
+            type_desc = type_ast.type_desc or primitive(base_type)
             
             # Buat parent node
-            var_ast = ASTNode("VarItem")
+            var_ast = ASTNode(NodeKind.VAR_ITEM)
             
             # Masukkan setiap identifier ke symbol table dan buat VarDeclNode
             for identifier in identifiers:
@@ -843,27 +901,28 @@ class SemanticAnalyzer:
                     node.children[0].children[0].token if node.children and node.children[0].children else None):
                     
                     var_idx = self.symbol_table.enter_identifier(
-                        identifier, ObjType.VARIABLE, base_type.value, size=1
+                        identifier, ObjType.VARIABLE, base_type.value,
+                        ref=self.type_ref(type_ast), size=type_desc.size, type_desc=type_desc
                     )
                     # Buat VarDeclNode dengan level yang benar
-                    ident_ast = VarDeclNode("Variable", identifier=identifier,
+                    ident_ast = VarDeclNode(NodeKind.VARIABLE, identifier=identifier,
                                         token=Token(TokenType.IDENTIFIER, identifier, 0, 0),
                                         data_type=base_type, tab_index=var_idx, block_index=0)
                     var_ast.add_child(ident_ast)
                 else:
                     # Tetap buat node tapi tandai sebagai error
-                    ident_ast = VarDeclNode("Variable", identifier=identifier,
+                    ident_ast = VarDeclNode(NodeKind.VARIABLE, identifier=identifier,
                                         token=Token(TokenType.IDENTIFIER, identifier, 0, 0),
                                         data_type=base_type, tab_index=-1, block_index=0)
                     var_ast.add_child(ident_ast)
             
             return var_ast
         
-        return ASTNode("VarItem")
+        return ASTNode(NodeKind.VAR_ITEM)
     
     def visit_type(self, node: ParseNode) -> ASTNode:
         if not node.children:
-            return ASTNode("Type", data_type=BaseType.VOID)
+            return ASTNode(NodeKind.TYPE, data_type=BaseType.VOID)
             
         first_child = node.children[0]
         
@@ -871,37 +930,45 @@ class SemanticAnalyzer:
         if first_child.token:
             token_value = first_child.token.value.lower()
             if token_value == "integer":
-                return ASTNode("Type", data_type=BaseType.INTEGER)
+                return ASTNode(NodeKind.TYPE, data_type=BaseType.INTEGER, type_desc=primitive(BaseType.INTEGER))
             elif token_value == "real":
-                return ASTNode("Type", data_type=BaseType.REAL)
+                return ASTNode(NodeKind.TYPE, data_type=BaseType.REAL, type_desc=primitive(BaseType.REAL))
             elif token_value == "boolean":
-                return ASTNode("Type", data_type=BaseType.BOOLEAN)
+                return ASTNode(NodeKind.TYPE, data_type=BaseType.BOOLEAN, type_desc=primitive(BaseType.BOOLEAN))
             elif token_value == "char":
-                return ASTNode("Type", data_type=BaseType.CHAR)
+                return ASTNode(NodeKind.TYPE, data_type=BaseType.CHAR, type_desc=primitive(BaseType.CHAR))
             elif token_value == "string":
-                return ASTNode("Type", data_type=BaseType.STRING)
+                return ASTNode(NodeKind.TYPE, data_type=BaseType.STRING, type_desc=primitive(BaseType.STRING))
         
         # Handle array type
         if first_child.name == "<array-type>":
             return self.visit_array_type(first_child)
+        
+        # Record: field belum di-layout, jadi tipenya hanya RECORD tanpa struktur
+        # (backend menolak akses ke variabel record)
+        if first_child.name == "<record-type>":
+            return ASTNode(NodeKind.TYPE, data_type=BaseType.RECORD, type_desc=primitive(BaseType.RECORD))
             
         # Handle range type (direct range seperti 1..10)
         if first_child.name == "<range>":
-            # Treat range sebagai integer type untuk sekarang
-            return ASTNode("Type", data_type=BaseType.INTEGER)
+            # Subrange integer dengan batas hasil folding
+            low_bound, high_bound = self.parse_range(node)
+            return ASTNode(NodeKind.TYPE, data_type=BaseType.INTEGER,
+                           type_desc=subrange_type(primitive(BaseType.INTEGER), low_bound, high_bound))
             
         # Handle type alias (identifier)
         if first_child.name == "IDENTIFIER" and first_child.token:
             # Cari type di symbol table
             type_name = first_child.token.value
             type_idx = self.symbol_table.find_identifier(type_name)
-            if type_idx is not None and self.symbol_table.tab[type_idx]["obj"] == ObjType.TYPE:
-                base_type = BaseType(self.symbol_table.tab[type_idx]["type"])
-                return ASTNode("Type", data_type=base_type, tab_index=type_idx)
+            if type_idx is not None and self.symbol_table.tab[type_idx].obj == ObjType.TYPE:
+                type_entry = self.symbol_table.tab[type_idx]
+                return ASTNode(NodeKind.TYPE, data_type=type_entry.type_desc.base, tab_index=type_idx,
+                               type_desc=type_entry.type_desc)
             else:
-                self.error(f"Undefined type '{type_name}'", first_child.token)
+                self.report("E103", first_child.token, symbol=type_name, name=type_name)
         
-        return ASTNode("Type", data_type=BaseType.VOID)
+        return ASTNode(NodeKind.TYPE, data_type=BaseType.VOID)
     
     def visit_array_type(self, node: ParseNode) -> ASTNode:
         # Extract index specification dan element type
@@ -923,24 +990,29 @@ class SemanticAnalyzer:
         if element_type_node:
             # Cek invalid array bounds
             if low_bound > high_bound:
-                self.error(f"Invalid array bounds: {low_bound}..{high_bound} (lower bound > upper bound)", 
-                        node.children[0].token if node.children else None)
+                self.report("E301", node.children[0].token if node.children else None,
+                            low=low_bound, high=high_bound)
+            
+            element_desc = element_type_node.type_desc or primitive(element_type_node.data_type)
             
             # Buat array table entry
             array_idx = self.symbol_table.enter_array(
                 BaseType.INTEGER.value,  # index type (asumsi integer untuk sekarang)
-                element_type_node.data_type.value,  # element type
+                element_desc.base.value,  # element type
                 low_bound,  
                 high_bound,
-                1   # element size
+                element_desc.size,  # element size
+                self.type_ref(element_type_node),  # eref untuk elemen komposit
+                element_desc
             )
             
-            return ASTNode("ArrayType", data_type=BaseType.ARRAY, tab_index=array_idx)
+            return ASTNode(NodeKind.ARRAY_TYPE, data_type=BaseType.ARRAY, tab_index=array_idx,
+                           type_desc=self.symbol_table.atab[array_idx].type_desc)
         
-        return ASTNode("ArrayType", data_type=BaseType.ARRAY)
+        return ASTNode(NodeKind.ARRAY_TYPE, data_type=BaseType.ARRAY)
     
     def visit_type_declaration(self, node: ParseNode) -> ASTNode:
-        ast_node = ASTNode("TypeDeclaration")
+        ast_node = ASTNode(NodeKind.TYPE_DECLARATION)
         for child in node.children:
             if child.name == "<type-item>":
                 type_item_ast = self.visit(child)
@@ -963,73 +1035,92 @@ class SemanticAnalyzer:
                     if first_child.name == "<type>":
                         type_def_ast = self.visit(first_child)
                     elif first_child.name == "<range>":
-                        # Untuk range types seperti "1..10", treat sebagai integer type
-                        type_def_ast = ASTNode("RangeType", data_type=BaseType.INTEGER)
+                        # Range type seperti "1..10" menjadi subrange integer
+                        low_bound, high_bound = self.parse_range(type_def_node)
+                        type_def_ast = ASTNode(NodeKind.RANGE_TYPE, data_type=BaseType.INTEGER,
+                                               type_desc=subrange_type(primitive(BaseType.INTEGER),
+                                                                       low_bound, high_bound))
                     elif first_child.name == "<array-type>":
                         type_def_ast = self.visit(first_child)
                     else:
                         # Default case
                         type_def_ast = self.visit(first_child)
                 else:
-                    type_def_ast = ASTNode("TypeDefinition", data_type=BaseType.VOID)
+                    type_def_ast = ASTNode(NodeKind.TYPE_DEFINITION, data_type=BaseType.VOID)
         
         if identifier and type_def_ast:
             # Masukkan type alias ke symbol table
             type_idx = self.symbol_table.enter_identifier(
-                identifier, ObjType.TYPE, type_def_ast.data_type.value if type_def_ast.data_type else BaseType.VOID.value
+                identifier, ObjType.TYPE, type_def_ast.data_type.value if type_def_ast.data_type else BaseType.VOID.value,
+                ref=self.type_ref(type_def_ast), type_desc=type_def_ast.type_desc
             )
             
             # Buat specialized type node
-            type_node = ASTNode("TypeItem", 
+            type_node = ASTNode(NodeKind.TYPE_ITEM, 
                             token=node.children[0].token if node.children else None,
-                            data_type=type_def_ast.data_type, tab_index=type_idx)
+                            data_type=type_def_ast.data_type, tab_index=type_idx,
+                            type_desc=self.symbol_table.tab[type_idx].type_desc)
             type_node.add_child(type_def_ast)
             return type_node
         
-        return ASTNode("TypeItem", data_type=BaseType.VOID)
+        return ASTNode(NodeKind.TYPE_ITEM, data_type=BaseType.VOID)
+    
+    def type_ref(self, type_ast: Optional[ASTNode]) -> int:
+        # Index atab untuk tipe array: langsung dari ArrayType, atau lewat
+        # ref milik type alias di tab
+        if type_ast is None or type_ast.tab_index < 0:
+            return 0
+        if type_ast.node_type == NodeKind.ARRAY_TYPE:
+            return type_ast.tab_index
+        if type_ast.node_type in (NodeKind.TYPE, NodeKind.TYPE_ITEM):
+            return self.symbol_table.tab[type_ast.tab_index].ref
+        return 0
     
     def visit_type_definition(self, node: ParseNode) -> ASTNode:
         if node.children:
             return self.visit(node.children[0])
-        return ASTNode("TypeDefinition", data_type=BaseType.VOID)
+        return ASTNode(NodeKind.TYPE_DEFINITION, data_type=BaseType.VOID)
     
-    def visit_compound_statement(self, node: ParseNode) -> ASTNode:
-        ast_node = ASTNode("CompoundStatement", block_index=self.symbol_table.display[-1])
+    def visit_compound_statement(self, node: ParseNode) -> Generator:
+        ast_node = ASTNode(NodeKind.COMPOUND_STATEMENT, block_index=self.symbol_table.display[-1])
         for child in node.children:
             if child.name == "<statement-list>":
-                stmt_list = self.visit(child)
+                stmt_list = yield child
                 # Extract statements langsung
                 for stmt in stmt_list.children:
                     ast_node.add_child(stmt)
         return ast_node
     
-    def visit_statement_list(self, node: ParseNode) -> ASTNode:
-        ast_node = ASTNode("StatementList")
+    def visit_statement_list(self, node: ParseNode) -> Generator:
+        ast_node = ASTNode(NodeKind.STATEMENT_LIST)
         for child in node.children:
             if (child.name == "<statement>" or 
                 child.name == "<assignment-statement>" or
                 child.name == "<procedure-call>"):
-                stmt_ast = self.visit(child)
+                stmt_ast = yield child
                 if stmt_ast:  # Hanya tambahkan jika tidak None
                     ast_node.add_child(stmt_ast)
         return ast_node
     
-    def visit_statement(self, node: ParseNode) -> ASTNode:
+    def visit_statement(self, node: ParseNode) -> Generator:
         if node.children:
             first_child = node.children[0]
             if first_child.name == "<while-statement>":
-                return self.visit_while_statement(first_child)
+                return (yield self.visit_while_statement(first_child))
             elif first_child.name == "<for-statement>":
-                return self.visit_for_statement(first_child)
+                return (yield self.visit_for_statement(first_child))
             elif first_child.name == "<repeat-statement>":
-                return self.visit_repeat_statement(first_child)
+                return (yield self.visit_repeat_statement(first_child))
             elif first_child.name == "<if-statement>":
-                return self.visit(first_child)
+                return (yield first_child)
+            elif first_child.name == "IDENTIFIER" and first_child.token:
+                # Pemanggilan prosedur tanpa parameter, mis. "InitializeData;"
+                return (yield self.visit_procedure_call(node))
             else:
-                return self.visit(first_child)
-        return ASTNode("Statement", data_type=BaseType.VOID)
+                return (yield first_child)
+        return ASTNode(NodeKind.STATEMENT, data_type=BaseType.VOID)
     
-    def visit_assignment_statement(self, node: ParseNode) -> ASTNode:
+    def visit_assignment_statement(self, node: ParseNode) -> Generator:
         target_node = None
         value_node = None
         
@@ -1043,8 +1134,8 @@ class SemanticAnalyzer:
                 value_child = node.children[i + 2]
                 
                 try:
-                    target_node = self.visit(target_child)
-                    value_node = self.visit(value_child)
+                    target_node = yield target_child
+                    value_node = yield value_child
                     
                     # Cek constant assignment
                     if target_node:
@@ -1063,13 +1154,13 @@ class SemanticAnalyzer:
             for child in node.children:
                 if child.name == "<variable>":
                     try:
-                        var_node = self.visit(child)
+                        var_node = yield child
                         variables.append(var_node)
                     except:
                         continue
                 elif child.name == "<expression>":
                     try:
-                        expr_node = self.visit(child)
+                        expr_node = yield child
                         expressions.append(expr_node)
                     except:
                         continue
@@ -1086,77 +1177,91 @@ class SemanticAnalyzer:
         # Type checking - hanya jika kedua node berhasil diproses
         if target_node and value_node and target_node.data_type and value_node.data_type:
             # Cek jika target adalah array element
-            if hasattr(target_node, 'is_array_element') and target_node.is_array_element:
-                if not self.is_type_compatible(target_node.data_type, value_node.data_type):
-                    self.error(f"Type mismatch in array assignment: cannot assign {value_node.data_type.name} to array element of type {target_node.data_type.name}", 
-                            node.children[1].token if len(node.children) > 1 else None)
+            if isinstance(target_node, VariableNode) and target_node.is_array_element:
+                if not self.is_type_compatible(target_node.type_desc or target_node.data_type,
+                                               value_node.type_desc or value_node.data_type):
+                    self.report("E202", node.children[1].token if len(node.children) > 1 else None,
+                                source=self.type_label(value_node), target=self.type_label(target_node))
             else:
-                if not self.is_type_compatible(target_node.data_type, value_node.data_type):
-                    self.error(f"Type mismatch in assignment: cannot assign {value_node.data_type.name} to {target_node.data_type.name}", 
-                            node.children[1].token if len(node.children) > 1 else None)
+                if not self.is_type_compatible(target_node.type_desc or target_node.data_type,
+                                               value_node.type_desc or value_node.data_type):
+                    self.report("E201", node.children[1].token if len(node.children) > 1 else None,
+                                source=self.type_label(value_node), target=self.type_label(target_node))
         
         # Buat AssignmentNode
-        ast_node = AssignmentNode("Assignment", data_type=BaseType.VOID)
+        ast_node = AssignmentNode(NodeKind.ASSIGNMENT, data_type=BaseType.VOID)
         if target_node:
             ast_node.add_child(target_node)
         else:
-            ast_node.add_child(ASTNode("UnknownTarget"))
+            ast_node.add_child(ASTNode(NodeKind.UNKNOWN_TARGET))
         
         if value_node:
             ast_node.add_child(value_node)
         else:
-            ast_node.add_child(ASTNode("UnknownValue"))
+            ast_node.add_child(ASTNode(NodeKind.UNKNOWN_VALUE))
                     
         return ast_node
     
-    def visit_expression(self, node: ParseNode) -> ASTNode:
+    def visit_expression(self, node: ParseNode) -> Generator:
         if len(node.children) == 1:
             # Simple expression saja
-            return self.visit(node.children[0])
+            return (yield node.children[0])
         else:
             # Expression dengan operator
-            left_expr = self.visit(node.children[0])
+            left_expr = yield node.children[0]
+            result_node = left_expr
             
-            # Jika hanya ada 1 child setelah left_expr, return left_expr saja
-            if len(node.children) == 1:
-                return left_expr
+            i = 1
+            while i + 1 < len(node.children):
+                operator_node = node.children[i]
+                right_expr = yield node.children[i + 1]
                 
-            operator_node = node.children[1]
-            right_expr = self.visit(node.children[2])
-            
-            # Tentukan nilai operator
-            operator_value = ""
-            if operator_node.children and operator_node.children[0].token:
-                operator_value = operator_node.children[0].token.value
-            elif operator_node.token:
-                operator_value = operator_node.token.value
-            
-            # Tentukan result type
-            result_type = self.get_expression_type(left_expr.data_type, right_expr.data_type, operator_value)
+                # Tentukan nilai operator
+                operator_value = ""
+                if operator_node.children and operator_node.children[0].token:
+                    operator_value = operator_node.children[0].token.value
+                elif operator_node.token:
+                    operator_value = operator_node.token.value
+                
+                # Operator relasional tidak asosiatif: a < b < c harus diberi kurung
+                if i > 1 and operator_node.name == "<relational-operator>":
+                    self.report("E208", self.first_token(operator_node), operator=operator_value)
+                self.check_logical_operands(operator_value, result_node, right_expr,
+                                            self.first_token(operator_node))
+                
+                # Tentukan result type
+                result_type = self.get_expression_type(result_node.data_type, right_expr.data_type, operator_value)
+                
+                # Gunakan BinaryExpressionNode khusus dengan 2 children
+                new_result = BinaryExpressionNode(NodeKind.BINARY_EXPRESSION, data_type=result_type, operator=operator_value)
+                new_result.add_child(result_node)
+                new_result.add_child(right_expr)  # Hanya 2 children: left dan right
+                result_node = new_result
+                i += 2
             
-            # Gunakan BinaryExpressionNode khusus dengan 2 children
-            ast_node = BinaryExpressionNode("BinaryExpression", data_type=result_type, operator=operator_value)
-            ast_node.add_child(left_expr)
-            ast_node.add_child(right_expr)  # Hanya 2 children: left dan right
-            return ast_node
+            return result_node
         
-    def visit_simple_expression(self, node: ParseNode) -> ASTNode:
+    def visit_simple_expression(self, node: ParseNode) -> Generator:
         if len(node.children) == 1:
-            return self.visit(node.children[0])
+            return (yield node.children[0])
         else:
             # Simple expression dengan additive operators
-            left_term = self.visit(node.children[0])
+            if node.children[0].name == "<unary-add-operator>":
+                left_term = yield self.visit_unary_term(node.children[0], node.children[1])
+                i = 2
+            else:
+                left_term = yield node.children[0]
+                i = 1
             result_node = left_term
             
             # Handle multiple terms - gunakan while loop yang lebih aman
-            i = 1
             while i < len(node.children):
                 # Pastikan ada cukup children untuk operator dan term
                 if i + 1 >= len(node.children):
                     break
                     
                 operator_node = node.children[i]
-                right_term = self.visit(node.children[i + 1])
+                right_term = yield node.children[i + 1]
                 
                 # Tentukan nilai operator
                 operator_value = ""
@@ -1165,13 +1270,16 @@ class SemanticAnalyzer:
                 elif operator_node.token:
                     operator_value = operator_node.token.value
                 
+                self.check_logical_operands(operator_value, result_node, right_term,
+                                            self.first_token(operator_node))
+                
                 # Tentukan result type
                 result_type = self.get_expression_type(
                     result_node.data_type, right_term.data_type, operator_value
                 )
                 
                 # Buat binary expression dengan 2 children
-                new_result = BinaryExpressionNode("BinaryExpression", data_type=result_type, operator=operator_value)
+                new_result = BinaryExpressionNode(NodeKind.BINARY_EXPRESSION, data_type=result_type, operator=operator_value)
                 new_result.add_child(result_node)
                 new_result.add_child(right_term)  # Hanya 2 children
                 result_node = new_result
@@ -1179,12 +1287,26 @@ class SemanticAnalyzer:
             
             return result_node
     
-    def visit_term(self, node: ParseNode) -> ASTNode:
+    def visit_unary_term(self, operator_node: ParseNode, term_node: ParseNode) -> Generator:
+        operand = yield term_node
+        operator_token = operator_node.children[0].token if operator_node.children else None
+        operator_value = operator_token.value if operator_token else "+"
+        
+        if operand.data_type not in (BaseType.INTEGER, BaseType.REAL, BaseType.VOID):
+            self.report("E207", operator_token, operator=operator_value,
+                        actual=self.get_type_name(operand.data_type))
+        
+        ast_node = UnaryExpressionNode(NodeKind.UNARY_EXPRESSION, token=operator_token,
+                                       data_type=operand.data_type, operator=operator_value)
+        ast_node.add_child(operand)
+        return ast_node
+    
+    def visit_term(self, node: ParseNode) -> Generator:
         if len(node.children) == 1:
-            return self.visit(node.children[0])
+            return (yield node.children[0])
         else:
             # Term dengan multiplicative operators
-            left_factor = self.visit(node.children[0])
+            left_factor = yield node.children[0]
             result_node = left_factor
             
             # Handle multiple factors - gunakan while loop yang lebih aman
@@ -1195,7 +1317,7 @@ class SemanticAnalyzer:
                     break
                     
                 operator_node = node.children[i]
-                right_factor = self.visit(node.children[i + 1])
+                right_factor = yield node.children[i + 1]
                 
                 # Tentukan nilai operator
                 operator_value = ""
@@ -1204,13 +1326,16 @@ class SemanticAnalyzer:
                 elif operator_node.token:
                     operator_value = operator_node.token.value
                 
+                self.check_logical_operands(operator_value, result_node, right_factor,
+                                            self.first_token(operator_node))
+                
                 # Tentukan result type
                 result_type = self.get_expression_type(
                     result_node.data_type, right_factor.data_type, operator_value
                 )
                 
                 # Buat binary expression dengan 2 children
-                new_result = BinaryExpressionNode("BinaryExpression", data_type=result_type, operator=operator_value)
+                new_result = BinaryExpressionNode(NodeKind.BINARY_EXPRESSION, data_type=result_type, operator=operator_value)
                 new_result.add_child(result_node)
                 new_result.add_child(right_factor)  # Hanya 2 children
                 result_node = new_result
@@ -1218,9 +1343,9 @@ class SemanticAnalyzer:
             
             return result_node
     
-    def visit_factor(self, node: ParseNode) -> ASTNode:
+    def visit_factor(self, node: ParseNode) -> Generator:
         if not node.children:
-            return ASTNode("Factor", data_type=BaseType.VOID)
+            return ASTNode(NodeKind.FACTOR, data_type=BaseType.VOID)
         
         first_child = node.children[0]
         
@@ -1231,10 +1356,8 @@ class SemanticAnalyzer:
                 # Treat sebagai boolean literal
                 data_type = BaseType.BOOLEAN
                 value = ident_name == 'benar'
-                ast_node = BooleanNode("Boolean", token=first_child.token, data_type=data_type)
-                ast_node.value = value
-                ast_node.identifier = ident_name
-                return ast_node
+                return BooleanNode(NodeKind.BOOLEAN, token=first_child.token, data_type=data_type,
+                                   value=value, identifier=ident_name)
         
         # Number literal
         if first_child.name == "NUMBER" and first_child.token:
@@ -1250,7 +1373,7 @@ class SemanticAnalyzer:
                     value = int(first_child.token.value)
                 except ValueError:
                     value = 0
-            return NumberNode("Number", token=first_child.token, data_type=data_type, value=value)
+            return NumberNode(NodeKind.NUMBER, token=first_child.token, data_type=data_type, value=value)
         
         # String literal - Deteksi char vs string
         elif first_child.name == "STRING_LITERAL" and first_child.token:
@@ -1258,16 +1381,15 @@ class SemanticAnalyzer:
             # Deteksi char literal: string dengan panjang 3 dan diapit tanda kutip tunggal
             if len(token_value) == 3 and token_value.startswith("'") and token_value.endswith("'"):
                 data_type = BaseType.CHAR
-                ast_node = ASTNode("Char", token=first_child.token, data_type=data_type)
-                ast_node.value = token_value[1]  # Extract char
-                return ast_node
+                return ConstantNode(NodeKind.CHAR, token=first_child.token, data_type=data_type,
+                                    value=token_value[1])  # Extract char
             else:
                 # String literal biasa
-                return StringNode("String", token=first_child.token, data_type=BaseType.STRING, value=token_value)
+                return StringNode(NodeKind.STRING, token=first_child.token, data_type=BaseType.STRING, value=token_value)
         
         # Char literal (jika ada token type khusus)
         elif first_child.name == "CHAR_LITERAL" and first_child.token:
-            return ASTNode("Char", token=first_child.token, data_type=BaseType.CHAR)
+            return ConstantNode(NodeKind.CHAR, token=first_child.token, data_type=BaseType.CHAR)
         
         # Identifier (variable or function call)
         elif first_child.name == "IDENTIFIER" and first_child.token:
@@ -1276,47 +1398,55 @@ class SemanticAnalyzer:
             
             if ident_idx is not None:
                 ident_entry = self.symbol_table.tab[ident_idx]
-                ident_type = BaseType(ident_entry["type"])
-                obj_type = ident_entry["obj"]
+                ident_type = ident_entry.type_desc.base
+                obj_type = ident_entry.obj
                 
                 if obj_type == ObjType.CONSTANT:
                     # Handle constant identifier
                     const_value = self.symbol_table.get_constant_value(ident_name)
-                    ast_node = ASTNode("ConstIdentifier", token=first_child.token, 
-                                data_type=ident_type, tab_index=ident_idx)
-                    ast_node.value = const_value
-                    ast_node.identifier = ident_name
-                    return ast_node
+                    return ConstantNode(NodeKind.CONST_IDENTIFIER, token=first_child.token, 
+                                data_type=ident_type, tab_index=ident_idx,
+                                value=const_value, identifier=ident_name)
                 else:
+                    # Nama fungsi tanpa argumen adalah pemanggilan tanpa parameter
+                    if obj_type == ObjType.FUNCTION and ident_entry.signature is not None:
+                        self.check_parameter_count(ident_name, len(ident_entry.signature.params), 0,
+                                                   first_child.token)
                     # Regular variable
-                    return VariableNode("Variable", token=first_child.token, 
-                                data_type=ident_type, tab_index=ident_idx, identifier=ident_name)
+                    return VariableNode(NodeKind.VARIABLE, token=first_child.token, 
+                                data_type=ident_type, tab_index=ident_idx, identifier=ident_name,
+                                type_desc=ident_entry.type_desc)
             else:
-                self.error(f"Undefined identifier '{ident_name}'", first_child.token)
-                return VariableNode("Variable", token=first_child.token, 
+                self.report("E101", first_child.token, symbol=ident_name, name=ident_name)
+                return VariableNode(NodeKind.VARIABLE, token=first_child.token, 
                             data_type=BaseType.VOID, identifier=ident_name)
         
         # Parenthesized expression
         elif (first_child.name == "LPARENTHESIS" and first_child.token and
-            len(node.children) > 2 and node.children[2].name == "<expression>"):
-            return self.visit(node.children[1])
+            len(node.children) > 2 and node.children[1].name == "<expression>"):
+            return (yield node.children[1])
+        
+        # Variable dengan indeks (elemen array)
+        elif first_child.name == "<variable>":
+            return (yield first_child)
         
         # Function call
         elif first_child.name == "<function-call>":
-            return self.visit(first_child)
+            return (yield first_child)
         
         # Handle case LOGICAL_OPERATOR(tidak) <factor>
         elif (first_child.name == "LOGICAL_OPERATOR(tidak)" and first_child.token and
             len(node.children) > 1):
             # Ini NOT operator
-            factor_node = self.visit(node.children[1])
-            ast_node = ASTNode("NotExpression", data_type=BaseType.BOOLEAN)
+            factor_node = yield node.children[1]
+            self.check_logical_operands("tidak", factor_node, None, first_child.token)
+            ast_node = ASTNode(NodeKind.NOT_EXPRESSION, data_type=BaseType.BOOLEAN)
             ast_node.add_child(factor_node)
             return ast_node
         
-        return ASTNode("Factor", data_type=BaseType.VOID)
+        return ASTNode(NodeKind.FACTOR, data_type=BaseType.VOID)
     
-    def visit_variable(self, node: ParseNode) -> ASTNode:
+    def visit_variable(self, node: ParseNode) -> Generator:
         # Cek pattern array access: IDENTIFIER LBRACKET expression (COMMA expression)* RBRACKET
         if (len(node.children) >= 4 and
             node.children[0].name == "IDENTIFIER" and
@@ -1335,18 +1465,22 @@ class SemanticAnalyzer:
                 
                 if array_idx is not None:
                     array_entry = self.symbol_table.tab[array_idx]
-                    if array_entry["type"] == BaseType.ARRAY.value:
+                    if array_entry.type == BaseType.ARRAY.value:
                         # Dapatkan tipe elemen array dari atab
-                        array_ref = array_entry["ref"]
+                        array_ref = array_entry.ref
                         if array_ref < len(self.symbol_table.atab):
-                            element_type = BaseType(self.symbol_table.atab[array_ref]["element_type"])
+                            array_desc = array_entry.type_desc
+                            if not isinstance(array_desc, ArrayType):
+                                array_desc = self.symbol_table.atab[array_ref].type_desc
+                            element_desc = array_desc.element
+                            element_type = element_desc.base
                             
                             # Parse index expressions untuk bounds checking
                             index_expressions = []
                             i = 2
                             while i < rbrace_index:
                                 if node.children[i].name == "<expression>":
-                                    index_expr = self.visit(node.children[i])
+                                    index_expr = yield node.children[i]
                                     index_expressions.append(index_expr)
                                     # Check array bounds untuk setiap index
                                     self.check_array_bounds(array_ref, index_expr, node.children[1].token)
@@ -1356,56 +1490,70 @@ class SemanticAnalyzer:
                                 i += 1
                             
                             # Buat node untuk array element access dengan tipe ELEMENT
-                            var_node = VariableNode("ArrayElement", identifier=array_name,
+                            var_node = VariableNode(NodeKind.ARRAY_ELEMENT, identifier=array_name,
                                             token=node.children[0].token, 
-                                            data_type=element_type, tab_index=array_idx)
-                            var_node.is_array_element = True
-                            var_node.index_expressions = index_expressions  # Simpan index expressions
+                                            data_type=element_type, tab_index=array_idx,
+                                            type_desc=element_desc, is_array_element=True,
+                                            index_expressions=index_expressions)
                             return var_node
                 
                 # Jika bukan array atau tidak ditemukan, treat sebagai error
-                self.error(f"'{array_name}' is not an array or undefined", node.children[0].token)
-                return VariableNode("Variable", identifier=array_name,
+                self.report("E108", node.children[0].token, symbol=array_name, name=array_name)
+                return VariableNode(NodeKind.VARIABLE, identifier=array_name,
                                 token=node.children[0].token, 
                                 data_type=BaseType.VOID)
         
+        # Akses field record (p.x): tipe field tidak diketahui, node menunjuk
+        # ke variabel record-nya
+        if len(node.children) >= 3 and node.children[0].token and node.children[1].name == "DOT":
+            var_node = self.resolve_variable(node.children[0].token)
+            var_node.data_type = BaseType.VOID
+            var_node.type_desc = None
+            return var_node
+        
         # Untuk kasus sederhana (non-array)
         for child in node.children:
             if child.name == "IDENTIFIER" and child.token:
-                var_name = child.token.value
-                var_idx = self.symbol_table.find_identifier(var_name)
-                
-                if var_idx is not None:
-                    var_type = BaseType(self.symbol_table.tab[var_idx]["type"])
-                    return VariableNode("Variable", identifier=var_name,
-                                    token=child.token, 
-                                    data_type=var_type, tab_index=var_idx)
-                else:
-                    self.error(f"Undefined variable '{var_name}'", child.token)
-                    return VariableNode("Variable", identifier=var_name,
-                                    token=child.token, 
-                                    data_type=BaseType.VOID)
+                return self.resolve_variable(child.token)
         
-        return ASTNode("UnknownVariable")
+        return ASTNode(NodeKind.UNKNOWN_VARIABLE)
     
-    def visit_procedure_call(self, node: ParseNode) -> ASTNode:
+    def resolve_variable(self, token: Token) -> VariableNode:
+        var_name = token.value
+        var_idx = self.symbol_table.find_identifier(var_name)
+        
+        if var_idx is not None:
+            var_desc = self.symbol_table.tab[var_idx].type_desc
+            return VariableNode(NodeKind.VARIABLE, identifier=var_name,
+                            token=token, 
+                            data_type=var_desc.base, tab_index=var_idx, type_desc=var_desc)
+        
+        self.report("E102", token, symbol=var_name, name=var_name)
+        return VariableNode(NodeKind.VARIABLE, identifier=var_name,
+                        token=token, 
+                        data_type=BaseType.VOID)
+    
+    def visit_procedure_call(self, node: ParseNode) -> Generator:
         proc_name = ""
+        proc_token = None
         for child in node.children:
             if (child.name == "IDENTIFIER" and child.token) or \
             (child.name.startswith("KEYWORD") and child.token and
                 child.token.value.lower() in ['writeln', 'readln', 'write', 'read']):
                 proc_name = child.token.value
+                proc_token = child.token
                 break
         
-        # Buat procedure call node
-        ast_node = ProcedureCallNode("ProcedureCall", data_type=BaseType.VOID, procedure_name=proc_name)
+        # Buat procedure call node (token nama dipakai untuk nomor baris di backend)
+        ast_node = ProcedureCallNode(NodeKind.PROCEDURE_CALL, token=proc_token, data_type=BaseType.VOID,
+                                     procedure_name=proc_name)
         
         # Cari procedure di symbol table
         proc_idx = self.symbol_table.find_identifier(proc_name)
         if proc_idx is not None:
             ast_node.tab_index = proc_idx
             proc_entry = self.symbol_table.tab[proc_idx]
-            if proc_entry["obj"] == ObjType.PROCEDURE:
+            if proc_entry.obj == ObjType.PROCEDURE:
                 ast_node.is_user_defined = True
             else:
                 ast_node.is_user_defined = False
@@ -1413,8 +1561,8 @@ class SemanticAnalyzer:
             if proc_name in ['writeln', 'readln', 'write', 'read']:
                 ast_node.is_user_defined = False
             else:
-                self.error(f"Undefined procedure '{proc_name}'", 
-                        node.children[0].token if node.children else None)
+                self.report("E105", node.children[0].token if node.children else None,
+                            symbol=proc_name, name=proc_name)
         
         # Kumpulkan dan validasi parameter untuk user-defined procedures
         param_nodes = []
@@ -1422,19 +1570,16 @@ class SemanticAnalyzer:
         
         for child in node.children:
             if child.name == "<parameter-list>":
-                param_ast = self.visit(child)
+                param_ast = yield child
                 # Extract parameter expressions dan types
                 for param_expr in param_ast.children:
                     param_nodes.append(param_expr)
-                    if hasattr(param_expr, 'data_type'):
-                        param_types.append(param_expr.data_type)
-                    else:
-                        param_types.append(BaseType.VOID)
+                    param_types.append(param_expr.type_desc or param_expr.data_type or BaseType.VOID)
         
         # Validasi parameter untuk user-defined procedures
         if proc_name not in ['writeln', 'readln', 'write', 'read'] and ast_node.is_user_defined:
             self.validate_parameters(proc_name, len(param_types), param_types,
-                                node.children[0].token if node.children else None)
+                                node.children[0].token if node.children else None, proc_idx)
         
         # Tambahkan parameter
         for param_node in param_nodes:
@@ -1442,15 +1587,15 @@ class SemanticAnalyzer:
         
         return ast_node
     
-    def visit_parameter_list(self, node: ParseNode) -> ASTNode:
-        ast_node = ASTNode("ParameterList")
+    def visit_parameter_list(self, node: ParseNode) -> Generator:
+        ast_node = ASTNode(NodeKind.PARAMETER_LIST)
         for child in node.children:
             if child.name == "<expression>":
-                ast_node.add_child(self.visit(child))
+                ast_node.add_child((yield child))
         return ast_node
     
     def visit_block(self, node: ParseNode) -> ASTNode:
-        ast_node = ASTNode("Block", block_index=self.symbol_table.display[-1])
+        ast_node = ASTNode(NodeKind.BLOCK, block_index=self.symbol_table.display[-1])
         
         for child in node.children:
             if child.name == "<declaration-part>":
@@ -1460,4 +1605,7 @@ class SemanticAnalyzer:
                 compound_ast = self.visit(child)
                 ast_node.add_child(compound_ast)
         
-        return ast_node
\ No newline at end of file
+        return ast_node
+
+
+SemanticAnalyzer._dispatch_table = SemanticAnalyzer._build_dispatch_table()
@@ -1,9 +1,10 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 from enum import Enum, auto
 from dataclasses import dataclass, field
 from src.parse_tree import ParseNode
 from src.tokens import Token, TokenType
+from .type_descriptors import BaseType, TypeDescriptor, PRIMITIVES_BY_VALUE, array_type
 
 class ObjType(Enum):
     CONSTANT = auto()
@@ -13,109 +14,286 @@ class ObjType(Enum):
     FUNCTION = auto()
     PROGRAM = auto()
 
-class BaseType(Enum):
-    INTEGER = 1
-    REAL = 2
-    BOOLEAN = 3
-    CHAR = 4
-    STRING = 5
-    ARRAY = 6
-    RECORD = 7
-    VOID = 8
-    RANGE = 9
+class _SlotRecord:
+    # Record ringkas berbasis __slots__. Akses gaya dict (entry["name"]) tetap
+    # didukung sebagai compatibility view untuk kode lama seperti ast_printer.
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key)
+
+    def keys(self):
+        return self.__slots__
+
+    def copy(self):
+        # Salinan dangkal, dipakai copy-on-write di SymbolTable
+        clone = object.__new__(type(self))
+        for name in self.__slots__:
+            setattr(clone, name, getattr(self, name))
+        return clone
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class TabEntry(_SlotRecord):
+    __slots__ = ("name", "obj", "type", "ref", "nrm", "lev", "adr", "link",
+                 "is_param", "block_index", "type_desc", "signature")
+
+    def __init__(self, name: str, obj: ObjType, type: int, ref: int = 0, nrm: int = 1,
+                 lev: int = 0, adr: int = 0, link: int = 0,
+                 is_param: bool = False, block_index: int = -1,
+                 type_desc: Optional[TypeDescriptor] = None, signature: Optional[Signature] = None):
+        self.name = name
+        self.obj = obj
+        self.type = type
+        self.ref = ref                  # Pointer ke tabel lain untuk tipe komposit
+        self.nrm = nrm                  # Normal variable (1) atau parameter by-reference (0)
+        self.lev = lev                  # Level lexical
+        self.adr = adr                  # Offset/address
+        self.link = link                # Link ke identifier sebelumnya dalam block
+        self.is_param = is_param        # True untuk parameter formal
+        self.block_index = block_index  # Block milik prosedur/fungsi (-1 jika tidak ada)
+        # Descriptor tipe yang di-intern (lihat type_descriptors.py)
+        self.type_desc = type_desc if type_desc is not None else PRIMITIVES_BY_VALUE[type]
+        self.signature = signature      # Signature prosedur/fungsi (None untuk non-subprogram)
+
+
+class Signature(_SlotRecord):
+    __slots__ = ("names", "params", "bases", "modes", "return_type")
+
+    def __init__(self, names: Tuple[str, ...], params: Tuple[TypeDescriptor, ...],
+                 modes: Tuple[int, ...], return_type: TypeDescriptor):
+        self.names = names                  # Nama parameter formal sesuai urutan
+        self.params = params                # Descriptor tipe parameter sesuai urutan
+        self.bases = tuple(param.base for param in params)  # Untuk fast path perbandingan tuple
+        self.modes = modes                  # nrm per parameter: 1 by-value, 0 by-reference
+        self.return_type = return_type      # VOID untuk prosedur
+
+
+class BlockEntry(_SlotRecord):
+    __slots__ = ("last", "lpar", "psze", "vsze", "param_count")
+
+    def __init__(self, last: int = 0, lpar: int = 0, psze: int = 0, vsze: int = 0,
+                 param_count: int = 0):
+        self.last = last                # Pointer ke identifier terakhir dalam block
+        self.lpar = lpar                # Pointer ke parameter terakhir (untuk prosedur/fungsi)
+        self.psze = psze                # Total ukuran parameter
+        self.vsze = vsze                # Total ukuran variabel lokal
+        self.param_count = param_count  # Jumlah parameter formal
+
+
+class ArrayEntry(_SlotRecord):
+    __slots__ = ("index_type", "element_type", "eref", "low", "high", "element_size", "size",
+                 "type_desc")
+
+    def __init__(self, index_type: int, element_type: int, eref: int, low: int, high: int,
+                 element_size: int, size: int, type_desc: Optional[TypeDescriptor] = None):
+        self.index_type = index_type      # Tipe indeks array
+        self.element_type = element_type  # Tipe elemen array
+        self.eref = eref                  # Pointer ke detail tipe elemen jika komposit
+        self.low = low                    # Batas bawah indeks
+        self.high = high                  # Batas atas indeks
+        self.element_size = element_size  # Ukuran satu elemen
+        self.size = size                  # Total ukuran array
+        self.type_desc = type_desc        # ArrayType yang di-intern
+
+
+# Identifier user dimulai dari index ini; index di bawahnya adalah reserved word
+USER_ID_START = 29
+
+
+def _build_prelude() -> Tuple[TabEntry, ...]:
+    tab: List[TabEntry] = []
+
+    # Types
+    reserved_types = [
+        ("integer", BaseType.INTEGER),
+        ("real", BaseType.REAL), 
+        ("boolean", BaseType.BOOLEAN),
+        ("char", BaseType.CHAR),
+        ("string", BaseType.STRING)
+    ]
+    
+    # Keywords lainnya
+    other_keywords = [
+        "program", "variabel", "mulai", "selesai", "jika", "maka", "selainitu",
+        "selama", "lakukan", "untuk", "ke", "turunke", "larik", "dari", 
+        "prosedur", "fungsi", "konstanta", "tipe", "kasus", "rekaman", 
+        "ulangi", "sampai"
+    ]
+    
+    for name, base_type in reserved_types:
+        tab.append(TabEntry(name, ObjType.TYPE, base_type.value))
+    
+    for name in other_keywords[:23]:
+        tab.append(TabEntry(name, ObjType.TYPE, BaseType.VOID.value, link=len(tab) - 1))
+    
+    # Built-in procedures
+    built_ins = [
+        ("writeln", ObjType.PROCEDURE, BaseType.VOID.value),
+        ("readln", ObjType.PROCEDURE, BaseType.VOID.value),
+        ("write", ObjType.PROCEDURE, BaseType.VOID.value),
+        ("read", ObjType.PROCEDURE, BaseType.VOID.value)
+    ]
+    
+    for name, obj_type, data_type in built_ins:
+        tab.append(TabEntry(name, obj_type, data_type, link=len(tab) - 1))
+    return tuple(tab)
+
+
+# Prelude reserved words dan built-in: dibuat sekali per proses dan dipakai
+# bersama oleh semua SymbolTable. Entry prelude tidak boleh diubah langsung;
+# lewati SymbolTable.writable_entry() yang menyalinnya lebih dulu.
+PRELUDE: Tuple[TabEntry, ...] = _build_prelude()
+
+# Nama reserved word -> index, menggantikan scan linear index 0-28
+_PRELUDE_INDEX: Dict[str, int] = {}
+for _index, _entry in enumerate(PRELUDE[:USER_ID_START]):
+    _PRELUDE_INDEX.setdefault(_entry.name, _index)
+
+
+class SymbolTableSnapshot:
+    # State SymbolTable yang tidak bisa diubah. Entry tab/btab/atab dipakai
+    # bersama dengan tabel asal dan fork-nya (copy-on-write), sehingga
+    # snapshot hanya menyalin list pointer, bukan entry-nya.
+    __slots__ = ("tab", "btab", "atab", "display", "level", "next_adr", "next_user_id",
+                 "const_values")
+
+    def __init__(self, tab: Tuple[Optional[TabEntry], ...], btab: Tuple[BlockEntry, ...],
+                 atab: Tuple[ArrayEntry, ...], display: Tuple[int, ...], level: int,
+                 next_adr: int, next_user_id: int, const_values: Dict[str, Any]):
+        self.tab = tab
+        self.btab = btab
+        self.atab = atab
+        self.display = display
+        self.level = level
+        self.next_adr = next_adr
+        self.next_user_id = next_user_id
+        self.const_values = const_values    # Dipakai bersama; hanya dibaca
+
+    def fork(self) -> SymbolTable:
+        return SymbolTable.from_snapshot(self)
+
+    def __getstate__(self):
+        # Entry prelude tidak ikut di-pickle; proses tujuan memakai PRELUDE miliknya
+        tab = tuple(None if i < len(PRELUDE) and entry is PRELUDE[i] else entry
+                    for i, entry in enumerate(self.tab))
+        return (tab, self.btab, self.atab, self.display, self.level, self.next_adr,
+                self.next_user_id, self.const_values)
+
+    def __setstate__(self, state):
+        tab, *rest = state
+        tab = tuple(PRELUDE[i] if entry is None and i < len(PRELUDE) else entry
+                    for i, entry in enumerate(tab))
+        self.__init__(tab, *rest)
+
 
 class SymbolTable:
     def __init__(self):
-        self.tab: List[Dict[str, Any]] = []
-        self.btab: List[Dict[str, Any]] = []
-        self.atab: List[Dict[str, Any]] = []
-        
-        # Initialize dengan reserved words (indices 0-28)
-        self._init_reserved_words()
+        # Reserved words (indices 0-28) dan built-in berasal dari PRELUDE
+        self.tab: List[Optional[TabEntry]] = list(PRELUDE)
+        self.btab: List[BlockEntry] = []
+        self.atab: List[ArrayEntry] = []
         
         self.display: List[int] = []
         self.level: int = -1
         self.next_adr: int = 0
         
         # Counter untuk user identifiers mulai dari 29
-        self.user_id_start = 29
-        self.next_user_id = 29
+        self.user_id_start = USER_ID_START
+        self.next_user_id = USER_ID_START
         
         # Store constant values
         self.const_values: Dict[str, Any] = {}
+        self._share_all()
         
-    def _init_reserved_words(self):
-        # Types
-        reserved_types = [
-            ("integer", BaseType.INTEGER),
-            ("real", BaseType.REAL), 
-            ("boolean", BaseType.BOOLEAN),
-            ("char", BaseType.CHAR),
-            ("string", BaseType.STRING)
-        ]
-        
-        # Keywords lainnya
-        other_keywords = [
-            "program", "variabel", "mulai", "selesai", "jika", "maka", "selainitu",
-            "selama", "lakukan", "untuk", "ke", "turunke", "larik", "dari", 
-            "prosedur", "fungsi", "konstanta", "tipe", "kasus", "rekaman", 
-            "ulangi", "sampai"
-        ]
-        
-        for name, base_type in reserved_types:
-            self.tab.append({
-                "name": name,
-                "obj": ObjType.TYPE,
-                "type": base_type.value,
-                "ref": 0,        # Pointer ke tabel lain untuk tipe komposit
-                "nrm": 1,        # Normal variable (1) atau parameter by-reference (0)
-                "lev": 0,        # Level lexical
-                "adr": 0,        # Offset/address
-                "link": 0        # Link ke identifier sebelumnya dalam block
-            })
-        
-        for name in other_keywords[:23]:
-            self.tab.append({
-                "name": name,
-                "obj": ObjType.TYPE,
-                "type": BaseType.VOID.value,
-                "ref": 0,
-                "nrm": 1,
-                "lev": 0,
-                "adr": 0,
-                "link": len(self.tab) - 1
-            })
-        
-        # Built-in procedures
-        built_ins = [
-            ("writeln", ObjType.PROCEDURE, BaseType.VOID.value),
-            ("readln", ObjType.PROCEDURE, BaseType.VOID.value),
-            ("write", ObjType.PROCEDURE, BaseType.VOID.value),
-            ("read", ObjType.PROCEDURE, BaseType.VOID.value)
-        ]
-        
-        for name, obj_type, data_type in built_ins:
-            self.tab.append({
-                "name": name,
-                "obj": obj_type,
-                "type": data_type,
-                "ref": 0,
-                "nrm": 1,
-                "lev": 0,
-                "adr": 0,
-                "link": len(self.tab) - 1
-            })
-    
+    def _share_all(self):
+        # Copy-on-write: entry dengan index di bawah batas shared dipakai bersama
+        # (dengan PRELUDE, snapshot, atau fork lain) dan disalin sebelum diubah.
+        # Entry yang sudah disalin dicatat di owned.
+        self.shared_tab = len(self.tab)
+        self.shared_btab = len(self.btab)
+        self.shared_atab = len(self.atab)
+        self.owned_tab: set = set()
+        self.owned_btab: set = set()
+        self.owned_atab: set = set()
+        self.shared_consts = True
+
+    def snapshot(self) -> SymbolTableSnapshot:
+        snapshot = SymbolTableSnapshot(tuple(self.tab), tuple(self.btab), tuple(self.atab),
+                                       tuple(self.display), self.level, self.next_adr,
+                                       self.next_user_id, self.const_values)
+        # Tabel ini tetap bisa dipakai; perubahan berikutnya menyalin entry dulu
+        self._share_all()
+        return snapshot
+
+    def fork(self) -> SymbolTable:
+        return SymbolTable.from_snapshot(self.snapshot())
+
+    @classmethod
+    def from_snapshot(cls, snapshot: SymbolTableSnapshot) -> SymbolTable:
+        table = cls.__new__(cls)
+        table.tab = list(snapshot.tab)
+        table.btab = list(snapshot.btab)
+        table.atab = list(snapshot.atab)
+        table.display = list(snapshot.display)
+        table.level = snapshot.level
+        table.next_adr = snapshot.next_adr
+        table.user_id_start = USER_ID_START
+        table.next_user_id = snapshot.next_user_id
+        table.const_values = snapshot.const_values
+        table._share_all()
+        return table
+
+    def writable_entry(self, index: int) -> TabEntry:
+        entry = self.tab[index]
+        if index < self.shared_tab and index not in self.owned_tab:
+            entry = self.tab[index] = entry.copy()
+            self.owned_tab.add(index)
+        return entry
+
+    def writable_block(self, index: int) -> BlockEntry:
+        block = self.btab[index]
+        if index < self.shared_btab and index not in self.owned_btab:
+            block = self.btab[index] = block.copy()
+            self.owned_btab.add(index)
+        return block
+
+    def writable_array(self, index: int) -> ArrayEntry:
+        array = self.atab[index]
+        if index < self.shared_atab and index not in self.owned_atab:
+            array = self.atab[index] = array.copy()
+            self.owned_atab.add(index)
+        return array
+
+    def set_constant(self, name: str, value: Any):
+        if self.shared_consts:
+            self.const_values = dict(self.const_values)
+            self.shared_consts = False
+        self.const_values[name] = value
+
     def enter_block(self) -> int:
         self.level += 1
         block_index = len(self.btab)
         
-        self.btab.append({
-            "last": 0,      # Pointer ke identifier terakhir dalam block
-            "lpar": 0,      # Pointer ke parameter terakhir (untuk prosedur/fungsi)
-            "psze": 0,      # Total ukuran parameter
-            "vsze": 0       # Total ukuran variabel lokal
-        })
+        self.btab.append(BlockEntry())
         self.display.append(block_index)
         return block_index
     
@@ -125,7 +303,8 @@ class SymbolTable:
             self.display.pop()
     
     def enter_identifier(self, name: str, obj_type: ObjType, data_type: int, 
-                        ref: int = 0, nrm: int = 1, size: int = 1, const_value: Any = None) -> int:
+                        ref: int = 0, nrm: int = 1, size: int = 1, const_value: Any = None,
+                        type_desc: Optional[TypeDescriptor] = None) -> int:
         # Gunakan next_user_id untuk user-defined identifiers
         tab_index = self.next_user_id
         self.next_user_id += 1
@@ -137,8 +316,8 @@ class SymbolTable:
             adr = 0
 
         current_block_idx = self.display[self.level]
-        current_block = self.btab[current_block_idx]
-        prev_last = current_block["last"]
+        current_block = self.writable_block(current_block_idx)
+        prev_last = current_block.last
         
         if tab_index >= len(self.tab):
             while len(self.tab) <= tab_index:
@@ -147,67 +326,116 @@ class SymbolTable:
         # Link menunjuk ke identifier sebelumnya dalam block yang sama
         link_value = prev_last if prev_last >= self.user_id_start else 0
         
-        self.tab[tab_index] = {
-            "name": name,
-            "obj": obj_type,
-            "type": data_type,
-            "ref": ref,        # Untuk tipe komposit (array/record)
-            "nrm": nrm,        # 1 = normal var, 0 = parameter by-reference
-            "lev": self.level, # Lexical level
-            "adr": adr,        # Address/offset
-            "link": link_value # Link ke ident sebelumnya dalam block
-        }
+        self.tab[tab_index] = TabEntry(name, obj_type, data_type, ref, nrm,
+                                       self.level, adr, link_value, type_desc=type_desc)
         
         # Store constant value
         if obj_type == ObjType.CONSTANT and const_value is not None:
-            self.const_values[name] = const_value
+            self.set_constant(name, const_value)
         
         # Update last pointer blok
-        current_block["last"] = tab_index
+        current_block.last = tab_index
         
         # Update block size
         if obj_type == ObjType.VARIABLE:
-            current_block["vsze"] += size
+            current_block.vsze += size
             
         return tab_index
 
+    def enter_local(self, block_index: int, level: int, name: str, data_type: int, ref: int = 0,
+                    type_desc: Optional[TypeDescriptor] = None) -> int:
+        # Variabel tambahan untuk block yang sudah selesai dianalisis (mis. hasil
+        # inlining). Frame dihitung dari adr relatif terhadap variabel pertama
+        # block, jadi adr baru diletakkan tepat setelah variabel terakhir block.
+        tab_index = self.next_user_id
+        self.next_user_id += 1
+        while len(self.tab) <= tab_index:
+            self.tab.append(None)
+
+        block = self.writable_block(block_index)
+        base_adr = None
+        current_idx = block.last
+        while current_idx >= self.user_id_start:
+            entry = self.tab[current_idx]
+            if entry is None:
+                break
+            if entry.obj == ObjType.VARIABLE and (base_adr is None or entry.adr < base_adr):
+                base_adr = entry.adr
+            current_idx = entry.link
+        entry = TabEntry(name, ObjType.VARIABLE, data_type, ref, 1, level, 0,
+                         block.last if block.last >= self.user_id_start else 0, type_desc=type_desc)
+        if base_adr is None:
+            entry.adr = self.next_adr
+            self.next_adr += entry.type_desc.size
+        else:
+            entry.adr = base_adr + block.vsze
+        self.tab[tab_index] = entry
+        block.last = tab_index
+        block.vsze += entry.type_desc.size
+        return tab_index
+
     def find_identifier(self, name: str) -> Optional[int]:
+        tab = self.tab
+        tab_len = len(tab)
         # Search from current level down to global level
         for level in range(self.level, -1, -1):
             block_index = self.display[level]
-            last_idx = self.btab[block_index]["last"]
-            
-            current_idx = last_idx
+            current_idx = self.btab[block_index].last
             while current_idx >= self.user_id_start:
-                if (current_idx < len(self.tab) and 
-                    self.tab[current_idx] is not None and 
-                    self.tab[current_idx]["name"] == name):
+                entry = tab[current_idx] if current_idx < tab_len else None
+                if entry is None:
+                    break
+                if entry.name == name:
                     return current_idx
-                current_idx = self.tab[current_idx]["link"] if current_idx < len(self.tab) and self.tab[current_idx] else -1
+                current_idx = entry.link
                 
             # Cek reserved words (0-28)
-            for i in range(min(29, len(self.tab))):
-                if self.tab[i] and self.tab[i]["name"] == name:
-                    return i
+            reserved_idx = _PRELUDE_INDEX.get(name)
+            if reserved_idx is not None:
+                return reserved_idx
                     
         return None
     
+    def enter_signature(self, tab_index: int, block_index: int,
+                        return_type: Optional[TypeDescriptor] = None) -> Signature:
+        # Dihitung sekali setelah parameter formal dimasukkan; validasi pemanggilan
+        # cukup membaca entry.signature tanpa menelusuri link chain lagi.
+        block = self.writable_block(block_index)
+        param_indices = []
+        current_idx = block.last
+        while current_idx >= self.user_id_start:
+            entry = self.tab[current_idx]
+            if entry is None:
+                break
+            if entry.obj == ObjType.VARIABLE and entry.is_param:
+                param_indices.append(current_idx)
+            current_idx = entry.link
+        param_indices.reverse()
+        
+        params = [self.tab[i] for i in param_indices]
+        signature = Signature(tuple(p.name for p in params), tuple(p.type_desc for p in params),
+                              tuple(p.nrm for p in params),
+                              return_type if return_type is not None else PRIMITIVES_BY_VALUE[BaseType.VOID.value])
+        
+        block.lpar = param_indices[-1] if param_indices else 0
+        block.psze = sum(p.type_desc.size for p in params)
+        self.writable_entry(tab_index).signature = signature
+        return signature
+    
     def get_constant_value(self, name: str) -> Optional[Any]:
         return self.const_values.get(name)
     
     def enter_array(self, index_type: int, element_type: int, low_bound: int, 
-                   high_bound: int, element_size: int = 1) -> int:
+                   high_bound: int, element_size: int = 1, eref: int = 0,
+                   element_desc: Optional[TypeDescriptor] = None) -> int:
         array_size = (high_bound - low_bound + 1) * element_size
         
+        if element_desc is None:
+            element_desc = PRIMITIVES_BY_VALUE[element_type]
+        type_desc = array_type(PRIMITIVES_BY_VALUE[index_type], element_desc, low_bound, high_bound)
+        
         atab_index = len(self.atab)
-        self.atab.append({
-            "index_type": index_type,       # Tipe indeks array
-            "element_type": element_type,   # Tipe elemen array  
-            "eref": 0,                      # Pointer ke detail tipe elemen jika komposit
-            "low": low_bound,               # Batas bawah indeks
-            "high": high_bound,             # Batas atas indeks
-            "element_size": element_size,   # Ukuran satu elemen
-            "size": array_size              # Total ukuran array
-        })
-        
-        return atab_index
\ No newline at end of file
+        self.atab.append(ArrayEntry(index_type, element_type, eref, low_bound, high_bound,
+                                    element_size, array_size, type_desc))
+        
+        return atab_index
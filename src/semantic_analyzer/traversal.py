@@ -0,0 +1,110 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, Generator, Optional, Union
+from types import GeneratorType
+from .ast_nodes import ASTNode, NodeKind
+
+# Traversal AST tanpa rekursi Python.
+# ASTWalker berjalan pre-order (enter) dan post-order (leave) memakai stack
+# eksplisit, sehingga kedalaman AST tidak dibatasi recursion limit. Handler
+# dipilih dari tabel per kelas node, lalu per node_type untuk node ASTNode
+# generik; tidak ada hasattr per node. Anak sebuah node adalah children lalu
+# index_expressions (untuk akses elemen array).
+#
+# Pass yang perlu meneruskan hasil dari anak ke induk (mis. pembangun CFG)
+# ditulis sebagai generator dan dijalankan dengan trampoline().
+
+HandlerKey = Union[type, NodeKind]
+Handler = Callable[[ASTNode], Any]
+
+# Nilai kembali handler enter: jangan turun ke anak dan jangan panggil leave
+SKIP = "skip"
+
+# Penanda di stack: entry berikutnya adalah node yang akan di-leave
+_LEAVE = object()
+
+
+class ASTWalker:
+    def __init__(self, enter: Optional[Dict[HandlerKey, Handler]] = None,
+                 leave: Optional[Dict[HandlerKey, Handler]] = None,
+                 default_enter: Optional[Handler] = None,
+                 default_leave: Optional[Handler] = None):
+        self.enter = enter or {}
+        self.leave = leave or {}
+        self.default_enter = default_enter
+        self.default_leave = default_leave
+        # Cache kelas -> node_type -> (enter, leave) agar resolusi handler
+        # cukup dilakukan sekali per jenis node
+        self.handlers: Dict[type, Dict[NodeKind, tuple]] = {}
+
+    def resolve(self, node: ASTNode) -> tuple:
+        cls = node.__class__
+        enter = self.enter.get(cls) or self.enter.get(node.node_type, self.default_enter)
+        leave = self.leave.get(cls) or self.leave.get(node.node_type, self.default_leave)
+        self.handlers.setdefault(cls, {})[node.node_type] = (enter, leave)
+        return enter, leave
+
+    def walk(self, root: ASTNode):
+        handlers = self.handlers
+        stack = [root]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            node = pop()
+            if node is _LEAVE:
+                leave = pop()
+                leave(pop())
+                continue
+
+            try:
+                enter, leave = handlers[node.__class__][node.node_type]
+            except KeyError:
+                enter, leave = self.resolve(node)
+            if enter is not None and enter(node) is SKIP:
+                continue
+            children = node.children
+            index_expressions = node.index_expressions
+            if leave is not None:
+                if not children and not index_expressions:
+                    # Daun: leave langsung tanpa lewat stack
+                    leave(node)
+                    continue
+                push(node)
+                push(leave)
+                push(_LEAVE)
+            # Dibalik agar anak pertama diproses lebih dulu
+            if index_expressions:
+                stack += index_expressions[::-1]
+            if children:
+                if len(children) == 1:
+                    push(children[0])
+                else:
+                    stack += children[::-1]
+
+
+def walk(root: ASTNode, enter: Optional[Dict[HandlerKey, Handler]] = None,
+         leave: Optional[Dict[HandlerKey, Handler]] = None,
+         default_enter: Optional[Handler] = None, default_leave: Optional[Handler] = None):
+    ASTWalker(enter, leave, default_enter, default_leave).walk(root)
+
+
+def trampoline(start: Union[Generator, Any]) -> Any:
+    # Generator melakukan "panggilan rekursif" dengan yield generator anak dan
+    # menerima nilai return anak sebagai hasil yield. Langkah yang tidak punya
+    # anak boleh berupa fungsi biasa; nilai non-generator dianggap hasil jadi.
+    if not isinstance(start, GeneratorType):
+        return start
+    stack = [start]
+    result = None
+    while stack:
+        try:
+            child = stack[-1].send(result)
+        except StopIteration as stop:
+            stack.pop()
+            result = stop.value
+            continue
+        if isinstance(child, GeneratorType):
+            stack.append(child)
+            result = None
+        else:
+            result = child
+    return result
@@ -0,0 +1,174 @@
+from __future__ import annotations
+from typing import Dict, Optional, Union
+from enum import Enum
+
+# Type descriptor yang di-hash-cons: dua tipe yang secara struktural sama
+# selalu berupa object yang sama, sehingga kesamaan tipe cukup dicek dengan
+# "is" dan hasil pengecekan kompatibilitas bisa di-memo per pasangan object.
+
+class BaseType(Enum):
+    INTEGER = 1
+    REAL = 2
+    BOOLEAN = 3
+    CHAR = 4
+    STRING = 5
+    ARRAY = 6
+    RECORD = 7
+    VOID = 8
+    RANGE = 9
+
+
+class TypeDescriptor:
+    __slots__ = ("base", "key")
+
+    def __init__(self, base: BaseType, key: tuple):
+        self.base = base    # BaseType untuk kolom type di tab dan AST
+        self.key = key      # Kunci struktural yang dipakai untuk interning
+
+    @property
+    def size(self) -> int:
+        return 1
+
+    def __repr__(self):
+        return self.base.name.lower()
+
+
+class PrimitiveType(TypeDescriptor):
+    __slots__ = ()
+
+    def __reduce__(self):
+        return primitive, (self.base,)
+
+
+class ArrayType(TypeDescriptor):
+    __slots__ = ("index", "element", "low", "high")
+
+    def __init__(self, key: tuple, index: TypeDescriptor, element: TypeDescriptor, low: int, high: int):
+        super().__init__(BaseType.ARRAY, key)
+        self.index = index
+        self.element = element
+        self.low = low
+        self.high = high
+
+    @property
+    def size(self) -> int:
+        return max(self.high - self.low + 1, 0) * self.element.size
+
+    def __reduce__(self):
+        # Unpickle lewat konstruktor ter-intern agar identitas tetap terjaga
+        # antar proses (mis. analisis paralel)
+        return array_type, (self.index, self.element, self.low, self.high)
+
+    def __repr__(self):
+        return f"larik[{self.low}..{self.high}] dari {self.element!r}"
+
+
+class SubrangeType(TypeDescriptor):
+    __slots__ = ("host", "low", "high")
+
+    def __init__(self, key: tuple, host: TypeDescriptor, low: int, high: int):
+        super().__init__(host.base, key)
+        self.host = host
+        self.low = low
+        self.high = high
+
+    def __reduce__(self):
+        return subrange_type, (self.host, self.low, self.high)
+
+    def __repr__(self):
+        return f"{self.low}..{self.high}"
+
+
+_interned: Dict[tuple, TypeDescriptor] = {}
+
+
+def _intern(key: tuple, factory) -> TypeDescriptor:
+    descriptor = _interned.get(key)
+    if descriptor is None:
+        descriptor = factory()
+        _interned[key] = descriptor
+    return descriptor
+
+
+# Tipe primitif dibuat sekali; lookup by BaseType maupun by nilai int
+PRIMITIVES: Dict[BaseType, PrimitiveType] = {
+    base: _intern(("primitive", base), lambda base=base: PrimitiveType(base, ("primitive", base)))
+    for base in BaseType
+}
+PRIMITIVES_BY_VALUE: Dict[int, PrimitiveType] = {base.value: desc for base, desc in PRIMITIVES.items()}
+
+
+def primitive(base: Optional[BaseType]) -> PrimitiveType:
+    return PRIMITIVES[base if base is not None else BaseType.VOID]
+
+
+def array_type(index: TypeDescriptor, element: TypeDescriptor, low: int, high: int) -> ArrayType:
+    key = ("array", index, element, low, high)
+    return _intern(key, lambda: ArrayType(key, index, element, low, high))
+
+
+def subrange_type(host: TypeDescriptor, low: int, high: int) -> SubrangeType:
+    key = ("subrange", host, low, high)
+    return _intern(key, lambda: SubrangeType(key, host, low, high))
+
+
+def as_descriptor(type_: Union[TypeDescriptor, BaseType, None]) -> TypeDescriptor:
+    if isinstance(type_, TypeDescriptor):
+        return type_
+    return primitive(type_)
+
+
+# Memo kompatibilitas per (target, source, is_parameter). Descriptor di-intern
+# sehingga hash/eq default berbasis identitas sudah tepat sebagai kunci; BaseType
+# polos juga diterima dan baru dikonversi ke descriptor saat cache miss.
+_compatibility_cache: Dict[tuple, bool] = {}
+
+
+def is_compatible(target: Union[TypeDescriptor, BaseType, None],
+                  source: Union[TypeDescriptor, BaseType, None], is_parameter: bool = False) -> bool:
+    if target is source:
+        return True
+    key = (target, source, is_parameter)
+    try:
+        return _compatibility_cache[key]
+    except KeyError:
+        result = _compute_compatible(as_descriptor(target), as_descriptor(source), is_parameter)
+        _compatibility_cache[key] = result
+        return result
+
+
+def _compute_compatible(target: TypeDescriptor, source: TypeDescriptor, is_parameter: bool) -> bool:
+    # Subrange kompatibel sesuai tipe host-nya
+    if isinstance(target, SubrangeType):
+        target = target.host
+    if isinstance(source, SubrangeType):
+        source = source.host
+    if target is source:
+        return True
+
+    target_base = target.base
+    source_base = source.base
+
+    # Parameter boolean/char hanya menerima tipe yang sama persis
+    if is_parameter and target_base in (BaseType.BOOLEAN, BaseType.CHAR):
+        return False
+
+    # VOID muncul dari ekspresi yang sudah error; jangan laporkan dua kali
+    if target_base == BaseType.VOID or source_base == BaseType.VOID:
+        return True
+
+    # Komposit: hanya tipe yang identik yang kompatibel. Primitive ARRAY/RECORD
+    # (struktur tidak diketahui) tetap diterima agar tidak ada false positive.
+    if target_base in (BaseType.ARRAY, BaseType.RECORD) or source_base in (BaseType.ARRAY, BaseType.RECORD):
+        if target_base != source_base:
+            return False
+        return isinstance(target, PrimitiveType) or isinstance(source, PrimitiveType)
+
+    if target_base == BaseType.REAL and source_base == BaseType.INTEGER:
+        return True
+
+    # Char dapat diassign ke string
+    if target_base == BaseType.STRING and source_base == BaseType.CHAR:
+        return True
+
+    return False
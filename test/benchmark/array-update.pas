@@ -0,0 +1,39 @@
+program ArrayUpdate;
+
+variabel
+  a, b: larik[1..10000] dari integer;
+  w, v: larik[1..10000] dari real;
+  i, pass, total: integer;
+  weight: real;
+
+mulai
+  untuk i := 1 ke 10000 lakukan
+  mulai
+    a[i] := i mod 97;
+    b[i] := 0;
+    w[i] := 0.0;
+    v[i] := 1.0;
+  selesai;
+
+  untuk pass := 1 ke 20 lakukan
+  mulai
+    untuk i := 1 ke 10000 lakukan
+      b[i] := (a[i] * 3 + i + pass) mod 1009;
+    untuk i := 1 ke 10000 lakukan
+      a[i] := b[i] - a[i] bagi 2;
+    untuk i := 1 ke 10000 lakukan
+      w[i] := w[i] * 0.5 + a[i] / 4;
+    untuk i := 1 ke 10000 lakukan
+      v[i] := v[i] * 0.75 + w[i] * 0.25 - 0.5;
+  selesai;
+
+  total := 0;
+  weight := 0.0;
+  untuk i := 1 ke 10000 lakukan
+  mulai
+    total := (total + a[i] * i) mod 1000007;
+    weight := weight + w[i] + v[i];
+  selesai;
+  writeln('Array checksum: ', total);
+  writeln('Weight: ', weight);
+selesai.
@@ -0,0 +1,72 @@
+program CallHeavy;
+
+variabel
+  counter, total, i, j, a, b: integer;
+  ratio: real;
+
+fungsi MaxOfThree(a, b, c: integer): integer;
+mulai
+  jika (a >= b) dan (a >= c) maka
+    MaxOfThree := a
+  selainitu jika b >= c maka
+    MaxOfThree := b
+  selainitu
+    MaxOfThree := c;
+selesai;
+
+fungsi Clamp(value, low, high: integer): integer;
+mulai
+  Clamp := value;
+  jika value < low maka
+    Clamp := low;
+  jika value > high maka
+    Clamp := high;
+selesai;
+
+fungsi Square(x: integer): integer;
+mulai
+  Square := x * x;
+selesai;
+
+fungsi Average(x, y: integer): real;
+mulai
+  Average := (x + y) / 2;
+selesai;
+
+prosedur Swap(x, y: integer);
+variabel
+  temp: integer;
+mulai
+  temp := x;
+  x := y;
+  y := temp;
+selesai;
+
+prosedur IncrementCounter;
+mulai
+  counter := counter + 1;
+selesai;
+
+prosedur Accumulate(value: integer);
+mulai
+  total := (total + Clamp(value, 0, 1000)) mod 1000003;
+  IncrementCounter;
+selesai;
+
+mulai
+  counter := 0;
+  total := 0;
+  ratio := 0.0;
+  a := 7;
+  b := 3;
+  untuk i := 1 ke 300 lakukan
+    untuk j := 1 ke 100 lakukan
+    mulai
+      Accumulate(MaxOfThree(i, j, a) + Square(j mod 7) - b);
+      Swap(a, b);
+      ratio := ratio + Average(i, j) / 1000;
+    selesai;
+  writeln('Counter: ', counter);
+  writeln('Total: ', total);
+  writeln('Ratio: ', ratio);
+selesai.
@@ -0,0 +1,39 @@
+program DeepRecursion;
+
+variabel
+  total, round: integer;
+
+fungsi SumTo(k, acc: integer): integer;
+mulai
+  jika k = 0 maka
+    SumTo := acc
+  selainitu
+    SumTo := SumTo(k - 1, (acc + k) mod 999983);
+selesai;
+
+fungsi Depth(k: integer): integer;
+mulai
+  jika k = 0 maka
+    Depth := 0
+  selainitu
+    Depth := 1 + Depth(k - 1);
+selesai;
+
+prosedur Collatz(n, steps: integer);
+mulai
+  jika n = 1 maka
+    total := total + steps
+  selainitu jika n mod 2 = 0 maka
+    Collatz(n bagi 2, steps + 1)
+  selainitu
+    Collatz(3 * n + 1, steps + 1);
+selesai;
+
+mulai
+  writeln('Tail sum: ', SumTo(1000000, 0));
+  writeln('Depth: ', Depth(1000000));
+  total := 0;
+  untuk round := 1 ke 2000 lakukan
+    Collatz(round, 0);
+  writeln('Collatz steps: ', total);
+selesai.
@@ -0,0 +1,48 @@
+program FactorialPrime;
+
+variabel
+  i, count, total: integer;
+
+fungsi Factorial(n: integer): integer;
+variabel
+  result, i: integer;
+mulai
+  result := 1;
+  untuk i := 1 ke n lakukan
+    result := result * i;
+  Factorial := result;
+selesai;
+
+fungsi IsPrime(num: integer): boolean;
+variabel
+  i: integer;
+  prime: boolean;
+mulai
+  prime := benar;
+  jika num < 2 maka
+    prime := salah
+  selainitu
+  mulai
+    i := 2;
+    selama (i * i <= num) dan prime lakukan
+    mulai
+      jika num mod i = 0 maka
+        prime := salah;
+      i := i + 1;
+    selesai;
+  selesai;
+  IsPrime := prime;
+selesai;
+
+mulai
+  count := 0;
+  untuk i := 1 ke 20000 lakukan
+    jika IsPrime(i) maka
+      count := count + 1;
+  writeln('Primes below 20000: ', count);
+
+  total := 0;
+  untuk i := 1 ke 2000 lakukan
+    total := (total + Factorial(i mod 12)) mod 1000007;
+  writeln('Factorial checksum: ', total);
+selesai.
@@ -0,0 +1,20 @@
+program IoHeavy;
+
+variabel
+  n, m, i, x, total: integer;
+  r, rtotal: real;
+
+mulai
+  readln(n, m);
+  untuk i := 1 ke n lakukan
+    writeln(i);
+  total := 0;
+  rtotal := 0.0;
+  untuk i := 1 ke m lakukan
+  mulai
+    read(x, r);
+    total := total + x;
+    rtotal := rtotal + r;
+  selesai;
+  writeln('Total: ', total, ' ', rtotal);
+selesai.
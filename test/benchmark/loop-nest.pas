@@ -0,0 +1,52 @@
+program LoopNest;
+
+variabel
+  m: larik[0..3599] dari integer;
+  rowsum: larik[0..59] dari integer;
+  n, i, j, pass, scale, offset, total, k, checksum: integer;
+  damping: real;
+
+mulai
+  n := 60;
+  scale := 3;
+  offset := 7;
+  damping := 0.0;
+  k := 0;
+  ulangi
+    m[k] := 0;
+    k := k + 1;
+  sampai k = n * n;
+  k := 0;
+  ulangi
+    rowsum[k] := 0;
+    k := k + 1;
+  sampai k = n;
+  untuk i := 0 ke n - 1 lakukan
+    untuk j := 0 ke n - 1 lakukan
+      m[i * n + j] := (i * 31 + j * 17) mod 101;
+
+  untuk pass := 1 ke 12 lakukan
+    untuk i := 0 ke n - 1 lakukan
+    mulai
+      total := 0;
+      untuk j := 0 ke n - 1 lakukan
+      mulai
+        total := total + m[i * n + j] * (scale * pass + offset);
+        m[i * n + j] := (m[i * n + j] + total) mod (n * 2 + 1);
+      selesai;
+      rowsum[i] := total mod 100003;
+      damping := damping * 0.5 + rowsum[i] / (n * n);
+    selesai;
+
+  checksum := 0;
+  k := 0;
+  selama k < n * n - offset lakukan
+  mulai
+    checksum := (checksum + m[k] * (scale + offset)) mod 1000007;
+    k := k + scale;
+  selesai;
+  untuk i := 0 ke n - 1 lakukan
+    checksum := (checksum + rowsum[i]) mod 1000007;
+  writeln('Checksum: ', checksum);
+  writeln('Damping: ', damping);
+selesai.
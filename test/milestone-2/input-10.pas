@@ -33,7 +33,7 @@ selesai;
 
 fungsi MaxOfThree(a, b, c: integer): integer;
 mulai
-  jika a >= b dan a >= c maka
+  jika (a >= b) dan (a >= c) maka
     MaxOfThree := a
   selainitu jika b >= c maka
     MaxOfThree := b
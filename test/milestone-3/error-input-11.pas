@@ -0,0 +1,15 @@
+program ErrorInput11;
+variabel x: integer;
+fungsi Twice(v: integer): integer;
+mulai
+  Twice := v * 2
+selesai;
+fungsi Seven: integer;
+mulai
+  Seven := 7
+selesai;
+mulai
+  x := Twice + 1;
+  x := Seven + Twice(2);
+  writeln(x)
+selesai.
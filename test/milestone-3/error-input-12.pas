@@ -0,0 +1,14 @@
+program ErrorInput12;
+variabel
+  a, b, c: integer;
+  p: boolean;
+mulai
+  a := 5;
+  b := 12;
+  c := 8;
+  p := a >= b dan a >= c;
+  p := a < b < c;
+  p := tidak a;
+  p := (a >= b) dan (a >= c);
+  writeln(p)
+selesai.
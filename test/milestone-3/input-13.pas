@@ -0,0 +1,28 @@
+program Input13;
+variabel
+  a: larik[1..8] dari integer;
+  i, total: integer;
+
+prosedur Hitung;
+variabel
+  x: integer;
+
+  prosedur SetX;
+  mulai
+    x := a[1] + a[8];
+  selesai;
+
+mulai
+  SetX;
+  writeln('x = ', x);
+selesai;
+
+mulai
+  untuk i := 1 ke 8 lakukan
+    a[i] := i * i;
+  total := 0;
+  untuk i := 2 ke 8 lakukan
+    total := total + a[i - 1];
+  writeln('total = ', total);
+  Hitung;
+selesai.
@@ -7,7 +7,7 @@ variabel
 
 fungsi CheckConditions(a, b: integer; flag: boolean): boolean;
 mulai
-  jika a > b dan flag maka
+  jika (a > b) dan flag maka
     CheckConditions := benar
   selainitu
     CheckConditions := salah;